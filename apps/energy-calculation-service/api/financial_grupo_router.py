@@ -13,16 +13,18 @@ Funcionalidades:
 - Documentação automática via FastAPI/OpenAPI
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from models.shared.financial_models import (
     GrupoBFinancialRequest, 
     GrupoAFinancialRequest,
     ResultadosCodigoBResponse, 
     ResultadosCodigoAResponse
 )
-from services.financial_grupo_b_service import FinancialGrupoBService
-from services.financial_grupo_a_service import FinancialGrupoAService
 from core.response_models import SuccessResponse
+from core.exceptions import ServiceOverloadedError
+from core.executor import calculation_executor, WorkloadKind
+from services import tasks
+from utils.response_cache import response_cache
 import logging
 
 # Configurar logger detalhado para o router
@@ -30,10 +32,6 @@ router = APIRouter(prefix="/financial", tags=["Financial Grupo A/B"])
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
-# Instanciar serviços
-grupo_b_service = FinancialGrupoBService()
-grupo_a_service = FinancialGrupoAService()
-
 
 @router.post(
     "/calculate-grupo-b",
@@ -51,7 +49,7 @@ grupo_a_service = FinancialGrupoAService()
     - Indicadores financeiros (VPL, TIR, Payback)
     """
 )
-async def calculate_grupo_b_financials(input_data: GrupoBFinancialRequest):
+async def calculate_grupo_b_financials(input_data: GrupoBFinancialRequest, request: Request, response: Response):
     try:
         logger.info("="*80)
         logger.info("[ENDPOINT GRUPO B] INÍCIO DO PROCESSAMENTO DA REQUISIÇÃO")
@@ -104,7 +102,12 @@ async def calculate_grupo_b_financials(input_data: GrupoBFinancialRequest):
 
         # Chamar serviço
         logger.info("CHAMANDO SERVIÇO DE CÁLCULO...")
-        resultado = await grupo_b_service.calculate(input_data)
+        resultado = await response_cache.run(
+            "financial_grupo_b", input_data, request, response,
+            compute=lambda: calculation_executor.run(
+                tasks.calculate_financial_grupo_b, input_data, kind=WorkloadKind.CPU
+            )
+        )
 
         logger.info("[Grupo B] Cálculo concluído com sucesso")
         logger.info("RESPOSTA GERADA:")
@@ -118,6 +121,9 @@ async def calculate_grupo_b_financials(input_data: GrupoBFinancialRequest):
             message="Cálculo Grupo B concluído com sucesso"
         )
 
+    except ServiceOverloadedError:
+        raise
+
     except ValueError as e:
         logger.error(f"[Grupo B] Erro de validação: {str(e)}")
         logger.error(f"Tipo do erro: {type(e)}")
@@ -147,13 +153,18 @@ async def calculate_grupo_b_financials(input_data: GrupoBFinancialRequest):
     - Análise de sensibilidade
     """
 )
-async def calculate_grupo_a_financials(input_data: GrupoAFinancialRequest):
+async def calculate_grupo_a_financials(input_data: GrupoAFinancialRequest, request: Request, response: Response):
     try:
         logger.info(f"[Grupo A Python DEBUG] Payload recebido: {input_data.model_dump()}")
         logger.info(f"[Grupo A] Iniciando cálculo - CAPEX: R$ {input_data.financeiros.capex:,.2f}")
 
         # Chamar serviço
-        resultado = await grupo_a_service.calculate(input_data)
+        resultado = await response_cache.run(
+            "financial_grupo_a", input_data, request, response,
+            compute=lambda: calculation_executor.run(
+                tasks.calculate_financial_grupo_a, input_data, kind=WorkloadKind.CPU
+            )
+        )
 
         logger.info("[Grupo A] Cálculo concluído com sucesso")
 
@@ -163,6 +174,9 @@ async def calculate_grupo_a_financials(input_data: GrupoAFinancialRequest):
             message="Cálculo Grupo A concluído com sucesso"
         )
 
+    except ServiceOverloadedError:
+        raise
+
     except ValueError as e:
         logger.error(f"[Grupo A] Erro de validação: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -2,10 +2,13 @@
 Router para endpoints de cálculos financeiros
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from models.shared.financial_models import FinancialInput, AdvancedFinancialResults
-from services.shared.financial_service import FinancialCalculationService
 from core.response_models import SuccessResponse
+from core.exceptions import ServiceOverloadedError
+from core.executor import calculation_executor, WorkloadKind
+from services import tasks
+from utils.response_cache import response_cache
 import logging
 
 # Configurar logging
@@ -15,7 +18,9 @@ router = APIRouter(prefix="/financial", tags=["Cálculos Financeiros"])
 
 @router.post("/calculate-advanced", response_model=SuccessResponse[AdvancedFinancialResults])
 async def calculate_advanced_financial_analysis(
-    input_data: FinancialInput
+    input_data: FinancialInput,
+    request: Request,
+    response: Response
 ):
     """
     Calcula análise financeira avançada para sistema fotovoltaico
@@ -66,7 +71,12 @@ async def calculate_advanced_financial_analysis(
         
         # Realizar cálculos
         print(f"🐍 [PYTHON] Chamando FinancialCalculationService.calculate_advanced_financials()...")
-        resultado = FinancialCalculationService.calculate_advanced_financials(input_data)
+        resultado = await response_cache.run(
+            "financial_advanced", input_data, request, response,
+            compute=lambda: calculation_executor.run(
+                tasks.calculate_advanced_financials, input_data, kind=WorkloadKind.CPU
+            )
+        )
         
         logger.info("Cálculo financeiro concluído com sucesso")
         logger.info(f"VPL: R$ {resultado.vpl:,.2f}")
@@ -85,7 +95,7 @@ async def calculate_advanced_financial_analysis(
             message="Análise financeira calculada com sucesso"
         )
         
-    except HTTPException as e:
+    except (HTTPException, ServiceOverloadedError) as e:
         raise e
     except Exception as e:
         logger.error(f"Erro no cálculo financeiro: {str(e)}", exc_info=True)
@@ -96,7 +106,9 @@ async def calculate_advanced_financial_analysis(
 
 @router.post("/calculate-simple", response_model=SuccessResponse[dict])
 async def calculate_simple_financial_analysis(
-    input_data: FinancialInput
+    input_data: FinancialInput,
+    request: Request,
+    response: Response
 ):
     """
     Calcula análise financeira simplificada
@@ -110,7 +122,13 @@ async def calculate_simple_financial_analysis(
         logger.info("Iniciando cálculo financeiro simplificado")
         
         # Realizar cálculos completos
-        resultado_completo = FinancialCalculationService.calculate_advanced_financials(input_data)
+        # Mesmo cálculo do endpoint avançado: o resultado em cache é compartilhado
+        resultado_completo = await response_cache.run(
+            "financial_advanced", input_data, request, response,
+            compute=lambda: calculation_executor.run(
+                tasks.calculate_advanced_financials, input_data, kind=WorkloadKind.CPU
+            )
+        )
         
         # Extrair apenas indicadores principais
         resultado_simples = {
@@ -131,6 +149,8 @@ async def calculate_simple_financial_analysis(
             message="Análise financeira simplificada calculada com sucesso"
         )
         
+    except ServiceOverloadedError:
+        raise
     except Exception as e:
         logger.error(f"Erro no cálculo financeiro simplificado: {str(e)}", exc_info=True)
         raise HTTPException(
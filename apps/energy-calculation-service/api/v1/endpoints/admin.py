@@ -4,7 +4,16 @@ import logging
 from models.solar.responses import CacheStatsResponse, MessageResponse, HealthCheckResponse
 from utils.cache import cache_manager
 from utils.geohash_cache import geohash_cache_manager
+from utils.single_flight import weather_download_flight
+from utils.revalidation import cache_refresher
+from utils.cache_janitor import cache_janitor, response_cache_janitor
+from utils.cache_budget import cache_budget
+from utils.http_client import pvgis_client, nasa_power_client
+from utils.response_cache import response_cache
+from services.solar.weather_source import weather_source_fetcher
+from services.solar.weather_repository import weather_repository
 from core.config import settings
+from core.executor import calculation_executor
 from api.dependencies import log_request_dependency
 
 logger = logging.getLogger(__name__)
@@ -64,7 +73,8 @@ async def get_cache_statistics(
             newest_file=stats.get('newest_file'),
             cache_dir=stats.get('cache_dir', str(settings.CACHE_DIR)),
             cache_ttl_hours=settings.CACHE_TTL_HOURS,
-            max_size_mb=settings.MAX_CACHE_SIZE_MB
+            max_size_mb=settings.MAX_CACHE_SIZE_MB,
+            budget=stats.get('budget')
         )
         
     except HTTPException:
@@ -144,6 +154,10 @@ async def get_geohash_cache_stats():
                 detail=f"Erro ao obter estatísticas: {stats['error']}"
             )
 
+        stats["single_flight"] = weather_download_flight.get_stats()
+        stats["background_refresh"] = cache_refresher.get_stats()
+        stats["janitor"] = cache_janitor.get_stats()
+        stats["repository"] = weather_repository.get_stats()
         return stats
 
     except HTTPException:
@@ -204,3 +218,80 @@ async def cleanup_expired_geohash_cache():
             status_code=500,
             detail="Erro interno na limpeza do geohash cache"
         )
+
+
+@router.get(
+    "/cache/budget",
+    summary="Orçamento de disco do cache",
+    description="Uso registrado por gerenciador (geohash e legado), limites de tamanho e remoções do janitor"
+)
+async def get_cache_budget_stats():
+    """Obtém estatísticas do orçamento de disco e do janitor"""
+
+    stats = cache_budget.get_stats()
+    if "error" in stats:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erro ao obter estatísticas: {stats['error']}"
+        )
+
+    stats["janitor"] = cache_janitor.get_stats()
+    return stats
+
+
+@router.get(
+    "/cache/responses/stats",
+    summary="Estatísticas do cache de respostas",
+    description="Acertos, falhas e recálculos forçados deste worker, uso de disco e remoções do janitor"
+)
+async def get_response_cache_stats():
+    """Obtém estatísticas do cache de respostas"""
+    stats = response_cache.get_stats()
+    stats["janitor"] = response_cache_janitor.get_stats()
+    return stats
+
+
+@router.delete(
+    "/cache/responses/clear",
+    response_model=MessageResponse,
+    summary="Limpar cache de respostas",
+    description="Remove todos os resultados de cálculo em cache"
+)
+async def clear_response_cache():
+    """Limpa o cache de respostas"""
+    removed_count = response_cache.clear_all()
+
+    message = f"Cache de respostas limpo com sucesso. {removed_count} arquivos removidos."
+    logger.info(message)
+
+    return MessageResponse(message=message)
+
+
+# Execution pool Endpoints
+
+@router.get(
+    "/executor/stats",
+    summary="Estatísticas do pool de cálculo",
+    description="Retorna ocupação da fila e contadores do pool de processos de cálculo deste worker"
+)
+async def get_executor_stats():
+    """Obtém estatísticas do executor de cálculos"""
+    return calculation_executor.get_stats()
+
+
+# Upstream providers Endpoints
+
+@router.get(
+    "/upstream/stats",
+    summary="Estatísticas dos provedores externos",
+    description="Retorna contadores de requisições, estado do circuit breaker e hedging de PVGIS e NASA POWER "
+                "deste processo uvicorn. Os contadores são por processo e não são agregados: downloads feitos "
+                "pelos processos do pool de cálculo (a maioria) não aparecem aqui"
+)
+async def get_upstream_stats():
+    """Obtém estatísticas dos clientes HTTP dos provedores"""
+    return {
+        "pvgis": pvgis_client.get_stats(),
+        "nasa_power": nasa_power_client.get_stats(),
+        "source_selection": weather_source_fetcher.get_stats()
+    }
@@ -6,12 +6,15 @@ Endpoints disponíveis:
 - GET /health: Health check do serviço BESS
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from models.bess.hybrid_requests import HybridDimensioningRequest
 from models.bess.hybrid_responses import HybridDimensioningResponse
-from services.bess.hybrid_service import hybrid_dimensioning_service
-from core.exceptions import ValidationError, CalculationError
+from core.exceptions import ValidationError, CalculationError, ServiceOverloadedError
+from core.executor import calculation_executor, WorkloadKind
+from services import tasks
 from api.dependencies import rate_limit_dependency, log_request_dependency
+from services.solar.solar_service import SolarCalculationService
+from utils.response_cache import response_cache
 import logging
 import json
 from datetime import datetime
@@ -24,6 +27,8 @@ router = APIRouter()
 @router.post("/hybrid-dimensioning", response_model=HybridDimensioningResponse)
 async def calculate_hybrid_dimensioning(
     request: HybridDimensioningRequest,
+    http_request: Request,
+    response: Response,
     _: None = Depends(rate_limit_dependency),
     req_log: None = Depends(log_request_dependency)
 ):
@@ -51,6 +56,9 @@ async def calculate_hybrid_dimensioning(
     - Compara 4 cenários: sem sistema, só solar, só BESS, híbrido
     - Retorna autossuficiência energética
 
+    Requisições idênticas são servidas do cache de respostas (header X-Cache);
+    'Cache-Control: no-cache' força o recálculo.
+
     Args:
         request: Parâmetros do sistema híbrido (solar + BESS)
 
@@ -143,7 +151,13 @@ async def calculate_hybrid_dimensioning(
         # 2. Geração perfil consumo horário
         # 3. Simulação BESS (BessSimulationService)
         # 4. Análise financeira (HybridFinancialService)
-        result = hybrid_dimensioning_service.calculate_hybrid_system(request)
+        result = await response_cache.run(
+            "bess_hybrid", request, http_request, response,
+            compute=lambda: calculation_executor.run(
+                tasks.calculate_hybrid_system, request, kind=WorkloadKind.CPU
+            ),
+            fingerprint=lambda: SolarCalculationService.weather_fingerprint(request.sistema_solar)
+        )
 
         # =================================================================
         # LOG: RESULTADO
@@ -179,6 +193,10 @@ async def calculate_hybrid_dimensioning(
 
         return result
 
+    except ServiceOverloadedError:
+        # Fila de cálculo cheia: handler global responde 503 + Retry-After
+        raise
+
     except ValidationError as e:
         # Erro de validação de dados de entrada
         print(f"\n❌ [PYTHON - BESS ENDPOINT] ERRO DE VALIDAÇÃO: {e}\n")
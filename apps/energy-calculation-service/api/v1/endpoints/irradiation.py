@@ -4,8 +4,9 @@ import logging
 
 from models.solar.requests import IrradiationAnalysisRequest
 from models.solar.responses import IrradiationAnalysisResponse, ErrorResponse
-from services.solar import irradiation_service
 from core.exceptions import SolarAPIException
+from core.executor import calculation_executor, WorkloadKind
+from services import tasks
 from api.dependencies import rate_limit_dependency, log_request_dependency
 
 logger = logging.getLogger(__name__)
@@ -55,7 +56,9 @@ async def analyze_monthly_irradiation(
     try:
         logger.info(f"Analisando irradiação mensal para {request.lat}, {request.lon}")
         
-        result = irradiation_service.analyze_monthly_irradiation(request)
+        result = await calculation_executor.run(
+            tasks.analyze_monthly_irradiation, request, kind=WorkloadKind.CPU
+        )
         
         logger.info(f"Análise concluída: {result.media_anual} kWh/m²/dia média anual")
         
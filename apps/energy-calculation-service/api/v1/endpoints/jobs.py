@@ -0,0 +1,181 @@
+"""
+Endpoints de jobs assíncronos para cálculos longos
+
+Alternativa aos endpoints síncronos de solar, híbrido e proposta: a submissão
+retorna imediatamente um job_id e o cliente consulta status/resultado por polling.
+
+Endpoints disponíveis:
+- POST /jobs/solar/calculate: Submete cálculo solar multi-inversor
+- POST /jobs/bess/hybrid-dimensioning: Submete dimensionamento híbrido
+- POST /jobs/proposal/generate: Submete geração de proposta
+- GET /jobs/{job_id}: Status do job
+- GET /jobs/{job_id}/result: Resultado do job
+- DELETE /jobs/{job_id}: Cancela o job
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+import logging
+
+from models.solar.requests import SolarSystemCalculationRequest
+from models.bess.hybrid_requests import HybridDimensioningRequest
+from models.proposal.requests import ProposalRequest
+from models.jobs.responses import (
+    JobType,
+    JobStatus,
+    JobSubmitResponse,
+    JobStatusResponse,
+    JobResultResponse
+)
+from models.solar.responses import MessageResponse
+from services.jobs.job_manager import job_manager
+from api.dependencies import rate_limit_dependency
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["Jobs Assíncronos"],
+    responses={
+        404: {"description": "Job não encontrado ou expirado"},
+        503: {"description": "Fila de cálculo cheia (ver header Retry-After)"}
+    }
+)
+
+
+def _submit(job_type: JobType, payload, http_request: Request) -> JobSubmitResponse:
+    job = job_manager.submit(job_type, payload)
+    job_id = job["job_id"]
+    status_url = str(http_request.url_for("get_job_status", job_id=job_id))
+
+    return JobSubmitResponse(
+        job_id=job_id,
+        job_type=job_type,
+        status=job["status"],
+        status_url=status_url,
+        result_url=str(http_request.url_for("get_job_result", job_id=job_id))
+    )
+
+
+@router.post(
+    "/solar/calculate",
+    response_model=JobSubmitResponse,
+    status_code=202,
+    summary="Submeter cálculo solar",
+    description="Versão assíncrona de POST /solar/calculate"
+)
+async def submit_solar_job(
+    request: SolarSystemCalculationRequest,
+    http_request: Request,
+    _: None = Depends(rate_limit_dependency)
+):
+    """Submete cálculo de sistema solar multi-inversor"""
+    logger.info(f"Submetendo job solar para lat={request.lat}, lon={request.lon}")
+    return _submit(JobType.SOLAR, request, http_request)
+
+
+@router.post(
+    "/bess/hybrid-dimensioning",
+    response_model=JobSubmitResponse,
+    status_code=202,
+    summary="Submeter dimensionamento híbrido",
+    description="Versão assíncrona de POST /bess/hybrid-dimensioning"
+)
+async def submit_hybrid_job(
+    request: HybridDimensioningRequest,
+    http_request: Request,
+    _: None = Depends(rate_limit_dependency)
+):
+    """Submete cálculo de sistema híbrido Solar + BESS"""
+    logger.info(f"Submetendo job híbrido para lat={request.sistema_solar.lat}, lon={request.sistema_solar.lon}")
+    return _submit(JobType.HYBRID, request, http_request)
+
+
+@router.post(
+    "/proposal/generate",
+    response_model=JobSubmitResponse,
+    status_code=202,
+    summary="Submeter geração de proposta",
+    description="Versão assíncrona de POST /proposal/generate"
+)
+async def submit_proposal_job(
+    request: ProposalRequest,
+    http_request: Request,
+    _: None = Depends(rate_limit_dependency)
+):
+    """Submete geração de proposta comercial em PDF"""
+    if not request.empresa.nome:
+        raise HTTPException(status_code=400, detail="Nome da empresa é obrigatório")
+
+    if not request.cliente.nome:
+        raise HTTPException(status_code=400, detail="Nome do cliente é obrigatório")
+
+    if request.valor_investimento <= 0:
+        raise HTTPException(status_code=400, detail="Valor do investimento deve ser positivo")
+
+    logger.info(f"Submetendo job de proposta para cliente: {request.cliente.nome}")
+    return _submit(JobType.PROPOSAL, request, http_request)
+
+
+@router.get(
+    "/{job_id}",
+    response_model=JobStatusResponse,
+    name="get_job_status",
+    summary="Status do job"
+)
+async def get_job_status(job_id: str):
+    """Retorna o status atual do job"""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job não encontrado ou expirado")
+
+    return JobStatusResponse(**job)
+
+
+@router.get(
+    "/{job_id}/result",
+    response_model=JobResultResponse,
+    name="get_job_result",
+    summary="Resultado do job",
+    responses={409: {"description": "Job ainda não concluído, falhou ou foi cancelado"}}
+)
+async def get_job_result(job_id: str):
+    """Retorna o resultado de um job concluído"""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job não encontrado ou expirado")
+
+    if job["status"] != JobStatus.SUCCEEDED.value:
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "message": "Resultado indisponível",
+                "status": job["status"],
+                "error": job["error"]
+            }
+        )
+
+    return JobResultResponse(
+        job_id=job_id,
+        job_type=job["job_type"],
+        status=job["status"],
+        result=job_manager.get_result(job_id)
+    )
+
+
+@router.delete(
+    "/{job_id}",
+    response_model=MessageResponse,
+    summary="Cancelar job",
+    responses={409: {"description": "Job já finalizado"}}
+)
+async def cancel_job(job_id: str):
+    """Cancela um job pendente ou em execução"""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job não encontrado ou expirado")
+
+    if not job_manager.cancel(job_id):
+        raise HTTPException(status_code=409, detail=f"Job já finalizado (status={job['status']})")
+
+    logger.info(f"Job {job_id} cancelado")
+    return MessageResponse(message=f"Job {job_id} cancelado")
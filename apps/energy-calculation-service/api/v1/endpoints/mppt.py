@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from models.solar.mppt_models import MPPTCalculationRequest, MPPTCalculationResponse, MPPTCalculationErrorResponse
 from services.solar.mppt_service import mppt_service
 from core.exceptions import ValidationError, CalculationError
+from core.executor import calculation_executor, WorkloadKind
 from api.dependencies import rate_limit_dependency, log_request_dependency
 import logging
 import json
@@ -36,8 +37,10 @@ async def calculate_modules_per_mppt(
     """
 
     try:
-        # Executar cálculo
-        result = mppt_service.calculate_modules_per_mppt(request)
+        # Executar cálculo (dominado pela busca de temperatura mínima no cache/PVGIS)
+        result = await calculation_executor.run(
+            mppt_service.calculate_modules_per_mppt, request, kind=WorkloadKind.IO
+        )
 
         # Verificar se o resultado é um erro estruturado
         if isinstance(result, MPPTCalculationErrorResponse):
@@ -2,8 +2,10 @@ from fastapi import APIRouter, HTTPException, BackgroundTasks
 from fastapi.responses import FileResponse
 from models.proposal.requests import ProposalRequest
 from models.proposal.responses import ProposalResponse
-from services.proposal.proposal_service import ProposalGenerationService
 from core.response_models import SuccessResponse
+from core.exceptions import ServiceOverloadedError
+from core.executor import calculation_executor, WorkloadKind
+from services import tasks
 import logging
 import os
 
@@ -42,7 +44,9 @@ async def generate_proposal(
             raise HTTPException(status_code=400, detail="Valor do investimento deve ser positivo")
         
         # Gerar proposta
-        resultado = ProposalGenerationService.generate_proposal(request)
+        resultado = await calculation_executor.run(
+            tasks.generate_proposal, request, kind=WorkloadKind.CPU
+        )
         
         logger.info(f"Proposta gerada com sucesso: {resultado.pdf_filename}")
         
@@ -52,7 +56,7 @@ async def generate_proposal(
             message="Proposta gerada com sucesso"
         )
         
-    except HTTPException as e:
+    except (HTTPException, ServiceOverloadedError) as e:
         raise e
     except Exception as e:
         logger.error(f"Erro na geração de proposta: {str(e)}", exc_info=True)
@@ -2,12 +2,17 @@
 Endpoint para cálculo de sistemas solares multi-inversor
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from fastapi.responses import JSONResponse
 import logging
 
-from models.solar.requests import SolarSystemCalculationRequest
+from models.solar.requests import SolarSystemCalculationRequest, DatasheetModulo
+from core.exceptions import ServiceOverloadedError
+from core.executor import calculation_executor, WorkloadKind
+from services import tasks
+from services.solar.module_fit import module_fit_cache
 from services.solar.solar_service import SolarCalculationService
+from utils.response_cache import response_cache
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -18,16 +23,18 @@ router = APIRouter(
     responses={
         400: {"description": "Erro de validação"},
         422: {"description": "Erro de processamento"},
-        500: {"description": "Erro interno do servidor"}
+        500: {"description": "Erro interno do servidor"},
+        503: {"description": "Fila de cálculo cheia (ver header Retry-After)"}
     }
 )
 
 @router.post(
     "/calculate",
     summary="Cálculo de sistema solar multi-inversor",
-    description="Calcula sistema fotovoltaico completo usando pvlib"
+    description="Calcula sistema fotovoltaico completo usando pvlib. Requisições idênticas são "
+                "servidas do cache de respostas (header X-Cache); 'Cache-Control: no-cache' recalcula."
 )
-async def calculate_solar_system(request: SolarSystemCalculationRequest):
+async def calculate_solar_system(request: SolarSystemCalculationRequest, http_request: Request, response: Response):
     """
     Endpoint para cálculo de sistema solar multi-inversor
     """
@@ -35,15 +42,63 @@ async def calculate_solar_system(request: SolarSystemCalculationRequest):
     try:
         logger.info(f"Calculando sistema solar para lat={request.lat}, lon={request.lon}")
 
-        result = SolarCalculationService.calculate(request)
+        result = await response_cache.run(
+            "solar", request, http_request, response,
+            compute=lambda: calculation_executor.run(
+                tasks.calculate_solar_system, request, kind=WorkloadKind.CPU
+            ),
+            fingerprint=lambda: SolarCalculationService.weather_fingerprint(request)
+        )
 
         logger.info(f"Cálculo concluído com sucesso")
 
         return result
 
+    except ServiceOverloadedError:
+        raise
     except ValueError as ve:
         logger.error(f"Erro de validação: {ve}")
         raise HTTPException(status_code=400, detail=str(ve))
     except Exception as e:
         logger.error(f"Erro interno: {e}")
         raise HTTPException(status_code=500, detail=f"Erro interno: {str(e)}")
+
+
+@router.post(
+    "/modules/fit",
+    summary="Ajuste dos parâmetros do diodo único a partir do datasheet",
+    description="Ajusta a_ref, I_L_ref, I_o_ref, R_s e R_sh_ref (De Soto) a Voc/Isc/Vmp/Imp e aos coeficientes de "
+                "temperatura. O ajuste é memoizado pelo hash do datasheet; o id retornado pode ser enviado em "
+                "modulo.parametros_id no cálculo."
+)
+async def fit_module_parameters(datasheet: DatasheetModulo):
+    """
+    Endpoint para ajuste dos parâmetros do módulo
+    """
+
+    try:
+        return await calculation_executor.run(tasks.fit_module_parameters, datasheet, kind=WorkloadKind.CPU)
+
+    except ServiceOverloadedError:
+        raise
+    except ValueError as ve:
+        logger.error(f"Erro de validação: {ve}")
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        logger.error(f"Erro interno: {e}")
+        raise HTTPException(status_code=500, detail=f"Erro interno: {str(e)}")
+
+
+@router.get(
+    "/modules/fit/{fit_id}",
+    summary="Ajuste de parâmetros do módulo já calculado"
+)
+async def get_module_fit(fit_id: str):
+    """
+    Endpoint para consulta de um ajuste pelo id
+    """
+
+    fit = module_fit_cache.get(fit_id)
+    if fit is None:
+        raise HTTPException(status_code=404, detail=f"Ajuste '{fit_id}' não encontrado")
+    return fit
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from api.v1.endpoints import irradiation, admin, mppt, solar, bess, proposal
+from api.v1.endpoints import irradiation, admin, mppt, solar, bess, proposal, jobs
 from api.financial_router import router as financial_router
 from api.financial_grupo_router import router as financial_grupo_router
 
@@ -16,6 +16,7 @@ api_router.include_router(admin.router)
 api_router.include_router(financial_router)
 api_router.include_router(financial_grupo_router)
 api_router.include_router(proposal.router, tags=["Propostas"])
+api_router.include_router(jobs.router)
 
 # Endpoint de informações da API
 @api_router.get(
@@ -56,6 +57,14 @@ async def api_info():
                 "POST /proposal/generate": "Geração de proposta comercial em PDF",
                 "GET /proposal/download/{filename}": "Download de proposta gerada"
             },
+            "jobs": {
+                "POST /jobs/solar/calculate": "Cálculo solar assíncrono",
+                "POST /jobs/bess/hybrid-dimensioning": "Cálculo híbrido assíncrono",
+                "POST /jobs/proposal/generate": "Geração de proposta assíncrona",
+                "GET /jobs/{job_id}": "Status do job",
+                "GET /jobs/{job_id}/result": "Resultado do job",
+                "DELETE /jobs/{job_id}": "Cancelar job"
+            },
             "admin": {
                 "GET /admin/health": "Health check",
                 "GET /admin/cache/stats": "Estatísticas do cache legado",
@@ -63,7 +72,10 @@ async def api_info():
                 "DELETE /admin/cache/cleanup": "Limpeza de arquivos antigos",
                 "GET /admin/cache/geohash/stats": "Estatísticas do geohash cache",
                 "DELETE /admin/cache/geohash/clear": "Limpar geohash cache",
-                "DELETE /admin/cache/geohash/cleanup": "Limpeza de cache expirado"
+                "DELETE /admin/cache/geohash/cleanup": "Limpeza de cache expirado",
+                "GET /admin/cache/budget": "Orçamento de disco do cache e limpeza LRU",
+                "GET /admin/executor/stats": "Estatísticas do pool de cálculo",
+                "GET /admin/upstream/stats": "Estatísticas dos provedores PVGIS e NASA POWER"
             }
         },
         "documentation": "/docs"
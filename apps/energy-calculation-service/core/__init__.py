@@ -8,7 +8,8 @@ from .exceptions import (
     ValidationError,
     PVGISError,
     CacheError,
-    CalculationError
+    CalculationError,
+    ServiceOverloadedError
 )
 
 __all__ = [
@@ -17,5 +18,6 @@ __all__ = [
     "ValidationError",
     "PVGISError",
     "CacheError", 
-    "CalculationError"
+    "CalculationError",
+    "ServiceOverloadedError"
 ]
\ No newline at end of file
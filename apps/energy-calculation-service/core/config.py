@@ -1,7 +1,7 @@
 from pydantic_settings import BaseSettings
 from pydantic import Field
 from pathlib import Path
-from typing import List
+from typing import List, Literal, Optional
 import os
 
 class Settings(BaseSettings):
@@ -41,6 +41,10 @@ class Settings(BaseSettings):
         description="URL base da API PVGIS"
     )
     PVGIS_TIMEOUT: int = Field(default=120, description="Timeout para requisições PVGIS (segundos)")
+    PVGIS_OUTPUT_FORMAT: Literal["json", "csv"] = Field(
+        default="json",
+        description="Formato de resposta do PVGIS seriescalc (csv é menor e mais rápido de processar)"
+    )
     PVGIS_START_YEAR: int = Field(default=2005, description="Ano inicial dos dados PVGIS")
     PVGIS_END_YEAR: int = Field(default=2020, description="Ano final dos dados PVGIS")
     
@@ -58,18 +62,125 @@ class Settings(BaseSettings):
     MAX_CONSUMPTION: float = Field(default=100000.0, description="Consumo máximo anual (kWh)")
     MIN_CONSUMPTION: float = Field(default=100.0, description="Consumo mínimo anual (kWh)")
     
+    # Execução de cálculos (process pool)
+    CALC_POOL_ENABLED: bool = Field(
+        default=True,
+        description="Executar cálculos CPU-bound em pool de processos (False = thread pool)"
+    )
+    CALC_POOL_WORKERS: int = Field(
+        default=2,
+        description="Número de processos do pool de cálculo por worker uvicorn"
+    )
+    CALC_QUEUE_MAX_SIZE: int = Field(
+        default=8,
+        description="Máximo de cálculos aguardando na fila além dos que estão em execução"
+    )
+    CALC_RETRY_AFTER_SECONDS: int = Field(
+        default=10,
+        description="Valor do header Retry-After quando a fila de cálculo está cheia"
+    )
+
+    # Jobs assíncronos
+    JOBS_DB_PATH: Optional[Path] = Field(
+        default=None,
+        description="Arquivo SQLite do armazenamento de jobs (padrão: CACHE_DIR/jobs.sqlite3)"
+    )
+    JOB_RESULT_TTL_HOURS: int = Field(
+        default=24,
+        description="Tempo de retenção de jobs e seus resultados (horas)"
+    )
+
     # Rate limiting (para implementação futura)
     RATE_LIMIT_REQUESTS: int = Field(default=100, description="Requisições por minuto por IP")
     RATE_LIMIT_WINDOW: int = Field(default=60, description="Janela de rate limiting (segundos)")
     
     # Configurações de cache
     CACHE_TTL_HOURS: int = Field(default=24*7, description="TTL do cache em horas (padrão: 1 semana)")
-    MAX_CACHE_SIZE_MB: int = Field(default=1000, description="Tamanho máximo do cache em MB")
+    MAX_CACHE_SIZE_MB: int = Field(
+        default=1000,
+        description="Tamanho máximo do cache em disco (geohash + legado) em MB; acima dele o janitor remove por LRU (0 desativa)"
+    )
+    CACHE_LOW_WATER_RATIO: float = Field(
+        default=0.8,
+        description="Fração de MAX_CACHE_SIZE_MB até a qual a limpeza LRU remove arquivos"
+    )
     
     # Geohash cache configuration
     GEOHASH_PRECISION: int = Field(default=5, description="Geohash precision (5 = ~4.9km cells)")
     CACHE_RADIUS_KM: float = Field(default=15.0, description="Maximum distance for cache hits (km)")
     PVGIS_CACHE_TTL_DAYS: int = Field(default=30, description="PVGIS cache TTL in days")
+    MEMORY_CACHE_MAX_MB: int = Field(
+        default=256,
+        description="In-process memory tier budget for weather datasets in MB, per process (0 disables)"
+    )
+    WEATHER_DOWNLOAD_LOCK_TIMEOUT: int = Field(
+        default=180,
+        description="Tempo máximo (s) aguardando download concorrente da mesma célula antes de baixar novamente"
+    )
+    CACHE_SEED_CONCURRENCY: int = Field(
+        default=4,
+        description="Downloads simultâneos no pré-aquecimento do cache (services/solar/cache_seeder.py)"
+    )
+    CACHE_STALE_GRACE_HOURS: int = Field(
+        default=24*7,
+        description="Carência após o TTL em que entradas vencidas ainda são servidas enquanto são atualizadas em segundo plano"
+    )
+    CACHE_REFRESH_MAX_WORKERS: int = Field(
+        default=1,
+        description="Atualizações de cache em segundo plano simultâneas, por processo"
+    )
+    CACHE_REFRESH_MIN_INTERVAL_SECONDS: float = Field(
+        default=5.0,
+        description="Intervalo mínimo (s) entre o início de duas atualizações em segundo plano"
+    )
+    CACHE_JANITOR_INTERVAL_SECONDS: int = Field(
+        default=900,
+        description="Intervalo (s) entre execuções do janitor: entradas fora da carência e limite de tamanho (0 desativa)"
+    )
+    CACHE_INTERPOLATION_ENABLED: bool = Field(
+        default=False,
+        description="Sintetiza a série horária por ponderação inversa da distância (IDW) das entradas vizinhas em cache"
+    )
+    CACHE_INTERPOLATION_MAX_NEIGHBORS: int = Field(
+        default=4,
+        description="Máximo de entradas vizinhas combinadas na interpolação (mínimo 2)"
+    )
+    CACHE_INTERPOLATION_RADIUS_KM: float = Field(
+        default=30.0,
+        description="Raio (km) de busca das entradas vizinhas na interpolação"
+    )
+    CACHE_INTERPOLATION_POWER: float = Field(
+        default=2.0,
+        description="Expoente da distância nos pesos IDW (peso = 1 / distância^p)"
+    )
+    CACHE_INTERPOLATION_EXACT_KM: float = Field(
+        default=1.0,
+        description="Entrada mais próxima que isso é servida diretamente, sem interpolar"
+    )
+    DIODE_SURFACE_ENABLED: bool = Field(
+        default=True,
+        description="Potência DC por interpolação na superfície P_mp(irradiância, temperatura) pré-calculada do módulo"
+    )
+    DIODE_SURFACE_MAX_ERROR_PCT: float = Field(
+        default=0.05,
+        description="Erro máximo (% de P_mp em STC) da superfície contra a solução exata; acima disso ela não é usada"
+    )
+    MODULE_FIT_MAX_ERROR_PCT: float = Field(
+        default=2.0,
+        description="Erro máximo (% de Vmp·Imp) de P_mp em STC do ajuste De Soto por datasheet; acima disso o ajuste é recusado"
+    )
+    RESPONSE_CACHE_ENABLED: bool = Field(
+        default=True,
+        description="Reutiliza o resultado de requisições idênticas (solar, financeiro, híbrido)"
+    )
+    RESPONSE_CACHE_TTL_HOURS: int = Field(
+        default=24,
+        description="Validade (h) de um resultado no cache de respostas"
+    )
+    RESPONSE_CACHE_MAX_MB: int = Field(
+        default=256,
+        description="Limite de tamanho (MB) do cache de respostas; a limpeza LRU do janitor o mantém abaixo disso"
+    )
     
     # Weather data source configuration
     WEATHER_DATA_SOURCE_DEFAULT: str = Field(
@@ -80,6 +191,27 @@ class Settings(BaseSettings):
         default=True,
         description="Enable fallback to alternative data source on failure"
     )
+    WEATHER_FETCH_MODE: Literal["fallback", "hedged"] = Field(
+        default="fallback",
+        description="fallback: secondary source only after primary fails; "
+                    "hedged: secondary starts in parallel when primary is slow"
+    )
+    WEATHER_HEDGE_PERCENTILE: float = Field(
+        default=95.0,
+        description="Percentile of recent primary latencies after which the secondary source is started"
+    )
+    WEATHER_HEDGE_MIN_SAMPLES: int = Field(
+        default=20,
+        description="Latency samples required before using the percentile"
+    )
+    WEATHER_HEDGE_DEFAULT_DELAY_SECONDS: float = Field(
+        default=15.0,
+        description="Hedge delay while there are not enough latency samples (seconds)"
+    )
+    WEATHER_HEDGE_MIN_DELAY_SECONDS: float = Field(
+        default=3.0,
+        description="Lower bound for the hedge delay, so cache-hit latencies do not trigger hedges (seconds)"
+    )
     
     # NASA POWER configuration
     NASA_POWER_API_TIMEOUT: int = Field(
@@ -102,6 +234,36 @@ class Settings(BaseSettings):
         default="PSM3",
         description="NASA POWER dataset name (PSM3 or TMY)"
     )
+    NASA_POWER_MAX_PARALLEL_YEARS: int = Field(
+        default=3,
+        description="Blocos anuais NASA POWER baixados em paralelo por requisição"
+    )
+
+    # Cliente HTTP dos provedores externos (PVGIS, NASA POWER)
+    UPSTREAM_MAX_RETRIES: int = Field(
+        default=2,
+        description="Novas tentativas após falha transitória (conexão, timeout, 429/5xx)"
+    )
+    UPSTREAM_BACKOFF_BASE_SECONDS: float = Field(
+        default=1.0,
+        description="Base do backoff exponencial com jitter entre tentativas (segundos)"
+    )
+    UPSTREAM_BACKOFF_MAX_SECONDS: float = Field(
+        default=30.0,
+        description="Espera máxima entre tentativas, inclusive via Retry-After (segundos)"
+    )
+    UPSTREAM_MAX_CONCURRENCY_PER_HOST: int = Field(
+        default=4,
+        description="Requisições simultâneas por host em cada processo"
+    )
+    UPSTREAM_CIRCUIT_FAILURE_THRESHOLD: int = Field(
+        default=5,
+        description="Falhas consecutivas que abrem o circuit breaker do provedor"
+    )
+    UPSTREAM_CIRCUIT_RESET_SECONDS: float = Field(
+        default=60.0,
+        description="Tempo com o circuito aberto antes de uma requisição de teste (segundos)"
+    )
     
     # Logging
     LOG_LEVEL: str = Field(default="INFO", description="Nível de log")
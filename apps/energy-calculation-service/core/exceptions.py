@@ -16,6 +16,19 @@ class SolarAPIException(Exception):
         self.timestamp = datetime.utcnow()
         super().__init__(self.message)
 
+    def __reduce__(self):
+        # Subclasses alteram a assinatura do __init__; reconstruir a partir do
+        # estado evita prefixar a mensagem novamente ao voltar do process pool
+        return (_restore_exception, (self.__class__, self.args, self.__dict__))
+
+
+def _restore_exception(cls, args, state):
+    """Reconstrói uma SolarAPIException serializada (pickle)"""
+    exc = cls.__new__(cls)
+    exc.args = args
+    exc.__dict__.update(state)
+    return exc
+
 class ValidationError(SolarAPIException):
     """Erro de validação de dados"""
     
@@ -85,4 +98,16 @@ class CalculationError(SolarAPIException):
             status_code=500,
             details=details
         )
-    
\ No newline at end of file
+    
+
+class ServiceOverloadedError(SolarAPIException):
+    """Fila de cálculo cheia - cliente deve tentar novamente mais tarde"""
+
+    def __init__(self, message: str, retry_after: int):
+        self.retry_after = retry_after
+
+        super().__init__(
+            message=f"Serviço sobrecarregado: {message}",
+            status_code=503,
+            details={"retry_after_seconds": retry_after}
+        )
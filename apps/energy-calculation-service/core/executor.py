@@ -0,0 +1,186 @@
+"""
+Camada de execução para cálculos pesados.
+
+Os handlers FastAPI são `async def`, mas pvlib, a simulação BESS de 8760 horas e
+a geração de PDF são código síncrono CPU-bound. Executados diretamente no event
+loop, eles bloqueiam todas as outras requisições do worker uvicorn (inclusive
+/health). Este módulo despacha esse trabalho para fora do loop:
+
+- WorkloadKind.CPU: pool de processos dedicado (contorna o GIL)
+- WorkloadKind.IO: thread pool padrão do loop (downloads, cache em disco)
+
+A fila é limitada: quando há mais de `CALC_POOL_WORKERS + CALC_QUEUE_MAX_SIZE`
+cálculos pendentes, novas submissões recebem ServiceOverloadedError (HTTP 503
+com header Retry-After).
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+from core.config import settings
+from core.exceptions import ServiceOverloadedError
+
+logger = logging.getLogger(__name__)
+
+
+class WorkloadKind(str, Enum):
+    """Natureza do trabalho declarada pelo endpoint"""
+
+    CPU = "cpu"
+    IO = "io"
+
+
+class CalculationExecutor:
+    """
+    Executor com pool de processos limitado para cálculos CPU-bound.
+
+    O pool é criado sob demanda (na primeira submissão) para que cada worker
+    uvicorn tenha o seu, e é encerrado no shutdown da aplicação.
+
+    Funções submetidas como WorkloadKind.CPU precisam ser serializáveis
+    (funções de módulo - ver services/tasks.py), assim como seus argumentos
+    e retorno.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = None,
+        max_queue_size: int = None,
+        retry_after_seconds: int = None,
+        use_processes: bool = None
+    ):
+        self.max_workers = max_workers or settings.CALC_POOL_WORKERS
+        self.max_queue_size = max_queue_size if max_queue_size is not None else settings.CALC_QUEUE_MAX_SIZE
+        self.retry_after_seconds = retry_after_seconds or settings.CALC_RETRY_AFTER_SECONDS
+        self.use_processes = settings.CALC_POOL_ENABLED if use_processes is None else use_processes
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._failed = 0
+
+    @property
+    def capacity(self) -> int:
+        """Máximo de cálculos CPU-bound pendentes (em execução + fila)"""
+        return self.max_workers + self.max_queue_size
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn evita herdar threads e o event loop do processo uvicorn
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info(f"Pool de cálculo iniciado: {self.max_workers} processos, "
+                        f"fila máxima {self.max_queue_size}")
+        return self._pool
+
+    def ensure_capacity(self) -> None:
+        """
+        Verifica se há espaço na fila de cálculo.
+
+        Raises:
+            ServiceOverloadedError: Fila cheia
+        """
+        if self._pending >= self.capacity:
+            self._rejected += 1
+            logger.warning(f"Fila de cálculo cheia ({self._pending}/{self.capacity}), rejeitando requisição")
+            raise ServiceOverloadedError(
+                f"fila de cálculo cheia ({self._pending} pendentes). Tente novamente em "
+                f"{self.retry_after_seconds}s",
+                retry_after=self.retry_after_seconds
+            )
+
+    def reserve(self) -> None:
+        """
+        Admite um cálculo agora e reserva sua vaga na fila.
+
+        Usado por quem aceita o trabalho antes de executá-lo (jobs: 202 na
+        submissão). A vaga é consumida por run(..., reserved=True) ou
+        devolvida com release() se o cálculo não chegar a ser executado.
+
+        Raises:
+            ServiceOverloadedError: Fila cheia
+        """
+        self.ensure_capacity()
+        self._pending += 1
+
+    def release(self) -> None:
+        """Devolve uma vaga reservada que não foi usada"""
+        self._pending -= 1
+
+    async def run(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        kind: WorkloadKind = WorkloadKind.CPU,
+        reserved: bool = False,
+        **kwargs: Any
+    ) -> Any:
+        """
+        Executa `func(*args, **kwargs)` fora do event loop.
+
+        Args:
+            func: Função a executar (serializável se kind=CPU)
+            *args: Argumentos posicionais
+            kind: Natureza do trabalho (CPU -> pool de processos, IO -> threads)
+            reserved: A vaga já foi reservada com reserve(); não há nova admissão
+            **kwargs: Argumentos nomeados
+
+        Returns:
+            Retorno de func
+
+        Raises:
+            ServiceOverloadedError: Fila de cálculo cheia (apenas kind=CPU sem reserva)
+        """
+        loop = asyncio.get_running_loop()
+        call = partial(func, *args, **kwargs)
+
+        if kind == WorkloadKind.IO:
+            return await loop.run_in_executor(None, call)
+
+        if not reserved:
+            self.ensure_capacity()
+            self._pending += 1
+        try:
+            if self.use_processes:
+                result = await loop.run_in_executor(self._get_pool(), call)
+            else:
+                result = await loop.run_in_executor(None, call)
+            self._completed += 1
+            return result
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._pending -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna estatísticas do executor"""
+        return {
+            "mode": "process" if self.use_processes else "thread",
+            "max_workers": self.max_workers,
+            "max_queue_size": self.max_queue_size,
+            "pending": self._pending,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "pool_started": self._pool is not None
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Encerra o pool de processos"""
+        if self._pool is not None:
+            logger.info("Encerrando pool de cálculo...")
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+
+# Instância global do executor
+calculation_executor = CalculationExecutor()
@@ -4,15 +4,34 @@ from fastapi.responses import JSONResponse
 import uvicorn
 import logging
 import json
+import threading
 from contextlib import asynccontextmanager
 
 from core.config import settings
-from core.exceptions import SolarAPIException
+from core.exceptions import SolarAPIException, ServiceOverloadedError
+from core.executor import calculation_executor
+from utils.http_client import pvgis_client, nasa_power_client
+from utils.cache_janitor import cache_janitor, response_cache_janitor
+from utils.revalidation import cache_refresher
+from services.solar.pvgis_service import pvgis_service
+from services.solar.nasa_service import nasa_service
+from services.solar.weather_repository import weather_repository
 from api.v1.router import api_router
 
 # Configurar logging detalhado
 logger = logging.getLogger(__name__)
 
+
+def _migrate_legacy_cache():
+    """Importa (uma única vez) o cache legado para o repositório meteorológico"""
+    try:
+        weather_repository.migrate_legacy_cache({
+            'pvgis': pvgis_service.cache_params,
+            'nasa': nasa_service.cache_params
+        })
+    except Exception as e:
+        logger.error(f"Falha na migração do cache legado: {e}")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Gerenciar ciclo de vida da aplicação"""
@@ -23,11 +42,24 @@ async def lifespan(app: FastAPI):
     
     # Criar diretório de cache se não existir
     settings.CACHE_DIR.mkdir(exist_ok=True)
+
+    # Remoção de entradas expiradas fora do caminho das requisições
+    cache_janitor.start()
+    response_cache_janitor.start()
+
+    # Migração do cache legado em segundo plano: não atrasa o startup
+    threading.Thread(target=_migrate_legacy_cache, name="legacy-cache-migration", daemon=True).start()
     
     yield
     
     # Shutdown
     logger.info("Encerrando Solar API...")
+    cache_janitor.stop()
+    response_cache_janitor.stop()
+    cache_refresher.shutdown()
+    calculation_executor.shutdown()
+    pvgis_client.close()
+    nasa_power_client.close()
 
 # Criar instância FastAPI
 app = FastAPI(
@@ -78,13 +110,18 @@ app.add_middleware(
 # Handler global para exceções customizadas
 @app.exception_handler(SolarAPIException)
 async def solar_api_exception_handler(request, exc: SolarAPIException):
+    headers = None
+    if isinstance(exc, ServiceOverloadedError):
+        headers = {"Retry-After": str(exc.retry_after)}
+
     return JSONResponse(
         status_code=exc.status_code,
         content={
             "error": exc.message,
             "details": exc.details,
             "timestamp": exc.timestamp.isoformat()
-        }
+        },
+        headers=headers
     )
 
 # Handler para exceções não tratadas
@@ -0,0 +1,3 @@
+from .responses import JobStatus, JobType, JobSubmitResponse, JobStatusResponse, JobResultResponse
+
+__all__ = ['JobStatus', 'JobType', 'JobSubmitResponse', 'JobStatusResponse', 'JobResultResponse']
@@ -0,0 +1,49 @@
+from pydantic import BaseModel, Field
+from typing import Optional, Any
+from datetime import datetime
+from enum import Enum
+
+
+class JobType(str, Enum):
+    """Tipos de cálculo que podem ser executados como job assíncrono"""
+    SOLAR = "solar"
+    HYBRID = "hybrid"
+    PROPOSAL = "proposal"
+
+
+class JobStatus(str, Enum):
+    """Ciclo de vida de um job"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class JobSubmitResponse(BaseModel):
+    """Resposta da submissão de um job"""
+    job_id: str = Field(..., description="Identificador do job")
+    job_type: JobType = Field(..., description="Tipo do cálculo")
+    status: JobStatus = Field(..., description="Status atual do job")
+    status_url: str = Field(..., description="URL para consultar o status")
+    result_url: str = Field(..., description="URL para obter o resultado")
+
+
+class JobStatusResponse(BaseModel):
+    """Status de um job"""
+    job_id: str = Field(..., description="Identificador do job")
+    job_type: JobType = Field(..., description="Tipo do cálculo")
+    status: JobStatus = Field(..., description="Status atual do job")
+    created_at: datetime = Field(..., description="Data/hora da submissão")
+    started_at: Optional[datetime] = Field(None, description="Data/hora de início da execução")
+    finished_at: Optional[datetime] = Field(None, description="Data/hora de término")
+    expires_at: datetime = Field(..., description="Data/hora em que o job e o resultado expiram")
+    error: Optional[str] = Field(None, description="Mensagem de erro (status=failed)")
+
+
+class JobResultResponse(BaseModel):
+    """Resultado de um job concluído"""
+    job_id: str = Field(..., description="Identificador do job")
+    job_type: JobType = Field(..., description="Tipo do cálculo")
+    status: JobStatus = Field(..., description="Status do job")
+    result: Any = Field(..., description="Resultado do cálculo (mesmo formato do endpoint síncrono)")
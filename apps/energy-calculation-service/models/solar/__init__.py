@@ -6,6 +6,7 @@ from .requests import (
     SolarModuleData,
     PerdasSistema,
     ModuloSolar,
+    DatasheetModulo,
     InversorData,
     OrientacaoModulos,
     InversorConfig,
@@ -41,6 +42,7 @@ __all__ = [
     "SolarModuleData",
     "PerdasSistema",
     "ModuloSolar",
+    "DatasheetModulo",
     "InversorData",
     "OrientacaoModulos",
     "InversorConfig",
@@ -250,12 +250,15 @@ class ModuloSolar(BaseModel):
     gamma_r: float = Field(..., description="Coef. temp. Pmp normalizado (1/°C)")
     cells_in_series: int = Field(..., description="Número de células em série")
 
-    # Parâmetros Sandia avançados
-    a_ref: float = Field(..., description="Fator de idealidade modificado (ref)")
-    il_ref: float = Field(..., description="Corrente foto-gerada (ref)")
-    io_ref: float = Field(..., description="Corrente de saturação (ref)")
-    rs: float = Field(..., description="Resistência série (ohms)")
-    rsh_ref: float = Field(..., description="Resistência shunt (ohms, ref)")
+    # Parâmetros Sandia avançados (ausentes: ajustados a partir do datasheet)
+    a_ref: Optional[float] = Field(None, description="Fator de idealidade modificado (ref)")
+    il_ref: Optional[float] = Field(None, description="Corrente foto-gerada (ref)")
+    io_ref: Optional[float] = Field(None, description="Corrente de saturação (ref)")
+    rs: Optional[float] = Field(None, description="Resistência série (ohms)")
+    rsh_ref: Optional[float] = Field(None, description="Resistência shunt (ohms, ref)")
+    parametros_id: Optional[str] = Field(
+        None, description="Id de um ajuste já calculado (POST /solar/modules/fit), usado no lugar dos parâmetros avançados"
+    )
 
     # Informações adicionais (opcionais)
     material: Optional[str] = Field(None, description="Material (ex: c-Si)")
@@ -291,6 +294,31 @@ class ModuloSolar(BaseModel):
         }
 
 
+class DatasheetModulo(BaseModel):
+    """Valores de datasheet para o ajuste dos parâmetros do diodo único"""
+
+    vmpp: float = Field(..., gt=0, description="Tensão no ponto de máxima potência (V)")
+    impp: float = Field(..., gt=0, description="Corrente no ponto de máxima potência (A)")
+    voc_stc: float = Field(..., gt=0, description="Tensão de circuito aberto STC (V)")
+    isc_stc: float = Field(..., gt=0, description="Corrente de curto-circuito STC (A)")
+    alpha_sc: float = Field(..., description="Coef. temp. Isc normalizado (1/°C)")
+    beta_oc: float = Field(..., description="Coef. temp. Voc normalizado (1/°C)")
+    cells_in_series: int = Field(..., gt=0, description="Número de células em série")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "vmpp": 41.4,
+                "impp": 13.05,
+                "voc_stc": 51.16,
+                "isc_stc": 14.55,
+                "alpha_sc": 0.00041,
+                "beta_oc": -0.0025,
+                "cells_in_series": 72
+            }
+        }
+
+
 class InversorData(BaseModel):
     """Dados do inversor fotovoltaico"""
 
@@ -423,6 +451,10 @@ class SolarSystemCalculationRequest(BaseModel):
     origem_dados: Literal["PVGIS", "NASA"] = Field(default="PVGIS", description="Fonte de dados climáticos")
     startyear: int = Field(default=2015, ge=2005, le=2020, description="Ano inicial dados históricos")
     endyear: int = Field(default=2020, ge=2005, le=2020, description="Ano final dados históricos")
+    modo_calculo: Literal["completo", "tmy"] = Field(
+        default="completo",
+        description="'completo' simula todas as horas do período; 'tmy' simula apenas um ano meteorológico típico (8760 h)"
+    )
 
     # Modelos de cálculo
     modelo_decomposicao: Literal["erbs", "disc", "louche"] = Field(
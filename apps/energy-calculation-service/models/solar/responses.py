@@ -352,6 +352,9 @@ class CacheStatsResponse(BaseModel):
     cache_dir: str = Field(..., description="Diretório do cache")
     cache_ttl_hours: int = Field(..., description="TTL do cache em horas")
     max_size_mb: int = Field(..., description="Tamanho máximo permitido em MB")
+    budget: Optional[Dict[str, Any]] = Field(
+        None, description="Uso do orçamento de disco compartilhado (geohash + legado) e remoções LRU"
+    )
 
     class Config:
         json_schema_extra = {
@@ -0,0 +1,10 @@
+"""Asynchronous job subsystem for long-running calculations"""
+
+from .job_store import JobStore
+from .job_manager import JobManager, job_manager
+
+__all__ = [
+    "JobStore",
+    "JobManager",
+    "job_manager",
+]
@@ -0,0 +1,167 @@
+"""
+Gerenciador de jobs assíncronos para cálculos longos.
+
+Submeter um job registra-o no JobStore e agenda a execução no
+CalculationExecutor do worker atual, liberando a conexão HTTP imediatamente.
+O job só passa a running quando um processo do pool o inicia. O cliente consulta
+status/resultado por polling. O cancelamento é registrado no store (visível a
+todos os workers); um job ainda na fila do pool não é executado, e um cálculo
+que já está rodando não é interrompido, mas seu resultado é descartado.
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Set
+
+import numpy as np
+from fastapi.encoders import jsonable_encoder
+
+from core.executor import calculation_executor, CalculationExecutor, WorkloadKind
+from core.exceptions import SolarAPIException
+from core.response_models import SuccessResponse
+from models.jobs.responses import JobType
+from services import tasks
+from services.jobs.job_store import JobStore
+
+logger = logging.getLogger(__name__)
+
+
+def _wrap_proposal(result: Any) -> Any:
+    # Mesmo formato da resposta de POST /proposal/generate
+    return SuccessResponse(success=True, data=result, message="Proposta gerada com sucesso")
+
+
+# Tipo de job -> função executada no pool de processos
+JOB_TASKS: Dict[JobType, Callable[[Any], Any]] = {
+    JobType.SOLAR: tasks.calculate_solar_system,
+    JobType.HYBRID: tasks.calculate_hybrid_system,
+    JobType.PROPOSAL: tasks.generate_proposal,
+}
+
+# Tipo de job -> adaptador do retorno para o formato do endpoint síncrono
+JOB_RESPONSE_ADAPTERS: Dict[JobType, Callable[[Any], Any]] = {
+    JobType.PROPOSAL: _wrap_proposal,
+}
+
+
+def serialize_result(result: Any) -> str:
+    """Serializa o retorno de um serviço (Pydantic, dict, tipos NumPy) para JSON"""
+    encoded = jsonable_encoder(result, custom_encoder={np.generic: lambda value: value.item()})
+    return json.dumps(encoded, ensure_ascii=False)
+
+
+class JobManager:
+    """Submissão, execução e cancelamento de jobs"""
+
+    def __init__(self, store: JobStore = None, executor: CalculationExecutor = None):
+        self._store = store
+        self.executor = executor or calculation_executor
+        # Referências às tasks em andamento (evita coleta pelo GC)
+        self._tasks: Dict[str, asyncio.Task] = {}
+        # Jobs admitidos cuja vaga reservada no executor ainda não foi usada
+        self._reserved: Set[str] = set()
+
+    @property
+    def store(self) -> JobStore:
+        # Criado sob demanda para não tocar no disco durante o import
+        if self._store is None:
+            self._store = JobStore()
+        return self._store
+
+    def submit(self, job_type: JobType, request: Any) -> Dict[str, Any]:
+        """
+        Registra e agenda um job.
+
+        A vaga no executor é reservada aqui: um job aceito (202) espera a sua
+        vez na fila em vez de falhar por sobrecarga quando começa a rodar.
+
+        Raises:
+            ServiceOverloadedError: Fila de cálculo cheia
+        """
+        self.executor.reserve()
+        try:
+            self.store.purge_expired()
+            job = self.store.create(job_type.value)
+        except Exception:
+            self.executor.release()
+            raise
+        job_id = job["job_id"]
+        self._reserved.add(job_id)
+
+        task = asyncio.create_task(self._run(job_id, job_type, request))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._finished(job_id))
+
+        logger.info(f"Job {job_id} ({job_type.value}) submetido")
+        return job
+
+    def _finished(self, job_id: str) -> None:
+        self._tasks.pop(job_id, None)
+        # Task encerrada sem usar a vaga (shutdown antes de _run começar)
+        if job_id in self._reserved:
+            self._reserved.discard(job_id)
+            self.executor.release()
+
+    async def _run(self, job_id: str, job_type: JobType, request: Any) -> None:
+        try:
+            # A vaga reservada na submissão passa ao executor (sem nova admissão).
+            # O job só passa a running no processo do pool (tasks.run_job).
+            self._reserved.discard(job_id)
+            result = await self.executor.run(
+                tasks.run_job, self.store.db_path, job_id, JOB_TASKS[job_type], request,
+                kind=WorkloadKind.CPU, reserved=True
+            )
+            if isinstance(result, str) and result == tasks.JOB_CANCELLED:
+                logger.info(f"Job {job_id} cancelado antes de iniciar")
+                return
+
+            adapter = JOB_RESPONSE_ADAPTERS.get(job_type)
+            if adapter is not None:
+                result = adapter(result)
+
+            if self.store.mark_succeeded(job_id, serialize_result(result)):
+                logger.info(f"Job {job_id} ({job_type.value}) concluído")
+            else:
+                logger.info(f"Job {job_id} cancelado durante a execução; resultado descartado")
+
+        except asyncio.CancelledError:
+            # Shutdown do worker: o job não terá resultado
+            self.store.mark_failed(job_id, "Execução interrompida pelo encerramento do serviço")
+            raise
+        except SolarAPIException as e:
+            logger.error(f"Job {job_id} falhou: {e.message}")
+            self.store.mark_failed(job_id, e.message)
+        except Exception as e:
+            logger.error(f"Job {job_id} falhou: {e}", exc_info=True)
+            self.store.mark_failed(job_id, str(e))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Retorna o registro do job com timestamps convertidos"""
+        job = self.store.get(job_id)
+        if job is None:
+            return None
+
+        for field in ("created_at", "started_at", "finished_at", "expires_at"):
+            if job[field] is not None:
+                job[field] = datetime.utcfromtimestamp(job[field])
+        return job
+
+    def get_result(self, job_id: str) -> Optional[Any]:
+        """Retorna o resultado de um job concluído"""
+        return self.store.get_result(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancela o job; False se ele já havia terminado.
+
+        A marcação no store é vista pelo processo do pool: se o job ainda não
+        iniciou (inclusive na fila do pool), ele não é executado; se já está
+        rodando, o resultado é descartado.
+        """
+        return self.store.cancel(job_id)
+
+
+# Instância global
+job_manager = JobManager()
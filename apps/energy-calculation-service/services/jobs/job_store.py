@@ -0,0 +1,150 @@
+"""
+Armazenamento de jobs assíncronos em SQLite.
+
+O arquivo é compartilhado pelos workers uvicorn do mesmo host, de modo que o
+status e o resultado de um job podem ser consultados em qualquer worker,
+independente de qual deles executou o cálculo. Jobs expiram após
+JOB_RESULT_TTL_HOURS e são removidos de forma preguiçosa.
+"""
+
+import json
+import sqlite3
+import time
+import uuid
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Dict, Any, Iterator
+
+from core.config import settings
+from models.jobs.responses import JobStatus
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id      TEXT PRIMARY KEY,
+    job_type    TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    created_at  REAL NOT NULL,
+    started_at  REAL,
+    finished_at REAL,
+    expires_at  REAL NOT NULL,
+    error       TEXT,
+    result      TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_expires_at ON jobs (expires_at);
+"""
+
+
+class JobStore:
+    """Persistência de status e resultados de jobs com TTL"""
+
+    def __init__(self, db_path: Path = None, ttl_hours: int = None):
+        self.db_path = Path(db_path or settings.JOBS_DB_PATH or settings.CACHE_DIR / "jobs.sqlite3")
+        self.ttl_seconds = (ttl_hours or settings.JOB_RESULT_TTL_HOURS) * 3600
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def create(self, job_type: str) -> Dict[str, Any]:
+        """Registra um novo job com status queued"""
+        now = time.time()
+        job_id = uuid.uuid4().hex
+
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (job_id, job_type, status, created_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, job_type, JobStatus.QUEUED.value, now, now + self.ttl_seconds)
+            )
+
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Retorna o registro do job (sem o resultado) ou None se inexistente/expirado"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT job_id, job_type, status, created_at, started_at, finished_at, expires_at, error "
+                "FROM jobs WHERE job_id = ? AND expires_at > ?",
+                (job_id, time.time())
+            ).fetchone()
+
+        return dict(row) if row else None
+
+    def get_result(self, job_id: str) -> Optional[Any]:
+        """Retorna o resultado desserializado de um job concluído"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT result FROM jobs WHERE job_id = ? AND status = ? AND expires_at > ?",
+                (job_id, JobStatus.SUCCEEDED.value, time.time())
+            ).fetchone()
+
+        if row is None or row["result"] is None:
+            return None
+        return json.loads(row["result"])
+
+    def mark_running(self, job_id: str) -> bool:
+        """Marca o job como em execução; False se ele foi cancelado antes de iniciar"""
+        return self._transition(job_id, JobStatus.QUEUED, JobStatus.RUNNING, started_at=time.time())
+
+    def mark_succeeded(self, job_id: str, result_json: str) -> bool:
+        """Grava o resultado; False se o job foi cancelado durante a execução"""
+        return self._transition(
+            job_id, JobStatus.RUNNING, JobStatus.SUCCEEDED,
+            finished_at=time.time(), result=result_json
+        )
+
+    def mark_failed(self, job_id: str, error: str) -> bool:
+        """Registra a falha do job"""
+        return self._transition(
+            job_id, JobStatus.RUNNING, JobStatus.FAILED,
+            finished_at=time.time(), error=error
+        ) or self._transition(
+            job_id, JobStatus.QUEUED, JobStatus.FAILED,
+            finished_at=time.time(), error=error
+        )
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancela um job pendente ou em execução; False se já finalizado"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ? WHERE job_id = ? AND status IN (?, ?)",
+                (JobStatus.CANCELLED.value, time.time(), job_id,
+                 JobStatus.QUEUED.value, JobStatus.RUNNING.value)
+            )
+            return cursor.rowcount > 0
+
+    def _transition(self, job_id: str, from_status: JobStatus, to_status: JobStatus, **fields: Any) -> bool:
+        # Transição condicional: protege contra corrida com cancelamentos feitos por outro worker
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        values = list(fields.values())
+
+        with self._connect() as conn:
+            cursor = conn.execute(
+                f"UPDATE jobs SET status = ?{', ' + assignments if assignments else ''} "
+                f"WHERE job_id = ? AND status = ?",
+                [to_status.value, *values, job_id, from_status.value]
+            )
+            return cursor.rowcount > 0
+
+    def purge_expired(self) -> int:
+        """Remove jobs expirados; retorna quantidade removida"""
+        with self._connect() as conn:
+            cursor = conn.execute("DELETE FROM jobs WHERE expires_at <= ?", (time.time(),))
+            removed = cursor.rowcount
+
+        if removed:
+            logger.info(f"Jobs expirados removidos: {removed}")
+        return removed
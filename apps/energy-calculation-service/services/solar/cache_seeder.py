@@ -0,0 +1,265 @@
+"""
+Pré-aquecimento do geohash cache de dados meteorológicos.
+
+Evita que o primeiro projeto de uma região espere pelo PVGIS/NASA POWER:
+as coordenadas são baixadas antecipadamente pelos próprios serviços
+(PVGISService/NASAService), que gravam no geohash cache como em uma
+requisição normal.
+
+Modos:
+- csv: lista de coordenadas (ex.: centroides dos municípios brasileiros)
+- bbox: centro de cada célula geohash (GEOHASH_PRECISION) dentro da área
+- import: respostas JSON do PVGIS/NASA POWER já baixadas (nó sem internet)
+
+Os modos csv e bbox usam concorrência limitada (CACHE_SEED_CONCURRENCY) e
+registram cada célula concluída em um arquivo de progresso; ao repetir o
+comando com o mesmo arquivo as células já concluídas são puladas.
+
+Uso:
+    python -m services.solar.cache_seeder csv municipios.csv --progress seed.progress
+    python -m services.solar.cache_seeder bbox -- -25.5 -49.5 -22.0 -44.0
+    python -m services.solar.cache_seeder import ./dumps
+"""
+
+import argparse
+import csv
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+import geohash
+
+from core.config import settings
+from core.exceptions import ValidationError
+from services.solar.nasa_service import nasa_service
+from services.solar.pvgis_service import pvgis_service
+from services.solar.weather_repository import weather_repository
+from utils.validators import validate_coordinates
+
+logger = logging.getLogger(__name__)
+
+LAT_COLUMNS = ('lat', 'latitude')
+LON_COLUMNS = ('lon', 'lng', 'long', 'longitude')
+
+
+def points_from_csv(path: Path, lat_column: str = None, lon_column: str = None) -> List[Tuple[float, float]]:
+    """
+    Lê coordenadas de um CSV com cabeçalho.
+
+    As colunas são detectadas pelo nome (lat/latitude, lon/lng/longitude) se
+    não forem informadas; linhas sem coordenada numérica são ignoradas.
+    """
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        columns = {name.strip().lower(): name for name in reader.fieldnames or ()}
+
+        lat_key = lat_column or next((columns[c] for c in LAT_COLUMNS if c in columns), None)
+        lon_key = lon_column or next((columns[c] for c in LON_COLUMNS if c in columns), None)
+        if lat_key is None or lon_key is None:
+            raise ValueError(f"Colunas de latitude/longitude não encontradas em {path}")
+
+        points = []
+        for row in reader:
+            try:
+                points.append((float(row[lat_key]), float(row[lon_key])))
+            except (TypeError, ValueError):
+                logger.debug(f"Linha ignorada sem coordenadas válidas: {row}")
+        return points
+
+
+def points_from_bbox(min_lat: float, min_lon: float, max_lat: float, max_lon: float,
+                     precision: int = None) -> Iterator[Tuple[float, float]]:
+    """Centros das células geohash que cobrem a área"""
+    precision = precision or settings.GEOHASH_PRECISION
+    start_lat, start_lon, lat_err, lon_err = geohash.decode_exactly(geohash.encode(min_lat, min_lon, precision))
+
+    lat = start_lat
+    while lat - lat_err <= max_lat:
+        lon = start_lon
+        while lon - lon_err <= max_lon:
+            yield lat, lon
+            lon += 2 * lon_err
+        lat += 2 * lat_err
+
+
+class CacheSeeder:
+    """Baixa e grava no cache os dados meteorológicos de uma lista de pontos"""
+
+    def __init__(self, sources: Sequence[str] = ('pvgis', 'nasa'), concurrency: int = None,
+                 progress_path: Optional[Path] = None, services: Dict[str, Any] = None):
+        self.services = services or {'pvgis': pvgis_service, 'nasa': nasa_service}
+        unknown = set(sources) - set(self.services)
+        if unknown:
+            raise ValueError(f"Fontes desconhecidas: {sorted(unknown)}")
+
+        self.sources = list(sources)
+        self.concurrency = concurrency or settings.CACHE_SEED_CONCURRENCY
+        self.progress_path = Path(progress_path) if progress_path else None
+        self._lock = threading.Lock()
+
+    def _load_progress(self) -> Set[str]:
+        if self.progress_path is None or not self.progress_path.exists():
+            return set()
+        return {line.strip() for line in self.progress_path.read_text().splitlines() if line.strip()}
+
+    def _mark_done(self, key: str) -> None:
+        if self.progress_path is None:
+            return
+        with self._lock, open(self.progress_path, 'a') as f:
+            f.write(key + '\n')
+
+    def _seed_one(self, source: str, lat: float, lon: float) -> str:
+        service = self.services[source]
+        if weather_repository.contains(lat, lon, service.cache_params):
+            return 'cached'
+        service.fetch_weather_data(lat, lon)
+        return 'downloaded'
+
+    def seed(self, points: Iterable[Tuple[float, float]]) -> Dict[str, int]:
+        """
+        Garante dados em cache para cada ponto e fonte.
+
+        Pontos na mesma célula geohash são baixados uma única vez. Falhas são
+        registradas e não interrompem os demais pontos; por não entrarem no
+        arquivo de progresso, são refeitas na próxima execução.
+
+        Returns:
+            Contadores: total, skipped, cached, downloaded, failed
+        """
+        done = self._load_progress()
+        stats = {'total': 0, 'skipped': 0, 'cached': 0, 'downloaded': 0, 'failed': 0}
+
+        seen: Set[str] = set()
+        tasks: Dict[str, Tuple[str, float, float]] = {}
+        for lat, lon in points:
+            try:
+                lat, lon = validate_coordinates(lat, lon)
+            except ValidationError as e:
+                stats['failed'] += 1
+                logger.warning(f"Ponto ignorado ({lat}, {lon}): {e}")
+                continue
+            cell = geohash.encode(lat, lon, settings.GEOHASH_PRECISION)
+            for source in self.sources:
+                key = f"{source}:{cell}"
+                if key in seen:
+                    continue
+                seen.add(key)
+                stats['total'] += 1
+                if key in done:
+                    stats['skipped'] += 1
+                else:
+                    tasks[key] = (source, lat, lon)
+
+        logger.info(f"Pré-aquecimento: {len(tasks)} tarefas pendentes, {stats['skipped']} já concluídas "
+                    f"({self.concurrency} em paralelo)")
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="cache-seed") as executor:
+            futures = {executor.submit(self._seed_one, *task): key for key, task in tasks.items()}
+            for i, future in enumerate(as_completed(futures), start=1):
+                key = futures[future]
+                try:
+                    stats[future.result()] += 1
+                    self._mark_done(key)
+                except Exception as e:
+                    stats['failed'] += 1
+                    logger.warning(f"Falha ao pré-aquecer {key}: {e}")
+
+                if i % 100 == 0 or i == len(futures):
+                    logger.info(f"Progresso: {i}/{len(futures)} ({stats['failed']} falhas)")
+
+        return stats
+
+
+def import_dumps(directory: Path) -> Dict[str, int]:
+    """
+    Importa respostas JSON do PVGIS (seriescalc) e da NASA POWER (hourly/point).
+
+    A coordenada vem do próprio arquivo (inputs.location no PVGIS,
+    geometry.coordinates na NASA POWER). Respostas NASA são gravadas como
+    blocos anuais; quando cobrem todo o período padrão o DataFrame completo
+    também é montado e gravado, sem acesso à rede.
+
+    Returns:
+        Contadores: pvgis, nasa, failed
+    """
+    stats = {'pvgis': 0, 'nasa': 0, 'failed': 0}
+
+    for path in sorted(Path(directory).rglob('*.json')):
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+
+            if 'outputs' in data and 'hourly' in data['outputs']:
+                location = data['inputs']['location']
+                lat, lon = validate_coordinates(location['latitude'], location['longitude'])
+                df = pvgis_service._process_pvgis_data(data['outputs']['hourly'])
+                weather_repository.store(lat, lon, df, pvgis_service.cache_params)
+                stats['pvgis'] += 1
+
+            elif 'properties' in data and 'parameter' in data['properties']:
+                lon, lat = data['geometry']['coordinates'][:2]
+                lat, lon = validate_coordinates(lat, lon)
+                years = nasa_service.cache_raw_years(lat, lon, nasa_service._parse_power_json(data))
+                if set(range(nasa_service.start_year, nasa_service.end_year + 1)) <= set(years):
+                    # Blocos já estão no cache: o download é servido localmente
+                    nasa_service.fetch_weather_data(lat, lon)
+                stats['nasa'] += 1
+
+            else:
+                raise ValueError("formato não reconhecido")
+
+            logger.info(f"Importado {path.name} ({lat}, {lon})")
+
+        except Exception as e:
+            stats['failed'] += 1
+            logger.warning(f"Falha ao importar {path}: {e}")
+
+    return stats
+
+
+def main(argv: Sequence[str] = None) -> Dict[str, int]:
+    parser = argparse.ArgumentParser(description="Pré-aquecimento do cache de dados meteorológicos")
+    parser.add_argument('--sources', default='pvgis,nasa', help="Fontes separadas por vírgula (pvgis,nasa)")
+    parser.add_argument('--concurrency', type=int, default=None, help="Downloads simultâneos")
+    parser.add_argument('--progress', type=Path, default=None, help="Arquivo de progresso para retomar")
+    modes = parser.add_subparsers(dest='mode', required=True)
+
+    csv_parser = modes.add_parser('csv', help="Coordenadas de um arquivo CSV")
+    csv_parser.add_argument('path', type=Path)
+    csv_parser.add_argument('--lat-column', default=None)
+    csv_parser.add_argument('--lon-column', default=None)
+
+    bbox_parser = modes.add_parser('bbox', help="Células geohash de uma área")
+    for name in ('min_lat', 'min_lon', 'max_lat', 'max_lon'):
+        bbox_parser.add_argument(name, type=float)
+
+    import_parser = modes.add_parser('import', help="Respostas JSON já baixadas")
+    import_parser.add_argument('directory', type=Path)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=settings.LOG_LEVEL, format=settings.LOG_FORMAT)
+
+    if args.mode == 'import':
+        stats = import_dumps(args.directory)
+    else:
+        if args.mode == 'csv':
+            points = points_from_csv(args.path, args.lat_column, args.lon_column)
+        else:
+            points = points_from_bbox(args.min_lat, args.min_lon, args.max_lat, args.max_lon)
+
+        seeder = CacheSeeder(
+            sources=[s.strip() for s in args.sources.split(',') if s.strip()],
+            concurrency=args.concurrency,
+            progress_path=args.progress
+        )
+        stats = seeder.seed(points)
+
+    print(json.dumps(stats))
+    return stats
+
+
+if __name__ == '__main__':
+    main()
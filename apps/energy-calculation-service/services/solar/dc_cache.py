@@ -0,0 +1,115 @@
+"""
+Cache do resultado DC por face de MPPT, para recálculo incremental.
+
+Ao editar um projeto (um MPPT, as perdas ou o consumo) a maior parte das
+faces (inclinação, azimute) continua igual. A POA e a potência DC de um
+módulo em cada face são gravadas no repositório meteorológico, com chave
+canônica de (local, impressão digital da série meteorológica, parâmetros do
+módulo, modelo de temperatura/montagem, modelo de transposição, tilt,
+azimute). Strings e módulos por string não entram na chave: a potência do
+MPPT é a do módulo escalada linearmente (services.solar.pv_engine).
+
+As séries são gravadas em float32 (arquivo colunar, lidas sem cópia); o cálculo
+usa sempre os valores arredondados, com ou sem acerto no cache.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from services.solar.solar_geometry import COORDINATE_DECIMALS
+from services.solar.weather_repository import WeatherRepository, weather_repository
+
+logger = logging.getLogger(__name__)
+
+# Versão do conteúdo: incrementar ao mudar o motor FV ou as colunas
+DC_CACHE_VERSION = 1
+
+# Colunas meteorológicas usadas pelo motor FV
+WEATHER_COLUMNS = ['ghi', 'dni', 'dhi', 'temp_air', 'wind_speed']
+
+
+def weather_fingerprint(weather: pd.DataFrame) -> str:
+    """Impressão digital dos instantes (UTC) e dos valores meteorológicos"""
+    digest = hashlib.md5(np.ascontiguousarray(weather.index.asi8).tobytes())
+    for column in WEATHER_COLUMNS:
+        digest.update(np.ascontiguousarray(weather[column].to_numpy(dtype=np.float64)).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def model_fingerprint(module_parameters: Dict[str, Any], temperature_model_parameters: Dict[str, float],
+                      transposition_model: str, dc_model: Optional[str] = None) -> str:
+    """Impressão digital dos parâmetros do módulo, da montagem, da transposição e do cálculo DC"""
+    canonical = json.dumps({
+        'module': module_parameters,
+        'temperature': temperature_model_parameters,
+        'transposition': transposition_model,
+        'dc_model': dc_model
+    }, sort_keys=True, default=str)
+    return hashlib.md5(canonical.encode()).hexdigest()[:16]
+
+
+class FaceResultScope:
+    """Resultados DC das faces de uma requisição (mesmo local, clima e modelo)"""
+
+    def __init__(self, repository: WeatherRepository, lat: float, lon: float, base_params: Dict[str, Any]):
+        self.repository = repository
+        self.lat = lat
+        self.lon = lon
+        self.base_params = base_params
+
+    def _cache_params(self, tilt: float, azimuth: float) -> Dict[str, Any]:
+        return {**self.base_params, 'tilt': float(tilt), 'azimuth': float(azimuth)}
+
+    def get(self, tilt: float, azimuth: float) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """(poa_global, p_mp por módulo) em float64, ou None"""
+        frame = self.repository.find(self.lat, self.lon, self._cache_params(tilt, azimuth))
+        if frame is None:
+            return None
+        return frame['poa_global'].to_numpy(dtype=np.float64), frame['p_mp'].to_numpy(dtype=np.float64)
+
+    def put(self, tilt: float, azimuth: float, index: pd.DatetimeIndex,
+            poa_global: np.ndarray, p_mp: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Grava o resultado de uma face.
+
+        Returns:
+            (poa_global, p_mp) com a precisão gravada, iguais aos de um acerto
+        """
+        frame = pd.DataFrame({'poa_global': poa_global, 'p_mp': p_mp}, index=index).astype(np.float32)
+        self.repository.store(self.lat, self.lon, frame, self._cache_params(tilt, azimuth))
+        return frame['poa_global'].to_numpy(dtype=np.float64), frame['p_mp'].to_numpy(dtype=np.float64)
+
+
+class MpptDcCache:
+    """Resultado DC por face memoizado no repositório meteorológico"""
+
+    def __init__(self, repository: WeatherRepository = None):
+        self.repository = repository or weather_repository
+
+    def scope(self, lat: float, lon: float, weather: pd.DataFrame, module_parameters: Dict[str, Any],
+              temperature_model_parameters: Dict[str, float], transposition_model: str,
+              dc_model: Optional[str] = None) -> FaceResultScope:
+        """
+        Escopo de cache para as faces de uma requisição.
+
+        dc_model distingue a solução exata (None) da superfície do módulo
+        (sua chave), que dão resultados ligeiramente diferentes.
+        """
+        lat = round(float(lat), COORDINATE_DECIMALS)
+        lon = round(float(lon), COORDINATE_DECIMALS)
+        return FaceResultScope(self.repository, lat, lon, {
+            'type': 'mppt_dc',
+            'site': f"{lat:.{COORDINATE_DECIMALS}f},{lon:.{COORDINATE_DECIMALS}f}",
+            'weather': weather_fingerprint(weather),
+            'model': model_fingerprint(module_parameters, temperature_model_parameters, transposition_model, dc_model),
+            'version': DC_CACHE_VERSION
+        })
+
+
+# Instância global
+mppt_dc_cache = MpptDcCache()
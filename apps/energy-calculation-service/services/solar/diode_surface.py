@@ -0,0 +1,188 @@
+"""
+Superfície de desempenho do módulo para o modelo de diodo único.
+
+A solução do diodo único (Lambert-W) hora a hora é a etapa mais cara da
+potência DC, e os mesmos módulos do catálogo se repetem em milhares de
+projetos. Para cada conjunto de parâmetros De Soto, P_mp é calculada uma vez
+numa grade (irradiância efetiva × temperatura de célula) e a potência horária
+vem de interpolação bilinear vetorizada.
+
+Antes de ser usada, a superfície é comparada com a solução exata em pontos
+aleatórios da grade; se o erro máximo passar de DIODE_SURFACE_MAX_ERROR_PCT
+(% da potência em STC), ela é descartada e o motor resolve o diodo único
+exatamente. Superfícies são persistidas em CACHE_DIR/surfaces, com chave pelo
+hash dos parâmetros do módulo, e memoizadas no processo.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from core.config import settings
+from services.solar.pv_engine import DESOTO_PARAMS, single_diode_p_mp
+from utils.file_io import atomic_write
+
+logger = logging.getLogger(__name__)
+
+# Versão da grade: incrementar ao mudar os eixos ou a validação
+SURFACE_VERSION = 1
+
+# Irradiância efetiva (W/m²): zero e passos geométricos, mais densos em baixa irradiância
+IRRADIANCE_GRID = np.concatenate([[0.0], np.geomspace(1.0, 1600.0, 150)])
+# Temperatura de célula (°C), passos de 2 °C
+TEMPERATURE_GRID = np.linspace(-40.0, 100.0, 71)
+
+# Pontos aleatórios (semente fixa) da validação contra a solução exata
+VALIDATION_POINTS = 2000
+
+
+def module_fingerprint(module_parameters: Dict[str, Any]) -> str:
+    """Hash dos parâmetros De Soto do módulo e da versão da grade"""
+    canonical = json.dumps({
+        'params': {k: module_parameters[k] for k in DESOTO_PARAMS if k in module_parameters},
+        'version': SURFACE_VERSION
+    }, sort_keys=True, default=str)
+    return hashlib.md5(canonical.encode()).hexdigest()[:16]
+
+
+@dataclass
+class DiodeSurface:
+    """P_mp de um módulo na grade (irradiância × temperatura)"""
+    key: str
+    irradiance: np.ndarray
+    temperature: np.ndarray
+    p_mp: np.ndarray        # (irradiâncias, temperaturas), W por módulo
+    max_error_pct: float    # erro máximo da validação, % de P_mp em STC
+
+    def evaluate(self, effective_irradiance: np.ndarray, temp_cell: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Interpolação bilinear de P_mp.
+
+        Returns:
+            Tuple (p_mp, inside): p_mp por módulo e máscara dos pontos dentro
+            da grade; fora dela p_mp é NaN
+        """
+        irradiance = np.asarray(effective_irradiance, dtype=float)
+        temperature = np.asarray(temp_cell, dtype=float)
+        inside = ((irradiance >= self.irradiance[0]) & (irradiance <= self.irradiance[-1])
+                  & (temperature >= self.temperature[0]) & (temperature <= self.temperature[-1]))
+
+        i = np.clip(np.searchsorted(self.irradiance, irradiance, side='right') - 1, 0, len(self.irradiance) - 2)
+        j = np.clip(np.searchsorted(self.temperature, temperature, side='right') - 1, 0, len(self.temperature) - 2)
+        with np.errstate(invalid='ignore'):
+            fi = (irradiance - self.irradiance[i]) / (self.irradiance[i + 1] - self.irradiance[i])
+            fj = (temperature - self.temperature[j]) / (self.temperature[j + 1] - self.temperature[j])
+
+        p_mp = (self.p_mp[i, j] * (1 - fi) * (1 - fj) + self.p_mp[i + 1, j] * fi * (1 - fj)
+                + self.p_mp[i, j + 1] * (1 - fi) * fj + self.p_mp[i + 1, j + 1] * fi * fj)
+        p_mp[~inside] = np.nan
+        return p_mp, inside
+
+
+def build_surface(module_parameters: Dict[str, Any]) -> DiodeSurface:
+    """Calcula a superfície e o seu erro máximo contra a solução exata"""
+    irradiance, temperature = np.meshgrid(IRRADIANCE_GRID, TEMPERATURE_GRID, indexing='ij')
+    p_mp = single_diode_p_mp(irradiance.ravel(), temperature.ravel(), module_parameters).reshape(irradiance.shape)
+    surface = DiodeSurface(module_fingerprint(module_parameters), IRRADIANCE_GRID, TEMPERATURE_GRID, p_mp, np.inf)
+
+    rng = np.random.default_rng(0)
+    sample_irradiance = np.exp(rng.uniform(0.0, np.log(IRRADIANCE_GRID[-1]), VALIDATION_POINTS))
+    sample_temperature = rng.uniform(TEMPERATURE_GRID[0], TEMPERATURE_GRID[-1], VALIDATION_POINTS)
+    approx, _ = surface.evaluate(sample_irradiance, sample_temperature)
+    exact = single_diode_p_mp(sample_irradiance, sample_temperature, module_parameters)
+    p_stc = single_diode_p_mp(np.array([1000.0]), np.array([25.0]), module_parameters)[0]
+
+    if p_stc > 0:
+        surface.max_error_pct = float(np.max(np.abs(approx - exact)) / p_stc * 100.0)
+    return surface
+
+
+class DiodeSurfaceCache:
+    """Superfícies por módulo: memória do processo e arquivos em CACHE_DIR/surfaces"""
+
+    def __init__(self, cache_dir: Path = None, max_error_pct: float = None, enabled: bool = None):
+        self.cache_dir = Path(cache_dir or settings.CACHE_DIR / "surfaces")
+        self.max_error_pct = settings.DIODE_SURFACE_MAX_ERROR_PCT if max_error_pct is None else max_error_pct
+        self.enabled = settings.DIODE_SURFACE_ENABLED if enabled is None else enabled
+        self._surfaces: Dict[str, Optional[DiodeSurface]] = {}
+        self._lock = threading.Lock()
+
+        # Contadores deste processo
+        self.built = 0
+        self.loaded = 0
+        self.rejected = 0
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"diode_surface_{key}.npz"
+
+    def get(self, module_parameters: Dict[str, Any]) -> Optional[DiodeSurface]:
+        """
+        Superfície validada do módulo.
+
+        Returns:
+            DiodeSurface, ou None se desativada ou fora da tolerância (o motor
+            então resolve o diodo único exatamente)
+        """
+        if not self.enabled:
+            return None
+
+        key = module_fingerprint(module_parameters)
+        with self._lock:
+            if key not in self._surfaces:
+                self._surfaces[key] = self._load_or_build(key, module_parameters)
+            surface = self._surfaces[key]
+
+        if surface is None or surface.max_error_pct > self.max_error_pct:
+            return None
+        return surface
+
+    def _load_or_build(self, key: str, module_parameters: Dict[str, Any]) -> DiodeSurface:
+        path = self._path(key)
+        try:
+            with np.load(path) as stored:
+                self.loaded += 1
+                return DiodeSurface(key, stored['irradiance'], stored['temperature'], stored['p_mp'],
+                                    float(stored['max_error_pct']))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Superfície do módulo ilegível ({path.name}), recalculando: {e}")
+
+        surface = build_surface(module_parameters)
+        self.built += 1
+        if surface.max_error_pct > self.max_error_pct:
+            self.rejected += 1
+            logger.warning(f"Superfície do módulo {key} descartada: erro {surface.max_error_pct:.3f}% "
+                           f"> {self.max_error_pct}% de P_mp em STC; usando solução exata")
+        else:
+            logger.info(f"Superfície do módulo {key} calculada (erro máximo {surface.max_error_pct:.4f}% de STC)")
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with atomic_write(path) as f:
+                np.savez(f, irradiance=surface.irradiance, temperature=surface.temperature,
+                         p_mp=surface.p_mp, max_error_pct=surface.max_error_pct)
+        except Exception as e:
+            logger.warning(f"Falha ao gravar superfície do módulo {key}: {e}")
+        return surface
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Contadores deste processo"""
+        return {
+            "enabled": self.enabled,
+            "max_error_pct": self.max_error_pct,
+            "in_memory": len(self._surfaces),
+            "built": self.built,
+            "loaded": self.loaded,
+            "rejected": self.rejected
+        }
+
+
+# Instância global
+diode_surface_cache = DiodeSurfaceCache()
@@ -14,8 +14,10 @@ from core.config import settings
 from core.exceptions import CalculationError, PVGISError, NASAError
 from services.solar.pvgis_service import pvgis_service
 from services.solar.nasa_service import nasa_service
+from services.solar.weather_source import weather_source_fetcher
+from services.solar.weather_repository import weather_repository
+from services.solar.solar_geometry import solar_geometry_cache
 
-from utils.geohash_cache import geohash_cache_manager
 
 def validate_decomposition_model(model: str) -> str:
     """Valida modelo de decomposição"""
@@ -64,8 +66,8 @@ class IrradiationService:
         else:
             logger.info(f"Sucesso: Utilizando fonte de dados {actual_source} conforme solicitado")
 
-        # Filtrar anos completos (2005-2020 ou disponível)
-        df_filtered = df[df.index.year >= 2005]
+        # Filtrar anos completos (2005-2020 ou disponível); float32 do cache -> float64 do pvlib
+        df_filtered = df[df.index.year >= 2005].astype(np.float64)
 
         if len(df_filtered) == 0:
             raise CalculationError("Nenhum dado válido encontrado para o período")
@@ -107,52 +109,9 @@ class IrradiationService:
         Raises:
             CalculationError: Se ambas as fontes falharem
         """
-        # Determinar ordem de tentativa
-        if preferred_source == 'nasa':
-            primary_service = self.nasa
-            secondary_service = self.pvgis
-            primary_name = 'NASA POWER'
-            secondary_name = 'PVGIS'
-            primary_error = NASAError
-            secondary_error = PVGISError
-        else:  # pvgis (default)
-            primary_service = self.pvgis
-            secondary_service = self.nasa
-            primary_name = 'PVGIS'
-            secondary_name = 'NASA POWER'
-            primary_error = PVGISError
-            secondary_error = NASAError
-
-        # Tentar fonte primária
-        try:
-            logger.info(f"Tentando buscar dados de {primary_name}")
-            df = primary_service.fetch_weather_data(lat, lon)
-            logger.info(f"Dados obtidos com sucesso de {primary_name}")
-            return df, primary_name
-
-        except (primary_error, Exception) as e:
-            logger.warning(f"Erro ao buscar dados de {primary_name}: {e}")
-
-            # Verificar se fallback está habilitado
-            if not settings.WEATHER_DATA_FALLBACK_ENABLED:
-                logger.error(f"Fallback desabilitado. Falha ao obter dados de {primary_name}")
-                raise CalculationError(
-                    f"Falha ao obter dados de {primary_name} e fallback está desabilitado: {str(e)}"
-                )
-
-            # Tentar fonte secundária (fallback)
-            try:
-                logger.warning(f"Tentando fallback para {secondary_name}")
-                df = secondary_service.fetch_weather_data(lat, lon)
-                logger.info(f"Fallback bem-sucedido! Dados obtidos de {secondary_name}")
-                return df, secondary_name
-
-            except (secondary_error, Exception) as e2:
-                logger.error(f"Fallback também falhou. Erro em {secondary_name}: {e2}")
-                raise CalculationError(
-                    f"Falha ao obter dados de ambas as fontes. "
-                    f"{primary_name}: {str(e)}. {secondary_name}: {str(e2)}"
-                )
+        # Ordem das fontes, fallback (WEATHER_DATA_FALLBACK_ENABLED) e hedging
+        # (WEATHER_FETCH_MODE) ficam a cargo do WeatherSourceFetcher
+        return weather_source_fetcher.fetch(lat, lon, preferred_source)
     
     def _calculate_poa_irradiance(self, df: pd.DataFrame, lat: float, lon: float,
                                  tilt: float, azimuth: float, model: str, source: str = 'unknown') -> pd.Series:
@@ -161,28 +120,28 @@ class IrradiationService:
         # Validar modelo de decomposição
         model = validate_decomposition_model(model)
 
-        # Verificar geohash cache para POA - incluir fonte de dados para diferenciar
+        # POA em cache por localização/orientação - incluir fonte de dados para diferenciar
         cache_key_params = {
             'tilt': tilt, 'azimuth': azimuth, 'model': model, 'type': 'poa', 'source': source
         }
 
-        try:
-            cached_poa = geohash_cache_manager.get(lat, lon, **cache_key_params)
-            if cached_poa is not None:
-                logger.info(f"Geohash cache HIT para POA (tilt={tilt}, azimuth={azimuth}, model={model}, source={source})")
-                return cached_poa
-            else:
-                logger.debug(f"Geohash cache MISS para POA (source={source})")
-        except Exception as e:
-            logger.warning(f"Erro no geohash cache POA (source={source}): {e}")
+        return weather_repository.get(
+            lat, lon, cache_key_params,
+            load=lambda la, lo: self._compute_poa(df, lat, lon, tilt, azimuth, model, source)
+        )
+
+    def _compute_poa(self, df: pd.DataFrame, lat: float, lon: float,
+                     tilt: float, azimuth: float, model: str, source: str) -> pd.Series:
+        """Irradiação no plano inclinado a partir da série meteorológica (cache miss)"""
+        logger.debug(f"Cache MISS para POA (tilt={tilt}, azimuth={azimuth}, model={model}, source={source})")
 
-        # Calcular posição solar
-        solar_pos = pvlib.solarposition.get_solarposition(df.index, lat, lon)
+        # Posição solar (cache de geometria, compartilhada com a decomposição)
+        solar_pos = solar_geometry_cache.get(df.index, lat, lon)
 
         # Decompor se necessário
         if df['dni'].sum() == 0:
             logger.info(f"Decompondo GHI usando modelo {model}")
-            df = self._decompose_ghi(df, lat, lon, model)
+            df = self._decompose_ghi(df, lat, lon, model, solar_pos=solar_pos)
 
         # Calcular POA
         poa_irrad = pvlib.irradiance.get_total_irradiance(
@@ -192,21 +151,14 @@ class IrradiationService:
             model='isotropic'
         )
 
-        poa_global = poa_irrad['poa_global']
-
-        # Cachear resultado
-        try:
-            geohash_cache_manager.set(lat, lon, poa_global, **cache_key_params)
-            logger.info(f"POA cacheado com sucesso no geohash cache (source={source})")
-        except Exception as e:
-            logger.warning(f"Erro ao cachear POA (source={source}): {e}")
-
-        return poa_global
+        return poa_irrad['poa_global']
 
-    def _decompose_ghi(self, df: pd.DataFrame, lat: float, lon: float, model: str) -> pd.DataFrame:
+    def _decompose_ghi(self, df: pd.DataFrame, lat: float, lon: float, model: str,
+                       solar_pos: pd.DataFrame = None) -> pd.DataFrame:
         """Decompõe GHI em DNI e DHI"""
         
-        solar_pos = pvlib.solarposition.get_solarposition(df.index, lat, lon)
+        if solar_pos is None:
+            solar_pos = solar_geometry_cache.get(df.index, lat, lon)
         
         if model == 'erbs':
             decomp = pvlib.irradiance.erbs(df['ghi'], solar_pos['zenith'], df.index)
@@ -0,0 +1,281 @@
+"""
+Ajuste dos parâmetros De Soto (diodo único) a partir do datasheet do módulo.
+
+Quando o frontend só tem os valores de datasheet (Voc, Isc, Vmp, Imp e os
+coeficientes de temperatura), os cinco parâmetros do diodo único (a_ref,
+I_L_ref, I_o_ref, R_s, R_sh_ref) são ajustados no servidor resolvendo as
+equações de De Soto (curto-circuito, circuito aberto, ponto de máxima
+potência, dP/dV = 0 no MPP e Voc a Tref + 2 °C).
+
+I_L e I_o são lineares nas equações de Isc e Voc e são eliminados
+analiticamente; as três equações restantes são resolvidas por mínimos
+quadrados limitados em (a, R_s, log R_sh), bem condicionado mesmo para
+datasheets em que o ajuste direto das cinco incógnitas não converge.
+
+O ajuste é memoizado pelo hash do datasheet: memória do processo e arquivos
+JSON em CACHE_DIR/module_fits, compartilhados pelos hosts que montam o mesmo
+CACHE_DIR. O ajuste de um datasheet inédito passa por um single-flight entre
+processos, então cada módulo é ajustado uma única vez. O id do ajuste
+("fit_<hash>") pode ser enviado em ModuloSolar.parametros_id no lugar dos
+coeficientes.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from scipy import constants, optimize
+
+from core.config import settings
+from services.solar.pv_engine import single_diode_p_mp
+from utils.file_io import atomic_write
+from utils.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Versão do ajuste: incrementar ao mudar as equações ou o solver
+FIT_VERSION = 1
+
+FIT_ID_PREFIX = "fit_"
+
+# Campos do datasheet (ModuloSolar) que determinam o ajuste
+DATASHEET_FIELDS = ('vmpp', 'impp', 'voc_stc', 'isc_stc', 'alpha_sc', 'beta_oc', 'cells_in_series')
+
+# Coeficientes do diodo único em ModuloSolar e os nomes do pvlib
+SINGLE_DIODE_FIELDS = {
+    'a_ref': 'a_ref',
+    'il_ref': 'I_L_ref',
+    'io_ref': 'I_o_ref',
+    'rs': 'R_s',
+    'rsh_ref': 'R_sh_ref'
+}
+
+# Silício cristalino (mesmos padrões de calcparams_desoto)
+EG_REF = 1.121
+DEG_DT = -0.0002677
+T_REF = 298.15
+
+# Peso da equação de Voc em Tref + 2 °C: datasheets arredondados raramente a
+# satisfazem exatamente junto com o MPP, que tem prioridade
+VOC_TEMPERATURE_WEIGHT = 0.1
+
+_BOLTZMANN_EV = constants.value('Boltzmann constant in eV/K')
+
+
+def datasheet_fingerprint(datasheet: Dict[str, Any]) -> str:
+    """Hash do datasheet e da versão do ajuste"""
+    canonical = json.dumps({
+        'datasheet': {k: float(datasheet[k]) for k in DATASHEET_FIELDS},
+        'version': FIT_VERSION
+    }, sort_keys=True)
+    return hashlib.md5(canonical.encode()).hexdigest()[:16]
+
+
+def fit_desoto(v_mp: float, i_mp: float, v_oc: float, i_sc: float, alpha_sc: float, beta_oc: float,
+               cells_in_series: int) -> Tuple[Dict[str, float], float]:
+    """
+    Ajusta os parâmetros De Soto a um datasheet.
+
+    Args:
+        v_mp, i_mp, v_oc, i_sc: Valores STC (V, A)
+        alpha_sc: Coef. temp. Isc normalizado (1/°C)
+        beta_oc: Coef. temp. Voc normalizado (1/°C)
+        cells_in_series: Células em série
+
+    Returns:
+        Tuple (parâmetros, erro): a_ref, I_L_ref, I_o_ref, R_s, R_sh_ref e o
+        erro de P_mp em STC do modelo ajustado (% de Vmp·Imp)
+    """
+    if not (0 < v_mp < v_oc and 0 < i_mp < i_sc and cells_in_series > 0):
+        raise ValueError("Datasheet inconsistente para o ajuste: exige 0 < Vmp < Voc, 0 < Imp < Isc e células > 0")
+
+    alpha_abs = alpha_sc * i_sc
+    beta_abs = beta_oc * v_oc
+
+    def currents(a, r_s, r_sh):
+        # Equações de Isc e Voc resolvidas para I_L e I_o
+        e_sc = np.expm1(i_sc * r_s / a)
+        e_oc = np.expm1(v_oc / a)
+        i_o = (i_sc * (1 + r_s / r_sh) - v_oc / r_sh) / (e_oc - e_sc)
+        return v_oc / r_sh + i_o * e_oc, i_o
+
+    def residuals(x):
+        a, r_s, r_sh = x[0], x[1], np.exp(x[2])
+        i_l, i_o = currents(a, r_s, r_sh)
+        v_d = v_mp + i_mp * r_s
+        exp_d = np.exp(v_d / a)
+
+        mpp = i_mp - i_l + i_o * np.expm1(v_d / a) + v_d / r_sh
+        dp_dv = i_mp - v_mp * (i_o / a * exp_d + 1 / r_sh) / (1 + i_o * r_s / a * exp_d + r_s / r_sh)
+
+        t2 = T_REF + 2
+        v_oc2 = v_oc + 2 * beta_abs
+        eg2 = EG_REF * (1 + DEG_DT * 2)
+        i_o2 = i_o * (t2 / T_REF) ** 3 * np.exp((EG_REF / T_REF - eg2 / t2) / _BOLTZMANN_EV)
+        voc_t2 = -(i_l + 2 * alpha_abs) + i_o2 * np.expm1(v_oc2 / (a * t2 / T_REF)) + v_oc2 / r_sh
+
+        return np.array([mpp, dp_dv, VOC_TEMPERATURE_WEIGHT * voc_t2]) / i_mp
+
+    v_th = _BOLTZMANN_EV * T_REF * cells_in_series
+    r_s_max = (v_oc - v_mp) / i_mp
+    bounds = ([0.5 * v_th, 0.0, 0.0], [3.0 * v_th, r_s_max, np.log(1e5)])
+
+    best = None
+    with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+        for ideality in (1.0, 1.3, 1.6):
+            x0 = [ideality * v_th, 0.1 * r_s_max, np.log(100 * v_mp / i_mp)]
+            result = optimize.least_squares(residuals, x0, bounds=bounds, xtol=1e-12, ftol=1e-12)
+            if np.isfinite(result.cost) and (best is None or result.cost < best.cost):
+                best = result
+
+    if best is None:
+        raise ValueError("Ajuste dos parâmetros do módulo não convergiu")
+
+    a, r_s, r_sh = best.x[0], best.x[1], float(np.exp(best.x[2]))
+    i_l, i_o = currents(a, r_s, r_sh)
+    params = {'a_ref': float(a), 'I_L_ref': float(i_l), 'I_o_ref': float(i_o),
+              'R_s': float(r_s), 'R_sh_ref': r_sh}
+
+    # Validação: P_mp do modelo ajustado em STC contra Vmp·Imp
+    p_mp = single_diode_p_mp(np.array([1000.0]), np.array([25.0]), {'alpha_sc': alpha_sc, **params})[0]
+    error_pct = float(abs(p_mp / (v_mp * i_mp) - 1) * 100.0)
+    return params, error_pct
+
+
+@dataclass
+class ModuleFit:
+    """Parâmetros ajustados de um datasheet"""
+    id: str
+    parametros: Dict[str, float]   # a_ref, I_L_ref, I_o_ref, R_s, R_sh_ref
+    datasheet: Dict[str, float]
+    erro_pmp_pct: float
+
+
+class ModuleFitCache:
+    """Ajustes por hash do datasheet: memória do processo e arquivos em CACHE_DIR/module_fits"""
+
+    def __init__(self, cache_dir: Path = None, flight: SingleFlight = None, max_error_pct: float = None):
+        self.cache_dir = Path(cache_dir or settings.CACHE_DIR / "module_fits")
+        self.flight = flight or SingleFlight(lock_dir=self.cache_dir / "locks")
+        self.max_error_pct = settings.MODULE_FIT_MAX_ERROR_PCT if max_error_pct is None else max_error_pct
+        self._fits: Dict[str, ModuleFit] = {}
+        self._lock = threading.Lock()
+
+        # Contadores deste processo
+        self.fitted = 0
+        self.loaded = 0
+
+    def _path(self, fit_id: str) -> Path:
+        return self.cache_dir / f"{fit_id}.json"
+
+    def get(self, fit_id: str) -> Optional[ModuleFit]:
+        """Ajuste pelo id, ou None se desconhecido"""
+        if not fit_id.startswith(FIT_ID_PREFIX) or not fit_id[len(FIT_ID_PREFIX):].isalnum():
+            return None
+
+        with self._lock:
+            fit = self._fits.get(fit_id)
+        if fit is not None:
+            return fit
+
+        path = self._path(fit_id)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                fit = ModuleFit(**json.load(f))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ajuste do módulo ilegível ({path.name}): {e}")
+            return None
+
+        self.loaded += 1
+        with self._lock:
+            self._fits[fit_id] = fit
+        return fit
+
+    def fit(self, datasheet: Dict[str, Any]) -> ModuleFit:
+        """
+        Ajuste do datasheet, calculado no máximo uma vez por CACHE_DIR.
+
+        Raises:
+            ValueError: Datasheet inconsistente ou ajuste fora da tolerância
+                (MODULE_FIT_MAX_ERROR_PCT)
+        """
+        fit_id = FIT_ID_PREFIX + datasheet_fingerprint(datasheet)
+        fit = self.get(fit_id)
+        if fit is not None:
+            return fit
+        return self.flight.run(fit_id, compute=lambda: self._compute(fit_id, datasheet),
+                               lookup=lambda: self.get(fit_id))
+
+    def _compute(self, fit_id: str, datasheet: Dict[str, Any]) -> ModuleFit:
+        values = {k: float(datasheet[k]) for k in DATASHEET_FIELDS}
+        params, error_pct = fit_desoto(
+            values['vmpp'], values['impp'], values['voc_stc'], values['isc_stc'],
+            values['alpha_sc'], values['beta_oc'], int(values['cells_in_series'])
+        )
+        self.fitted += 1
+
+        if error_pct > self.max_error_pct:
+            raise ValueError(
+                f"Ajuste dos parâmetros do módulo fora da tolerância (erro de P_mp {error_pct:.2f}% > "
+                f"{self.max_error_pct}%); informe a_ref, il_ref, io_ref, rs e rsh_ref"
+            )
+
+        fit = ModuleFit(fit_id, params, values, error_pct)
+        logger.info(f"Parâmetros do módulo ajustados ({fit_id}): a_ref={params['a_ref']:.4f}, "
+                    f"R_s={params['R_s']:.4f}, R_sh={params['R_sh_ref']:.1f} (erro P_mp {error_pct:.4f}%)")
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with atomic_write(self._path(fit_id)) as f:
+                f.write(json.dumps(asdict(fit)).encode('utf-8'))
+        except Exception as e:
+            logger.warning(f"Falha ao gravar ajuste do módulo {fit_id}: {e}")
+
+        with self._lock:
+            self._fits[fit_id] = fit
+        return fit
+
+    def resolve(self, modulo: Any) -> Dict[str, float]:
+        """
+        Parâmetros do diodo único de um ModuloSolar.
+
+        Usa, nesta ordem, os coeficientes enviados na requisição, o ajuste
+        referenciado por parametros_id e o ajuste do datasheet.
+
+        Returns:
+            Dict com a_ref, I_L_ref, I_o_ref, R_s e R_sh_ref
+        """
+        given = {name: getattr(modulo, field, None) for field, name in SINGLE_DIODE_FIELDS.items()}
+        if all(value is not None for value in given.values()):
+            return given
+
+        fit_id = getattr(modulo, 'parametros_id', None)
+        if fit_id:
+            fit = self.get(fit_id)
+            if fit is None:
+                raise ValueError(f"Ajuste de parâmetros do módulo '{fit_id}' não encontrado")
+            return dict(fit.parametros)
+
+        logger.info(f"Módulo {modulo.fabricante} {modulo.modelo} sem parâmetros do diodo único; ajustando pelo datasheet")
+        return dict(self.fit({k: getattr(modulo, k) for k in DATASHEET_FIELDS}).parametros)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Contadores deste processo"""
+        return {
+            "in_memory": len(self._fits),
+            "fitted": self.fitted,
+            "loaded": self.loaded,
+            "max_error_pct": self.max_error_pct,
+            "cache_dir": str(self.cache_dir)
+        }
+
+
+# Instância global
+module_fit_cache = ModuleFitCache()
@@ -140,15 +140,15 @@ class MPPTService:
         """Obtém temperatura mínima histórica do PVGIS"""
         
         try:
-            # Buscar dados meteorológicos do PVGIS
-            df = pvgis_service.fetch_weather_data(latitude, longitude)
+            # Resumo climático do cache (sem carregar os dados horários)
+            summary = pvgis_service.get_climate_summary(latitude, longitude)
             
-            if df.empty:
+            if summary.get('temp_min') is None:
                 logger.warning("Dados PVGIS vazios, usando temperatura mínima padrão: 0°C")
                 return 0.0
             
-            # Calcular temperatura mínima
-            temp_min = float(df['temp_air'].min())
+            # Temperatura mínima
+            temp_min = float(summary['temp_min'])
             logger.info(f"Temperatura mínima obtida do PVGIS: {temp_min}°C")
             
             return temp_min
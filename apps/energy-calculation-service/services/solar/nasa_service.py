@@ -1,16 +1,17 @@
 import pandas as pd
 import numpy as np
 import logging
-from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
-from pvlib.iotools import get_pvgis_tmy
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Dict, Any, List
+from datetime import datetime
 
 from core.config import settings
-from core.exceptions import NASAError, CacheError, ValidationError
-from utils.cache import cache_manager
-from utils.geohash_cache import geohash_cache_manager
-from utils.validators import validate_coordinates, validate_temperature, validate_wind_speed
+from core.exceptions import NASAError, ValidationError
+from utils.http_client import nasa_power_client
+from utils.climate_summary import summarize_weather
+from utils.validators import validate_coordinates
 from utils.weather_data_normalizer import normalize_nasa_data
+from services.solar.weather_repository import weather_repository
 
 logger = logging.getLogger(__name__)
 
@@ -26,21 +27,27 @@ class NASAService:
         self.api_name = settings.NASA_POWER_API
         self.start_year = 2015 
         self.end_year = 2020 
+        # Parâmetros de cache para distinguir da fonte PVGIS
+        self.cache_params = {'source': 'nasa', 'dataset': self.dataset}
 
-    def fetch_weather_data(self, lat: float, lon: float, use_cache: bool = True) -> pd.DataFrame:
+    def fetch_weather_data(self, lat: float, lon: float, use_cache: bool = True,
+                           start_year: Optional[int] = None, end_year: Optional[int] = None) -> pd.DataFrame:
         """
         Busca dados meteorológicos do NASA POWER com cache inteligente baseado em geohashing.
 
         Cache strategy:
         1. Try geohash-based cache with source='nasa' (searches 3x3 neighbor grid, ~44km² area)
-        2. If found within 15km radius, return cached data
+        2. If found within 15km radius, return cached data; an entry past its
+           TTL (within the stale grace window) is returned as well and
+           refreshed in the background
         3. If not found, call NASA POWER API via pvlib and cache with geohash
-        4. Fallback to legacy file cache if geohash fails
 
         Args:
             lat: Latitude
             lon: Longitude
             use_cache: Se deve usar cache
+            start_year: Primeiro ano (padrão: 2015)
+            end_year: Último ano, inclusive (padrão: 2020)
 
         Returns:
             DataFrame com dados meteorológicos formatados (mesmo formato do PVGIS)
@@ -54,235 +61,282 @@ class NASAService:
 
         logger.info(f"Buscando dados NASA POWER para {lat}, {lon}")
 
-        # Parâmetros de cache para distinguir da fonte PVGIS
-        cache_params = {'source': 'nasa', 'dataset': self.dataset}
+        start_year = start_year or self.start_year
+        end_year = end_year or self.end_year
+        if start_year > end_year:
+            raise ValidationError("Ano inicial maior que o ano final", field="start_year", value=start_year)
 
-        # Tentar geohash cache primeiro (novo sistema)
-        if use_cache:
+        # Período diferente do padrão: montado a partir dos blocos anuais em cache
+        if (start_year, end_year) != (self.start_year, self.end_year):
             try:
-                cached_data = geohash_cache_manager.get(lat, lon, **cache_params)
-                if cached_data is not None:
-                    logger.info(f"Geohash cache HIT para NASA POWER {lat}, {lon}")
-                    return cached_data
-                else:
-                    logger.debug(f"Geohash cache MISS para NASA POWER {lat}, {lon}")
+                return self._download_nasa_data(lat, lon, start_year, end_year, use_cache=use_cache)
+            except NASAError:
+                raise
             except Exception as e:
-                logger.warning(f"Erro no geohash cache NASA, tentando cache legado: {e}")
-                # Fallback para cache legado
-                cached_data = cache_manager.get(lat, lon, prefix="nasa")
-                if cached_data is not None:
-                    logger.info(f"Dados NASA encontrados no cache legado para {lat}, {lon}")
-                    return cached_data
-
-        # Buscar dados do NASA POWER (API call via pvlib)
+                raise NASAError(f"Falha ao obter dados meteorológicos: {str(e)}")
+
+        return weather_repository.get(
+            lat, lon, self.cache_params,
+            load=lambda la, lo: self._download(la, lo, use_cache),
+            refresh_load=lambda la, lo: self._download(la, lo, True, refresh=True),
+            client=nasa_power_client,
+            use_cache=use_cache
+        )
+
+    def _download(self, lat: float, lon: float, use_cache: bool, refresh: bool = False) -> pd.DataFrame:
+        """Baixa o período padrão da API NASA POWER (refresh: blocos anuais vencidos são rebaixados)"""
         try:
             logger.info(f"Chamando NASA POWER API para {lat}, {lon} (cache miss)")
-            df = self._download_nasa_data(lat, lon)
+            return self._download_nasa_data(lat, lon, use_cache=use_cache, refresh=refresh)
+        except Exception as e:
+            logger.error(f"Erro ao buscar dados NASA POWER: {e}")
+            raise NASAError(f"Falha ao obter dados meteorológicos: {str(e)}")
 
-            # Salvar em ambos os caches
-            if use_cache and df is not None:
-                # Salvar no geohash cache (novo sistema)
-                try:
-                    geohash_cache_manager.set(lat, lon, df, **cache_params)
-                    logger.debug(f"Dados NASA salvos no geohash cache para {lat}, {lon}")
-                except Exception as e:
-                    logger.warning(f"Erro ao salvar NASA no geohash cache: {e}")
+    def _download_nasa_data(self, lat: float, lon: float, start_year: Optional[int] = None,
+                            end_year: Optional[int] = None, use_cache: bool = True,
+                            refresh: bool = False) -> pd.DataFrame:
+        """
+        Download dos dados NASA POWER em blocos anuais, unidos e normalizados.
+
+        Cada ano é uma requisição independente, baixada em paralelo
+        (NASA_POWER_MAX_PARALLEL_YEARS) e gravada no geohash cache assim que
+        chega. Se algum ano falhar os demais continuam em cache, e a nova
+        tentativa baixa apenas os anos que faltam.
 
-                # Também salvar no cache legado para compatibilidade
+        Args:
+            lat: Latitude
+            lon: Longitude
+            start_year: Primeiro ano (padrão: self.start_year)
+            end_year: Último ano, inclusive (padrão: self.end_year)
+            use_cache: Ler/gravar os blocos anuais no cache
+            refresh: Baixar novamente blocos vencidos em vez de servi-los
+
+        Returns:
+            DataFrame padronizado do período
+
+        Raises:
+            NASAError: Algum ano não pôde ser obtido
+        """
+        years = list(range(start_year or self.start_year, (end_year or self.end_year) + 1))
+        workers = max(1, min(settings.NASA_POWER_MAX_PARALLEL_YEARS, len(years)))
+
+        logger.info(f"Fazendo requisição NASA POWER para {lat}, {lon}")
+        logger.info(f"Período: {years[0]} até {years[-1]} em {len(years)} blocos anuais ({workers} em paralelo)")
+
+        chunks: Dict[int, pd.DataFrame] = {}
+        errors: Dict[int, Exception] = {}
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="nasa-year") as executor:
+            futures = {executor.submit(self._get_year_chunk, lat, lon, year, use_cache, refresh): year for year in years}
+            for future in as_completed(futures):
+                year = futures[future]
                 try:
-                    cache_manager.set(lat, lon, df, prefix="nasa")
+                    chunks[year] = future.result()
                 except Exception as e:
-                    logger.warning(f"Erro ao salvar NASA no cache legado: {e}")
+                    logger.warning(f"Falha no bloco NASA POWER {year} para {lat}, {lon}: {e}")
+                    errors[year] = e
+
+        if errors:
+            failed = sorted(errors)
+            raise NASAError(
+                f"Erro na requisição NASA POWER para os anos {failed} "
+                f"({len(chunks)}/{len(years)} anos obtidos): {errors[failed[0]]}"
+            )
 
-            return df
+        raw = pd.concat([chunks[year] for year in years]).sort_index()
+        raw = raw[~raw.index.duplicated(keep='first')]
+        logger.info(f"Recebidos {len(raw)} registros horários da NASA POWER")
 
-        except Exception as e:
-            logger.error(f"Erro ao buscar dados NASA POWER: {e}")
-            raise NASAError(f"Falha ao obter dados meteorológicos: {str(e)}")
+        return self._process_nasa_data(raw, lat, lon, {'start_year': years[0], 'end_year': years[-1]})
 
-    def _download_nasa_data(self, lat: float, lon: float) -> pd.DataFrame:
+    def _year_cache_params(self, year: int) -> Dict[str, Any]:
+        """Parâmetros de cache de um bloco anual bruto"""
+        return {'source': 'nasa_year', 'dataset': self.dataset, 'year': year}
+
+    def _get_year_chunk(self, lat: float, lon: float, year: int, use_cache: bool = True,
+                        refresh: bool = False) -> pd.DataFrame:
+        """
+        Bloco anual bruto (UTC) do cache ou da API, coalescido por célula/ano.
+
+        Um bloco vencido é servido e atualizado em segundo plano; com
+        refresh=True ele é baixado novamente na hora.
         """
-        Download e processamento dos dados NASA POWER via pvlib.
+        return weather_repository.get(
+            lat, lon, self._year_cache_params(year),
+            load=lambda la, lo: self._download_year(la, lo, year),
+            client=nasa_power_client,
+            use_cache=use_cache,
+            refresh=refresh
+        )
+
+    def _download_year(self, lat: float, lon: float, year: int) -> pd.DataFrame:
+        """
+        Download de um ano de dados horários NASA POWER via pvlib.
 
-        NASA POWER provides hourly solar radiation and meteorological data.
         We use pvlib.iotools.get_nasa_power which is the official pvlib interface
         for NASA POWER API. Unlike NREL's get_psm3, this does NOT require email or API key.
         """
         try:
             # Importar a função correta do pvlib para NASA POWER
             from pvlib.iotools import get_nasa_power
-
-            # Criar datas de início e fim
-            start_date = datetime(self.start_year, 1, 1)
-            end_date = datetime(self.end_year, 12, 31)
-
-            logger.info(f"Fazendo requisição NASA POWER para {lat}, {lon}")
-            logger.info(f"Período: {start_date.strftime('%Y-%m-%d')} até {end_date.strftime('%Y-%m-%d')}")
-
-            # Buscar dados do NASA POWER via pvlib
-            # get_nasa_power é a interface oficial do pvlib para NASA POWER API
-            # NÃO requer email nem API key (diferente de get_psm3 que é do NREL)
-            data, metadata = get_nasa_power(
-                latitude=lat,
-                longitude=lon,
-                start=start_date,
-                end=end_date,
-                parameters=['ghi', 'dni', 'dhi', 'temp_air', 'wind_speed'],
-                community='re',  # renewable energy community
-                map_variables=True  # Mapeia nomes de variáveis para formato padrão pvlib
-            )
-
-            logger.info(f"Recebidos {len(data)} registros horários da NASA POWER")
-            logger.info(f"Período processado: {start_date.strftime('%Y-%m-%d')} até {end_date.strftime('%Y-%m-%d')}")
-
-            # Processar e normalizar dados
-            return self._process_nasa_data(data, lat, lon, metadata)
-
         except ImportError:
-            # Se get_nasa_power não estiver disponível, usar método alternativo
+            # Se get_nasa_power não estiver disponível, usar a API JSON diretamente
             logger.warning("pvlib.iotools.get_nasa_power não disponível, usando método alternativo")
-            return self._download_nasa_data_alternative(lat, lon)
+            return self._fetch_power_json(lat, lon, year, year)
+
+        data, _ = get_nasa_power(
+            latitude=lat,
+            longitude=lon,
+            start=datetime(year, 1, 1),
+            end=datetime(year, 12, 31),
+            parameters=['ghi', 'dni', 'dhi', 'temp_air', 'wind_speed'],
+            community='re',  # renewable energy community
+            map_variables=True  # Mapeia nomes de variáveis para formato padrão pvlib
+        )
+
+        if data is None or data.empty:
+            raise NASAError(f"NASA POWER não retornou dados para {year}")
+        return data
+
+    def cache_raw_years(self, lat: float, lon: float, raw: pd.DataFrame) -> List[int]:
+        """
+        Grava como blocos anuais os anos completos de um DataFrame bruto (UTC).
 
-        except Exception as e:
-            logger.error(f"Erro ao baixar dados NASA POWER: {e}")
-            raise NASAError(f"Erro na requisição NASA POWER: {str(e)}")
+        Usado na importação offline de respostas já baixadas da API; anos com
+        menos de 8760 horas são ignorados para não servir um ano parcial.
 
-    def _download_nasa_data_alternative(self, lat: float, lon: float) -> pd.DataFrame:
+        Returns:
+            Anos gravados no cache
+        """
+        index = raw.index if raw.index.tz is not None else raw.index.tz_localize('UTC')
+        years = index.tz_convert('UTC').year
+
+        stored = []
+        for year in sorted(set(years)):
+            chunk = raw[years == year]
+            if len(chunk) < 8760:
+                logger.warning(f"Ano {year} incompleto ({len(chunk)} horas), ignorado para {lat}, {lon}")
+                continue
+            weather_repository.store(lat, lon, chunk, self._year_cache_params(year))
+            stored.append(int(year))
+        return stored
+
+    def _fetch_power_json(self, lat: float, lon: float, start_year: int, end_year: int) -> pd.DataFrame:
         """
-        Método alternativo usando pvlib.iotools.get_pvgis_hourly como fallback.
+        Consulta direta à API NASA POWER (JSON) sem passar pelo pvlib.
 
-        Note: This is a temporary fallback. The proper implementation should use
-        NASA POWER's direct API or pvlib's NASA POWER integration.
+        Returns:
+            DataFrame bruto em UTC (ghi, dni, dhi, temp_air, wind_speed, pressure)
         """
-        try:
-            from pvlib.iotools import read_srml, get_pvgis_hourly
-            import requests        
-
-            logger.info(f"Usando método alternativo para NASA POWER data")
-
-            # NASA POWER API endpoint direto
-            # Documentação: https://power.larc.nasa.gov/docs/services/api/
-            base_url = "https://power.larc.nasa.gov/api/temporal/hourly/point"
-
-            # Parâmetros NASA POWER
-            # ALLSKY_SFC_SW_DWN: GHI (W/m²)
-            # ALLSKY_SFC_SW_DNI: DNI (W/m²) 
-            # ALLSKY_SFC_SW_DIFF: DHI (W/m²)
-            # T2M: Temperature at 2m (°C)
-            # WS10M: Wind speed at 10m (m/s)
-            parameters = "ALLSKY_SFC_SW_DWN,ALLSKY_SFC_SW_DNI,ALLSKY_SFC_SW_DIFF,T2M,WS10M,PS"
-
-            # Construir URL
-            url = (
-                f"{base_url}?"
-                f"parameters={parameters}&"
-                f"community=RE&"
-                f"longitude={lon}&"
-                f"latitude={lat}&"
-                f"start={self.start_year}0101&"
-                f"end={self.end_year}1231&"
-                f"format=JSON"
-            )
+        logger.info(f"Usando método alternativo para NASA POWER data")
+
+        # NASA POWER API endpoint direto
+        # Documentação: https://power.larc.nasa.gov/docs/services/api/
+        base_url = "https://power.larc.nasa.gov/api/temporal/hourly/point"
+
+        # Parâmetros NASA POWER
+        # ALLSKY_SFC_SW_DWN: GHI (W/m²)
+        # ALLSKY_SFC_SW_DNI: DNI (W/m²) 
+        # ALLSKY_SFC_SW_DIFF: DHI (W/m²)
+        # T2M: Temperature at 2m (°C)
+        # WS10M: Wind speed at 10m (m/s)
+        parameters = "ALLSKY_SFC_SW_DWN,ALLSKY_SFC_SW_DNI,ALLSKY_SFC_SW_DIFF,T2M,WS10M,PS"
+
+        # Construir URL
+        url = (
+            f"{base_url}?"
+            f"parameters={parameters}&"
+            f"community=RE&"
+            f"longitude={lon}&"
+            f"latitude={lat}&"
+            f"start={start_year}0101&"
+            f"end={end_year}1231&"
+            f"format=JSON"
+        )
+
+        logger.info(f"Chamando NASA POWER API: {url}")
+
+        # Fazer requisição
+        response = nasa_power_client.get(url, timeout=self.timeout)
+        return self._parse_power_json(response.json())
+
+    def _parse_power_json(self, data: Dict[str, Any]) -> pd.DataFrame:
+        """
+        Converte a resposta JSON da API NASA POWER em DataFrame.
 
-            logger.info(f"Chamando NASA POWER API: {url}")
-
-            # Fazer requisição
-            response = requests.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            data = response.json()
-
-            # Validar resposta
-            if 'properties' not in data or 'parameter' not in data['properties']:
-                raise NASAError("Formato de resposta NASA POWER inválido")
-
-            parameters_data = data['properties']['parameter']
-
-            # Processar dados
-            records = []
-
-            # NASA POWER retorna dados em formato: {"YYYYMMDDHH": value}
-            if 'ALLSKY_SFC_SW_DWN' in parameters_data:
-                ghi_data = parameters_data['ALLSKY_SFC_SW_DWN']
-                dni_data = parameters_data.get('ALLSKY_SFC_SW_DNI', {})  # ✅ DNI do NASA POWER
-                dhi_data = parameters_data.get('ALLSKY_SFC_SW_DIFF', {})  # ✅ DHI do NASA POWER
-                temp_data = parameters_data.get('T2M', {})
-                wind_data = parameters_data.get('WS10M', {})
-                pressure_data = parameters_data.get('PS', {})
-
-                for timestamp_str, ghi in ghi_data.items():
-                    try:
-                        # Parse timestamp: YYYYMMDDHH
-                        if len(timestamp_str) == 10:  # YYYYMMDDHH
-                            year = int(timestamp_str[0:4])
-                            month = int(timestamp_str[4:6])
-                            day = int(timestamp_str[6:8])
-                            hour = int(timestamp_str[8:10])
-
-                            dt = pd.Timestamp(
-                                year=year, month=month, day=day, hour=hour,
-                                tz='UTC'
-                            )
-
-                            # Extrair dados AGORA COM DNI/DHI!
-                            dni = dni_data.get(timestamp_str, 0.0)  # ✅ DNI
-                            dhi = dhi_data.get(timestamp_str, 0.0)  # ✅ DHI
-                            temp = temp_data.get(timestamp_str, 25.0)
-                            wind = wind_data.get(timestamp_str, 2.0)
-                            pressure = pressure_data.get(timestamp_str, 101325.0)
-
-                            # Converter pressão de kPa para Pa se necessário
-                            if pressure < 10000:  # Likely in kPa
-                                pressure = pressure * 1000
-
-                            # Validações básicas
-                            if ghi < 0 or ghi > settings.GHI_MAX_VALUE:
-                                continue
-
-                            record = {
-                                'datetime': dt,
-                                'ghi': max(0, ghi),  # GHI em W/m²
-                                'dni': max(0, dni),  # ✅ DNI em W/m²
-                                'dhi': max(0, dhi),  # ✅ DHI em W/m²
-                                'temp_air': temp,
-                                'wind_speed': max(0, wind),
-                                'pressure': pressure
-                            }
-
-                            records.append(record)
-
-                    except (ValueError, KeyError) as e:
-                        logger.debug(f"Erro ao processar registro {timestamp_str}: {e}")
-                        continue
-
-            if not records:
-                raise NASAError("Nenhum registro válido processado dos dados NASA POWER")
-
-            # Criar DataFrame
-            df = pd.DataFrame(records)
-            df.set_index('datetime', inplace=True)
-
-            # Converter timezone
-            df.index = df.index.tz_convert('America/Sao_Paulo')
-
-            # Normalizar usando a função do weather_data_normalizer
-            metadata = {
-                'dataset': self.dataset,
-                'years_back': self.years_back,
-                'api': 'NASA POWER'
-            }
+        Returns:
+            DataFrame bruto em UTC (ghi, dni, dhi, temp_air, wind_speed, pressure)
+        """
+        # Validar resposta
+        if 'properties' not in data or 'parameter' not in data['properties']:
+            raise NASAError("Formato de resposta NASA POWER inválido")
 
-            standardized = normalize_nasa_data(df, lat, lon, metadata)
+        parameters_data = data['properties']['parameter']
 
-            years_processed = sorted(standardized.dataframe.index.year.unique())
-            logger.info(f"Processados {len(standardized.dataframe)} registros NASA para anos {years_processed}")
+        # Processar dados
+        records = []
 
-            return standardized.dataframe
+        # NASA POWER retorna dados em formato: {"YYYYMMDDHH": value}
+        if 'ALLSKY_SFC_SW_DWN' in parameters_data:
+            ghi_data = parameters_data['ALLSKY_SFC_SW_DWN']
+            dni_data = parameters_data.get('ALLSKY_SFC_SW_DNI', {})  # ✅ DNI do NASA POWER
+            dhi_data = parameters_data.get('ALLSKY_SFC_SW_DIFF', {})  # ✅ DHI do NASA POWER
+            temp_data = parameters_data.get('T2M', {})
+            wind_data = parameters_data.get('WS10M', {})
+            pressure_data = parameters_data.get('PS', {})
 
-        except requests.RequestException as e:
-            raise NASAError(f"Erro na requisição HTTP NASA POWER: {str(e)}")
-        except Exception as e:
-            logger.error(f"Erro no método alternativo NASA POWER: {e}")
-            raise NASAError(f"Falha ao processar dados NASA POWER: {str(e)}")
+            for timestamp_str, ghi in ghi_data.items():
+                try:
+                    # Parse timestamp: YYYYMMDDHH
+                    if len(timestamp_str) == 10:  # YYYYMMDDHH
+                        year = int(timestamp_str[0:4])
+                        month = int(timestamp_str[4:6])
+                        day = int(timestamp_str[6:8])
+                        hour = int(timestamp_str[8:10])
+
+                        dt = pd.Timestamp(
+                            year=year, month=month, day=day, hour=hour,
+                            tz='UTC'
+                        )
+
+                        # Extrair dados AGORA COM DNI/DHI!
+                        dni = dni_data.get(timestamp_str, 0.0)  # ✅ DNI
+                        dhi = dhi_data.get(timestamp_str, 0.0)  # ✅ DHI
+                        temp = temp_data.get(timestamp_str, 25.0)
+                        wind = wind_data.get(timestamp_str, 2.0)
+                        pressure = pressure_data.get(timestamp_str, 101325.0)
+
+                        # Converter pressão de kPa para Pa se necessário
+                        if pressure < 10000:  # Likely in kPa
+                            pressure = pressure * 1000
+
+                        # Validações básicas
+                        if ghi < 0 or ghi > settings.GHI_MAX_VALUE:
+                            continue
+
+                        record = {
+                            'datetime': dt,
+                            'ghi': max(0, ghi),  # GHI em W/m²
+                            'dni': max(0, dni),  # ✅ DNI em W/m²
+                            'dhi': max(0, dhi),  # ✅ DHI em W/m²
+                            'temp_air': temp,
+                            'wind_speed': max(0, wind),
+                            'pressure': pressure
+                        }
+
+                        records.append(record)
+
+                except (ValueError, KeyError) as e:
+                    logger.debug(f"Erro ao processar registro {timestamp_str}: {e}")
+                    continue
+
+        if not records:
+            raise NASAError("Nenhum registro válido processado dos dados NASA POWER")
+
+        # Criar DataFrame
+        df = pd.DataFrame(records)
+        df.set_index('datetime', inplace=True)
+
+        return df
 
     def _process_nasa_data(self, raw_data: pd.DataFrame, lat: float, lon: float,
                           metadata: Dict[str, Any]) -> pd.DataFrame:
@@ -318,6 +372,21 @@ class NASAService:
             logger.error(f"Erro ao processar dados NASA POWER: {e}")
             raise NASAError(f"Falha no processamento dos dados: {str(e)}")
 
+    def get_climate_summary(self, lat: float, lon: float) -> Dict[str, Any]:
+        """
+        Resumo climático (temperaturas, vento, irradiação mensal, anos cobertos).
+
+        Lido do índice do geohash cache sem carregar os dados horários; em caso
+        de cache miss os dados são baixados (e o resumo gravado) normalmente.
+        """
+        lat, lon = validate_coordinates(lat, lon)
+        summary = weather_repository.get_summary(lat, lon, self.cache_params)
+        if summary is None:
+            summary = summarize_weather(self.fetch_weather_data(lat, lon))
+        if summary is None:
+            raise NASAError("Dados NASA POWER sem colunas para o resumo climático")
+        return summary
+
     def get_data_summary(self, lat: float, lon: float) -> Dict[str, Any]:
         """
         Retorna resumo dos dados disponíveis para uma localização.
@@ -330,22 +399,22 @@ class NASAService:
             Dicionário com resumo dos dados
         """
         try:
-            df = self.fetch_weather_data(lat, lon)
+            summary = self.get_climate_summary(lat, lon)
 
             return {
                 "fonte": "NASA POWER",
                 "coordenadas": {"lat": lat, "lon": lon},
                 "periodo": {
-                    "inicio": df.index.min().strftime('%Y-%m-%d'),
-                    "fim": df.index.max().strftime('%Y-%m-%d'),
-                    "total_registros": len(df),
-                    "anos_processados": sorted(df.index.year.unique().tolist())
+                    "inicio": summary['start'],
+                    "fim": summary['end'],
+                    "total_registros": summary['n_records'],
+                    "anos_processados": summary['years']
                 },
                 "estatisticas": {
-                    "ghi_medio": round(df['ghi'].mean(), 1),
-                    "ghi_maximo": round(df['ghi'].max(), 1),
-                    "temp_media": round(df['temp_air'].mean(), 1),
-                    "vento_medio": round(df['wind_speed'].mean(), 1)
+                    "ghi_medio": round(summary['ghi_mean'], 1),
+                    "ghi_maximo": round(summary['ghi_max'], 1),
+                    "temp_media": round(summary['temp_mean'], 1),
+                    "vento_medio": round(summary['wind_mean'], 1)
                 },
                 "dataset": self.dataset
             }
@@ -0,0 +1,195 @@
+"""
+Motor FV vetorizado por orientação.
+
+Todas as orientações (MPPTs) de uma requisição são empilhadas em arrays
+NumPy 2-D (orientação × hora) e calculadas numa única passada com
+broadcasting: AOI, transposição (POA), perda angular (IAM físico),
+temperatura de célula (SAPM) e potência DC pelo modelo de diodo único
+(De Soto). O resultado é o mesmo do ModelChain do pvlib configurado com
+aoi_model='physical', spectral_model sem perdas, temperatura SAPM e
+dc_model 'desoto', sem criar um PVSystem/ModelChain por MPPT. Com uma
+superfície do módulo (services.solar.diode_surface), a potência DC vem da
+interpolação na grade pré-calculada em vez da solução hora a hora.
+
+Orientações com a mesma face (inclinação e azimute; módulo e montagem são
+os da requisição) são simuladas uma única vez por módulo e escaladas
+linearmente pela quantidade de módulos de cada MPPT. Para limitar a
+memória, as faces são processadas em lotes de até MAX_BATCH_CELLS células
+(face × hora).
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import pvlib
+
+logger = logging.getLogger(__name__)
+
+# Células (orientações × horas) por lote: ~8 milhões ≈ 64 MB por array float64
+MAX_BATCH_CELLS = 8_000_000
+
+# Parâmetros do módulo repassados ao calcparams_desoto (os mesmos que o PVSystem usa)
+DESOTO_PARAMS = ('alpha_sc', 'a_ref', 'I_L_ref', 'I_o_ref', 'R_sh_ref', 'R_s',
+                  'EgRef', 'dEgdT', 'irrad_ref', 'temp_ref')
+_IAM_PARAMS = ('n', 'K', 'L')
+
+
+@dataclass
+class Orientation:
+    """Uma orientação (MPPT) do sistema"""
+    tilt: float
+    azimuth: float
+    modules_per_string: int
+    strings: int
+
+
+@dataclass
+class EngineResult:
+    """Séries horárias por orientação (linhas na ordem de entrada)"""
+    index: pd.DatetimeIndex
+    poa_global: np.ndarray  # (orientações, horas), W/m²
+    p_mp: np.ndarray        # (orientações, horas), W DC no MPP, 0 fora de operação
+
+
+def simulate(orientations: Sequence[Orientation], weather: pd.DataFrame, geometry: pd.DataFrame,
+             module_parameters: Dict[str, Any], temperature_model_parameters: Dict[str, float],
+             transposition_model: str = 'perez', face_cache: Optional[Any] = None,
+             surface: Optional[Any] = None) -> EngineResult:
+    """
+    Potência DC e POA de todas as orientações.
+
+    Orientações com a mesma inclinação e azimute (mesma face do telhado)
+    são simuladas uma única vez, por módulo; a potência de cada MPPT é a
+    do módulo multiplicada pela sua quantidade de módulos.
+
+    Args:
+        orientations: Orientações (MPPTs)
+        weather: Série horária com ghi, dni, dhi, temp_air, wind_speed
+        geometry: Geometria solar do mesmo índice (services.solar.solar_geometry)
+        module_parameters: Parâmetros De Soto/CEC do módulo
+        temperature_model_parameters: Parâmetros SAPM (a, b, deltaT)
+        transposition_model: Modelo de transposição do pvlib
+        face_cache: Resultados por face já calculados (services.solar.dc_cache.FaceResultScope);
+            só as faces ausentes são simuladas e então gravadas
+        surface: Superfície P_mp(irradiância, temperatura) do módulo
+            (services.solar.diode_surface); None resolve o diodo único hora a hora
+
+    Returns:
+        EngineResult com arrays (orientações × horas)
+    """
+    n_hours = len(weather)
+    batch_size = max(1, MAX_BATCH_CELLS // max(n_hours, 1))
+
+    # Faces distintas (tilt, azimute) e a face de cada orientação
+    faces, face_of = np.unique(
+        np.array([(o.tilt, o.azimuth) for o in orientations], dtype=float).reshape(-1, 2),
+        axis=0, return_inverse=True
+    )
+    face_of = np.asarray(face_of).reshape(-1)
+
+    inputs = {
+        'apparent_zenith': geometry['apparent_zenith'].to_numpy(dtype=float),
+        'solar_azimuth': geometry['azimuth'].to_numpy(dtype=float),
+        'dni_extra': geometry['dni_extra'].to_numpy(dtype=float),
+        'airmass': geometry['airmass_relative'].to_numpy(dtype=float),
+        'ghi': weather['ghi'].to_numpy(dtype=float),
+        'dni': weather['dni'].to_numpy(dtype=float),
+        'dhi': weather['dhi'].to_numpy(dtype=float),
+        'temp_air': weather['temp_air'].to_numpy(dtype=float),
+        'wind_speed': weather['wind_speed'].to_numpy(dtype=float),
+    }
+
+    # Faces já calculadas (edição incremental de um projeto)
+    poa_faces = np.empty((len(faces), n_hours))
+    p_mp_faces = np.empty((len(faces), n_hours))
+    missing = []
+    for k, (tilt, azimuth) in enumerate(faces):
+        cached = face_cache.get(tilt, azimuth) if face_cache is not None else None
+        if cached is None:
+            missing.append(k)
+        else:
+            poa_faces[k], p_mp_faces[k] = cached
+
+    n_batches = 0
+    for start in range(0, len(missing), batch_size):
+        rows = missing[start:start + batch_size]
+        poa_global, p_mp = _simulate_batch(faces[rows], inputs, module_parameters,
+                                           temperature_model_parameters, transposition_model, surface)
+        n_batches += 1
+        for k, poa_row, p_mp_row in zip(rows, poa_global, p_mp):
+            if face_cache is not None:
+                poa_row, p_mp_row = face_cache.put(faces[k][0], faces[k][1], weather.index, poa_row, p_mp_row)
+            poa_faces[k], p_mp_faces[k] = poa_row, p_mp_row
+
+    logger.debug(f"Motor FV: {len(orientations)} orientações ({len(faces)} distintas, {len(missing)} simuladas) "
+                 f"× {n_hours} horas em {n_batches} lote(s)")
+
+    # Módulos em série multiplicam a tensão e strings a corrente
+    modules = np.array([o.modules_per_string * o.strings for o in orientations], dtype=float)[:, None]
+    return EngineResult(
+        index=weather.index,
+        poa_global=poa_faces[face_of],
+        p_mp=p_mp_faces[face_of] * modules
+    )
+
+
+def _simulate_batch(faces: np.ndarray, inputs: Dict[str, np.ndarray],
+                    module_parameters: Dict[str, Any], temperature_model_parameters: Dict[str, float],
+                    transposition_model: str, surface: Optional[Any] = None):
+    """POA e potência DC de um único módulo para cada face (tilt, azimute)"""
+    tilt = faces[:, :1]
+    azimuth = faces[:, 1:]
+
+    # POA (face × hora)
+    poa = pvlib.irradiance.get_total_irradiance(
+        tilt, azimuth, inputs['apparent_zenith'], inputs['solar_azimuth'],
+        inputs['dni'], inputs['ghi'], inputs['dhi'],
+        dni_extra=inputs['dni_extra'], airmass=inputs['airmass'],
+        model=transposition_model
+    )
+    poa_global = np.broadcast_to(poa['poa_global'], (len(faces), len(inputs['ghi'])))
+
+    # Perda angular e irradiância efetiva (sem perda espectral, FD do módulo)
+    aoi = pvlib.irradiance.aoi(tilt, azimuth, inputs['apparent_zenith'], inputs['solar_azimuth'])
+    iam = pvlib.iam.physical(aoi, **{k: module_parameters[k] for k in _IAM_PARAMS if k in module_parameters})
+    fd = module_parameters.get('FD', 1.0)
+    effective_irradiance = poa['poa_direct'] * iam + fd * poa['poa_diffuse']
+
+    # Temperatura de célula a partir do POA global
+    temp_cell = pvlib.temperature.sapm_cell(
+        poa_global, inputs['temp_air'], inputs['wind_speed'],
+        temperature_model_parameters['a'], temperature_model_parameters['b'],
+        temperature_model_parameters['deltaT']
+    )
+
+    # Diodo único (De Soto) sobre o lote achatado
+    shape = poa_global.shape
+    effective_irradiance = np.broadcast_to(effective_irradiance, shape).ravel()
+    temp_cell = np.broadcast_to(temp_cell, shape).ravel()
+
+    if surface is None:
+        p_mp = single_diode_p_mp(effective_irradiance, temp_cell, module_parameters)
+    else:
+        # Superfície pré-calculada; pontos fora da grade resolvidos exatamente
+        p_mp, inside = surface.evaluate(effective_irradiance, temp_cell)
+        if not inside.all():
+            p_mp[~inside] = single_diode_p_mp(effective_irradiance[~inside], temp_cell[~inside], module_parameters)
+
+    return np.array(poa_global, dtype=float), p_mp.reshape(shape)
+
+
+def single_diode_p_mp(effective_irradiance: np.ndarray, temp_cell: np.ndarray,
+                      module_parameters: Dict[str, Any]) -> np.ndarray:
+    """P_mp de um módulo (De Soto + Lambert-W); 0 onde não há solução (noite)"""
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        params = pvlib.pvsystem.calcparams_desoto(
+            effective_irradiance, temp_cell,
+            **{k: module_parameters[k] for k in DESOTO_PARAMS if k in module_parameters}
+        )
+        p_mp = np.array(pvlib.pvsystem.singlediode(*params)['p_mp'], dtype=float)
+
+    p_mp[np.isnan(p_mp)] = 0.0
+    return p_mp
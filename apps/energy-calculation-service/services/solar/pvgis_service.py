@@ -1,15 +1,17 @@
+import io
 import requests
 import pandas as pd
 import numpy as np
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple, Union
 from pathlib import Path
 
 from core.config import settings
 from core.exceptions import PVGISError, CacheError, ValidationError
-from utils.cache import cache_manager
-from utils.geohash_cache import geohash_cache_manager
-from utils.validators import validate_coordinates, validate_temperature, validate_wind_speed
+from utils.http_client import pvgis_client
+from utils.climate_summary import summarize_weather
+from utils.validators import validate_coordinates
+from services.solar.weather_repository import weather_repository
 
 logger = logging.getLogger(__name__)
 
@@ -19,18 +21,21 @@ class PVGISService:
     def __init__(self):
         self.base_url = settings.PVGIS_BASE_URL
         self.timeout = settings.PVGIS_TIMEOUT
+        self.output_format = settings.PVGIS_OUTPUT_FORMAT
         self.start_year = 2015 
         self.end_year = 2020 
+        # Parâmetros de cache para distinguir da fonte NASA
+        self.cache_params = {'source': 'pvgis', 'dataset': 'PVGIS'}
     
     def fetch_weather_data(self, lat: float, lon: float, use_cache: bool = True) -> pd.DataFrame:
         """
         Busca dados meteorológicos do PVGIS com cache inteligente baseado em geohashing.
 
-        Cache strategy:
-        1. Try geohash-based cache (searches 3x3 neighbor grid, ~44km² area)
-        2. If found within 15km radius, return cached data
-        3. If not found, call PVGIS API and cache with geohash
-        4. Fallback to legacy file cache if geohash fails
+        Cache strategy (WeatherRepository):
+        1. Memory tier, then geohash-based disk cache (3x3 neighbor grid, 15km radius)
+        2. An entry past its TTL (within the stale grace window) is returned
+           as well and refreshed in the background
+        3. If not found, call PVGIS API (coalesced per cell) and cache with geohash
 
         Args:
             lat: Latitude
@@ -49,148 +54,139 @@ class PVGISService:
 
         logger.info(f"Buscando dados PVGIS para {lat}, {lon}")
 
-        # Parâmetros de cache para distinguir da fonte NASA
-        cache_params = {'source': 'pvgis', 'dataset': 'PVGIS'}
-
-        # Tentar geohash cache primeiro (novo sistema)
-        if use_cache:
-            try:
-                cached_data = geohash_cache_manager.get(lat, lon, **cache_params)
-                if cached_data is not None:
-                    logger.info(f"Geohash cache HIT para PVGIS {lat}, {lon}")
-                    return cached_data
-                else:
-                    logger.debug(f"Geohash cache MISS para PVGIS {lat}, {lon}")
-            except Exception as e:
-                logger.warning(f"Erro no geohash cache PVGIS, tentando cache legado: {e}")
-                # Fallback para cache legado
-                cached_data = cache_manager.get(lat, lon, prefix="pvgis")
-                if cached_data is not None:
-                    logger.info(f"Dados PVGIS encontrados no cache legado para {lat}, {lon}")
-                    return cached_data
-
-        # Buscar dados do PVGIS (API call)
-        try:
-            logger.info(f"Chamando API PVGIS para {lat}, {lon} (cache miss)")
-            df = self._download_pvgis_data(lat, lon)
-
-            # Salvar em ambos os caches
-            if use_cache and df is not None:
-                # Salvar no geohash cache (novo sistema)
-                try:
-                    geohash_cache_manager.set(lat, lon, df, **cache_params)
-                    logger.debug(f"Dados PVGIS salvos no geohash cache para {lat}, {lon}")
-                except Exception as e:
-                    logger.warning(f"Erro ao salvar PVGIS no geohash cache: {e}")
-
-                # Também salvar no cache legado para compatibilidade
-                try:
-                    cache_manager.set(lat, lon, df, prefix="pvgis")
-                except Exception as e:
-                    logger.warning(f"Erro ao salvar PVGIS no cache legado: {e}")
-
-            return df
+        return weather_repository.get(
+            lat, lon, self.cache_params, load=self._download,
+            client=pvgis_client, use_cache=use_cache
+        )
 
+    def _download(self, lat: float, lon: float) -> pd.DataFrame:
+        """Baixa os dados da API PVGIS (cache miss ou atualização em segundo plano)"""
+        try:
+            logger.info(f"Chamando API PVGIS para {lat}, {lon}")
+            return self._download_pvgis_data(lat, lon)
         except Exception as e:
             logger.error(f"Erro ao buscar dados PVGIS: {e}")
             raise PVGISError(f"Falha ao obter dados meteorológicos: {str(e)}")
     
     def _download_pvgis_data(self, lat: float, lon: float) -> pd.DataFrame:
-        """Download e processamento dos dados PVGIS"""
+        """Download e processamento dos dados PVGIS (JSON ou CSV, conforme PVGIS_OUTPUT_FORMAT)"""
         
         # Mudança: agora usa período específico 2018-2020 diretamente na URL
         url = (f"{self.base_url}/seriescalc?"
                f"lat={lat}&lon={lon}&"
                f"startyear={self.start_year}&endyear={self.end_year}&"  # Agora: 2018-2020
-               f"outputformat=json&usehorizon=1&selectrad=1&angle=0&aspect=0")
+               f"outputformat={self.output_format}&usehorizon=1&selectrad=1&angle=0&aspect=0")
         
         logger.info(f"Fazendo requisição para PVGIS: {url}")
         logger.info(f"Período solicitado: {self.start_year}-{self.end_year}")  # Log do período
         
         try:
-            response = requests.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            data = response.json()
+            response = pvgis_client.get(url, timeout=self.timeout)
+
+            if self.output_format == 'csv':
+                hourly_data = self._parse_pvgis_csv(response.text)
+            else:
+                data = response.json()
+
+                # Validar estrutura da resposta
+                if 'outputs' not in data or 'hourly' not in data['outputs']:
+                    raise PVGISError("Formato de resposta PVGIS inválido", url)
+
+                hourly_data = pd.DataFrame.from_records(data['outputs']['hourly'])
             
         except requests.RequestException as e:
             raise PVGISError(f"Erro na requisição HTTP: {str(e)}", url)
         except ValueError as e:
-            raise PVGISError(f"Erro ao decodificar JSON: {str(e)}", url)
+            raise PVGISError(f"Erro ao decodificar resposta {self.output_format.upper()}: {str(e)}", url)
         
-        # Validar estrutura da resposta
-        if 'outputs' not in data or 'hourly' not in data['outputs']:
-            raise PVGISError("Formato de resposta PVGIS inválido", url)
-        
-        hourly_data = data['outputs']['hourly']
         logger.info(f"Recebidos {len(hourly_data)} registros do PVGIS para período {self.start_year}-{self.end_year}")
         
         # Processar dados
         return self._process_pvgis_data(hourly_data)
+
+    def _parse_pvgis_csv(self, text: str) -> pd.DataFrame:
+        """
+        Extrai a seção de dados horários do CSV do PVGIS.
+
+        O arquivo tem linhas de metadados, o cabeçalho iniciado por "time,",
+        os registros e, após uma linha em branco, a legenda das variáveis.
+        """
+        lines = text.splitlines()
+        header_idx = next((i for i, line in enumerate(lines) if line.startswith('time,')), None)
+        if header_idx is None:
+            raise PVGISError("Seção de dados não encontrada no CSV do PVGIS")
+
+        end_idx = next(
+            (i for i in range(header_idx + 1, len(lines)) if not lines[i].strip()),
+            len(lines)
+        )
+
+        return pd.read_csv(io.StringIO("\n".join(lines[header_idx:end_idx])), dtype={'time': str})
     
-    def _process_pvgis_data(self, hourly_data: list) -> pd.DataFrame:
-        """Processa dados brutos do PVGIS para formato pandas"""
-        
-        processed_records = []
-        errors = 0
-        
-        for record in hourly_data:
-            try:
-                # Parse timestamp: "20200101:0003"
-                time_str = record['time']
-                year = int(time_str[0:4])
-                month = int(time_str[4:6])
-                day = int(time_str[6:8])
-                hour = int(time_str[9:11])
-                minute = int(time_str[11:13])
-            
-                
-                # Criar datetime
-                dt = pd.Timestamp(year=year, month=month, day=day,
-                                hour=hour, minute=minute, tz='UTC')
-                
-                # Extrair e validar dados - AGORA INCLUINDO DNI E DHI DO PVGIS!
-                ghi = float(record['G(i)'])
-                dni = float(record.get('Gb(n)', 0.0))  # Direct Normal Irradiation
-                dhi = float(record.get('Gd(n)', 0.0))  # Diffuse Horizontal Irradiation
-                temp_air = float(record.get('T2m', 25))
-                wind_speed = float(record.get('WS10m', 2))
-                
-                # Validações básicas
-                if not (0 <= ghi <= settings.GHI_MAX_VALUE):
-                    continue
-                    
-                try:
-                    validate_temperature(temp_air)
-                    validate_wind_speed(wind_speed)
-                except ValidationError:
-                    # Log mas continue com valores padrão
-                    temp_air = max(min(temp_air, settings.TEMP_MAX_VALUE), settings.TEMP_MIN_VALUE)
-                    wind_speed = max(min(wind_speed, settings.WIND_MAX_VALUE), settings.WIND_MIN_VALUE)
-                
-                processed_record = {
-                    'datetime': dt,
-                    'ghi': ghi,
-                    'dni': dni,  # ✅ AGORA SALVANDO DNI DO PVGIS
-                    'dhi': dhi,  # ✅ AGORA SALVANDO DHI DO PVGIS
-                    'temp_air': temp_air,
-                    'wind_speed': wind_speed,
-                    'pressure': 101325.0,  # Pressão padrão
-                }
-                
-                processed_records.append(processed_record)
-                
-            except (KeyError, ValueError, TypeError) as e:
-                errors += 1
-                if errors % 1000 == 0:  # Log a cada 1000 erros
-                    logger.warning(f"Erros no processamento: {errors}")
-                continue
-        
-        if not processed_records:
+    def _process_pvgis_data(self, hourly_data: Union[pd.DataFrame, list]) -> pd.DataFrame:
+        """
+        Processa dados brutos do PVGIS para formato pandas.
+
+        Conversão e validação vetorizadas sobre as colunas (mesmas regras do
+        processamento registro a registro): registros com horário ou G(i)
+        inválidos, ou com Gb(n)/Gd(n)/T2m/WS10m nulos ou não numéricos, são
+        descartados e contados como erro; campos ausentes usam os valores
+        padrão. GHI fora de [0, GHI_MAX_VALUE] é removido e temperatura/vento
+        são limitados às faixas válidas.
+        """
+        records = None if isinstance(hourly_data, pd.DataFrame) else hourly_data
+        raw = hourly_data if records is None else pd.DataFrame.from_records(records)
+
+        if raw.empty or 'time' not in raw or 'G(i)' not in raw:
+            raise PVGISError(f"Nenhum registro válido processado ({len(raw)} erros)")
+
+        # Parse timestamp: "20200101:0003"
+        times = pd.to_datetime(raw['time'].astype(str), format='%Y%m%d:%H%M', utc=True, errors='coerce')
+
+        def column(name: str, default: float) -> Tuple[pd.Series, np.ndarray]:
+            """Valores (padrão onde o campo não veio) e máscara de valores nulos/inválidos"""
+            if name not in raw:
+                return pd.Series(default, index=raw.index, dtype=float), np.zeros(len(raw), dtype=bool)
+            values = pd.to_numeric(raw[name], errors='coerce')
+            invalid = values.isna().to_numpy()
+            if records is not None and invalid.any():
+                # No JSON, chave ausente no registro usa o padrão; só nulo/não numérico é erro
+                positions = np.flatnonzero(invalid)
+                invalid[positions] = [name in records[i] for i in positions]
+            return values.fillna(default), invalid
+
+        # Extrair dados - incluindo DNI e DHI do PVGIS
+        ghi = pd.to_numeric(raw['G(i)'], errors='coerce')
+        dni, dni_invalid = column('Gb(n)', 0.0)  # Direct Normal Irradiation
+        dhi, dhi_invalid = column('Gd(n)', 0.0)  # Diffuse Horizontal Irradiation
+        temp_air, temp_invalid = column('T2m', 25.0)
+        wind_speed, wind_invalid = column('WS10m', 2.0)
+
+        parsed = (times.notna().to_numpy() & ghi.notna().to_numpy()
+                  & ~(dni_invalid | dhi_invalid | temp_invalid | wind_invalid))
+        errors = int((~parsed).sum())
+        if errors:
+            logger.warning(f"Erros no processamento: {errors}")
+
+        # Validações básicas
+        valid = parsed & (ghi >= 0).to_numpy() & (ghi <= settings.GHI_MAX_VALUE).to_numpy()
+
+        if not valid.any():
             raise PVGISError(f"Nenhum registro válido processado ({errors} erros)")
-        
-        # Criar DataFrame
-        df = pd.DataFrame(processed_records)
-        df.set_index('datetime', inplace=True)
+
+        df = pd.DataFrame(
+            {
+                'ghi': ghi.to_numpy(dtype=float)[valid],
+                'dni': dni.to_numpy(dtype=float)[valid],
+                'dhi': dhi.to_numpy(dtype=float)[valid],
+                'temp_air': np.clip(temp_air.to_numpy(dtype=float)[valid],
+                                    settings.TEMP_MIN_VALUE, settings.TEMP_MAX_VALUE),
+                'wind_speed': np.clip(wind_speed.to_numpy(dtype=float)[valid],
+                                      settings.WIND_MIN_VALUE, settings.WIND_MAX_VALUE),
+                'pressure': 101325.0,  # Pressão padrão
+            },
+            index=pd.DatetimeIndex(times[valid], name='datetime')
+        )
         df.index = df.index.tz_convert('America/Sao_Paulo')
         
         # Mudança: log específico do período processado
@@ -199,26 +195,41 @@ class PVGISService:
         
         return df
     
+    def get_climate_summary(self, lat: float, lon: float) -> Dict[str, Any]:
+        """
+        Resumo climático (temperaturas, vento, irradiação mensal, anos cobertos).
+
+        Lido do índice do cache meteorológico sem carregar os dados horários; em caso
+        de cache miss os dados são baixados (e o resumo gravado) normalmente.
+        """
+        lat, lon = validate_coordinates(lat, lon)
+        summary = weather_repository.get_summary(lat, lon, self.cache_params)
+        if summary is None:
+            summary = summarize_weather(self.fetch_weather_data(lat, lon))
+        if summary is None:
+            raise PVGISError("Dados PVGIS sem colunas para o resumo climático")
+        return summary
+
     def get_data_summary(self, lat: float, lon: float) -> Dict[str, Any]:
         """Retorna resumo dos dados disponíveis para uma localização"""
         
         try:
-            df = self.fetch_weather_data(lat, lon)
+            summary = self.get_climate_summary(lat, lon)
             
             return {
                 "coordenadas": {"lat": lat, "lon": lon},
                 "periodo": {
-                    "inicio": df.index.min().strftime('%Y-%m-%d'),
-                    "fim": df.index.max().strftime('%Y-%m-%d'),
-                    "total_registros": len(df),
+                    "inicio": summary['start'],
+                    "fim": summary['end'],
+                    "total_registros": summary['n_records'],
                     # Mudança: adicionar informação sobre anos processados
-                    "anos_processados": sorted(df.index.year.unique().tolist())
+                    "anos_processados": summary['years']
                 },
                 "estatisticas": {
-                    "ghi_medio": round(df['ghi'].mean(), 1),
-                    "ghi_maximo": round(df['ghi'].max(), 1),
-                    "temp_media": round(df['temp_air'].mean(), 1),
-                    "vento_medio": round(df['wind_speed'].mean(), 1)
+                    "ghi_medio": round(summary['ghi_mean'], 1),
+                    "ghi_maximo": round(summary['ghi_max'], 1),
+                    "temp_media": round(summary['temp_mean'], 1),
+                    "vento_medio": round(summary['wind_mean'], 1)
                 }
             }
             
@@ -0,0 +1,97 @@
+"""
+Cache da geometria solar por localização e índice horário.
+
+A posição solar (SPA sobre ~52 mil instantes) é um dos maiores custos de uma
+requisição e depende apenas da localização e dos instantes. Zenite, zenite
+aparente, azimute, irradiância extraterrestre e massa de ar são calculados uma
+vez por (lat/lon arredondados, impressão digital do índice) e gravados no
+repositório meteorológico: camada de memória do processo e arquivo colunar
+float32 no mesmo diretório/índice das entradas meteorológicas.
+"""
+
+import hashlib
+import logging
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+import pvlib
+
+from services.solar.weather_repository import WeatherRepository, weather_repository
+
+logger = logging.getLogger(__name__)
+
+# Casas decimais das coordenadas na chave (0,01° ≈ 1 km; o Sol se desloca ~2 s)
+COORDINATE_DECIMALS = 2
+
+# Versão do conteúdo: incrementar ao mudar colunas ou modelos
+GEOMETRY_VERSION = 1
+
+AIRMASS_MODEL = 'kastenyoung1989'
+
+SOLAR_POSITION_COLUMNS = ['zenith', 'apparent_zenith', 'azimuth']
+AIRMASS_COLUMNS = ['airmass_relative', 'airmass_absolute']
+
+
+def index_fingerprint(index: pd.DatetimeIndex) -> str:
+    """Impressão digital dos instantes (UTC) do índice"""
+    return hashlib.md5(np.ascontiguousarray(index.asi8).tobytes()).hexdigest()[:16]
+
+
+class SolarGeometryCache:
+    """Geometria solar memoizada por localização e índice"""
+
+    def __init__(self, repository: WeatherRepository = None):
+        self.repository = repository or weather_repository
+
+    def _cache_params(self, lat: float, lon: float, index: pd.DatetimeIndex) -> Dict[str, Any]:
+        return {
+            'type': 'solar_geometry',
+            'site': f"{lat:.{COORDINATE_DECIMALS}f},{lon:.{COORDINATE_DECIMALS}f}",
+            'index': index_fingerprint(index),
+            'version': GEOMETRY_VERSION
+        }
+
+    def get(self, index: pd.DatetimeIndex, lat: float, lon: float) -> pd.DataFrame:
+        """
+        Geometria solar de (lat, lon) nos instantes do índice.
+
+        Returns:
+            DataFrame float64 com o índice informado e as colunas zenith,
+            apparent_zenith, azimuth, dni_extra, airmass_relative e
+            airmass_absolute (pressão padrão)
+        """
+        lat = round(float(lat), COORDINATE_DECIMALS)
+        lon = round(float(lon), COORDINATE_DECIMALS)
+
+        geometry = self.repository.get(
+            lat, lon, self._cache_params(lat, lon, index),
+            load=lambda la, lo: self._compute(index, la, lo)
+        )
+
+        # Mesmos instantes (impressão digital); o índice do chamador preserva o fuso
+        return pd.DataFrame(
+            {name: np.asarray(geometry[name], dtype=np.float64) for name in geometry.columns},
+            index=index
+        )
+
+    @staticmethod
+    def _compute(index: pd.DatetimeIndex, lat: float, lon: float) -> pd.DataFrame:
+        """Calcula a geometria (cache miss); colunas float32"""
+        logger.info(f"Calculando geometria solar para {lat}, {lon} ({len(index)} instantes)")
+
+        solar_pos = pvlib.solarposition.get_solarposition(index, lat, lon)
+        airmass_relative = pvlib.atmosphere.get_relative_airmass(solar_pos['apparent_zenith'], model=AIRMASS_MODEL)
+
+        return pd.DataFrame({
+            'zenith': solar_pos['zenith'],
+            'apparent_zenith': solar_pos['apparent_zenith'],
+            'azimuth': solar_pos['azimuth'],
+            'dni_extra': pvlib.irradiance.get_extra_radiation(index),
+            'airmass_relative': airmass_relative,
+            'airmass_absolute': pvlib.atmosphere.get_absolute_airmass(airmass_relative)
+        }, index=index).astype(np.float32)
+
+
+# Instância global
+solar_geometry_cache = SolarGeometryCache()
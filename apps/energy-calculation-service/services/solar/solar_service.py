@@ -3,16 +3,24 @@ Serviço de cálculo de sistemas solares multi-inversor
 Replicando lógica do notebook Python
 """
 
+import hashlib
 import numpy as np
 import pandas as pd
 import pvlib
 from pvlib.temperature import TEMPERATURE_MODEL_PARAMETERS
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 
 from models.solar.requests import SolarSystemCalculationRequest
-from services.solar.pvgis_service import pvgis_service
-from services.solar.nasa_service import nasa_service
+from core.exceptions import CalculationError
+from services.solar.typical_year import build_typical_year, estimate_deviation_pct
+from services.solar.weather_source import weather_source_fetcher
+from services.solar import pv_engine
+from services.solar.dc_cache import mppt_dc_cache
+from services.solar.diode_surface import diode_surface_cache
+from services.solar.module_fit import module_fit_cache
+from services.solar.solar_geometry import solar_geometry_cache
+from services.solar.weather_repository import weather_repository
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +45,7 @@ class SolarCalculationService:
 
         logger.info("=== Iniciando cálculo sistema solar ===")
         logger.info(f"Localização: {lat}, {lon}")
-        logger.info(f"Período: {startyear}-{endyear}")
+        logger.info(f"Período: {startyear}-{endyear} (modo {request.modo_calculo})")
         logger.info(f"Fonte de dados preferida: {preferred_source}")
         logger.info(f"Modelo transposição: {modelo_transposicao}")
         logger.info(f"Tipo de montagem: {mount_type}")
@@ -83,11 +91,8 @@ class SolarCalculationService:
             'I_sc_ref': modulo.isc_stc,
             'V_mp_ref': modulo.vmpp,
             'I_mp_ref': modulo.impp,
-            'a_ref': modulo.a_ref,
-            'I_L_ref': modulo.il_ref,
-            'I_o_ref': modulo.io_ref,
-            'R_s': modulo.rs,
-            'R_sh_ref': modulo.rsh_ref,
+            # Coeficientes do diodo único: da requisição, de um ajuste por id ou ajustados do datasheet
+            **module_fit_cache.resolve(modulo),
         }
 
         # Preparar configurações dos inversores
@@ -132,42 +137,14 @@ class SolarCalculationService:
         # BUSCAR DADOS METEOROLÓGICOS
         # ========================================
 
-        df = None
-
-        if preferred_source == 'NASA':
-            logger.info("Tentando fonte primária: NASA POWER (com cache)")
-            try:
-                df = nasa_service.fetch_weather_data(lat, lon, use_cache=True)
-                logger.info("NASA POWER dados obtidos com sucesso (usando cache)")
-            except Exception as e:
-                logger.warning(f"NASA falhou: {e}, tentando PVGIS como fallback")
-                try:
-                    df = pvgis_service.fetch_weather_data(lat, lon, use_cache=True)
-                    logger.info("PVGIS fallback obtido com sucesso (usando cache)")
-                except Exception as e2:
-                    logger.error(f"Ambas as fontes falharam. NASA: {e}, PVGIS: {e2}")
-                    df = None
-        else:  # PVGIS
-            logger.info("Tentando fonte primária: PVGIS (com cache)")
-            try:
-                df = pvgis_service.fetch_weather_data(lat, lon, use_cache=True)
-                logger.info("PVGIS dados obtidos com sucesso (usando cache)")
-            except Exception as e:
-                logger.warning(f"PVGIS falhou: {e}, tentando NASA como fallback")
-                try:
-                    df = nasa_service.fetch_weather_data(lat, lon, use_cache=True)
-                    logger.info("NASA fallback obtido com sucesso (usando cache)")
-                except Exception as e2:
-                    logger.error(f"Ambas as fontes falharam. PVGIS: {e}, NASA: {e2}")
-                    df = None
-
-        if df is None or df.empty:
-            logger.error("Falha ao obter dados de ambas as fontes (NASA e PVGIS)")
-            raise ValueError("Não foi possível obter dados meteorológicos")
-    
-
-        # Remover registros fora do período solicitado
-        df = df[(df.index.year >= startyear) & (df.index.year <= endyear)]
+        tmy_info = None
+        if request.modo_calculo == 'tmy':
+            df, fonte_dados, tmy_info = SolarCalculationService._get_typical_year(
+                lat, lon, preferred_source, startyear, endyear
+            )
+        else:
+            df, fonte_dados = SolarCalculationService._get_weather_data(lat, lon, preferred_source, startyear, endyear)
+        modo_calculo = 'tmy' if tmy_info else 'completo'
         
         logger.info(f"Dados obtidos: {len(df)} registros de {df.index.min()} a {df.index.max()}")
         logger.info(f"Resumo irradiação - GHI: {df['ghi'].mean():.1f}±{df['ghi'].std():.1f} W/m²")
@@ -186,25 +163,27 @@ class SolarCalculationService:
             
         logger.info(f"Resumo temperatura: {df['temp_air'].mean():.1f}±{df['temp_air'].std():.1f} °C")
 
-        # Calcular número de anos para normalização
-        n_anos = df.index.year.nunique()
+        # Calcular número de anos para normalização (ano típico: um único ano)
+        n_anos = 1 if tmy_info else df.index.year.nunique()
         registros_por_ano = df.groupby(df.index.year).size()
         for ano, count in registros_por_ano.items():
             logger.info(f"Ano {ano}: {count} registros")
         logger.info(f"Período analisado: {n_anos} ano(s)")
 
-        # Calcular posição solar
-        logger.info("Calculando posição solar")
-        logger.info(df.columns)
+        # ========================================
+        # GEOMETRIA DO LOCAL (UMA VEZ POR REQUISIÇÃO)
+        # ========================================
 
-        solar_pos = pvlib.solarposition.get_solarposition(df.index, lat, lon)
-        logger.debug(f"Posição solar calculada: zenite médio {solar_pos['zenith'].mean():.1f}°")
-        
+        # Posição solar, irradiância extraterrestre e massa de ar são comuns a
+        # todos os MPPTs: obtidas do cache de geometria (por local e índice)
+        logger.info("Obtendo geometria solar")
+        geometry = solar_geometry_cache.get(df.index, lat, lon)
+        logger.debug(f"Posição solar calculada: zenite médio {geometry['zenith'].mean():.1f}°")
 
         # Decompor se necessário
         if df['dni'].sum() == 0:
             logger.info("DNI nulo, decompondo GHI em DNI/DHI usando modelo Louche")
-            decomp = pvlib.irradiance.louche(ghi=df['ghi'], solar_zenith=solar_pos['zenith'], datetime_or_doy=df.index)
+            decomp = pvlib.irradiance.louche(ghi=df['ghi'], solar_zenith=geometry['zenith'], datetime_or_doy=df.index)
             df['dni'] = decomp['dni']
             df['dhi'] = decomp['dhi']
             logger.info(f"Decomposição concluída - DNI médio: {df['dni'].mean():.1f} W/m², DHI médio: {df['dhi'].mean():.1f} W/m²")
@@ -212,15 +191,54 @@ class SolarCalculationService:
             logger.info(f"DNI já disponível: {df['dni'].mean():.1f}±{df['dni'].std():.1f} W/m²")
 
         # ========================================
-        # CALCULAR SISTEMA (LOOP POR INVERSOR)
+        # CALCULAR SISTEMA (TODOS OS MPPTS DE UMA VEZ)
         # ========================================
 
-        ac_all = pd.Series(0.0, index=df.index)
-        dc_all_pre_clipping = pd.Series(0.0, index=df.index)
+        # Uma linha por MPPT, na ordem inversor → MPPT
+        mppt_entries = []
+        for inv_idx, inv_cfg in enumerate(inverter_configs):
+            for i, mppt in enumerate(inv_cfg['mppts']):
+                mppt_id = mppt.get('id', f"{inv_cfg['name']}_MPPT_{i+1}")
+                kwp = (mppt['modules_per_string'] * mppt['strings'] * potencia_modulo) / 1000.0
+                mppt_entries.append((inv_idx, i, mppt, mppt_id, kwp))
+
+        logger.info(f"Module Parameters: {module_parameters}")
+        logger.info(f"Temperature model parameters: {temperature_model_params}")
+        logger.info(f"Simulando {len(mppt_entries)} MPPT(s) × {len(df)} horas (modelo {modelo_transposicao})")
+
+        # Superfície P_mp do módulo (None: solução exata do diodo único)
+        surface = diode_surface_cache.get(module_parameters)
+
+        engine = pv_engine.simulate(
+            [pv_engine.Orientation(mppt['tilt'], mppt['azimuth'], mppt['modules_per_string'], mppt['strings'])
+             for _, _, mppt, _, _ in mppt_entries],
+            df, geometry, module_parameters, temperature_model_params,
+            transposition_model=modelo_transposicao,
+            face_cache=mppt_dc_cache.scope(lat, lon, df, module_parameters, temperature_model_params,
+                                           modelo_transposicao, dc_model=surface.key if surface else None),
+            surface=surface
+        )
+
+        # AC por MPPT: eficiência e clipping do seu inversor, depois as perdas
+        perdas_totais_pct = sum(losses_parameters.values())
+        perdas_fator = (1.0 - perdas_totais_pct / 100.0)
+        logger.info(f"Aplicando perdas finais: {perdas_totais_pct}% (fator: {perdas_fator:.3f})")
+        row_inverter = np.array([inv_idx for inv_idx, _, _, _, _ in mppt_entries], dtype=int)
+        efficiency_rows = np.array([inverter_configs[k]['efficiency_dc_ac'] for k in row_inverter])[:, None]
+        paco_rows = np.array([inverter_configs[k]['paco_w'] for k in row_inverter], dtype=float)[:, None]
+        ac_rows = np.minimum(engine.p_mp * efficiency_rows, paco_rows) * perdas_fator
+
+        dc_annual_rows = engine.p_mp.sum(axis=1) / 1000.0
+        ac_annual_rows = ac_rows.sum(axis=1) / 1000.0 / n_anos
+
+        # Agregados horários do sistema
+        ac_all = pd.Series(ac_rows.sum(axis=0), index=df.index)
+        dc_all_pre_clipping = pd.Series(engine.p_mp.sum(axis=0), index=df.index)
 
         results_inverter = {}
         poa_global_mppt_results = {}
         total_kwp_by_mppt_id = {}
+        monthly_energy_by_orientation = {}
 
         for inv_idx, inv_cfg in enumerate(inverter_configs):
             inv_name = inv_cfg['name']
@@ -231,109 +249,23 @@ class SolarCalculationService:
             logger.info(f"Processando inversor {inv_idx+1}/{len(inverter_configs)}: {inv_name}")
             logger.info(f"  Potência AC: {paco_inv}W, Eficiência: {efficiency_factor}")
 
-            dc_inv_total_pure = pd.Series(0.0, index=df.index)
+            rows = np.flatnonzero(row_inverter == inv_idx)
             kwp_inv = 0.0
 
-            # Loop por MPPT
-            for i, mppt in enumerate(mppts_list):
-                mppt_id = mppt.get('id', f'{inv_name}_MPPT_{i+1}')
-
-                current_mppt_kwp = (mppt['modules_per_string'] * mppt['strings'] * potencia_modulo) / 1000.0
+            for row in rows:
+                _, i, mppt, mppt_id, current_mppt_kwp = mppt_entries[row]
                 total_kwp_by_mppt_id[mppt_id] = current_mppt_kwp
                 kwp_inv += current_mppt_kwp
+                poa_global_mppt_results[mppt_id] = pd.Series(engine.poa_global[row], index=df.index)
 
-                logger.info(f"  MPPT {i+1}/{len(mppts_list)} ({mppt_id}): {current_mppt_kwp:.2f} kWp")
-                logger.debug(f"    Orientação: {mppt['tilt']}° inclinação, {mppt['azimuth']}° azimute")
-                logger.debug(f"    Configuração: {mppt['modules_per_string']} módulos/string × {mppt['strings']} strings")
-
-                # Calcular AOI
-                aoi = pvlib.irradiance.aoi(mppt['tilt'], mppt['azimuth'], solar_pos['apparent_zenith'], solar_pos['azimuth'])
-                dni_extra = pvlib.irradiance.get_extra_radiation(df.index)
-
-                # Calcular POA
-                logger.debug(f"    Calculando POA com modelo {modelo_transposicao}")
-                poa_irrad = pvlib.irradiance.get_total_irradiance(
-                    mppt['tilt'], mppt['azimuth'], solar_pos['apparent_zenith'], solar_pos['azimuth'],
-                    df['dni'], df['ghi'], df['dhi'],
-                    dni_extra=dni_extra,
-                    model=modelo_transposicao
-                )
-
-                poa_global_mppt_results[mppt_id] = poa_irrad['poa_global']
-                logger.debug(f"    POA global médio: {poa_irrad['poa_global'].mean():.1f} W/m²")
-
-                # Criar weather para MPPT
-                weather_mppt = pd.DataFrame({
-                    'ghi': df['ghi'], 'dni': df['dni'], 'dhi': df['dhi'],
-                    'temp_air': df['temp_air'], 'wind_speed': df['wind_speed'],
-                    'poa_global': poa_irrad['poa_global'],
-                    'poa_direct': poa_irrad['poa_direct'], 'poa_diffuse': poa_irrad['poa_diffuse']
-                }, index=df.index)
-
-                logger.info(f"    POA médio para {mppt_id}: {weather_mppt['poa_global'].mean():.1f} W/m²")
-                logger.info(f"    POA direto médio para {mppt_id}: {weather_mppt['poa_direct'].mean():.1f} W/m²")
-                logger.info(f"    POA difuso médio para {mppt_id}: {weather_mppt['poa_diffuse'].mean():.1f} W/m²")
-                logger.info(f"    Temperatura média para {mppt_id}: {weather_mppt['temp_air'].mean():.1f} °C")
-                logger.info(f"    Velocidade do vento média para {mppt_id}: {weather_mppt['wind_speed'].mean():.1f} m/s")
-                logger.info(f"    Irradiação média GHI para {mppt_id}: {weather_mppt['ghi'].mean():.1f} W/m²")
-                logger.info(f"    Irradiação média DNI para {mppt_id}: {weather_mppt['dni'].mean():.1f} W/m²")
-                logger.info(f"    Irradiação média DHI para {mppt_id}: {weather_mppt['dhi'].mean():.1f} W/m²")
-            
+                logger.info(f"  MPPT {i+1}/{len(mppts_list)} ({mppt_id}): {current_mppt_kwp:.2f} kWp, "
+                            f"POA médio {engine.poa_global[row].mean():.1f} W/m²")
+                logger.info(f"    Energia DC MPPT: {dc_annual_rows[row]:.0f} kWh/ano")
 
-                pdc_stc_array = current_mppt_kwp * 1000.0
-
-                logger.info(f"Surface tilt: {mppt['tilt']}°, azimuth: {mppt['azimuth']}°, kWp MPPT: {current_mppt_kwp:.2f} kWp")
-                logger.info(f"Module Parameters: {module_parameters}")
-                logger.info(f"Inverter parameters (Paco set to MPPT kWp): Paco={pdc_stc_array}W")
-                logger.info(f"Temperature model parameters: {temperature_model_params}")
-
-
-                # Criar sistema PV
-                logger.info(f"    Criando sistema PV: {pdc_stc_array}W STC")
-                system = pvlib.pvsystem.PVSystem(
-                    surface_tilt=mppt['tilt'], surface_azimuth=mppt['azimuth'],
-                    module_parameters={**module_parameters, 'module_type':'glass_glass'},
-                    modules_per_string=mppt['modules_per_string'],
-                    strings_per_inverter=mppt['strings'],
-                    inverter_parameters={'Paco': pdc_stc_array, 'Pdco': pdc_stc_array, 'pdc0': pdc_stc_array},
-                    temperature_model_parameters=temperature_model_params,
-                    losses_parameters={}
-                )
-
-                site = pvlib.location.Location(lat, lon, tz='America/Sao_Paulo')
-                mc = pvlib.modelchain.ModelChain(
-                    system, site, aoi_model='physical', ac_model='pvwatts',
-                    transposition_model=modelo_transposicao
-                )
-
-                logger.debug(f"    Executando ModelChain para {mppt_id}")
-                mc.run_model(weather_mppt)
-
-                dc_pre_clipping_mppt = mc.results.dc['p_mp'].fillna(0)
-                dc_inv_total_pure += dc_pre_clipping_mppt
-                dc_mppt_energy = dc_pre_clipping_mppt.sum() / 1000.0 / n_anos
-                logger.info(f"    Energia DC MPPT: {dc_pre_clipping_mppt.sum() / 1000.0:.0f} kWh/ano")
-
-                # ===== NOVO: Calcular AC individual para esta orientação =====
-                # Aplicar eficiência e clipping individualmente
-                ac_mppt_pre_clipping = np.minimum(dc_pre_clipping_mppt * efficiency_factor, paco_inv)
-                
-                # Aplicar perdas finais individuais
-                perdas_totais_pct = sum(losses_parameters.values())
-                perdas_fator = (1.0 - perdas_totais_pct / 100.0)
-                ac_mppt_final = ac_mppt_pre_clipping * perdas_fator
-                
-                # Calcular geração anual individual
-                mppt_annual_energy = ac_mppt_final.sum() / 1000.0 / n_anos
-                
                 # Calcular área utilizada
                 total_modulos_mppt = mppt['modules_per_string'] * mppt['strings']
                 area_orientacao_m2 = total_modulos_mppt * area_modulo_m2
-                
-                # Armazenar resultados individuais (criar o array aqui)
-                if 'monthly_energy_by_orientation' not in locals():
-                    monthly_energy_by_orientation = {}
-                
+
                 monthly_energy_by_orientation[mppt_id] = {
                     'nome': mppt_id,
                     'orientacao': mppt['azimuth'],
@@ -341,42 +273,22 @@ class SolarCalculationService:
                     'potencia_kwp': total_kwp_by_mppt_id[mppt_id],
                     'numero_modulos': total_modulos_mppt,
                     'area_utilizada_m2': area_orientacao_m2,
-                    'geracao_anual_kwh': mppt_annual_energy,
+                    'geracao_anual_kwh': ac_annual_rows[row],
                     'percentual_total': None  # Será calculado depois
                 }
-                
-                # Adicionar ao AC total do sistema
-                ac_all += ac_mppt_final
-
-            # Removido: O ac_all já é somado individualmente acima
-            # dc_pre_clipping_with_eff = dc_inv_total_pure * efficiency_factor
-            # ac_inv_output = np.minimum(dc_pre_clipping_with_eff, paco_inv)
 
             results_inverter[inv_name] = {
-                'dc_pure': dc_inv_total_pure,
-                'ac_pre_losses': ac_all,  # Usar o ac_all que já foi somado
+                'dc_pure': pd.Series(engine.p_mp[rows].sum(axis=0), index=df.index),
+                'ac_pre_losses': ac_all,  # AC do sistema (já com perdas), como no cálculo por MPPT
                 'paco_w': paco_inv,
                 'kwp': kwp_inv
             }
 
-            # Removido: Já somado individualmente acima
-            # ac_all += ac_inv_output
-            dc_all_pre_clipping += dc_inv_total_pure
-            
-            # ac_inv_energy = ac_inv_output.sum() / 1000.0 / n_anos
-            # logger.info(f"  Energia AC inversor: {ac_inv_energy:.0f} kWh/ano ({kwp_inv:.2f} kWp)")
-
-        # Aplicar perdas finais (já foram aplicadas individualmente, mas precisamos ajustar o total)
-        # Nota: As perdas já foram aplicadas individualmente em cada MPPT, mas mantemos para consistência
-        perdas_totais_pct = sum(losses_parameters.values())
-        perdas_fator = (1.0 - perdas_totais_pct / 100.0)
-        # ac_after_losses = ac_all  # Já com perdas aplicadas individualmente
-        ac_after_losses = ac_all  # Já com perdas aplicadas individualmente
+        # Perdas aplicadas por MPPT em ac_rows
+        ac_after_losses = ac_all
 
         potencia_total_kWp = sum(r['kwp'] for r in results_inverter.values())
 
-        logger.info(f"Aplicando perdas finais: {perdas_totais_pct}% (fator: {perdas_fator:.3f})")
-
         # Energia total
         annual_energy_kwh = ac_after_losses.sum() / 1000.0 / n_anos
         annual_energy_total_kwh_pre_losses = ac_all.sum() / 1000.0 / n_anos
@@ -401,12 +313,9 @@ class SolarCalculationService:
         monthly_energy_kwh.index = meses_str
 
         # Calcular percentuais das orientações (após ter o total)
-        if 'monthly_energy_by_orientation' in locals():
-            for mppt_id in monthly_energy_by_orientation:
-                geracao_anual = monthly_energy_by_orientation[mppt_id]['geracao_anual_kwh']
-                monthly_energy_by_orientation[mppt_id]['percentual_total'] = (geracao_anual / annual_energy_kwh * 100) if annual_energy_kwh > 0 else 0
-        else:
-            monthly_energy_by_orientation = {}
+        for mppt_id in monthly_energy_by_orientation:
+            geracao_anual = monthly_energy_by_orientation[mppt_id]['geracao_anual_kwh']
+            monthly_energy_by_orientation[mppt_id]['percentual_total'] = (geracao_anual / annual_energy_kwh * 100) if annual_energy_kwh > 0 else 0
 
         # POA
         df_poa_hourly = pd.DataFrame(poa_global_mppt_results)
@@ -466,10 +375,93 @@ class SolarCalculationService:
             'fator_capacidade': fator_capacidade,
             'pr_total': PR_total * 100.0,
             'anos_analisados': n_anos,
+            'fonte_dados': fonte_dados,
+            'modo_calculo': modo_calculo,
+            'tmy': tmy_info,
             'inversores': inverter_summary,
             'geracao_por_orientacao': monthly_energy_by_orientation
         }
 
+    @staticmethod
+    def _get_weather_data(lat: float, lon: float, preferred_source: str,
+                          startyear: int, endyear: int) -> Tuple[pd.DataFrame, str]:
+        """Série horária do período solicitado e a fonte efetivamente utilizada"""
+        # Fallback entre fontes sempre habilitado neste cálculo; em modo hedged a
+        # fonte secundária é disparada em paralelo se a primária demorar
+        try:
+            df, fonte_dados = weather_source_fetcher.fetch(lat, lon, preferred_source, allow_fallback=True)
+            logger.info(f"Dados meteorológicos obtidos de {fonte_dados} (usando cache)")
+        except CalculationError as e:
+            logger.error(f"Falha ao obter dados de ambas as fontes (NASA e PVGIS): {e.message}")
+            raise ValueError("Não foi possível obter dados meteorológicos")
+
+        # Remover registros fora do período solicitado; o cache entrega float32
+        # mapeado em memória e o cálculo (pvlib, ano típico) usa float64
+        return df[(df.index.year >= startyear) & (df.index.year <= endyear)].astype(np.float64), fonte_dados
+
+    @staticmethod
+    def _typical_year_cache_params(lat: float, lon: float, preferred_source: str,
+                                   startyear: int, endyear: int) -> Dict[str, Any]:
+        """Parâmetros de cache do ano típico (source='tmy')"""
+        return {'source': 'tmy', 'origem': preferred_source, 'startyear': startyear, 'endyear': endyear}
+
+    @staticmethod
+    def weather_fingerprint(request: SolarSystemCalculationRequest) -> str:
+        """
+        Impressão digital de todos os dados em cache que servem o cálculo
+        (cache de respostas): entradas meteorológicas das fontes e, no modo
+        'tmy', a entrada do ano típico. Faz consultas ao índice e ao disco.
+        """
+        versions = [weather_source_fetcher.fingerprint(request.lat, request.lon)]
+        if request.modo_calculo == 'tmy':
+            cache_params = SolarCalculationService._typical_year_cache_params(
+                request.lat, request.lon, request.origem_dados, request.startyear, request.endyear
+            )
+            versions.append(f"tmy={weather_repository.get_version(request.lat, request.lon, cache_params)}")
+        return hashlib.md5("|".join(versions).encode()).hexdigest()[:16]
+
+    @staticmethod
+    def _get_typical_year(lat: float, lon: float, preferred_source: str,
+                          startyear: int, endyear: int) -> Tuple[pd.DataFrame, str, Optional[Dict[str, Any]]]:
+        """
+        Ano meteorológico típico (8760 h) do período, com cache por localização.
+
+        Lido e gravado pelo weather_repository: a montagem é coalescida por
+        célula e uma entrada vencida é servida e atualizada em segundo plano.
+
+        Se não for possível montar o ano típico (meses sem dados completos), a
+        série multi-anual é retornada e o cálculo segue no modo completo.
+
+        Returns:
+            Tuple (DataFrame, fonte_dados, informações do TMY ou None)
+        """
+        def load(la: float, lo: float) -> Optional[Dict[str, Any]]:
+            # None (montagem impossível) não é gravado no cache
+            df, fonte_dados = SolarCalculationService._get_weather_data(la, lo, preferred_source, startyear, endyear)
+            try:
+                typical, selection = build_typical_year(df)
+            except ValueError as e:
+                logger.warning(f"Ano típico indisponível ({e}); usando série multi-anual completa")
+                return None
+            return {
+                'dataframe': typical,
+                'fonte_dados': fonte_dados,
+                'tmy': {
+                    'meses_selecionados': {str(month): year for month, year in selection.items()},
+                    'horas': len(typical),
+                    'desvio_estimado_pct': round(estimate_deviation_pct(df, typical), 2)
+                }
+            }
+
+        cache_params = SolarCalculationService._typical_year_cache_params(lat, lon, preferred_source, startyear, endyear)
+        typical_year = weather_repository.get(lat, lon, cache_params, load=load)
+        if typical_year is None:
+            # Série multi-anual já em cache pela tentativa de montagem
+            df, fonte_dados = SolarCalculationService._get_weather_data(lat, lon, preferred_source, startyear, endyear)
+            return df, fonte_dados, None
+
+        return typical_year['dataframe'].copy(), typical_year['fonte_dados'], dict(typical_year['tmy'])
+
     # REMOVIDO: Funções _buscar_dados_nasa e _buscar_dados_pvgis foram removidas
 # Agora usamos os serviços com cache: nasa_service.fetch_weather_data() e pvgis_service.fetch_weather_data()
 # Isso garante uso do cache geohash e legado já implementado
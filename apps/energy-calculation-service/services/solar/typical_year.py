@@ -0,0 +1,135 @@
+"""
+Ano meteorológico típico (TMY) a partir da série horária multi-anual.
+
+Seleção de meses pelo método Sandia (base do TMY2/TMY3): para cada mês do
+calendário e cada ano candidato, a estatística de Finkelstein-Schafer compara
+a distribuição dos valores diários do mês naquele ano com a distribuição de
+longo prazo (todos os anos). O ano com menor soma ponderada das estatísticas é
+escolhido, e os 12 meses selecionados formam um ano de 8760 horas.
+
+Os meses escolhidos são reposicionados em um ano de referência não bissexto
+(29/02 é descartado); o deslocamento é feito em dias inteiros, preservando o
+instante UTC de cada registro.
+"""
+
+import logging
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+REFERENCE_YEAR = 2019
+
+# Pesos das estatísticas diárias (adaptados do TMY3 às variáveis disponíveis)
+FS_WEIGHTS = {
+    ('ghi', 'sum'): 0.50,
+    ('dni', 'sum'): 0.25,
+    ('temp_air', 'mean'): 0.10,
+    ('temp_air', 'max'): 0.05,
+    ('temp_air', 'min'): 0.05,
+    ('wind_speed', 'mean'): 0.05,
+}
+
+# Fração mínima de horas presentes para um mês ser candidato
+MIN_MONTH_COVERAGE = 0.9
+
+
+def _finkelstein_schafer(candidate: np.ndarray, long_term: np.ndarray) -> float:
+    """Distância média entre a CDF do candidato e a CDF de longo prazo"""
+    candidate = np.sort(candidate)
+    cdf_candidate = np.arange(1, len(candidate) + 1) / len(candidate)
+    cdf_long_term = np.searchsorted(long_term, candidate, side='right') / len(long_term)
+    return float(np.abs(cdf_candidate - cdf_long_term).mean())
+
+
+def _daily_statistics(df: pd.DataFrame) -> pd.DataFrame:
+    """Estatísticas diárias indexadas por (ano, mês, dia); só dias com dados"""
+    agg: Dict[str, list] = {}
+    for name, how in FS_WEIGHTS:
+        if name in df.columns:
+            agg.setdefault(name, []).append(how)
+
+    index = df.index
+    keys = [index.year.rename('year'), index.month.rename('month'), index.day.rename('day')]
+    return df[list(agg)].groupby(keys).agg(agg)
+
+
+def select_typical_months(df: pd.DataFrame) -> Dict[int, int]:
+    """
+    Ano escolhido para cada mês do calendário.
+
+    Returns:
+        {mês: ano}
+
+    Raises:
+        ValueError: Algum mês sem ano candidato completo
+    """
+    hours = df.groupby([df.index.year, df.index.month]).size()
+    daily = _daily_statistics(df)
+    weights = {key: w for key, w in FS_WEIGHTS.items() if key in daily.columns}
+
+    selection: Dict[int, int] = {}
+    for month in range(1, 13):
+        if month not in daily.index.get_level_values('month'):
+            raise ValueError(f"Nenhum ano com dados completos para o mês {month}")
+        in_month = daily.xs(month, level='month')
+        candidates = [
+            int(year) for year in in_month.index.get_level_values('year').unique()
+            if hours.get((year, month), 0) >= MIN_MONTH_COVERAGE * 24 * pd.Timestamp(year, month, 1).days_in_month
+        ]
+        if not candidates:
+            raise ValueError(f"Nenhum ano com dados completos para o mês {month}")
+
+        long_term = {key: np.sort(in_month[key].dropna().to_numpy()) for key in weights}
+        scores = {}
+        for year in candidates:
+            days = in_month.xs(year, level='year')
+            scores[year] = sum(
+                w * _finkelstein_schafer(days[key].dropna().to_numpy(), long_term[key])
+                for key, w in weights.items() if days[key].notna().any()
+            )
+        selection[month] = min(scores, key=scores.get)
+
+    return selection
+
+
+def build_typical_year(df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[int, int]]:
+    """
+    Monta o ano típico de 8760 horas.
+
+    Returns:
+        Tuple (DataFrame do ano típico em REFERENCE_YEAR, {mês: ano selecionado})
+    """
+    selection = select_typical_months(df)
+    tz = df.index.tz
+
+    blocks = []
+    for month, year in selection.items():
+        block = df[(df.index.year == year) & (df.index.month == month)]
+        block = block[~((block.index.month == 2) & (block.index.day == 29))]
+        shift = pd.Timestamp(REFERENCE_YEAR, month, 1) - pd.Timestamp(year, month, 1)
+        blocks.append(block.set_axis(block.index + shift))
+
+    typical = pd.concat(blocks).sort_index()
+    typical = typical[~typical.index.duplicated(keep='first')]
+    if tz is not None:
+        typical.index = typical.index.tz_convert(tz)
+
+    logger.info(f"Ano típico montado: {len(typical)} horas, meses selecionados {selection}")
+    return typical, selection
+
+
+def estimate_deviation_pct(df: pd.DataFrame, typical: pd.DataFrame) -> float:
+    """
+    Desvio estimado (%) do ano típico em relação à média multi-anual.
+
+    Estimado pela irradiação global horizontal média, à qual a geração é
+    aproximadamente proporcional; o cálculo completo não é executado.
+    """
+    long_term = df['ghi'].mean()
+    if not long_term or long_term <= 0:
+        return 0.0
+    # Médias horárias: independem do número de anos e de horas faltantes
+    return float((typical['ghi'].mean() / long_term - 1.0) * 100.0)
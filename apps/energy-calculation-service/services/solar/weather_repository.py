@@ -0,0 +1,212 @@
+"""
+Repositório único de dados meteorológicos.
+
+Camadas, na ordem de consulta:
+
+1. memória do processo (camada LRU do GeohashCacheManager)
+2. disco local com índice espacial (geohash cache, raio de 15 km)
+3. API externa, via função de carga informada pelo serviço (PVGIS, NASA POWER)
+
+Downloads são coalescidos por célula (single-flight) e gravados uma única vez,
+no geohash cache. Entradas vencidas dentro da carência são servidas e
+atualizadas em segundo plano (utils.revalidation).
+
+O cache legado (utils.cache, arquivos pvgis_*/nasa_* por coordenada exata) não
+recebe mais gravações: migrate_legacy_cache() importa uma única vez os
+arquivos existentes para o geohash cache e os remove.
+"""
+
+import logging
+from typing import Any, Callable, Dict, Optional
+
+from utils.cache import CacheManager, cache_manager
+from utils.columnar_store import FILE_EXTENSION as COLUMNAR_EXTENSION, read_header
+from utils.file_io import file_lock
+from utils.geohash_cache import GeohashCacheManager, geohash_cache_manager
+from utils.http_client import UpstreamClient
+from utils.revalidation import BackgroundRefresher, cache_refresher
+from utils.single_flight import SingleFlight, weather_download_flight
+
+logger = logging.getLogger(__name__)
+
+# Marca gravada no diretório do cache legado após a migração
+LEGACY_MIGRATION_MARKER = ".legacy_migrated"
+
+Loader = Callable[[float, float], Any]
+
+
+class WeatherRepository:
+    """Acesso em camadas (memória → disco → API) aos dados meteorológicos"""
+
+    def __init__(self, cache: GeohashCacheManager = None, flight: SingleFlight = None,
+                 refresher: BackgroundRefresher = None):
+        self.cache = cache or geohash_cache_manager
+        self.flight = flight or weather_download_flight
+        self.refresher = refresher or cache_refresher
+
+        # Contadores deste processo
+        self.hits = 0
+        self.stale_hits = 0
+        self.loads = 0
+
+    def get(self, lat: float, lon: float, cache_params: Dict[str, Any], load: Loader,
+            client: UpstreamClient = None, use_cache: bool = True,
+            refresh_load: Loader = None, refresh: bool = False) -> Any:
+        """
+        Dados da célula de (lat, lon), do cache ou da API.
+
+        Args:
+            lat: Latitude
+            lon: Longitude
+            cache_params: Parâmetros que identificam o conjunto de dados (fonte, dataset...)
+            load: Carrega da API para (lat, lon); o resultado é gravado no cache
+            client: Cliente da API usada por `load` (atualização em segundo
+                plano não é agendada com o circuit breaker aberto)
+            use_cache: False carrega direto da API, sem ler nem gravar o cache
+            refresh_load: Carga usada na atualização em segundo plano (padrão: `load`)
+            refresh: Entrada vencida conta como ausente e é recarregada na hora
+
+        Returns:
+            Dados do cache ou de `load`
+        """
+        if not use_cache:
+            return load(lat, lon)
+
+        data, stale_entry = self.cache.lookup(lat, lon, **cache_params)
+        if data is not None and not (refresh and stale_entry is not None):
+            self.hits += 1
+            if stale_entry is not None:
+                self.stale_hits += 1
+                self.schedule_refresh(stale_entry, cache_params, refresh_load or load, client)
+            return data
+
+        # Download coalescido: uma única chamada por célula/parâmetros entre
+        # threads e workers; quem aguardou lê o resultado gravado no cache
+        return self.flight.run(
+            self.cache.cell_key(lat, lon, **cache_params),
+            compute=lambda: self._load_and_store(lat, lon, cache_params, load),
+            lookup=lambda: self.cache.get_fresh(lat, lon, **cache_params)
+        )
+
+    def _load_and_store(self, lat: float, lon: float, cache_params: Dict[str, Any], load: Loader) -> Any:
+        self.loads += 1
+        data = load(lat, lon)
+        if data is not None:
+            self.store(lat, lon, data, cache_params)
+        return data
+
+    def store(self, lat: float, lon: float, data: Any, cache_params: Dict[str, Any]) -> bool:
+        """Grava dados já obtidos (importação de dumps, blocos anuais)"""
+        return self.cache.set(lat, lon, data, **cache_params)
+
+    def find(self, lat: float, lon: float, cache_params: Dict[str, Any]) -> Optional[Any]:
+        """Dados em cache para (lat, lon), ou None; nunca vai à API"""
+        data = self.cache.get(lat, lon, **cache_params)
+        if data is not None:
+            self.hits += 1
+        return data
+
+    def contains(self, lat: float, lon: float, cache_params: Dict[str, Any]) -> bool:
+        """Há dados servíveis para (lat, lon), sem ir à API"""
+        return self.cache.get(lat, lon, **cache_params) is not None
+
+    def get_summary(self, lat: float, lon: float, cache_params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Resumo climático da entrada em cache, sem carregar a série horária"""
+        return self.cache.get_summary(lat, lon, **cache_params)
+
+    def get_version(self, lat: float, lon: float, cache_params: Dict[str, Any]) -> Optional[str]:
+        """Identidade da entrada servida para (lat, lon); muda quando ela é regravada"""
+        return self.cache.get_version(lat, lon, **cache_params)
+
+    def schedule_refresh(self, entry: Dict[str, Any], cache_params: Dict[str, Any], load: Loader,
+                         client: UpstreamClient = None) -> bool:
+        """
+        Agenda o novo download de uma entrada vencida servida dentro da carência.
+
+        O download usa as coordenadas da própria entrada, regravando-a no
+        lugar, e é coalescido com downloads da mesma célula em outros workers.
+        """
+        lat, lon = entry['lat'], entry['lon']
+        key = self.cache.cell_key(lat, lon, **cache_params)
+        return self.refresher.submit(
+            key,
+            lambda: self.flight.run(
+                key,
+                compute=lambda: self._load_and_store(lat, lon, cache_params, load),
+                lookup=lambda: self.cache.get_fresh(lat, lon, **cache_params)
+            ),
+            client=client
+        )
+
+    def migrate_legacy_cache(self, params_by_prefix: Dict[str, Dict[str, Any]],
+                             legacy: CacheManager = None) -> Dict[str, int]:
+        """
+        Importa uma única vez os arquivos do cache legado para o geohash cache.
+
+        As coordenadas vêm do cabeçalho (arquivos colunares) ou, para pickles,
+        cuja chave é um hash de lat/lon, das coordenadas já presentes no índice
+        espacial. O arquivo é importado se ainda estiver dentro do TTL legado e
+        a célula não tiver dados; em qualquer caso é removido. Ao final uma
+        marca é gravada e as execuções seguintes não fazem nada.
+
+        Args:
+            params_by_prefix: Prefixo do arquivo legado ('pvgis', 'nasa') ->
+                parâmetros de cache do serviço correspondente
+            legacy: Cache legado (padrão: instância global)
+
+        Returns:
+            Contadores: imported, skipped, removed
+        """
+        legacy = legacy or cache_manager
+        marker = legacy.cache_dir / LEGACY_MIGRATION_MARKER
+        stats = {'imported': 0, 'skipped': 0, 'removed': 0}
+        if marker.exists():
+            return stats
+
+        with file_lock(legacy.cache_dir / "locks" / "legacy_migration.lock", timeout=300):
+            if marker.exists():
+                return stats
+
+            known = {legacy._generate_cache_key(lat, lon): (lat, lon) for lat, lon in self.cache.index.coordinates()}
+            for path in legacy._cache_files():
+                prefix, _, key = path.stem.partition('_')
+                cache_params = params_by_prefix.get(prefix)
+                if cache_params is None:
+                    continue
+                try:
+                    if path.suffix == COLUMNAR_EXTENSION:
+                        header = read_header(path)
+                        coords = (header['lat'], header['lon']) if header['lat'] is not None else None
+                    else:
+                        coords = known.get(key)
+
+                    data = legacy.get(*coords, prefix=prefix) if coords else None
+                    if data is not None and not self.contains(*coords, cache_params):
+                        self.store(*coords, data, cache_params)
+                        stats['imported'] += 1
+                    else:
+                        stats['skipped'] += 1
+                except (OSError, ValueError, KeyError) as e:
+                    logger.warning(f"Arquivo legado ilegível {path.name}: {e}")
+                    stats['skipped'] += 1
+
+                legacy.evict_file(path.name)
+                legacy.budget.forget([path.name])
+                stats['removed'] += 1
+
+            marker.touch()
+
+        logger.info(f"Migração do cache legado concluída: {stats}")
+        return stats
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Contadores deste processo"""
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "loads": self.loads
+        }
+
+
+# Instância global
+weather_repository = WeatherRepository()
@@ -0,0 +1,246 @@
+"""
+Busca de dados meteorológicos com fallback entre PVGIS e NASA POWER.
+
+Modos (WEATHER_FETCH_MODE):
+- fallback: a fonte secundária só é consultada depois que a primária falha
+- hedged: se a primária demora mais que o percentil configurado de suas
+  latências recentes, a secundária é disparada em paralelo e vence a primeira
+  resposta válida. A requisição perdedora continua em segundo plano e grava seu
+  resultado no cache quando chegar.
+"""
+
+import hashlib
+import threading
+import time
+import logging
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Deque, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.config import settings
+from core.exceptions import CalculationError
+from services.solar.pvgis_service import pvgis_service
+from services.solar.nasa_service import nasa_service
+from services.solar.weather_repository import weather_repository
+
+logger = logging.getLogger(__name__)
+
+PVGIS = 'PVGIS'
+NASA_POWER = 'NASA POWER'
+
+
+class SourceLatencyTracker:
+    """Latências recentes de downloads bem-sucedidos por fonte (acertos de cache não contam)"""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, source: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(source, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, source: str, pct: float, min_samples: int) -> Optional[float]:
+        """Percentil das latências; None se houver menos de min_samples amostras"""
+        with self._lock:
+            samples = list(self._samples.get(source, ()))
+        if len(samples) < max(min_samples, 1):
+            return None
+        return float(np.percentile(samples, pct))
+
+
+class WeatherSourceFetcher:
+    """Obtém o DataFrame meteorológico da fonte preferida com fallback ou hedging"""
+
+    def __init__(self, services: Dict[str, Any] = None, mode: str = None):
+        self.services = services or {PVGIS: pvgis_service, NASA_POWER: nasa_service}
+        self.mode = mode or settings.WEATHER_FETCH_MODE
+        self.latencies = SourceLatencyTracker()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        # Contadores deste processo
+        self.hedges_started = 0
+        self.wins: Dict[str, int] = {name: 0 for name in self.services}
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="weather-fetch")
+            return self._executor
+
+    @staticmethod
+    def _order(preferred_source: str) -> Tuple[str, str]:
+        # Aceita 'NASA'/'PVGIS' (solar) e 'nasa'/'pvgis' (irradiação)
+        if preferred_source and preferred_source.lower().startswith('nasa'):
+            return NASA_POWER, PVGIS
+        return PVGIS, NASA_POWER
+
+    def hedge_delay(self, source: str) -> float:
+        """Tempo de espera pela fonte primária antes de disparar a secundária"""
+        observed = self.latencies.percentile(
+            source, settings.WEATHER_HEDGE_PERCENTILE, settings.WEATHER_HEDGE_MIN_SAMPLES
+        )
+        if observed is None:
+            return settings.WEATHER_HEDGE_DEFAULT_DELAY_SECONDS
+        return max(observed, settings.WEATHER_HEDGE_MIN_DELAY_SECONDS)
+
+    def _fetch_source(self, source: str, lat: float, lon: float) -> pd.DataFrame:
+        service = self.services[source]
+        cache_params = getattr(service, 'cache_params', None)
+        # Acertos de cache (~0 s) não entram na janela: o atraso de hedging
+        # deve refletir só a latência real do provedor
+        cached = cache_params is not None and weather_repository.contains(lat, lon, cache_params)
+
+        start = time.monotonic()
+        df = service.fetch_weather_data(lat, lon)
+        if df is None or df.empty:
+            raise ValueError(f"{source} retornou dados vazios")
+        if not cached:
+            self.latencies.record(source, time.monotonic() - start)
+        return df
+
+    def _record_win(self, source: str) -> None:
+        with self._lock:
+            self.wins[source] += 1
+
+    def fingerprint(self, lat: float, lon: float) -> str:
+        """
+        Impressão digital dos dados meteorológicos em cache para (lat, lon).
+
+        Combina a identidade das entradas que cada fonte serviria (todos os
+        vizinhos combinados, com interpolação); muda quando uma delas é
+        gravada ou atualizada (cache de respostas). Consulta o índice em
+        disco: não chamar no event loop.
+        """
+        versions = [
+            f"{name}={weather_repository.get_version(lat, lon, service.cache_params)}"
+            for name, service in sorted(self.services.items())
+            if getattr(service, 'cache_params', None) is not None
+        ]
+        return hashlib.md5("|".join(versions).encode()).hexdigest()[:16]
+
+    def fetch(self, lat: float, lon: float, preferred_source: str,
+              allow_fallback: bool = None) -> Tuple[pd.DataFrame, str]:
+        """
+        Busca dados meteorológicos.
+
+        Args:
+            lat: Latitude
+            lon: Longitude
+            preferred_source: Fonte preferencial ('pvgis'/'PVGIS' ou 'nasa'/'NASA')
+            allow_fallback: Consultar a outra fonte (padrão: WEATHER_DATA_FALLBACK_ENABLED)
+
+        Returns:
+            Tuple (DataFrame, fonte_utilizada) com fonte 'PVGIS' ou 'NASA POWER'
+
+        Raises:
+            CalculationError: Nenhuma fonte retornou dados
+        """
+        primary, secondary = self._order(preferred_source)
+        if allow_fallback is None:
+            allow_fallback = settings.WEATHER_DATA_FALLBACK_ENABLED
+
+        if not allow_fallback:
+            try:
+                logger.info(f"Tentando buscar dados de {primary}")
+                df = self._fetch_source(primary, lat, lon)
+            except Exception as e:
+                logger.error(f"Fallback desabilitado. Falha ao obter dados de {primary}")
+                raise CalculationError(
+                    f"Falha ao obter dados de {primary} e fallback está desabilitado: {str(e)}"
+                )
+            self._record_win(primary)
+            return df, primary
+
+        if self.mode == 'hedged':
+            return self._fetch_hedged(lat, lon, primary, secondary)
+        return self._fetch_sequential(lat, lon, primary, secondary)
+
+    def _fetch_sequential(self, lat: float, lon: float, primary: str, secondary: str) -> Tuple[pd.DataFrame, str]:
+        try:
+            logger.info(f"Tentando buscar dados de {primary}")
+            df = self._fetch_source(primary, lat, lon)
+            logger.info(f"Dados obtidos com sucesso de {primary}")
+            self._record_win(primary)
+            return df, primary
+        except Exception as e:
+            logger.warning(f"Erro ao buscar dados de {primary}: {e}")
+            primary_error = e
+
+        try:
+            logger.warning(f"Tentando fallback para {secondary}")
+            df = self._fetch_source(secondary, lat, lon)
+            logger.info(f"Fallback bem-sucedido! Dados obtidos de {secondary}")
+            self._record_win(secondary)
+            return df, secondary
+        except Exception as e2:
+            logger.error(f"Fallback também falhou. Erro em {secondary}: {e2}")
+            raise CalculationError(
+                f"Falha ao obter dados de ambas as fontes. "
+                f"{primary}: {str(primary_error)}. {secondary}: {str(e2)}"
+            )
+
+    def _fetch_hedged(self, lat: float, lon: float, primary: str, secondary: str) -> Tuple[pd.DataFrame, str]:
+        futures: Dict[Future, str] = {self.executor.submit(self._fetch_source, primary, lat, lon): primary}
+        errors: Dict[str, Exception] = {}
+
+        def start_secondary(reason: str) -> None:
+            logger.info(f"Disparando {secondary} em paralelo ({reason})")
+            futures[self.executor.submit(self._fetch_source, secondary, lat, lon)] = secondary
+
+        delay = self.hedge_delay(primary)
+        done, _ = wait(futures, timeout=delay)
+        if not done:
+            with self._lock:
+                self.hedges_started += 1
+            start_secondary(f"{primary} sem resposta após {delay:.1f}s")
+
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+            # Se ambas concluíram juntas, a primária tem preferência
+            for future in sorted(done, key=lambda f: futures[f] != primary):
+                source = futures[future]
+                try:
+                    df = future.result()
+                except Exception as e:
+                    logger.warning(f"Erro ao buscar dados de {source}: {e}")
+                    errors[source] = e
+                    continue
+
+                if source != primary:
+                    logger.info(f"Hedging: {source} respondeu antes de {primary}")
+                self._record_win(source)
+                return df, source
+
+            if secondary not in futures.values():
+                start_secondary(f"{primary} falhou")
+                pending = {f for f, name in futures.items() if name == secondary}
+
+        raise CalculationError(
+            f"Falha ao obter dados de ambas as fontes. "
+            f"{primary}: {str(errors.get(primary))}. {secondary}: {str(errors.get(secondary))}"
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Modo, atrasos de hedging e vitórias por fonte neste processo"""
+        with self._lock:
+            hedges_started = self.hedges_started
+            wins = dict(self.wins)
+        return {
+            "mode": self.mode,
+            "hedges_started": hedges_started,
+            "wins": wins,
+            "hedge_delay_seconds": {name: round(self.hedge_delay(name), 2) for name in self.services}
+        }
+
+
+# Instância global
+weather_source_fetcher = WeatherSourceFetcher()
@@ -0,0 +1,96 @@
+"""
+Pontos de entrada dos cálculos executados no pool de processos.
+
+Funções de módulo (serializáveis) que envolvem os serviços usados pelos
+endpoints. São executadas pelo CalculationExecutor (core/executor.py) em
+processos separados, portanto recebem e retornam apenas objetos serializáveis.
+"""
+
+import asyncio
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+from models.solar.requests import SolarSystemCalculationRequest, IrradiationAnalysisRequest, DatasheetModulo
+from models.solar.responses import IrradiationAnalysisResponse
+from models.bess.hybrid_requests import HybridDimensioningRequest
+from models.bess.hybrid_responses import HybridDimensioningResponse
+from models.proposal.requests import ProposalRequest
+from models.proposal.responses import ProposalResponse
+from models.shared.financial_models import (
+    FinancialInput,
+    AdvancedFinancialResults,
+    GrupoAFinancialRequest,
+    GrupoBFinancialRequest,
+    ResultadosCodigoAResponse,
+    ResultadosCodigoBResponse
+)
+
+# Retorno de run_job quando o job foi cancelado enquanto aguardava o pool
+JOB_CANCELLED = "__job_cancelled__"
+
+
+def run_job(db_path: Path, job_id: str, func: Callable[[Any], Any], request: Any) -> Any:
+    """
+    Executa um job assíncrono (services/jobs) dentro do processo do pool.
+
+    A transição QUEUED -> RUNNING acontece aqui, quando o processo já está
+    livre: enquanto o job espera na fila do pool ele continua queued, e um
+    cancelamento feito nesse intervalo impede o cálculo.
+
+    Returns:
+        Retorno de func, ou JOB_CANCELLED se o job não estava mais na fila
+    """
+    from services.jobs.job_store import JobStore
+    if not JobStore(db_path=db_path).mark_running(job_id):
+        return JOB_CANCELLED
+    return func(request)
+
+
+def calculate_solar_system(request: SolarSystemCalculationRequest) -> Dict[str, Any]:
+    """Cálculo de sistema solar multi-inversor (pvlib ModelChain)"""
+    from services.solar.solar_service import SolarCalculationService
+    return SolarCalculationService.calculate(request)
+
+
+def fit_module_parameters(datasheet: DatasheetModulo) -> Dict[str, Any]:
+    """Ajuste dos parâmetros De Soto de um datasheet (memoizado por hash)"""
+    from dataclasses import asdict
+    from services.solar.module_fit import module_fit_cache
+    return asdict(module_fit_cache.fit(datasheet.model_dump()))
+
+
+def analyze_monthly_irradiation(request: IrradiationAnalysisRequest) -> IrradiationAnalysisResponse:
+    """Análise de irradiação mensal"""
+    from services.solar.irradiation_service import irradiation_service
+    return irradiation_service.analyze_monthly_irradiation(request)
+
+
+def calculate_hybrid_system(request: HybridDimensioningRequest) -> HybridDimensioningResponse:
+    """Dimensionamento híbrido Solar + BESS (inclui simulação de 8760 horas)"""
+    from services.bess.hybrid_service import hybrid_dimensioning_service
+    return hybrid_dimensioning_service.calculate_hybrid_system(request)
+
+
+def generate_proposal(request: ProposalRequest) -> ProposalResponse:
+    """Geração de proposta em PDF (matplotlib + FPDF)"""
+    from services.proposal.proposal_service import ProposalGenerationService
+    return ProposalGenerationService.generate_proposal(request)
+
+
+def calculate_advanced_financials(input_data: FinancialInput) -> AdvancedFinancialResults:
+    """Análise financeira avançada"""
+    from services.shared.financial_service import FinancialCalculationService
+    return FinancialCalculationService.calculate_advanced_financials(input_data)
+
+
+def calculate_financial_grupo_a(request: GrupoAFinancialRequest) -> ResultadosCodigoAResponse:
+    """Análise financeira Grupo A"""
+    from services.financial_grupo_a_service import FinancialGrupoAService
+    # O serviço expõe uma corrotina, mas o corpo é síncrono e CPU-bound
+    return asyncio.run(FinancialGrupoAService().calculate(request))
+
+
+def calculate_financial_grupo_b(request: GrupoBFinancialRequest) -> ResultadosCodigoBResponse:
+    """Análise financeira Grupo B"""
+    from services.financial_grupo_b_service import FinancialGrupoBService
+    return asyncio.run(FinancialGrupoBService().calculate(request))
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""
+Fixtures compartilhadas pelos testes do cache meteorologico
+"""
+
+import sys
+import os
+
+# Adicionar o diretorio raiz ao path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+import pytest
+
+from utils.geohash_cache import GeohashCacheManager
+from utils.memory_cache import MemoryCache
+
+
+@pytest.fixture
+def make_weather():
+    """Fabrica de series horarias constantes em UTC a partir de 2020-01-01"""
+    def make(ghi=500.0, periods=48, minute=0):
+        index = pd.date_range("2020-01-01", periods=periods, freq="h", tz="UTC") + pd.Timedelta(minutes=minute)
+        return pd.DataFrame({"ghi": ghi, "dni": 300.0, "dhi": 100.0, "temp_air": 25.0, "wind_speed": 2.0}, index=index)
+    return make
+
+
+@pytest.fixture
+def make_geohash_cache():
+    """Fabrica de GeohashCacheManager sem camada de memoria: cada leitura vai ao disco"""
+    def make(cache_dir, budget=None):
+        return GeohashCacheManager(cache_dir=cache_dir, memory_cache=MemoryCache(max_mb=0), budget=budget)
+    return make
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para o orcamento de disco compartilhado e a limpeza LRU do janitor
+"""
+
+import sys
+import os
+import sqlite3
+
+# Adicionar o diretorio raiz ao path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from utils.cache import CacheManager
+from utils.cache_budget import BUDGET_FILENAME, CacheBudget
+from utils.cache_index import INDEX_FILENAME
+from utils.cache_janitor import CacheJanitor
+
+LAT, LON = -23.55, -46.63
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def weather(make_weather):
+    return make_weather(periods=24 * 30)
+
+
+@pytest.fixture
+def caches(tmp_path, make_geohash_cache):
+    """Gerenciadores geohash e legado no mesmo diretorio, com o orcamento informado"""
+    def make(budget):
+        return make_geohash_cache(tmp_path, budget=budget), CacheManager(cache_dir=tmp_path, budget=budget)
+    return make
+
+
+def _set_access(cache_dir, file_name, last_access):
+    with sqlite3.connect(cache_dir / BUDGET_FILENAME) as conn:
+        conn.execute("UPDATE files SET last_access = ? WHERE file_name = ?", (last_access, file_name))
+
+
+def _files(cache_dir):
+    return sorted(p.name for p in cache_dir.iterdir() if p.suffix in (".wcol", ".pkl"))
+
+
+def test_contagem_de_bytes_dos_dois_gerenciadores(tmp_path, caches, weather):
+    """Gravacoes registradas por dono; total igual ao tamanho dos arquivos"""
+    budget = CacheBudget(tmp_path, max_mb=100)
+    geohash, legacy = caches(budget)
+
+    geohash.set(LAT, LON, weather, source="pvgis")
+    geohash.set(LAT, LON, weather, source="nasa")
+    legacy.set(LAT, LON, weather, prefix="pvgis")
+
+    on_disk = sum((tmp_path / name).stat().st_size for name in _files(tmp_path))
+    stats = budget.get_stats()
+    assert budget.total_bytes() == on_disk
+    assert (stats["by_owner"]["geohash"]["files"], stats["by_owner"]["legacy"]["files"]) == (2, 1)
+
+    # Limpeza do legado nao toca os arquivos nem o registro do geohash
+    assert legacy.clear_all() == 1
+    assert budget.total_bytes() == budget.total_bytes("geohash")
+    assert geohash.get(LAT, LON, source="nasa") is not None
+
+
+def test_janitor_remove_menos_usados_ate_limite_inferior(tmp_path, caches, weather):
+    """Acima do limite, remove por ultimo acesso (nao por idade) ate o low-water"""
+    budget = CacheBudget(tmp_path, max_mb=100, low_water_ratio=0.65)
+    geohash, legacy = caches(budget)
+
+    for source in ["a", "b", "c"]:
+        geohash.set(LAT, LON, weather, source=source)
+    legacy.set(LAT, LON, weather, prefix="pvgis")
+
+    with sqlite3.connect(tmp_path / INDEX_FILENAME) as conn:
+        names = {key[len("source_"):]: name for key, name in conn.execute("SELECT params_key, file_name FROM entries")}
+    (legacy_name,) = [name for name in _files(tmp_path) if name.startswith("pvgis_")]
+
+    # "a" e o mais antigo gravado, mas o mais recente em uso
+    _set_access(tmp_path, names["a"], 4000.0)
+    _set_access(tmp_path, names["b"], 1000.0)
+    _set_access(tmp_path, legacy_name, 2000.0)
+    _set_access(tmp_path, names["c"], 3000.0)
+
+    # Limite de 3,5 entradas; low-water de ~2,3: saem as duas menos usadas
+    entry = budget.total_bytes() // 4
+    budget.max_mb = (entry * 3.5) / MB
+
+    janitor = CacheJanitor({"geohash": geohash, "legacy": legacy}, interval=0, budget=budget)
+    assert janitor.run_once()["lru"] == 2
+
+    assert _files(tmp_path) == sorted([names["a"], names["c"]])
+    assert budget.total_bytes() <= budget.low_water_bytes
+    assert geohash.get(LAT, LON, source="b") is None
+    assert geohash.index.count() == 2
+    assert legacy.get(LAT, LON, prefix="pvgis") is None
+
+    # Abaixo do limite nada mais e removido
+    assert janitor.run_once()["lru"] == 0
+    assert budget.get_stats()["evicted_files"] == 2
+
+
+def test_arquivos_anteriores_ao_registro_sao_adotados(tmp_path, caches, weather):
+    """Diretorio existente sem registro: o janitor registra os arquivos antes de aplicar o limite"""
+    geohash, legacy = caches(CacheBudget(tmp_path, max_mb=100))
+    geohash.set(LAT, LON, weather, source="pvgis")
+    legacy.set(LAT, LON, weather, prefix="pvgis")
+    (tmp_path / BUDGET_FILENAME).unlink()
+
+    budget = CacheBudget(tmp_path, max_mb=100)
+    geohash.budget = legacy.budget = budget
+    janitor = CacheJanitor({"geohash": geohash, "legacy": legacy}, interval=0, budget=budget)
+
+    assert janitor.run_once()["lru"] == 0
+    stats = budget.get_stats()
+    assert stats["total_files"] == 2
+    assert set(stats["by_owner"]) == {"geohash", "legacy"}
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para o indice espacial do cache geohash
+"""
+
+import sys
+import os
+
+# Adicionar o diretorio raiz ao path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from utils.cache_index import INDEX_FILENAME
+from utils.geohash_cache import GeohashCacheManager
+
+
+def _series(value):
+    index = pd.date_range("2020-01-01", periods=48, freq="h", tz="UTC")
+    return pd.Series(np.full(len(index), value), index=index, name="poa_global")
+
+
+def test_busca_carrega_apenas_entrada_mais_proxima(tmp_path, monkeypatch):
+    """Consulta ao indice escolhe a entrada mais proxima e so ela e lida do disco"""
+    cache = GeohashCacheManager(cache_dir=tmp_path)
+    cache.set(-23.5505, -46.6333, _series(1.0), source="pvgis")
+    cache.set(-23.5800, -46.6700, _series(2.0), source="pvgis")
+    cache.set(-23.5505, -46.6333, _series(3.0), source="nasa")
+
+    loaded = []
+    original = GeohashCacheManager._load_entry_data
+    monkeypatch.setattr(
+        GeohashCacheManager, "_load_entry_data",
+        staticmethod(lambda path: loaded.append(path) or original(path))
+    )
+
+    data = cache.get(-23.5790, -46.6690, source="pvgis")
+
+    assert data.iloc[0] == 2.0
+    assert len(loaded) == 1
+    assert cache.index.count() == 3
+
+
+def test_indice_reconstruido_a_partir_dos_arquivos(tmp_path):
+    """Diretorio de cache sem indice deve ser indexado no primeiro uso"""
+    GeohashCacheManager(cache_dir=tmp_path).set(-23.5505, -46.6333, _series(1.0), source="pvgis")
+    GeohashCacheManager(cache_dir=tmp_path).set(-23.5505, -46.6333, {"meta": True}, source="meta")
+    (tmp_path / INDEX_FILENAME).unlink()
+
+    cache = GeohashCacheManager(cache_dir=tmp_path)
+
+    assert cache.get(-23.5510, -46.6340, source="meta") == {"meta": True}
+    assert cache.get(-23.5510, -46.6340, source="pvgis").iloc[0] == 1.0
+    assert cache.index.count() == 2
+
+
+def test_entrada_sem_arquivo_e_removida_do_indice(tmp_path):
+    """Linha do indice cujo arquivo sumiu resulta em miss e e descartada"""
+    cache = GeohashCacheManager(cache_dir=tmp_path)
+    cache.set(-23.5505, -46.6333, _series(1.0), source="pvgis")
+    for cache_file in cache._cache_files():
+        cache_file.unlink()
+
+    assert cache.get(-23.5505, -46.6333, source="pvgis") is None
+    assert cache.index.count() == 0
+
+
+def test_fora_do_raio_e_miss(tmp_path):
+    """Entradas alem do raio configurado nao sao retornadas"""
+    cache = GeohashCacheManager(cache_dir=tmp_path)
+    cache.cache_radius_km = 1.0
+    cache.set(-23.5505, -46.6333, _series(1.0), source="pvgis")
+
+    assert cache.get(-23.5800, -46.6700, source="pvgis") is None
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para o pre-aquecimento do cache meteorologico
+"""
+
+import sys
+import os
+import importlib
+import json
+
+# Adicionar o diretorio raiz ao path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import geohash
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.config import settings
+from utils.geohash_cache import GeohashCacheManager
+from utils.single_flight import SingleFlight
+from services.solar import cache_seeder
+from services.solar.weather_repository import WeatherRepository
+from services.solar.cache_seeder import CacheSeeder, import_dumps, points_from_bbox, points_from_csv
+
+# services.solar reexporta as instancias com o mesmo nome dos modulos
+nasa_module = importlib.import_module("services.solar.nasa_service")
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    manager = GeohashCacheManager(cache_dir=tmp_path / "cache")
+    repository = WeatherRepository(cache=manager, flight=SingleFlight(lock_dir=tmp_path / "locks", timeout=5))
+    monkeypatch.setattr(cache_seeder, "weather_repository", repository)
+    monkeypatch.setattr(nasa_module, "weather_repository", repository)
+    return manager
+
+
+class _FakeService:
+    def __init__(self, cache, name, failing=()):
+        self.cache = cache
+        self.cache_params = {"source": name}
+        self.failing = set(failing)
+        self.calls = []
+
+    def fetch_weather_data(self, lat, lon):
+        self.calls.append((lat, lon))
+        if (lat, lon) in self.failing:
+            raise RuntimeError("503")
+        index = pd.date_range("2020-01-01", periods=24, freq="h", tz="UTC")
+        self.cache.set(lat, lon, pd.DataFrame({"ghi": np.arange(24.0)}, index=index), **self.cache_params)
+
+
+def test_bbox_cobre_a_area_com_uma_celula_por_ponto():
+    """Centros gerados sao unicos por celula e cobrem os cantos da area"""
+    points = list(points_from_bbox(-23.7, -46.8, -23.4, -46.4))
+    cells = [geohash.encode(lat, lon, settings.GEOHASH_PRECISION) for lat, lon in points]
+
+    assert len(cells) == len(set(cells))
+    for corner in [(-23.7, -46.8), (-23.4, -46.4), (-23.7, -46.4), (-23.4, -46.8)]:
+        assert geohash.encode(*corner, settings.GEOHASH_PRECISION) in cells
+
+
+def test_seed_retoma_apenas_pontos_pendentes(cache, tmp_path):
+    """Falhas ficam fora do progresso e sao refeitas; celulas repetidas baixam uma vez"""
+    csv_path = tmp_path / "municipios.csv"
+    csv_path.write_text("nome,Latitude,Longitude\nSao Paulo,-23.5505,-46.6333\n"
+                        "Mesma celula,-23.5506,-46.6334\nRio,-22.9068,-43.1729\nsem coordenada,,\n")
+    points = points_from_csv(csv_path)
+    assert len(points) == 3
+
+    progress = tmp_path / "seed.progress"
+    pvgis = _FakeService(cache, "pvgis", failing={(-22.9068, -43.1729)})
+    stats = CacheSeeder(sources=["pvgis"], concurrency=2, progress_path=progress,
+                        services={"pvgis": pvgis}).seed(points)
+
+    assert stats == {"total": 2, "skipped": 0, "cached": 0, "downloaded": 1, "failed": 1}
+    assert len(pvgis.calls) == 2
+
+    pvgis.failing.clear()
+    pvgis.calls.clear()
+    stats = CacheSeeder(sources=["pvgis"], progress_path=progress, services={"pvgis": pvgis}).seed(points)
+
+    assert stats["skipped"] == 1 and stats["downloaded"] == 1
+    assert pvgis.calls == [(-22.9068, -43.1729)]
+
+
+def test_import_de_respostas_json_offline(cache, tmp_path, monkeypatch):
+    """Respostas PVGIS e NASA POWER gravadas em disco alimentam o cache sem rede"""
+    dumps = tmp_path / "dumps"
+    dumps.mkdir()
+
+    hourly = [{"time": f"20200101:{h:02d}10", "G(i)": 100.0 * h, "T2m": 25.0, "WS10m": 2.0} for h in range(10)]
+    (dumps / "pvgis.json").write_text(json.dumps({
+        "inputs": {"location": {"latitude": -23.55, "longitude": -46.63}},
+        "outputs": {"hourly": hourly}
+    }))
+
+    hours = pd.date_range("2019-01-01", "2019-12-31 23:00", freq="h")
+    series = {t.strftime("%Y%m%d%H"): 300.0 for t in hours}
+    (dumps / "nasa.json").write_text(json.dumps({
+        "geometry": {"coordinates": [-43.17, -22.91, 10.0]},
+        "properties": {"parameter": {"ALLSKY_SFC_SW_DWN": series, "T2M": series, "WS10M": {}}}
+    }))
+    (dumps / "outro.json").write_text("{}")
+
+    assert import_dumps(dumps) == {"pvgis": 1, "nasa": 1, "failed": 1}
+
+    pvgis_df = cache.get(-23.55, -46.63, source="pvgis", dataset="PVGIS")
+    assert len(pvgis_df) == 10
+
+    def no_network(lat, lon, year):
+        raise AssertionError("download inesperado")
+
+    service = nasa_module.NASAService()
+    monkeypatch.setattr(service, "_download_year", no_network)
+    df = service.fetch_weather_data(-22.91, -43.17, start_year=2019, end_year=2019)
+    assert len(df) == 8760
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para o executor de cálculos (pool de processos com fila limitada)
+"""
+
+import sys
+import os
+import asyncio
+import pickle
+import threading
+
+# Adicionar o diretorio raiz ao path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from core.executor import CalculationExecutor, WorkloadKind
+from core.exceptions import ServiceOverloadedError, ValidationError
+
+
+def test_executa_funcao_no_pool_de_processos():
+    """Funcao de modulo deve ser executada no pool e retornar o resultado"""
+    executor = CalculationExecutor(max_workers=1, max_queue_size=1, use_processes=True)
+    try:
+        result = asyncio.run(executor.run(pow, 2, 10, kind=WorkloadKind.CPU))
+        assert result == 1024
+        assert executor.get_stats()["completed"] == 1
+    finally:
+        executor.shutdown()
+
+
+def test_fila_cheia_rejeita_com_retry_after():
+    """Com a fila cheia, novas submissoes devem receber ServiceOverloadedError"""
+    executor = CalculationExecutor(
+        max_workers=1, max_queue_size=0, retry_after_seconds=7, use_processes=False
+    )
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(executor.run(release.wait, 5))
+        await asyncio.sleep(0.05)
+
+        with pytest.raises(ServiceOverloadedError) as exc_info:
+            await executor.run(pow, 2, 2)
+
+        release.set()
+        await running
+        return exc_info.value
+
+    error = asyncio.run(scenario())
+
+    assert error.status_code == 503
+    assert error.retry_after == 7
+    assert executor.get_stats()["rejected"] == 1
+    assert executor.get_stats()["pending"] == 0
+
+
+def test_trabalho_io_nao_ocupa_fila():
+    """WorkloadKind.IO deve usar o thread pool sem consumir a fila de calculo"""
+    executor = CalculationExecutor(max_workers=1, max_queue_size=0, use_processes=False)
+
+    result = asyncio.run(executor.run(sum, [1, 2, 3], kind=WorkloadKind.IO))
+
+    assert result == 6
+    assert executor.get_stats()["completed"] == 0
+
+
+def test_excecao_sobrevive_serializacao():
+    """Excecoes da API devem voltar do pool sem duplicar o prefixo da mensagem"""
+    original = ValidationError("latitude invalida", field="lat", value=100)
+
+    restored = pickle.loads(pickle.dumps(original))
+
+    assert type(restored) is ValidationError
+    assert restored.message == original.message
+    assert str(restored) == str(original)
+    assert restored.status_code == 422
+    assert restored.details == {"field": "lat", "received_value": 100}
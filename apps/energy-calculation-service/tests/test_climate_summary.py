@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para o resumo climatico gravado no indice do geohash cache
+"""
+
+import sys
+import os
+import sqlite3
+
+# Adicionar o diretorio raiz ao path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.cache_index import CacheIndex, INDEX_FILENAME
+from utils.climate_summary import summarize_weather
+from utils.geohash_cache import haversine_distance
+
+LAT, LON = -23.55, -46.63
+
+
+def _weather():
+    index = pd.date_range("2019-01-01", "2020-12-31 23:00", freq="h", tz="UTC").tz_convert("America/Sao_Paulo")
+    return pd.DataFrame({
+        "ghi": np.where((index.hour >= 6) & (index.hour < 18), 500.0, 0.0),
+        "dni": 300.0,
+        "dhi": 100.0,
+        "temp_air": np.where(index.month == 7, 5.0, 25.0),
+        "wind_speed": np.linspace(0.0, 10.0, len(index)),
+        "pressure": 101325.0
+    }, index=index)
+
+
+def test_resumo_de_dados_horarios():
+    """Estatisticas, irradiacao mensal e anos cobertos (em UTC)"""
+    summary = summarize_weather(_weather())
+
+    assert summary["years"] == [2019, 2020]
+    assert summary["n_records"] == 2 * 8760 + 24
+    assert (summary["temp_min"], summary["temp_max"]) == (5.0, 25.0)
+    assert summary["wind_max"] == 10.0
+    assert summary["monthly_ghi_kwh_m2"][0] == pytest.approx(31 * 6.0, rel=0.01)
+    assert summary["monthly_dni_kwh_m2"][1] == pytest.approx(28.25 * 7.2)
+
+    assert summarize_weather(pd.DataFrame({"x": [1.0]})) is None
+    assert summarize_weather([1, 2, 3]) is None
+
+
+def test_resumo_consultado_sem_carregar_dados(tmp_path, monkeypatch, make_geohash_cache):
+    """O resumo vem do indice; o arquivo horario nao e lido"""
+    make_geohash_cache(tmp_path).set(LAT, LON, _weather(), source="pvgis")
+
+    reader = make_geohash_cache(tmp_path)
+
+    def no_load(_):
+        raise AssertionError("dados horarios carregados")
+
+    monkeypatch.setattr(reader, "_load_entry_data", no_load)
+    summary = reader.get_summary(LAT + 0.01, LON, source="pvgis")
+
+    assert summary["temp_min"] == 5.0
+    assert reader.get_summary(LAT, LON, source="nasa") is None
+
+
+def test_resumo_ausente_e_preenchido_na_primeira_consulta(tmp_path, make_geohash_cache):
+    """Entradas indexadas antes do resumo sao carregadas uma vez e atualizadas"""
+    manager = make_geohash_cache(tmp_path)
+    manager.set(LAT, LON, _weather(), source="pvgis")
+    with sqlite3.connect(tmp_path / INDEX_FILENAME) as conn:
+        conn.execute("UPDATE entries SET summary = NULL")
+
+    assert manager.get_summary(LAT, LON, source="pvgis")["temp_max"] == 25.0
+
+    with sqlite3.connect(tmp_path / INDEX_FILENAME) as conn:
+        assert conn.execute("SELECT summary FROM entries").fetchone()[0] is not None
+
+
+def test_resumo_preenchido_da_propria_entrada_com_interpolacao(tmp_path, make_geohash_cache, make_weather):
+    """Com interpolacao ligada, o resumo gravado na linha e o da entrada, nao da combinacao"""
+    manager = make_geohash_cache(tmp_path)
+    manager.interpolation_enabled = True
+    manager.interpolation_exact_km = 1.0
+    manager.set(LAT + 0.03, LON, make_weather().assign(temp_air=10.0), source="pvgis")
+    manager.set(LAT - 0.1, LON, make_weather().assign(temp_air=30.0), source="pvgis")
+    with sqlite3.connect(tmp_path / INDEX_FILENAME) as conn:
+        conn.execute("UPDATE entries SET summary = NULL")
+
+    # Entre as duas entradas get() combina; o resumo vem da mais proxima
+    assert manager.get(LAT + 0.01, LON, source="pvgis").attrs.get("interpolation")
+    assert manager.get_summary(LAT + 0.01, LON, source="pvgis")["temp_min"] == 10.0
+    assert manager.get_summary(LAT + 0.03, LON, source="pvgis")["temp_min"] == 10.0
+
+
+def test_indice_antigo_recebe_coluna_de_resumo(tmp_path):
+    """Banco criado sem a coluna summary e migrado ao abrir"""
+    db_path = tmp_path / INDEX_FILENAME
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE entries (cache_key TEXT PRIMARY KEY, geohash TEXT NOT NULL, params_key TEXT NOT NULL, "
+            "lat REAL NOT NULL, lon REAL NOT NULL, file_name TEXT NOT NULL, size_bytes INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+
+    index = CacheIndex(db_path, distance_fn=haversine_distance)
+    index.upsert("k", "6gycf", "source_pvgis", LAT, LON, "f.wcol", 10, summary={"temp_min": 1.0})
+
+    match = index.nearest(["6gycf"], "source_pvgis", LAT, LON, radius_km=1)
+    assert match["summary"] == {"temp_min": 1.0}
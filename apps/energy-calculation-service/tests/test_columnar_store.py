@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para o formato colunar de cache meteorologico
+"""
+
+import sys
+import os
+
+# Adicionar o diretorio raiz ao path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.cache import CacheManager
+from utils.columnar_store import (
+    ColumnarFormatError,
+    ColumnarWeatherFile,
+    is_columnar_compatible,
+    read_columnar,
+    read_header,
+    write_columnar,
+)
+from utils.geohash_cache import GeohashCacheManager
+
+
+def _weather_df(years=(2019, 2020)):
+    index = pd.date_range(f"{years[0]}-01-01", f"{years[-1]}-12-31 23:00", freq="h", tz="America/Sao_Paulo")
+    rng = np.random.default_rng(42)
+    return pd.DataFrame({
+        "ghi": rng.uniform(0, 1100, len(index)),
+        "dni": rng.uniform(0, 900, len(index)),
+        "dhi": rng.uniform(0, 300, len(index)),
+        "temp_air": rng.uniform(10, 35, len(index)),
+        "wind_speed": rng.uniform(0, 8, len(index)),
+    }, index=index)
+
+
+def test_roundtrip_preserva_indice_e_colunas(tmp_path):
+    """Leitura deve reproduzir indice com timezone e valores em precisao float32"""
+    df = _weather_df()
+    path = tmp_path / "entry.wcol"
+    write_columnar(path, df, metadata={"lat": -23.55, "lon": -46.63, "source": "pvgis"})
+
+    loaded = read_columnar(path)
+
+    pd.testing.assert_index_equal(loaded.index, df.index)
+    assert list(loaded.columns) == list(df.columns)
+    np.testing.assert_allclose(loaded.values, df.values.astype(np.float32), rtol=0)
+
+
+def test_header_legivel_sem_payload(tmp_path):
+    """Header traz metadados da entrada e anos cobertos"""
+    path = tmp_path / "entry.wcol"
+    write_columnar(path, _weather_df(), metadata={"lat": -23.55, "lon": -46.63, "source": "nasa", "params": {"a": 1}})
+
+    header = read_header(path)
+
+    assert header["lat"] == -23.55
+    assert header["lon"] == -46.63
+    assert header["source"] == "nasa"
+    assert header["years"] == [2019, 2020]
+    assert header["metadata"] == {"params": {"a": 1}}
+    assert header["schema_version"] == 1
+
+
+def test_colunas_mapeadas_sob_demanda(tmp_path):
+    """Colunas sao memmaps somente leitura carregados apenas quando pedidos"""
+    df = _weather_df()
+    path = tmp_path / "entry.wcol"
+    write_columnar(path, df)
+
+    entry = ColumnarWeatherFile(path)
+    ghi = entry.column("ghi")
+
+    assert isinstance(ghi, np.memmap)
+    assert ghi.dtype == np.float32
+    assert not ghi.flags.writeable
+    assert list(entry._columns) == ["ghi"]
+
+    subset = entry.to_dataframe(["temp_air"])
+    assert list(subset.columns) == ["temp_air"]
+    # Sem copia: o frame usa o memmap float32; dtype converte quando pedido
+    assert subset["temp_air"].dtype == np.float32
+    assert np.shares_memory(subset["temp_air"].to_numpy(), entry.column("temp_air"))
+    assert entry.to_dataframe(["ghi"], dtype=np.float64)["ghi"].dtype == np.float64
+
+
+def test_series_e_dados_incompativeis(tmp_path):
+    """Series voltam como Series; dados nao tabulares sao rejeitados"""
+    series = _weather_df()["ghi"].rename("poa_global")
+    path = tmp_path / "poa.wcol"
+    write_columnar(path, series)
+
+    loaded = read_columnar(path)
+    assert isinstance(loaded, pd.Series)
+    assert loaded.name == "poa_global"
+
+    assert not is_columnar_compatible({"ghi": [1, 2]})
+    with pytest.raises(ColumnarFormatError):
+        write_columnar(tmp_path / "x.wcol", {"ghi": [1, 2]})
+
+
+def test_cache_managers_usam_formato_colunar(tmp_path):
+    """DataFrames sao gravados como .wcol; outros tipos continuam em pickle"""
+    df = _weather_df()
+
+    geohash_cache = GeohashCacheManager(cache_dir=tmp_path / "geo")
+    assert geohash_cache.set(-23.55, -46.63, df, source="pvgis")
+    assert geohash_cache.set(-23.55, -46.63, {"foo": 1}, source="meta")
+    assert len(list((tmp_path / "geo").glob("geohash_*.wcol"))) == 1
+    assert geohash_cache.get(-23.56, -46.64, source="meta") == {"foo": 1}
+    pd.testing.assert_index_equal(geohash_cache.get(-23.56, -46.64, source="pvgis").index, df.index)
+
+    legacy_cache = CacheManager(cache_dir=tmp_path / "legacy")
+    legacy_cache.set(-23.55, -46.63, df, prefix="nasa")
+    assert len(list((tmp_path / "legacy").glob("nasa_*.wcol"))) == 1
+    assert list(legacy_cache.get(-23.55, -46.63, prefix="nasa").columns) == list(df.columns)
+    assert legacy_cache.get_cache_stats()["total_files"] == 1
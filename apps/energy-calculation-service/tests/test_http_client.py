@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para o cliente HTTP dos provedores externos (servidor local como substituto)
+"""
+
+import sys
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Adicionar o diretorio raiz ao path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+import requests
+
+from utils.http_client import CircuitBreaker, CircuitOpenError, UpstreamClient
+
+
+class _FakeProvider(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.calls += 1
+            server.ports.add(self.client_address[1])
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+            status = server.statuses.pop(0) if server.statuses else 200
+
+        time.sleep(server.delay)
+        body = b'{"ok": true}'
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+        with server.lock:
+            server.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def provider():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeProvider)
+    server.lock = threading.Lock()
+    server.calls = 0
+    server.ports = set()
+    server.active = 0
+    server.max_active = 0
+    server.statuses = []
+    server.delay = 0.0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _client(**kwargs):
+    options = dict(max_retries=2, backoff_base=0.01, backoff_max=0.05,
+                   max_concurrency_per_host=2, failure_threshold=2, reset_timeout=60)
+    options.update(kwargs)
+    return UpstreamClient("teste", **options)
+
+
+def _url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}/seriescalc"
+
+
+def test_retry_em_erro_transitorio_e_conexao_reutilizada(provider):
+    """503 seguido de sucesso deve ser retentado na mesma conexao keep-alive"""
+    provider.statuses = [503, 502]
+    client = _client()
+
+    response = client.get(_url(provider), timeout=5)
+
+    assert response.json() == {"ok": True}
+    assert provider.calls == 3
+    assert len(provider.ports) == 1
+    assert client.get_stats()["retries"] == 2
+
+
+def test_erro_4xx_nao_e_retentado(provider):
+    """Erros do cliente sobem imediatamente"""
+    provider.statuses = [400]
+    client = _client()
+
+    with pytest.raises(requests.HTTPError):
+        client.get(_url(provider), timeout=5)
+
+    assert provider.calls == 1
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_circuit_breaker_abre_apos_falhas(provider):
+    """Apos falhas consecutivas o provedor nao recebe novas requisicoes"""
+    provider.statuses = [500] * 6
+    client = _client(max_retries=0)
+
+    for _ in range(2):
+        with pytest.raises(requests.HTTPError):
+            client.get(_url(provider), timeout=5)
+
+    with pytest.raises(CircuitOpenError):
+        client.get(_url(provider), timeout=5)
+
+    assert provider.calls == 2
+    assert client.get_stats()["circuit_state"] == CircuitBreaker.OPEN
+
+
+def test_circuit_breaker_meio_aberto_fecha_com_sucesso(provider):
+    """Requisicao de teste bem sucedida fecha o circuito"""
+    provider.statuses = [500]
+    client = _client(max_retries=0, failure_threshold=1, reset_timeout=0.05)
+
+    with pytest.raises(requests.HTTPError):
+        client.get(_url(provider), timeout=5)
+    time.sleep(0.06)
+
+    assert client.get(_url(provider), timeout=5).status_code == 200
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_limite_de_concorrencia_por_host(provider):
+    """Rajada de requisicoes respeita o semaforo por host"""
+    provider.delay = 0.1
+    client = _client(max_concurrency_per_host=2)
+
+    threads = [threading.Thread(target=client.get, args=(_url(provider),), kwargs={"timeout": 5}) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert provider.calls == 6
+    assert provider.max_active <= 2
+
+
+def test_erro_de_corpo_conta_como_falha_e_nao_trava_meio_aberto(provider, monkeypatch):
+    """RequestException fora de conexao/timeout e retentada e registrada no circuit breaker"""
+    client = _client(max_retries=1, failure_threshold=1, reset_timeout=0.05)
+    original = requests.Session.get
+    errors = [requests.exceptions.ChunkedEncodingError("corpo truncado")] * 2
+
+    def flaky_get(self, *args, **kwargs):
+        if errors:
+            raise errors.pop(0)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(requests.Session, "get", flaky_get)
+
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        client.get(_url(provider), timeout=5)
+    assert client.get_stats()["retries"] == 1
+    assert client.breaker.state == CircuitBreaker.OPEN
+
+    # Requisicao de teste com erro inesperado reabre o circuito em vez de travar meio aberto
+    time.sleep(0.06)
+    errors.append(RuntimeError("falha inesperada"))
+    with pytest.raises(RuntimeError):
+        client.get(_url(provider), timeout=5)
+    assert client.breaker._state == CircuitBreaker.OPEN
+
+    time.sleep(0.06)
+    assert client.get(_url(provider), timeout=5).status_code == 200
+    assert client.breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para a interpolacao IDW entre entradas vizinhas do cache geohash
+"""
+
+import sys
+import os
+import time
+
+# Adicionar o diretorio raiz ao path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+from utils.geohash_cache import haversine_distance
+from utils.interpolation import idw_blend, idw_weights
+
+LAT, LON = -23.55, -46.63
+
+
+@pytest.fixture
+def interpolating_cache(tmp_path, make_geohash_cache):
+    """Cache em modo de interpolacao (ou fora dele) com parametros fixos"""
+    def make(enabled=True):
+        manager = make_geohash_cache(tmp_path)
+        manager.interpolation_enabled = enabled
+        manager.interpolation_neighbors = 4
+        manager.interpolation_radius_km = 30.0
+        manager.interpolation_power = 2.0
+        manager.interpolation_exact_km = 1.0
+        return manager
+    return make
+
+
+def test_pesos_e_procedencia_da_combinacao(make_weather):
+    """Pesos 1/d^2 normalizados; indice da mais proxima; vizinho desalinhado ignorado"""
+    assert idw_weights([1.0, 2.0], power=2) == pytest.approx([0.8, 0.2])
+
+    frames = [make_weather(100.0, minute=10), make_weather(200.0, minute=11), make_weather(900.0, periods=24)]
+    sources = [
+        {"lat": 1.0, "lon": 1.0, "distance_km": 1.0},
+        {"lat": 2.0, "lon": 2.0, "distance_km": 2.0},
+        {"lat": 3.0, "lon": 3.0, "distance_km": 1.5},
+    ]
+
+    blended = idw_blend(frames, sources, power=2)
+
+    assert np.allclose(blended["ghi"], 120.0)
+    assert np.allclose(blended["temp_air"], 25.0)
+    assert blended.index.equals(frames[0].index)
+    provenance = blended.attrs["interpolation"]
+    assert (provenance["method"], provenance["power"]) == ("idw", 2)
+    assert [(s["lat"], s["weight"]) for s in provenance["sources"]] == [(1.0, 0.8), (2.0, 0.2)]
+
+    assert idw_blend(frames[::2], sources[::2], power=2) is None
+
+
+def test_cache_sintetiza_serie_sem_entrada_proxima(interpolating_cache, make_weather):
+    """Entradas a 10-25 km combinadas; fora do modo, alvo sem vizinho no raio e miss"""
+    manager = interpolating_cache()
+    points = [(LAT + 0.1, LON, 100.0), (LAT - 0.1, LON, 200.0), (LAT, LON + 0.2, 400.0)]
+    for lat, lon, ghi in points:
+        manager.set(lat, lon, make_weather(ghi), source="pvgis")
+
+    data, stale_entry = manager.lookup(LAT, LON, source="pvgis")
+
+    distances = [haversine_distance(LAT, LON, lat, lon) for lat, lon, _ in points]
+    expected = np.dot(idw_weights(distances, power=2), [ghi for _, _, ghi in points])
+    assert stale_entry is None
+    assert np.allclose(data["ghi"], expected)
+    assert len(data.attrs["interpolation"]["sources"]) == 3
+    assert manager.interpolated_hits == 1
+
+    # Outra fonte nao participa; modo desligado volta ao vizinho mais proximo
+    assert manager.get(LAT, LON, source="nasa") is None
+    assert interpolating_cache(enabled=False).get(LAT, LON, source="pvgis") is None
+
+
+def test_entrada_muito_proxima_servida_sem_interpolar(interpolating_cache, make_weather):
+    """Entrada dentro de CACHE_INTERPOLATION_EXACT_KM e servida como esta"""
+    manager = interpolating_cache()
+    manager.set(LAT + 0.001, LON, make_weather(100.0), source="pvgis")
+    manager.set(LAT + 0.1, LON, make_weather(500.0), source="pvgis")
+
+    data = manager.get(LAT, LON, source="pvgis")
+
+    assert np.all(data["ghi"] == 100.0)
+    assert "interpolation" not in data.attrs
+    assert manager.interpolated_hits == 0
+
+
+def test_versao_inclui_todos_os_vizinhos_interpolados(interpolating_cache, make_weather):
+    """Vizinho regravado ou novo muda a versao servida (cache de respostas)"""
+    manager = interpolating_cache()
+    manager.set(LAT + 0.1, LON, make_weather(100.0), source="pvgis")
+    manager.set(LAT - 0.1, LON, make_weather(200.0), source="pvgis")
+    version = manager.get_version(LAT, LON, source="pvgis")
+    assert len(version.split(",")) == 2
+
+    time.sleep(0.01)
+    manager.set(LAT - 0.1, LON, make_weather(300.0), source="pvgis")
+    refreshed = manager.get_version(LAT, LON, source="pvgis")
+    assert refreshed != version
+
+    manager.set(LAT, LON + 0.2, make_weather(400.0), source="pvgis")
+    assert len(manager.get_version(LAT, LON, source="pvgis").split(",")) == 3
+
+    # Sem interpolacao so a entrada mais proxima conta
+    assert len(interpolating_cache(enabled=False).get_version(LAT + 0.09, LON, source="pvgis").split(",")) == 1
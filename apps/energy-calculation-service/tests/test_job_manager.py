@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para o subsistema de jobs assincronos
+"""
+
+import sys
+import os
+import asyncio
+import importlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Adicionar o diretorio raiz ao path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+from core.exceptions import ServiceOverloadedError
+from core.executor import CalculationExecutor
+from models.jobs.responses import JobType, JobStatus
+from services.jobs.job_manager import JobManager
+from services.jobs.job_store import JobStore
+
+# O pacote exporta a instancia job_manager com o mesmo nome do modulo
+job_manager_module = importlib.import_module("services.jobs.job_manager")
+
+
+def _fake_solar(request):
+    return {"energia_anual_kwh": np.float64(1234.5), "anos_analisados": np.int64(6), "lat": request["lat"]}
+
+
+def _failing_solar(request):
+    raise ValueError("Não foi possível obter dados meteorológicos")
+
+
+def _make_manager(tmp_path):
+    store = JobStore(db_path=tmp_path / "jobs.sqlite3", ttl_hours=1)
+    executor = CalculationExecutor(max_workers=1, max_queue_size=2, use_processes=False)
+    return JobManager(store=store, executor=executor)
+
+
+async def _wait_finished(manager, job_id, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = manager.get(job_id)
+        if job["status"] not in (JobStatus.QUEUED.value, JobStatus.RUNNING.value):
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError("Job não finalizou a tempo")
+
+
+def test_job_concluido_persiste_resultado(tmp_path, monkeypatch):
+    """Resultado deve ficar disponivel no store apos a conclusao"""
+    monkeypatch.setitem(job_manager_module.JOB_TASKS, JobType.SOLAR, _fake_solar)
+    manager = _make_manager(tmp_path)
+
+    async def scenario():
+        job = manager.submit(JobType.SOLAR, {"lat": -23.5})
+        return await _wait_finished(manager, job["job_id"])
+
+    job = asyncio.run(scenario())
+
+    assert job["status"] == JobStatus.SUCCEEDED.value
+    assert manager.get_result(job["job_id"]) == {"energia_anual_kwh": 1234.5, "anos_analisados": 6, "lat": -23.5}
+
+
+def test_job_com_erro_registra_falha(tmp_path, monkeypatch):
+    """Excecao no calculo deve marcar o job como failed com a mensagem"""
+    monkeypatch.setitem(job_manager_module.JOB_TASKS, JobType.SOLAR, _failing_solar)
+    manager = _make_manager(tmp_path)
+
+    async def scenario():
+        job = manager.submit(JobType.SOLAR, {"lat": -23.5})
+        return await _wait_finished(manager, job["job_id"])
+
+    job = asyncio.run(scenario())
+
+    assert job["status"] == JobStatus.FAILED.value
+    assert "dados meteorológicos" in job["error"]
+    assert manager.get_result(job["job_id"]) is None
+
+
+def test_job_cancelado_antes_de_iniciar_nao_executa(tmp_path, monkeypatch):
+    """Cancelamento registrado antes da execucao deve impedir o calculo"""
+    calls = []
+    monkeypatch.setitem(job_manager_module.JOB_TASKS, JobType.SOLAR, lambda request: calls.append(request))
+    manager = _make_manager(tmp_path)
+
+    async def scenario():
+        job = manager.submit(JobType.SOLAR, {"lat": -23.5})
+        assert manager.cancel(job["job_id"])
+        await asyncio.sleep(0.05)
+        return manager.get(job["job_id"])
+
+    job = asyncio.run(scenario())
+
+    assert job["status"] == JobStatus.CANCELLED.value
+    assert calls == []
+    assert not manager.cancel(job["job_id"])
+    assert manager.executor.get_stats()["pending"] == 0
+
+
+def test_job_cancelado_na_fila_do_pool_nao_executa(tmp_path, monkeypatch):
+    """Job aguardando um processo livre continua queued e, se cancelado, nao e calculado"""
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def solar(request):
+        calls.append(request["lat"])
+        started.set()
+        release.wait(5)
+        return {"lat": request["lat"]}
+
+    monkeypatch.setitem(job_manager_module.JOB_TASKS, JobType.SOLAR, solar)
+    manager = _make_manager(tmp_path)
+
+    async def scenario():
+        # Pool com um unico worker, ocupado pelo primeiro job
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=1))
+        first = manager.submit(JobType.SOLAR, {"lat": -23.5})
+        waiting = manager.submit(JobType.SOLAR, {"lat": -22.9})
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+
+        assert manager.get(waiting["job_id"])["status"] == JobStatus.QUEUED.value
+        assert manager.get(waiting["job_id"])["started_at"] is None
+        assert manager.cancel(waiting["job_id"])
+        release.set()
+        jobs = [await _wait_finished(manager, job["job_id"]) for job in (first, waiting)]
+        while manager._tasks:
+            await asyncio.sleep(0.01)
+        return jobs
+
+    first, waiting = asyncio.run(scenario())
+
+    assert first["status"] == JobStatus.SUCCEEDED.value
+    assert waiting["status"] == JobStatus.CANCELLED.value
+    assert calls == [-23.5]
+    assert manager.executor.get_stats()["pending"] == 0
+
+
+def test_rajada_de_jobs_aceitos_aguarda_a_vez(tmp_path, monkeypatch):
+    """Jobs aceitos reservam vaga na submissao: excedentes recebem 503, aceitos nao falham por sobrecarga"""
+    def slow_solar(request):
+        time.sleep(0.05)
+        return {"lat": request["lat"]}
+
+    monkeypatch.setitem(job_manager_module.JOB_TASKS, JobType.SOLAR, slow_solar)
+    manager = _make_manager(tmp_path)
+
+    async def scenario():
+        jobs = [manager.submit(JobType.SOLAR, {"lat": -23.5 - i}) for i in range(manager.executor.capacity)]
+        with pytest.raises(ServiceOverloadedError):
+            manager.submit(JobType.SOLAR, {"lat": 0.0})
+        return [await _wait_finished(manager, job["job_id"]) for job in jobs]
+
+    jobs = asyncio.run(scenario())
+
+    assert [job["status"] for job in jobs] == [JobStatus.SUCCEEDED.value] * 3
+    assert manager.executor.get_stats()["pending"] == 0
+
+
+def test_job_expirado_nao_e_retornado(tmp_path):
+    """Jobs apos o TTL nao devem ser encontrados e sao removidos na limpeza"""
+    store = JobStore(db_path=tmp_path / "jobs.sqlite3", ttl_hours=1)
+    job = store.create(JobType.SOLAR.value)
+
+    with store._connect() as conn:
+        conn.execute("UPDATE jobs SET expires_at = ? WHERE job_id = ?", (time.time() - 1, job["job_id"]))
+
+    assert store.get(job["job_id"]) is None
+    assert store.purge_expired() == 1
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para a camada de cache em memoria
+"""
+
+import sys
+import os
+
+# Adicionar o diretorio raiz ao path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.geohash_cache import GeohashCacheManager
+from utils.memory_cache import MemoryCache
+
+
+def _weather_df(rows=1000):
+    index = pd.date_range("2020-01-01", periods=rows, freq="h", tz="UTC")
+    return pd.DataFrame({"ghi": np.linspace(0, 1000, rows), "dni": np.zeros(rows)}, index=index)
+
+
+def test_lru_respeita_orcamento_e_conta_acessos():
+    """Entradas menos usadas sao removidas ao exceder o orcamento"""
+    entry_mb = _weather_df().memory_usage(index=True, deep=True).sum() / (1024 * 1024)
+    cache = MemoryCache(max_mb=entry_mb * 2.5)
+
+    cache.set("a", _weather_df())
+    cache.set("b", _weather_df())
+    assert cache.get("a") is not None  # "a" passa a ser a mais recente
+    cache.set("c", _weather_df())
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+    stats = cache.get_stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 3
+    assert stats["misses"] == 1
+
+
+def test_frames_compartilhados_sao_somente_leitura():
+    """Substituir coluna afeta so o chamador; escrita in-place e bloqueada"""
+    cache = MemoryCache(max_mb=10)
+    cache.set("site", _weather_df())
+
+    df = cache.get("site")
+    df["dni"] = df["ghi"] * 0.7
+    assert cache.get("site")["dni"].sum() == 0
+
+    with pytest.raises(ValueError):
+        cache.get("site").loc[:, "ghi"] *= 2
+
+
+def test_orcamento_zero_desativa_camada():
+    """Com orcamento zero nada e armazenado"""
+    cache = MemoryCache(max_mb=0)
+    cache.set("site", _weather_df())
+
+    assert cache.get("site") is None
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_geohash_cache_serve_da_memoria(tmp_path, monkeypatch):
+    """Segundo acesso ao mesmo site nao le o arquivo novamente"""
+    cache = GeohashCacheManager(cache_dir=tmp_path, memory_cache=MemoryCache(max_mb=10))
+    cache.set(-23.5505, -46.6333, _weather_df(), source="pvgis")
+
+    loaded = []
+    original = GeohashCacheManager._load_entry_data
+    monkeypatch.setattr(
+        GeohashCacheManager, "_load_entry_data",
+        staticmethod(lambda path: loaded.append(path) or original(path))
+    )
+
+    first = cache.get(-23.5505, -46.6333, source="pvgis")
+    second = cache.get(-23.5510, -46.6340, source="pvgis")
+
+    assert len(loaded) == 1
+    pd.testing.assert_frame_equal(first, second)
+    assert cache.get_cache_stats()["memory_tier"]["hits"] == 1
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para o ajuste dos parametros do diodo unico a partir do datasheet
+"""
+
+import sys
+import os
+
+# Adicionar o diretorio raiz ao path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pvlib
+import pytest
+
+from models.solar.requests import ModuloSolar
+from services.solar.module_fit import ModuleFitCache, fit_desoto
+from utils.single_flight import SingleFlight
+
+# Datasheet do exemplo de ModuloSolar (coeficientes normalizados, 1/°C)
+DATASHEET = {
+    "vmpp": 41.4, "impp": 13.05, "voc_stc": 51.16, "isc_stc": 14.55,
+    "alpha_sc": 0.00041, "beta_oc": -0.0025, "cells_in_series": 72
+}
+
+
+def _modulo(**overrides):
+    data = {
+        **ModuloSolar.model_config["json_schema_extra"]["example"],
+        **DATASHEET,
+        "a_ref": None, "il_ref": None, "io_ref": None, "rs": None, "rsh_ref": None
+    }
+    data.update(overrides)
+    return ModuloSolar(**data)
+
+
+def _cache(tmp_path):
+    return ModuleFitCache(cache_dir=tmp_path / "module_fits", flight=SingleFlight(tmp_path / "locks", 5))
+
+
+def test_ajuste_reproduz_o_datasheet():
+    """O modelo ajustado reproduz Isc, Voc e o ponto de máxima potência"""
+    params, error_pct = fit_desoto(41.4, 13.05, 51.16, 14.55, 0.00041, -0.0025, 72)
+
+    curve = pvlib.pvsystem.singlediode(*pvlib.pvsystem.calcparams_desoto(1000.0, 25.0, 0.00041 * 14.55, **params))
+
+    assert error_pct < 0.01
+    assert float(curve["i_sc"]) == pytest.approx(14.55, rel=1e-6)
+    assert float(curve["v_oc"]) == pytest.approx(51.16, rel=1e-6)
+    assert float(curve["v_mp"]) == pytest.approx(41.4, rel=1e-4)
+    assert float(curve["i_mp"]) == pytest.approx(13.05, rel=1e-4)
+
+
+def test_datasheet_ajustado_uma_unica_vez(tmp_path, monkeypatch):
+    """Mesmo datasheet: memória do processo, depois arquivo compartilhado; ajuste uma vez"""
+    from services.solar import module_fit
+
+    calls = []
+    original = module_fit.fit_desoto
+
+    def counting_fit(*args):
+        calls.append(args)
+        return original(*args)
+
+    monkeypatch.setattr(module_fit, "fit_desoto", counting_fit)
+
+    cache = _cache(tmp_path)
+    first = cache.resolve(_modulo())
+    second = cache.resolve(_modulo(fabricante="Outro", modelo="Mesmo datasheet"))
+    assert first == second
+    assert len(calls) == 1
+
+    # Outro processo/host com o mesmo CACHE_DIR
+    other = _cache(tmp_path)
+    assert other.resolve(_modulo()) == first
+    assert len(calls) == 1
+    assert other.loaded == 1 and other.fitted == 0
+
+    # Datasheet diferente é ajustado
+    cache.resolve(_modulo(vmpp=41.2))
+    assert len(calls) == 2
+
+
+def test_resolve_por_id_e_coeficientes_informados(tmp_path):
+    """Coeficientes da requisição têm prioridade; parametros_id usa o ajuste gravado"""
+    cache = _cache(tmp_path)
+
+    given = cache.resolve(_modulo(a_ref=1.8, il_ref=14.86, io_ref=2.5e-12, rs=0.25, rsh_ref=450.0))
+    assert given == {"a_ref": 1.8, "I_L_ref": 14.86, "I_o_ref": 2.5e-12, "R_s": 0.25, "R_sh_ref": 450.0}
+    assert cache.fitted == 0
+
+    fit = cache.fit(DATASHEET)
+    assert fit.id.startswith("fit_")
+    assert _cache(tmp_path).get(fit.id).parametros == fit.parametros
+
+    # Por id, sem datasheet consistente: não reajusta
+    by_id = _cache(tmp_path).resolve(_modulo(parametros_id=fit.id, vmpp=10.0))
+    assert by_id == fit.parametros
+
+    with pytest.raises(ValueError):
+        cache.resolve(_modulo(parametros_id="fit_0000000000000000"))
+    assert cache.get("../../etc/passwd") is None
+
+
+def test_ajuste_fora_da_tolerancia_recusado(tmp_path, monkeypatch):
+    """Datasheet inconsistente ou ajuste impreciso gera ValueError (400) e nada é gravado"""
+    from services.solar import module_fit
+
+    cache = _cache(tmp_path)
+
+    with pytest.raises(ValueError):
+        cache.fit({**DATASHEET, "vmpp": 60.0})
+
+    params, _ = fit_desoto(41.4, 13.05, 51.16, 14.55, 0.00041, -0.0025, 72)
+    monkeypatch.setattr(module_fit, "fit_desoto", lambda *args: (params, cache.max_error_pct + 1.0))
+    with pytest.raises(ValueError):
+        cache.fit(DATASHEET)
+    assert not list((tmp_path / "module_fits").glob("*.json"))
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para o download NASA POWER em blocos anuais
+"""
+
+import sys
+import os
+import importlib
+import threading
+
+# Adicionar o diretorio raiz ao path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.exceptions import NASAError
+from services.solar.nasa_service import NASAService
+from services.solar.weather_repository import WeatherRepository
+from utils.geohash_cache import GeohashCacheManager
+from utils.single_flight import SingleFlight
+
+# services.solar reexporta a instancia nasa_service com o mesmo nome do modulo
+nasa_module = importlib.import_module("services.solar.nasa_service")
+
+LAT, LON = -23.55, -46.63
+
+
+def _raw_year(year):
+    index = pd.date_range(f"{year}-01-01", periods=48, freq="h", tz="UTC")
+    ghi = np.clip(np.sin(np.linspace(0, 4 * np.pi, 48)) * 800, 0, None)
+    return pd.DataFrame({
+        "ghi": ghi, "dni": ghi * 0.7, "dhi": ghi * 0.2,
+        "temp_air": 25.0, "wind_speed": 2.0
+    }, index=index)
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(nasa_module, "weather_repository", WeatherRepository(
+        cache=GeohashCacheManager(cache_dir=tmp_path),
+        flight=SingleFlight(lock_dir=tmp_path / "locks", timeout=5)
+    ))
+
+    service = NASAService()
+    service.downloads = []
+    service.failing_years = set()
+    lock = threading.Lock()
+
+    def fake_download(lat, lon, year):
+        with lock:
+            service.downloads.append(year)
+        if year in service.failing_years:
+            raise NASAError(f"503 para {year}")
+        return _raw_year(year)
+
+    monkeypatch.setattr(service, "_download_year", fake_download)
+    return service
+
+
+def test_blocos_anuais_unidos_no_formato_padrao(service):
+    """Todos os anos sao baixados e unidos em um unico DataFrame normalizado"""
+    df = service.fetch_weather_data(LAT, LON)
+
+    assert sorted(service.downloads) == list(range(2015, 2021))
+    assert sorted(df.index.year.unique()) == list(range(2014, 2021))  # 00h UTC = 21h do dia anterior
+    assert len(df) == 6 * 48
+    assert {"ghi", "dni", "dhi", "temp_air", "wind_speed", "pressure"} <= set(df.columns)
+    assert str(df.index.tz) == "America/Sao_Paulo"
+
+
+def test_nova_tentativa_baixa_apenas_anos_faltantes(service):
+    """Falha em um ano mantem os demais em cache para a proxima tentativa"""
+    service.failing_years = {2018}
+    with pytest.raises(NASAError, match="2018"):
+        service.fetch_weather_data(LAT, LON)
+
+    service.failing_years = set()
+    service.downloads.clear()
+    df = service.fetch_weather_data(LAT, LON)
+
+    assert service.downloads == [2018]
+    assert len(df) == 6 * 48
+
+
+def test_periodo_menor_servido_pelos_blocos_em_cache(service):
+    """Subperiodo e montado a partir dos anos ja baixados, sem novas requisicoes"""
+    service.fetch_weather_data(LAT, LON)
+    service.downloads.clear()
+
+    df = service.fetch_weather_data(LAT, LON, start_year=2017, end_year=2018)
+
+    assert service.downloads == []
+    assert len(df) == 2 * 48
+    assert df.index.min() == pd.Timestamp("2017-01-01", tz="UTC")
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para o motor FV vetorizado por orientacao
+"""
+
+import sys
+import os
+
+# Adicionar o diretorio raiz ao path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pvlib
+import pytest
+
+from services.solar import pv_engine
+from services.solar.diode_surface import DiodeSurfaceCache, module_fingerprint
+
+LAT, LON = -23.55, -46.63
+
+MODULE = {
+    "alpha_sc": 0.00041, "a_ref": 1.8, "I_L_ref": 14.86, "I_o_ref": 2.5e-12,
+    "R_sh_ref": 450.0, "R_s": 0.25, "EgRef": 1.121, "dEgdT": -0.0002677
+}
+TEMPERATURE = pvlib.temperature.TEMPERATURE_MODEL_PARAMETERS["sapm"]["open_rack_glass_glass"]
+
+ORIENTATIONS = [
+    pv_engine.Orientation(tilt=20, azimuth=0, modules_per_string=6, strings=2),
+    pv_engine.Orientation(tilt=15, azimuth=90, modules_per_string=4, strings=1),
+    pv_engine.Orientation(tilt=30, azimuth=270, modules_per_string=5, strings=3),
+]
+
+
+def _inputs():
+    index = pd.date_range("2020-01-01", "2020-01-14 23:00", freq="h", tz="America/Sao_Paulo")
+    temp_air = 22.0 + 6.0 * np.sin(np.pi * (index.hour - 8) / 12)
+
+    # Geometria em float64, a mesma que o ModelChain calcula pela Location
+    location = pvlib.location.Location(LAT, LON)
+    solar_pos = location.get_solarposition(index, temperature=temp_air)
+    airmass = location.get_airmass(solar_position=solar_pos)
+    geometry = pd.concat([solar_pos[["zenith", "apparent_zenith", "azimuth"]], airmass], axis=1)
+    geometry["dni_extra"] = pvlib.irradiance.get_extra_radiation(index)
+    clear = pvlib.clearsky.ineichen(geometry["apparent_zenith"], geometry["airmass_absolute"], 3.0,
+                                    dni_extra=geometry["dni_extra"])
+    weather = pd.DataFrame({
+        "ghi": clear["ghi"], "dni": clear["dni"], "dhi": clear["dhi"],
+        "temp_air": temp_air, "wind_speed": 2.0
+    }, index=index)
+    return weather, geometry
+
+
+def _modelchain(orientation, weather, geometry):
+    """Referencia: PVSystem + ModelChain do pvlib para uma orientacao"""
+    system = pvlib.pvsystem.PVSystem(
+        surface_tilt=orientation.tilt, surface_azimuth=orientation.azimuth,
+        module_parameters=MODULE, temperature_model_parameters=TEMPERATURE,
+        modules_per_string=orientation.modules_per_string, strings_per_inverter=orientation.strings,
+        inverter_parameters={"pdc0": 1e6}
+    )
+    location = pvlib.location.Location(LAT, LON)
+    mc = pvlib.modelchain.ModelChain(system, location, aoi_model="physical", spectral_model="no_loss",
+                                     dc_model="desoto", ac_model="pvwatts", losses_model="no_loss")
+    poa = pvlib.irradiance.get_total_irradiance(
+        orientation.tilt, orientation.azimuth, geometry["apparent_zenith"], geometry["azimuth"],
+        weather["dni"], weather["ghi"], weather["dhi"],
+        dni_extra=geometry["dni_extra"], airmass=geometry["airmass_relative"], model="perez"
+    )
+    mc.run_model_from_poa(pd.concat([poa[["poa_global", "poa_direct", "poa_diffuse"]],
+                                     weather[["temp_air", "wind_speed"]]], axis=1))
+    return poa["poa_global"].to_numpy(), mc.results.dc["p_mp"].fillna(0).to_numpy()
+
+
+def test_motor_reproduz_modelchain_por_orientacao():
+    """Cada linha (orientacao) igual ao ModelChain do pvlib para o mesmo MPPT"""
+    weather, geometry = _inputs()
+
+    result = pv_engine.simulate(ORIENTATIONS, weather, geometry, MODULE, TEMPERATURE)
+
+    assert result.p_mp.shape == result.poa_global.shape == (len(ORIENTATIONS), len(weather))
+    for row, orientation in enumerate(ORIENTATIONS):
+        poa_global, p_mp = _modelchain(orientation, weather, geometry)
+        np.testing.assert_allclose(result.poa_global[row], poa_global, rtol=1e-9, atol=1e-9)
+        np.testing.assert_allclose(result.p_mp[row], p_mp, rtol=1e-6, atol=1e-6)
+    assert result.p_mp.sum() > 0
+
+
+def test_lotes_limitados_pelo_numero_de_celulas(monkeypatch):
+    """Processar uma orientacao por lote nao altera o resultado"""
+    weather, geometry = _inputs()
+    single = pv_engine.simulate(ORIENTATIONS, weather, geometry, MODULE, TEMPERATURE, "isotropic")
+
+    calls = []
+    transposition = pvlib.irradiance.get_total_irradiance
+
+    def count_transposition(*args, **kwargs):
+        calls.append(len(args[0]))
+        return transposition(*args, **kwargs)
+
+    monkeypatch.setattr(pv_engine, "MAX_BATCH_CELLS", len(weather))
+    monkeypatch.setattr(pvlib.irradiance, "get_total_irradiance", count_transposition)
+    batched = pv_engine.simulate(ORIENTATIONS, weather, geometry, MODULE, TEMPERATURE, "isotropic")
+
+    assert calls == [1, 1, 1]
+    np.testing.assert_array_equal(batched.p_mp, single.p_mp)
+    np.testing.assert_array_equal(batched.poa_global, single.poa_global)
+
+
+def test_orientacoes_iguais_simuladas_uma_vez(monkeypatch):
+    """MPPTs da mesma face compartilham a simulacao por modulo, escalada pela quantidade de modulos"""
+    weather, geometry = _inputs()
+    reference = pv_engine.simulate(ORIENTATIONS[:1], weather, geometry, MODULE, TEMPERATURE)
+
+    rows = []
+    singlediode = pvlib.pvsystem.singlediode
+
+    def count_singlediode(*args, **kwargs):
+        rows.append(len(args[0]))
+        return singlediode(*args, **kwargs)
+
+    monkeypatch.setattr(pvlib.pvsystem, "singlediode", count_singlediode)
+    same_face = [
+        ORIENTATIONS[0],
+        pv_engine.Orientation(tilt=20, azimuth=0, modules_per_string=3, strings=1),
+        ORIENTATIONS[1],
+        pv_engine.Orientation(tilt=20, azimuth=0, modules_per_string=8, strings=2),
+    ]
+    result = pv_engine.simulate(same_face, weather, geometry, MODULE, TEMPERATURE)
+
+    assert rows == [2 * len(weather)]
+    np.testing.assert_allclose(result.p_mp[0], reference.p_mp[0])
+    np.testing.assert_allclose(result.p_mp[1], reference.p_mp[0] * 3 / 12)
+    np.testing.assert_allclose(result.p_mp[3], reference.p_mp[0] * 16 / 12)
+    np.testing.assert_array_equal(result.poa_global[3], reference.poa_global[0])
+
+
+def test_superficie_do_modulo_proxima_da_solucao_exata(tmp_path, monkeypatch):
+    """Superficie validada, persistida por hash do modulo; pontos fora da grade resolvidos exatamente"""
+    weather, geometry = _inputs()
+    cache = DiodeSurfaceCache(cache_dir=tmp_path, max_error_pct=0.05, enabled=True)
+
+    surface = cache.get(MODULE)
+    assert surface is not None and surface.max_error_pct < 0.05
+    assert (tmp_path / f"diode_surface_{module_fingerprint(MODULE)}.npz").exists()
+
+    exact = pv_engine.simulate(ORIENTATIONS, weather, geometry, MODULE, TEMPERATURE)
+    approx = pv_engine.simulate(ORIENTATIONS, weather, geometry, MODULE, TEMPERATURE, surface=surface)
+    p_stc = pv_engine.single_diode_p_mp(np.array([1000.0]), np.array([25.0]), MODULE)[0]
+    per_module = np.array([[o.modules_per_string * o.strings] for o in ORIENTATIONS])
+    assert np.abs(approx.p_mp - exact.p_mp).max() <= (per_module * p_stc * 0.05 / 100).max()
+    assert approx.p_mp.sum() == pytest.approx(exact.p_mp.sum(), rel=1e-4)
+
+    p_mp, inside = surface.evaluate(np.array([500.0, 2000.0, 500.0]), np.array([25.0, 25.0, 120.0]))
+    assert inside.tolist() == [True, False, False]
+    assert np.isnan(p_mp[1:]).all()
+
+    # Outro processo le a superficie do disco; tolerancia menor que o erro a descarta
+    assert DiodeSurfaceCache(cache_dir=tmp_path, max_error_pct=0.05, enabled=True).get(MODULE).key == surface.key
+    strict = DiodeSurfaceCache(cache_dir=tmp_path, max_error_pct=surface.max_error_pct / 2, enabled=True)
+    assert strict.get(MODULE) is None
+    assert strict.loaded == 1
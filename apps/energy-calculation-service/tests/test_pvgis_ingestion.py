@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para o processamento vetorizado das respostas do PVGIS
+"""
+
+import sys
+import os
+
+# Adicionar o diretorio raiz ao path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+import pytest
+
+from core.exceptions import PVGISError
+from services.solar.pvgis_service import PVGISService
+
+RECORDS = [
+    {"time": "20200101:0010", "G(i)": 0.0, "Gb(n)": 0.0, "Gd(n)": 0.0, "T2m": 22.5, "WS10m": 1.2, "Int": 0},
+    {"time": "20200101:1510", "G(i)": 850.0, "Gb(n)": 600.0, "Gd(n)": 150.0, "T2m": 75.0, "WS10m": -3.0, "Int": 0},
+    {"time": "20200101:1610", "G(i)": 1800.0, "T2m": 30.0, "WS10m": 2.0, "Int": 0},
+    {"time": "invalido", "G(i)": 500.0, "T2m": 30.0, "WS10m": 2.0, "Int": 0},
+    {"time": "20200101:1710", "T2m": 30.0, "WS10m": 2.0, "Int": 0},
+    {"time": "20200101:1810", "G(i)": 120.0, "Int": 0},
+]
+
+CSV = "\r\n".join([
+    "Latitude (decimal degrees):\t-23.550",
+    "Longitude (decimal degrees):\t-46.630",
+    "Elevation (m):\t760.0",
+    "Radiation database:\tPVGIS-SARAH2",
+    "",
+    "time,G(i),H_sun,T2m,WS10m,Int",
+    "20200101:0010,0.0,0.0,22.5,1.2,0.0",
+    "20200101:1510,850.0,60.1,75.0,-3.0,0.0",
+    "20200101:1610,1800.0,45.0,30.0,2.0,0.0",
+    "",
+    "G(i): Global irradiance on the inclined plane (plane of the array) (W/m2)",
+    "T2m: 2-m air temperature (degree Celsius)",
+])
+
+
+def test_registros_json_aplicam_regras_de_validacao():
+    """Horario/G(i) invalidos e GHI fora da faixa sao descartados; temp e vento limitados"""
+    df = PVGISService()._process_pvgis_data(RECORDS)
+
+    assert list(df.columns) == ["ghi", "dni", "dhi", "temp_air", "wind_speed", "pressure"]
+    assert df.index.name == "datetime"
+    assert str(df.index.tz) == "America/Sao_Paulo"
+    assert len(df) == 3
+
+    row = df.loc[pd.Timestamp("2020-01-01 15:10", tz="UTC")]
+    assert row["temp_air"] == 60.0
+    assert row["wind_speed"] == 0.0
+    assert row["dni"] == 600.0
+
+    # Valores padrao quando a coluna nao veio no registro
+    last = df.iloc[-1]
+    assert (last["dni"], last["temp_air"], last["wind_speed"]) == (0.0, 25.0, 2.0)
+
+
+def test_campos_nulos_ou_invalidos_descartam_registro():
+    """Gb(n)/Gd(n)/T2m/WS10m nulos ou nao numericos invalidam o registro (como G(i))"""
+    records = [
+        {"time": "20200101:1210", "G(i)": 700.0, "Gb(n)": 500.0, "Gd(n)": 100.0, "T2m": 28.0, "WS10m": 1.5},
+        {"time": "20200101:1310", "G(i)": 700.0, "Gb(n)": None, "Gd(n)": 100.0, "T2m": 28.0, "WS10m": 1.5},
+        {"time": "20200101:1410", "G(i)": 700.0, "Gb(n)": 500.0, "Gd(n)": 100.0, "T2m": "x", "WS10m": 1.5},
+        {"time": "20200101:1510", "G(i)": 700.0, "Gb(n)": 500.0, "Gd(n)": 100.0, "T2m": 28.0},
+    ]
+    df = PVGISService()._process_pvgis_data(records)
+
+    assert list(df.index.tz_convert("UTC").hour) == [12, 15]
+    assert df.iloc[-1]["wind_speed"] == 2.0
+
+    csv = PVGISService()._parse_pvgis_csv(CSV.replace("850.0,60.1,75.0,-3.0", "850.0,60.1,,-3.0"))
+    assert len(PVGISService()._process_pvgis_data(csv)) == 1
+
+
+def test_csv_produz_mesmo_schema():
+    """Saida CSV do PVGIS gera o mesmo DataFrame que o JSON equivalente"""
+    service = PVGISService()
+    from_csv = service._process_pvgis_data(service._parse_pvgis_csv(CSV))
+    from_json = service._process_pvgis_data(RECORDS[:3])
+
+    pd.testing.assert_frame_equal(from_csv, from_json.assign(dni=0.0, dhi=0.0))
+
+
+def test_sem_registros_validos_gera_erro():
+    """Resposta sem nenhum registro aproveitavel deve falhar"""
+    with pytest.raises(PVGISError):
+        PVGISService()._process_pvgis_data([{"time": "x", "G(i)": "y"}])
+
+    with pytest.raises(PVGISError):
+        PVGISService()._parse_pvgis_csv("Latitude: 1\r\nsem dados\r\n")
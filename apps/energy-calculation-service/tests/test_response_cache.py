@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para o cache de respostas endereçado pelo conteudo da requisicao
+"""
+
+import sys
+import os
+import asyncio
+import time
+
+# Adicionar o diretorio raiz ao path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from typing import List
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from utils.cache_janitor import CacheJanitor
+from utils.response_cache import ResponseCache
+
+
+class _Payload(BaseModel):
+    lat: float
+    consumo: List[float]
+
+
+def _request(cache_control=None):
+    headers = [(b"cache-control", cache_control.encode())] if cache_control else []
+    return Request({"type": "http", "method": "POST", "path": "/", "headers": headers})
+
+
+def _call(cache, payload, cache_control=None, fingerprint=None, result="resultado"):
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return {"valor": result}
+
+    response = Response()
+    value = asyncio.run(cache.run("solar", payload, _request(cache_control), response, compute,
+                                  fingerprint=fingerprint))
+    return value, response.headers.get("X-Cache"), len(calls)
+
+
+def test_requisicao_identica_servida_do_cache(tmp_path):
+    """Mesmo payload e mesmo clima: HIT sem recalcular; payload ou clima diferente: MISS"""
+    cache = ResponseCache(cache_dir=tmp_path, ttl_hours=1, max_mb=10, enabled=True)
+    payload = _Payload(lat=-23.5, consumo=[500.0] * 12)
+    weather = {"version": "a"}
+
+    assert _call(cache, payload, fingerprint=lambda: weather["version"]) == ({"valor": "resultado"}, "MISS", 1)
+    assert _call(cache, _Payload(lat=-23.5, consumo=[500] * 12),
+                 fingerprint=lambda: weather["version"]) == ({"valor": "resultado"}, "HIT", 0)
+    assert _call(cache, _Payload(lat=-23.6, consumo=[500.0] * 12),
+                 fingerprint=lambda: weather["version"])[1:] == ("MISS", 1)
+
+    weather["version"] = "b"
+    assert _call(cache, payload, fingerprint=lambda: weather["version"])[1:] == ("MISS", 1)
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_cache_control_ignora_o_cache(tmp_path):
+    """no-cache recalcula e substitui o resultado; no-store recalcula sem gravar"""
+    cache = ResponseCache(cache_dir=tmp_path, ttl_hours=1, max_mb=10, enabled=True)
+    payload = _Payload(lat=-23.5, consumo=[1.0])
+
+    _call(cache, payload, result="antigo")
+    assert _call(cache, payload, cache_control="no-cache", result="novo") == ({"valor": "novo"}, "BYPASS", 1)
+    assert _call(cache, payload)[:2] == ({"valor": "novo"}, "HIT")
+
+    other = _Payload(lat=0.0, consumo=[1.0])
+    assert _call(cache, other, cache_control="no-store")[1:] == ("BYPASS", 1)
+    assert _call(cache, other)[1:] == ("MISS", 1)
+
+
+def test_validade_e_limite_de_tamanho(tmp_path):
+    """Resultado vencido e miss; janitor remove vencidos e aplica o limite de disco (LRU)"""
+    cache = ResponseCache(cache_dir=tmp_path, ttl_hours=1, max_mb=10, enabled=True)
+    old = cache.key("solar", _Payload(lat=1.0, consumo=[]))
+    cache.set(old, "x")
+    os.utime(cache._path(old), (time.time() - 7200, time.time() - 7200))
+
+    assert cache.get(old) is None
+    assert CacheJanitor({"responses": cache}, interval=0, budget=cache.budget).run_once()["responses"] == 1
+
+    small = ResponseCache(cache_dir=tmp_path / "small", ttl_hours=1, max_mb=0.05, enabled=True)
+    keys = [small.key("solar", _Payload(lat=float(i), consumo=[])) for i in range(4)]
+    for key in keys:
+        small.set(key, os.urandom(20_000))
+
+    removed = CacheJanitor({"responses": small}, interval=0, budget=small.budget).run_once()
+    assert removed["lru"] >= 1
+    assert small.budget.total_bytes() <= small.budget.max_bytes
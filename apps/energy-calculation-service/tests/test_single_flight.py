@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para coalescencia de downloads e escrita atomica
+"""
+
+import sys
+import os
+import threading
+import time
+
+# Adicionar o diretorio raiz ao path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from utils.file_io import atomic_write, file_lock
+from utils.single_flight import SingleFlight
+
+
+def test_chamadas_concorrentes_executam_uma_vez(tmp_path):
+    """Apenas o primeiro chamador baixa; os demais leem o cache"""
+    flight = SingleFlight(lock_dir=tmp_path, timeout=5)
+    cache = {}
+    downloads = []
+
+    def compute():
+        downloads.append(threading.get_ident())
+        time.sleep(0.2)
+        cache["cell"] = "dados"
+        return "dados"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(flight.run("cell", compute, lookup=lambda: cache.get("cell"))))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(downloads) == 1
+    assert results == ["dados"] * 5
+    assert flight.get_stats()["coalesced"] == 4
+
+
+def test_chaves_distintas_nao_se_bloqueiam(tmp_path):
+    """Locks sao independentes por chave"""
+    flight = SingleFlight(lock_dir=tmp_path, timeout=5)
+
+    with file_lock(flight._lock_path("a"), timeout=1) as acquired:
+        assert acquired
+        assert flight.run("b", lambda: 42) == 42
+
+
+def test_timeout_do_lock_executa_mesmo_assim(tmp_path):
+    """Se o lock nao for obtido a tempo, o calculo e executado sem ele"""
+    flight = SingleFlight(lock_dir=tmp_path, timeout=0.1)
+
+    with file_lock(flight._lock_path("cell"), timeout=1):
+        assert flight.run("cell", lambda: "baixado", lookup=lambda: None) == "baixado"
+
+    assert flight.get_stats()["timeouts"] == 1
+
+
+def test_escrita_atomica_preserva_arquivo_em_falha(tmp_path):
+    """Falha durante a escrita mantem o arquivo anterior e remove o temporario"""
+    target = tmp_path / "entry.pkl"
+    with atomic_write(target) as f:
+        f.write(b"v1")
+
+    with pytest.raises(RuntimeError):
+        with atomic_write(target) as f:
+            f.write(b"parcial")
+            raise RuntimeError("falha no meio da escrita")
+
+    assert target.read_bytes() == b"v1"
+    assert [p.name for p in tmp_path.iterdir()] == ["entry.pkl"]
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para o calculo de sistema solar com dados meteorologicos sinteticos
+"""
+
+import sys
+import os
+import importlib
+
+# Adicionar o diretorio raiz ao path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pvlib
+import pytest
+
+from models.solar.requests import SolarSystemCalculationRequest
+from services.solar.dc_cache import MpptDcCache
+from services.solar.diode_surface import DiodeSurfaceCache
+from services.solar.solar_geometry import SolarGeometryCache
+from services.solar.solar_service import SolarCalculationService
+from services.solar.weather_repository import WeatherRepository
+from utils.columnar_store import read_header
+from utils.geohash_cache import GeohashCacheManager
+from utils.memory_cache import MemoryCache
+from utils.single_flight import SingleFlight
+
+solar_module = importlib.import_module("services.solar.solar_service")
+
+LAT, LON = -23.55, -46.63
+
+
+def _weather(start="2015-01-01", end="2020-12-31 23:00"):
+    """Ceu claro (Haurwitz) com nebulosidade diaria aleatoria, DNI/DHI por Erbs"""
+    index = pd.date_range(start, end, freq="h", tz="UTC").tz_convert("America/Sao_Paulo")
+    solar_pos = pvlib.solarposition.get_solarposition(index, LAT, LON)
+    clear = pvlib.clearsky.haurwitz(solar_pos["apparent_zenith"])["ghi"]
+
+    days = index.tz_convert("UTC").normalize()
+    rng = np.random.default_rng(42)
+    cloud = pd.Series(rng.uniform(0.4, 1.0, len(days.unique())), index=days.unique())
+    ghi = clear * cloud.reindex(days).to_numpy()
+    split = pvlib.irradiance.erbs(ghi, solar_pos["zenith"], index)
+
+    return pd.DataFrame({
+        "ghi": ghi, "dni": split["dni"], "dhi": split["dhi"],
+        "temp_air": 22.0 + 6.0 * np.sin(np.pi * (index.hour - 8) / 12),
+        "wind_speed": 2.0, "pressure": 101325.0
+    }, index=index)
+
+
+def _request(**overrides):
+    data = {
+        "lat": LAT, "lon": LON,
+        "consumo_mensal_kwh": [500.0] * 12,
+        "perdas": {"sujeira": 2, "sombreamento": 1, "incompatibilidade": 1, "fiacao": 1, "outras": 0},
+        "modulo": {
+            "fabricante": "Canadian Solar", "modelo": "CS3W-540MS", "potencia_nominal_w": 550,
+            "largura_mm": 2261, "altura_mm": 1134, "peso_kg": 27.5, "vmpp": 41.4, "impp": 13.05,
+            "voc_stc": 51.16, "isc_stc": 14.55, "eficiencia": 20.9, "temp_coef_pmax": -0.37,
+            "alpha_sc": 0.00041, "beta_oc": -0.0025, "gamma_r": -0.0029, "cells_in_series": 144,
+            "a_ref": 1.8, "il_ref": 14.86, "io_ref": 2.5e-12, "rs": 0.25, "rsh_ref": 450.0
+        },
+        "inversores": [{
+            "inversor": {
+                "fabricante": "WEG", "modelo": "SIW500H-M", "potencia_saida_ca_w": 5000,
+                "tipo_rede": "Monofásico 220V", "potencia_fv_max_w": 7500, "tensao_cc_max_v": 600,
+                "numero_mppt": 2, "strings_por_mppt": 2, "eficiencia_max": 97.6, "efficiency_dc_ac": 0.976
+            },
+            "orientacoes": [
+                {"nome": "Norte", "orientacao": 0, "inclinacao": 20, "modulos_por_string": 6},
+                {"nome": "Leste", "orientacao": 90, "inclinacao": 15, "modulos_por_string": 4}
+            ]
+        }]
+    }
+    data.update(overrides)
+    return SolarSystemCalculationRequest(**data)
+
+
+class _FakeFetcher:
+    def __init__(self, df):
+        self.df = df
+        self.calls = 0
+
+    def fetch(self, lat, lon, preferred_source, allow_fallback=None):
+        self.calls += 1
+        return self.df.copy(), "PVGIS"
+
+    def fingerprint(self, lat, lon):
+        return "clima"
+
+
+@pytest.fixture(scope="module")
+def weather():
+    return _weather()
+
+
+@pytest.fixture
+def fetcher(weather, tmp_path, monkeypatch):
+    fake = _FakeFetcher(weather)
+    monkeypatch.setattr(solar_module, "weather_source_fetcher", fake)
+    repository = WeatherRepository(
+        cache=GeohashCacheManager(cache_dir=tmp_path, memory_cache=MemoryCache(max_mb=64)),
+        flight=SingleFlight(lock_dir=tmp_path / "locks", timeout=5)
+    )
+    monkeypatch.setattr(solar_module, "weather_repository", repository)
+    monkeypatch.setattr(solar_module, "solar_geometry_cache", SolarGeometryCache(repository))
+    monkeypatch.setattr(solar_module, "mppt_dc_cache", MpptDcCache(repository))
+    monkeypatch.setattr(solar_module, "diode_surface_cache", DiodeSurfaceCache(cache_dir=tmp_path / "surfaces"))
+    return fake
+
+
+def test_modo_tmy_proximo_do_calculo_completo(fetcher):
+    """Ano tipico simula 8760 h e fica perto do resultado multi-anual"""
+    full = SolarCalculationService.calculate(_request())
+    tmy = SolarCalculationService.calculate(_request(modo_calculo="tmy"))
+
+    assert full["modo_calculo"] == "completo" and full["tmy"] is None
+    assert tmy["modo_calculo"] == "tmy"
+    assert tmy["anos_analisados"] == 1
+    assert abs(tmy["tmy"]["horas"] - 8760) <= 2
+    assert sorted(int(m) for m in tmy["tmy"]["meses_selecionados"]) == list(range(1, 13))
+    assert tmy["energia_anual_kwh"] == pytest.approx(full["energia_anual_kwh"], rel=0.05)
+
+    # Desvio estimado pela irradiacao acompanha o desvio real da energia
+    actual = (tmy["energia_anual_kwh"] / full["energia_anual_kwh"] - 1) * 100
+    assert abs(tmy["tmy"]["desvio_estimado_pct"] - actual) < 2.0
+
+
+def test_ano_tipico_reutilizado_do_cache(fetcher):
+    """Segunda chamada no mesmo local nao busca a serie multi-anual"""
+    first = SolarCalculationService.calculate(_request(modo_calculo="tmy"))
+    calls = fetcher.calls
+    second = SolarCalculationService.calculate(_request(modo_calculo="tmy", lat=LAT + 0.01))
+
+    assert fetcher.calls == calls
+    assert second["tmy"] == first["tmy"]
+    assert second["energia_anual_kwh"] == pytest.approx(first["energia_anual_kwh"], rel=1e-3)
+
+
+def test_tmy_sem_meses_completos_usa_modo_completo(fetcher, weather):
+    """Mes sem nenhum ano completo recai no calculo completo"""
+    fetcher.df = weather[(weather.index.month != 7) | (weather.index.day <= 15)]
+
+    result = SolarCalculationService.calculate(_request(modo_calculo="tmy"))
+
+    assert result["modo_calculo"] == "completo"
+    assert result["tmy"] is None
+
+    # Montagem que falhou nao e gravada: nova tentativa com dados completos monta o ano
+    fetcher.df = weather
+    assert SolarCalculationService.calculate(_request(modo_calculo="tmy"))["modo_calculo"] == "tmy"
+
+
+def test_geometria_e_transposicao_calculadas_uma_vez(fetcher, monkeypatch):
+    """Posicao solar uma vez por requisicao; transposicao de todos os MPPTs numa unica chamada"""
+    calls = {"solarposition": 0, "transposition": 0}
+    solarposition = pvlib.solarposition.get_solarposition
+    transposition = pvlib.irradiance.get_total_irradiance
+
+    def count_solarposition(*args, **kwargs):
+        calls["solarposition"] += 1
+        return solarposition(*args, **kwargs)
+
+    def count_transposition(*args, **kwargs):
+        calls["transposition"] += 1
+        return transposition(*args, **kwargs)
+
+    monkeypatch.setattr(pvlib.solarposition, "get_solarposition", count_solarposition)
+    monkeypatch.setattr(pvlib.irradiance, "get_total_irradiance", count_transposition)
+
+    result = SolarCalculationService.calculate(_request())
+
+    assert calls == {"solarposition": 1, "transposition": 1}
+    assert set(result["geracao_por_orientacao"]) == {"Norte", "Leste"}
+    assert result["energia_anual_kwh"] == pytest.approx(
+        sum(o["geracao_anual_kwh"] for o in result["geracao_por_orientacao"].values())
+    )
+
+
+def test_geometria_solar_reutilizada_do_cache(fetcher, tmp_path, monkeypatch):
+    """Mesmo local e indice: posicao solar nao e recalculada; disco guarda float32"""
+    first = SolarCalculationService.calculate(_request())
+
+    calls = []
+    solarposition = pvlib.solarposition.get_solarposition
+    monkeypatch.setattr(pvlib.solarposition, "get_solarposition",
+                        lambda *args, **kwargs: calls.append(1) or solarposition(*args, **kwargs))
+
+    second = SolarCalculationService.calculate(_request(lat=LAT + 0.001))
+    assert calls == []
+    assert second["energia_anual_kwh"] == pytest.approx(first["energia_anual_kwh"], rel=1e-6)
+
+    # Entrada gravada ao lado dos dados meteorologicos, lida de volta em float32
+    (path,) = [p for p in tmp_path.glob("geohash_*.wcol")
+               if read_header(p)["metadata"]["params"].get("type") == "solar_geometry"]
+    stored = GeohashCacheManager._load_entry_data(path)
+    assert set(stored.columns) == {"zenith", "apparent_zenith", "azimuth", "dni_extra",
+                                   "airmass_relative", "airmass_absolute"}
+    assert set(stored.dtypes) == {np.dtype("float32")}
+
+
+def test_edicao_recalcula_apenas_mppt_alterado(fetcher, monkeypatch):
+    """Mudar uma orientacao e as perdas simula so a face nova; a outra vem do cache DC"""
+    first = SolarCalculationService.calculate(_request())
+
+    data = _request().model_dump()
+    data["inversores"][0]["orientacoes"][1]["inclinacao"] = 25
+    data["perdas"]["sujeira"] = 4
+
+    rows = []
+    singlediode = pvlib.pvsystem.singlediode
+    monkeypatch.setattr(pvlib.pvsystem, "singlediode",
+                        lambda *args, **kwargs: rows.append(len(args[0])) or singlediode(*args, **kwargs))
+
+    edited = SolarCalculationService.calculate(SolarSystemCalculationRequest(**data))
+
+    assert len(rows) == 1
+    assert fetcher.calls == 2
+    norte_first = first["geracao_por_orientacao"]["Norte"]["geracao_anual_kwh"]
+    norte_edited = edited["geracao_por_orientacao"]["Norte"]["geracao_anual_kwh"]
+    assert norte_edited == pytest.approx(norte_first * 0.93 / 0.95)
+    assert edited["geracao_por_orientacao"]["Leste"]["inclinacao"] == 25
+
+
+def test_impressao_digital_inclui_ano_tipico(fetcher):
+    """No modo tmy a entrada do ano tipico entra na impressao digital do cache de respostas"""
+    tmy, completo = _request(modo_calculo="tmy"), _request()
+    before = (SolarCalculationService.weather_fingerprint(tmy), SolarCalculationService.weather_fingerprint(completo))
+
+    SolarCalculationService._get_typical_year(LAT, LON, tmy.origem_dados, tmy.startyear, tmy.endyear)
+
+    assert SolarCalculationService.weather_fingerprint(tmy) != before[0]
+    assert SolarCalculationService.weather_fingerprint(completo) == before[1]
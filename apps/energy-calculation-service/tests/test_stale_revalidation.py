@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para entradas vencidas servidas na carencia e atualizadas em segundo plano
+"""
+
+import sys
+import os
+import importlib
+import sqlite3
+import threading
+import time
+
+# Adicionar o diretorio raiz ao path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+from services.solar.pvgis_service import PVGISService
+from services.solar.weather_repository import WeatherRepository
+from utils.cache import CacheManager
+from utils.cache_index import INDEX_FILENAME
+from utils.cache_janitor import CacheJanitor
+from utils.http_client import UpstreamClient
+from utils.revalidation import BackgroundRefresher
+from utils.single_flight import SingleFlight
+
+pvgis_module = importlib.import_module("services.solar.pvgis_service")
+
+LAT, LON = -23.55, -46.63
+DAY = 24 * 3600
+
+
+@pytest.fixture
+def manager(tmp_path, make_geohash_cache):
+    """Cache com TTL de 30 dias e carencia de 7 dias"""
+    manager = make_geohash_cache(tmp_path)
+    manager.ttl_days = 30
+    manager.stale_grace_hours = 7 * 24
+    return manager
+
+
+def _age(cache_dir, seconds):
+    """Envelhece todas as entradas (indice e arquivos)"""
+    with sqlite3.connect(cache_dir / INDEX_FILENAME) as conn:
+        conn.execute("UPDATE entries SET created_at = created_at - ?", (seconds,))
+    for path in cache_dir.glob("geohash_*.wcol"):
+        mtime = path.stat().st_mtime - seconds
+        os.utime(path, (mtime, mtime))
+
+
+def _wait_idle(refresher, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while refresher.get_stats()["pending"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_entrada_vencida_servida_na_carencia_e_removida_pelo_janitor(tmp_path, manager, make_weather):
+    """Leitura nunca apaga; fora da carencia e miss e o janitor remove"""
+    manager.set(LAT, LON, make_weather(), source="pvgis")
+
+    data, stale_entry = manager.lookup(LAT, LON, source="pvgis")
+    assert data is not None and stale_entry is None
+
+    _age(tmp_path, 31 * DAY)
+    data, stale_entry = manager.lookup(LAT + 0.01, LON, source="pvgis")
+    assert data is not None
+    assert (stale_entry["lat"], stale_entry["lon"]) == (LAT, LON)
+    assert manager.get_fresh(LAT, LON, source="pvgis") is None
+
+    _age(tmp_path, 7 * DAY)
+    assert manager.get(LAT, LON, source="pvgis") is None
+    assert len(list(tmp_path.glob("geohash_*.wcol"))) == 1
+
+    janitor = CacheJanitor({"geohash": manager}, interval=0, budget=manager.budget)
+    assert janitor.run_once() == {"geohash": 1, "lru": 0}
+    assert list(tmp_path.glob("geohash_*.wcol")) == []
+    assert manager.index.count() == 0
+
+
+def test_cache_legado_serve_na_carencia_sem_apagar(tmp_path, monkeypatch):
+    """CacheManager.get nao remove arquivos; clear_expired remove fora da carencia"""
+    monkeypatch.setattr(pvgis_module.settings, "CACHE_TTL_HOURS", 24)
+    monkeypatch.setattr(pvgis_module.settings, "CACHE_STALE_GRACE_HOURS", 24)
+    legacy = CacheManager(cache_dir=tmp_path)
+    legacy.set(LAT, LON, {"valor": 1}, prefix="pvgis")
+    (path,) = tmp_path.glob("pvgis_*")
+
+    def age(hours):
+        mtime = time.time() - hours * 3600
+        os.utime(path, (mtime, mtime))
+
+    age(30)
+    assert legacy.get(LAT, LON, prefix="pvgis") == {"valor": 1}
+    assert legacy.clear_expired() == 0
+
+    age(50)
+    assert legacy.get(LAT, LON, prefix="pvgis") is None
+    assert path.exists()
+    assert legacy.clear_expired() == 1
+    assert not path.exists()
+
+
+def test_refresher_deduplica_e_respeita_circuito_aberto():
+    """Mesma chave uma vez por vez; nada e agendado com o circuito aberto"""
+    refresher = BackgroundRefresher(max_workers=1, min_interval=0)
+    release = threading.Event()
+    calls = []
+
+    def refresh():
+        calls.append(1)
+        release.wait(5)
+
+    assert refresher.submit("k", refresh)
+    assert not refresher.submit("k", refresh)
+
+    client = UpstreamClient("teste", failure_threshold=1, reset_timeout=60)
+    client.breaker.record_failure()
+    assert not refresher.submit("outra", refresh, client=client)
+
+    release.set()
+    _wait_idle(refresher)
+    refresher.shutdown(wait=True)
+
+    stats = refresher.get_stats()
+    assert calls == [1]
+    assert (stats["completed"], stats["skipped_circuit_open"], stats["pending"]) == (1, 1, 0)
+
+
+def test_pvgis_vencido_servido_e_atualizado_em_segundo_plano(tmp_path, monkeypatch, manager, make_weather):
+    """A requisicao recebe o dado vencido; o novo download regrava a entrada"""
+    refresher = BackgroundRefresher(max_workers=1, min_interval=0)
+    monkeypatch.setattr(pvgis_module, "weather_repository", WeatherRepository(
+        cache=manager, flight=SingleFlight(lock_dir=tmp_path / "locks", timeout=5), refresher=refresher
+    ))
+
+    service = PVGISService()
+    downloads = []
+
+    def fake_download(lat, lon):
+        downloads.append((lat, lon))
+        return make_weather(ghi=800.0)
+
+    monkeypatch.setattr(service, "_download_pvgis_data", fake_download)
+
+    manager.set(LAT, LON, make_weather(ghi=500.0), **service.cache_params)
+    _age(tmp_path, 31 * DAY)
+
+    served = service.fetch_weather_data(LAT + 0.01, LON)
+    assert np.all(served["ghi"] == 500.0)
+
+    _wait_idle(refresher)
+    refresher.shutdown(wait=True)
+
+    # Rebaixado nas coordenadas da entrada vencida, que e substituida
+    assert downloads == [(LAT, LON)]
+    assert manager.index.count() == 1
+    fresh = manager.get_fresh(LAT + 0.01, LON, **service.cache_params)
+    assert fresh is not None and np.all(fresh["ghi"] == 800.0)
+
+    service.fetch_weather_data(LAT, LON)
+    assert len(downloads) == 1
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para o repositorio meteorologico unico e a migracao do cache legado
+"""
+
+import sys
+import os
+import pickle
+
+# Adicionar o diretorio raiz ao path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+from services.solar.weather_repository import LEGACY_MIGRATION_MARKER, WeatherRepository
+from utils.cache import CacheManager
+from utils.cache_budget import CacheBudget
+from utils.single_flight import SingleFlight
+
+LAT, LON = -23.55, -46.63
+PARAMS = {"pvgis": {"source": "pvgis"}, "nasa": {"source": "nasa"}}
+
+
+@pytest.fixture
+def caches(tmp_path, make_geohash_cache):
+    """Repositorio sobre o geohash cache e o cache legado, no mesmo diretorio e orcamento"""
+    budget = CacheBudget(tmp_path, max_mb=100)
+    manager = make_geohash_cache(tmp_path, budget=budget)
+    repository = WeatherRepository(cache=manager, flight=SingleFlight(lock_dir=tmp_path / "locks", timeout=5))
+    return repository, CacheManager(cache_dir=tmp_path, budget=budget)
+
+
+def test_carga_unica_gravada_somente_no_geohash(caches, make_weather):
+    """Miss chama a carga uma vez e grava so no geohash cache; vizinho e servido do cache"""
+    repository, legacy = caches
+    loads = []
+
+    def load(lat, lon):
+        loads.append((lat, lon))
+        return make_weather()
+
+    first = repository.get(LAT, LON, PARAMS["pvgis"], load=load)
+    second = repository.get(LAT + 0.01, LON, PARAMS["pvgis"], load=load)
+
+    assert loads == [(LAT, LON)]
+    assert np.all(second["ghi"] == first["ghi"])
+    assert legacy._cache_files() == []
+    assert set(repository.cache.budget.get_stats()["by_owner"]) == {"geohash"}
+    assert (repository.get_stats()["hits"], repository.get_stats()["loads"]) == (1, 1)
+
+    # Sem cache: carga direta, nada gravado
+    repository.get(LAT + 1, LON, PARAMS["pvgis"], load=load, use_cache=False)
+    assert repository.cache.index.count() == 1
+
+
+def test_migracao_importa_colunar_e_pickle_com_coordenadas_conhecidas(caches, make_weather):
+    """Colunar pelo cabecalho; pickle pelas coordenadas do indice; demais removidos"""
+    repository, legacy = caches
+
+    legacy.set(LAT, LON, make_weather(ghi=700.0), prefix="pvgis")
+
+    # Pickle cujas coordenadas ja estao no indice (outra fonte) e um sem correspondencia
+    other_lat, other_lon = -15.78, -47.93
+    repository.store(other_lat, other_lon, make_weather(), {"source": "outra"})
+    for lat, lon in [(other_lat, other_lon), (10.0, 10.0)]:
+        path = legacy._get_cache_filepath(legacy._generate_cache_key(lat, lon), "nasa")
+        with open(path, "wb") as f:
+            pickle.dump(make_weather(ghi=300.0), f)
+
+    stats = repository.migrate_legacy_cache(PARAMS, legacy=legacy)
+
+    assert stats == {"imported": 2, "skipped": 1, "removed": 3}
+    assert legacy._cache_files() == []
+    assert set(repository.cache.budget.get_stats()["by_owner"]) == {"geohash"}
+    assert np.all(repository.cache.get(LAT, LON, **PARAMS["pvgis"])["ghi"] == 700.0)
+    assert np.all(repository.cache.get(other_lat, other_lon, **PARAMS["nasa"])["ghi"] == 300.0)
+    assert repository.cache.get(10.0, 10.0, **PARAMS["nasa"]) is None
+
+
+def test_migracao_executada_uma_unica_vez(tmp_path, caches, make_weather):
+    """Com a marca gravada, arquivos legados posteriores nao sao tocados"""
+    repository, legacy = caches
+    legacy.set(LAT, LON, make_weather(), prefix="pvgis")
+
+    assert repository.migrate_legacy_cache(PARAMS, legacy=legacy)["imported"] == 1
+    assert (tmp_path / LEGACY_MIGRATION_MARKER).exists()
+
+    legacy.set(LAT, LON, make_weather(), prefix="nasa")
+    assert repository.migrate_legacy_cache(PARAMS, legacy=legacy) == {"imported": 0, "skipped": 0, "removed": 0}
+    assert len(legacy._cache_files()) == 1
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Testes para a selecao de fonte meteorologica (fallback e hedging)
+"""
+
+import sys
+import os
+import threading
+import time
+
+# Adicionar o diretorio raiz ao path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+import pytest
+
+from core.config import settings
+from core.exceptions import CalculationError
+from services.solar.weather_source import NASA_POWER, PVGIS, WeatherSourceFetcher
+
+
+class _FakeService:
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.finished = threading.Event()
+
+    def fetch_weather_data(self, lat, lon):
+        self.calls += 1
+        time.sleep(self.delay)
+        self.finished.set()
+        if self.error:
+            raise self.error
+        index = pd.date_range("2020-01-01", periods=24, freq="h", tz="UTC")
+        return pd.DataFrame({"ghi": range(24)}, index=index)
+
+
+@pytest.fixture
+def hedge_settings(monkeypatch):
+    monkeypatch.setattr(settings, "WEATHER_HEDGE_DEFAULT_DELAY_SECONDS", 0.05)
+    monkeypatch.setattr(settings, "WEATHER_HEDGE_MIN_DELAY_SECONDS", 0.01)
+    monkeypatch.setattr(settings, "WEATHER_HEDGE_MIN_SAMPLES", 3)
+
+
+def test_hedged_fonte_secundaria_vence_primaria_lenta(hedge_settings):
+    """Primaria lenta dispara a secundaria, que vence; a primaria termina em segundo plano"""
+    pvgis, nasa = _FakeService(delay=0.5), _FakeService(delay=0.01)
+    fetcher = WeatherSourceFetcher(services={PVGIS: pvgis, NASA_POWER: nasa}, mode="hedged")
+
+    start = time.monotonic()
+    df, source = fetcher.fetch(-23.5, -46.6, "pvgis", allow_fallback=True)
+
+    assert source == NASA_POWER
+    assert len(df) == 24
+    assert time.monotonic() - start < 0.4
+    assert fetcher.get_stats()["hedges_started"] == 1
+
+    # Requisicao perdedora continua e conclui (gravando no cache do servico)
+    assert pvgis.finished.wait(2)
+
+
+def test_hedged_primaria_rapida_nao_dispara_secundaria(hedge_settings):
+    """Resposta dentro do atraso de hedging nao consulta a outra fonte"""
+    pvgis, nasa = _FakeService(), _FakeService()
+    fetcher = WeatherSourceFetcher(services={PVGIS: pvgis, NASA_POWER: nasa}, mode="hedged")
+
+    _, source = fetcher.fetch(-23.5, -46.6, "NASA", allow_fallback=True)
+
+    assert source == NASA_POWER
+    assert pvgis.calls == 0
+
+
+def test_hedged_falha_rapida_usa_fallback(hedge_settings):
+    """Falha da primaria antes do atraso inicia a secundaria imediatamente"""
+    pvgis, nasa = _FakeService(error=ValueError("PVGIS fora do ar")), _FakeService()
+    fetcher = WeatherSourceFetcher(services={PVGIS: pvgis, NASA_POWER: nasa}, mode="hedged")
+
+    _, source = fetcher.fetch(-23.5, -46.6, "pvgis", allow_fallback=True)
+
+    assert source == NASA_POWER
+
+
+def test_atraso_de_hedging_segue_percentil_das_latencias(hedge_settings):
+    """Com amostras suficientes o atraso e o percentil configurado"""
+    fetcher = WeatherSourceFetcher(services={PVGIS: _FakeService(), NASA_POWER: _FakeService()})
+    for seconds in (1.0, 2.0, 3.0, 4.0):
+        fetcher.latencies.record(PVGIS, seconds)
+
+    assert fetcher.hedge_delay(PVGIS) == pytest.approx(3.85)
+    assert fetcher.hedge_delay(NASA_POWER) == 0.05
+
+
+def test_acertos_de_cache_nao_entram_na_janela_de_latencia(hedge_settings, monkeypatch):
+    """So downloads reais (cache miss) alimentam o percentil de hedging"""
+    import services.solar.weather_source as weather_source_module
+
+    class _Repository:
+        cached = True
+
+        def contains(self, lat, lon, cache_params):
+            return self.cached
+
+    repository = _Repository()
+    monkeypatch.setattr(weather_source_module, "weather_repository", repository)
+    pvgis = _FakeService(delay=0.02)
+    pvgis.cache_params = {"source": "pvgis"}
+    fetcher = WeatherSourceFetcher(services={PVGIS: pvgis, NASA_POWER: _FakeService()}, mode="fallback")
+
+    for _ in range(3):
+        fetcher.fetch(-23.5, -46.6, "pvgis", allow_fallback=True)
+    assert fetcher.latencies.percentile(PVGIS, 50, 1) is None
+
+    repository.cached = False
+    fetcher.fetch(-23.5, -46.6, "pvgis", allow_fallback=True)
+    assert fetcher.latencies.percentile(PVGIS, 50, 1) >= 0.02
+    assert fetcher.get_stats()["wins"][PVGIS] == 4
+
+
+def test_fallback_desabilitado_e_ambas_falhando():
+    """Sem fallback a falha da primaria e reportada; com fallback, falha das duas"""
+    pvgis = _FakeService(error=ValueError("timeout"))
+    nasa = _FakeService(error=ValueError("503"))
+    fetcher = WeatherSourceFetcher(services={PVGIS: pvgis, NASA_POWER: nasa}, mode="fallback")
+
+    with pytest.raises(CalculationError, match="fallback está desabilitado"):
+        fetcher.fetch(-23.5, -46.6, "pvgis", allow_fallback=False)
+    assert nasa.calls == 0
+
+    with pytest.raises(CalculationError, match="ambas as fontes"):
+        fetcher.fetch(-23.5, -46.6, "pvgis", allow_fallback=True)
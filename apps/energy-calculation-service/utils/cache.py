@@ -8,15 +8,24 @@ import os
 
 from core.config import settings
 from core.exceptions import CacheError
+from utils.cache_budget import CacheBudget, cache_budget
+from utils.file_io import atomic_write
+from utils.columnar_store import FILE_EXTENSION as COLUMNAR_EXTENSION, is_columnar_compatible, read_columnar, write_columnar
 
 logger = logging.getLogger(__name__)
 
 class CacheManager:
     """Gerenciador de cache para dados PVGIS"""
+
+    # Dono dos arquivos deste gerenciador no orçamento de disco
+    budget_owner = "legacy"
     
-    def __init__(self, cache_dir: Path = None):
+    def __init__(self, cache_dir: Path = None, budget: CacheBudget = None):
         self.cache_dir = cache_dir or settings.CACHE_DIR
         self.cache_dir.mkdir(exist_ok=True)
+        # Orçamento de disco compartilhado com o cache geohash (limpeza LRU pelo janitor)
+        self.budget = budget or (cache_budget if self.cache_dir == cache_budget.cache_dir
+                                 else CacheBudget(self.cache_dir))
     
     def _generate_cache_key(self, lat: float, lon: float, **kwargs) -> str:
         """Gera chave única para cache baseada em coordenadas e parâmetros"""
@@ -37,32 +46,49 @@ class CacheManager:
         hash_object = hashlib.md5(key_string.encode())
         return hash_object.hexdigest()
     
-    def _get_cache_filepath(self, cache_key: str, prefix: str = "pvgis") -> Path:
+    def _get_cache_filepath(self, cache_key: str, prefix: str = "pvgis", extension: str = ".pkl") -> Path:
         """Retorna caminho completo para arquivo de cache"""
-        filename = f"{prefix}_{cache_key}.pkl"
+        filename = f"{prefix}_{cache_key}{extension}"
         return self.cache_dir / filename
+
+    def _cache_files(self) -> List[Path]:
+        """Lista arquivos de cache (colunares e pickle), exceto os do cache geohash"""
+        files = list(self.cache_dir.glob(f"*{COLUMNAR_EXTENSION}")) + list(self.cache_dir.glob("*.pkl"))
+        return [f for f in files if not f.name.startswith("geohash_")]
     
+    def _max_age(self) -> timedelta:
+        """Idade máxima servida: TTL + carência (entradas vencidas são removidas por clear_expired)"""
+        return timedelta(hours=settings.CACHE_TTL_HOURS + settings.CACHE_STALE_GRACE_HOURS)
+
     def get(self, lat: float, lon: float, prefix: str = "pvgis", **kwargs) -> Optional[Any]:
-        """Recupera dados do cache se existir e não expirou"""
+        """Recupera dados do cache se existir e estiver dentro do TTL + carência"""
         try:
             cache_key = self._generate_cache_key(lat, lon, **kwargs)
-            cache_file = self._get_cache_filepath(cache_key, prefix)
+            cache_file = self._get_cache_filepath(cache_key, prefix, COLUMNAR_EXTENSION)
+            if not cache_file.exists():
+                cache_file = self._get_cache_filepath(cache_key, prefix)
             
             if not cache_file.exists():
                 logger.debug(f"Cache miss: {cache_file}")
                 return None
             
-            # Verificar se cache expirou
+            # Vencido mas dentro da carência: servido; fora dela, ignorado
+            # (a remoção fica com clear_expired, fora do caminho da requisição)
             file_age = datetime.now() - datetime.fromtimestamp(cache_file.stat().st_mtime)
-            if file_age > timedelta(hours=settings.CACHE_TTL_HOURS):
+            if file_age > self._max_age():
                 logger.info(f"Cache expirado: {cache_file} (idade: {file_age})")
-                cache_file.unlink()  # Remove arquivo expirado
                 return None
+            if file_age > timedelta(hours=settings.CACHE_TTL_HOURS):
+                logger.info(f"Cache vencido servido dentro da carência: {cache_file} (idade: {file_age})")
             
             # Carregar dados do cache
-            with open(cache_file, 'rb') as f:
-                data = pickle.load(f)
+            if cache_file.suffix == COLUMNAR_EXTENSION:
+                data = read_columnar(cache_file)
+            else:
+                with open(cache_file, 'rb') as f:
+                    data = pickle.load(f)
             
+            self.budget.touch(cache_file.name)
             logger.info(f"Cache hit: {cache_file}")
             return data
             
@@ -75,14 +101,20 @@ class CacheManager:
         try:
             cache_key = self._generate_cache_key(lat, lon, **kwargs)
             cache_file = self._get_cache_filepath(cache_key, prefix)
-            
-            # Verificar espaço em disco antes de salvar
-            if not self._check_disk_space():
-                logger.warning("Espaço em disco insuficiente, limpando cache antigo...")
-                self.cleanup_old_files()
-            
-            with open(cache_file, 'wb') as f:
-                pickle.dump(data, f)
+
+            # Tamanho total controlado pelo janitor (utils.cache_budget), não a cada gravação
+            # Séries temporais em formato colunar; demais tipos via pickle
+            if is_columnar_compatible(data):
+                pickle_file = cache_file
+                cache_file = self._get_cache_filepath(cache_key, prefix, COLUMNAR_EXTENSION)
+                write_columnar(cache_file, data, metadata={'lat': lat, 'lon': lon, 'source': prefix})
+                if pickle_file.exists():
+                    pickle_file.unlink(missing_ok=True)
+                    self.budget.forget([pickle_file.name])
+            else:
+                with atomic_write(cache_file) as f:
+                    pickle.dump(data, f)
+            self.budget.record(self.budget_owner, cache_file)
             
             logger.info(f"Dados salvos no cache: {cache_file}")
             return True
@@ -91,41 +123,23 @@ class CacheManager:
             logger.error(f"Erro ao salvar cache: {e}")
             raise CacheError(f"Falha ao salvar cache: {str(e)}", str(cache_file))
     
-    def _check_disk_space(self) -> bool:
-        """Verifica se há espaço suficiente em disco"""
-        try:
-            # Calcular tamanho atual do diretório de cache
-            total_size = sum(
-                f.stat().st_size for f in self.cache_dir.rglob('*') if f.is_file()
-            )
-            
-            # Converter para MB
-            total_size_mb = total_size / (1024 * 1024)
-            
-            if total_size_mb > settings.MAX_CACHE_SIZE_MB:
-                logger.warning(f"Cache muito grande: {total_size_mb:.1f}MB > {settings.MAX_CACHE_SIZE_MB}MB")
-                return False
-            
-            return True
-            
-        except Exception as e:
-            logger.error(f"Erro ao verificar espaço em disco: {e}")
-            return True  # Assumir que há espaço se não conseguir verificar
-    
     def cleanup_old_files(self, days_old: int = 7) -> int:
         """Remove arquivos de cache antigos"""
         try:
             cutoff_date = datetime.now() - timedelta(days=days_old)
-            removed_count = 0
+            removed = []
             
-            for cache_file in self.cache_dir.glob("*.pkl"):
+            for cache_file in self._cache_files():
                 if cache_file.is_file():
                     file_time = datetime.fromtimestamp(cache_file.stat().st_mtime)
                     if file_time < cutoff_date:
                         cache_file.unlink()
-                        removed_count += 1
+                        removed.append(cache_file.name)
                         logger.debug(f"Arquivo de cache removido: {cache_file}")
             
+            self.budget.forget(removed)
+            removed_count = len(removed)
+            
             if removed_count > 0:
                 logger.info(f"Limpeza de cache: {removed_count} arquivos removidos")
             
@@ -135,14 +149,50 @@ class CacheManager:
             logger.error(f"Erro na limpeza de cache: {e}")
             return 0
     
+    def clear_expired(self) -> int:
+        """Remove arquivos além do TTL + carência (executado pelo janitor)"""
+        try:
+            cutoff = datetime.now() - self._max_age()
+            removed = []
+
+            for cache_file in self._cache_files():
+                try:
+                    if datetime.fromtimestamp(cache_file.stat().st_mtime) < cutoff:
+                        cache_file.unlink()
+                        removed.append(cache_file.name)
+                except FileNotFoundError:
+                    continue
+
+            self.budget.forget(removed)
+            removed_count = len(removed)
+
+            if removed_count > 0:
+                logger.info(f"Cache expirado removido: {removed_count} arquivos")
+
+            return removed_count
+
+        except Exception as e:
+            logger.error(f"Erro ao remover cache expirado: {e}")
+            return 0
+
+    def evict_file(self, file_name: str) -> bool:
+        """Remove um arquivo escolhido pela limpeza LRU do janitor"""
+        try:
+            (self.cache_dir / file_name).unlink(missing_ok=True)
+            return True
+        except OSError as e:
+            logger.warning(f"Erro ao remover {file_name}: {e}")
+            return False
+
     def clear_all(self) -> int:
         """Remove todos os arquivos de cache"""
         try:
             removed_count = 0
-            for cache_file in self.cache_dir.glob("*.pkl"):
+            for cache_file in self._cache_files():
                 if cache_file.is_file():
                     cache_file.unlink()
                     removed_count += 1
+            self.budget.forget_owner(self.budget_owner)
             
             logger.info(f"Cache limpo: {removed_count} arquivos removidos")
             return removed_count
@@ -154,7 +204,7 @@ class CacheManager:
     def get_cache_stats(self) -> Dict[str, Any]:
         """Retorna estatísticas do cache"""
         try:
-            files = list(self.cache_dir.glob("*.pkl"))
+            files = self._cache_files()
             total_files = len(files)
             
             if total_files == 0:
@@ -162,7 +212,8 @@ class CacheManager:
                     "total_files": 0,
                     "total_size_mb": 0,
                     "oldest_file": None,
-                    "newest_file": None
+                    "newest_file": None,
+                    "budget": self.budget.get_stats()
                 }
             
             total_size = sum(f.stat().st_size for f in files)
@@ -177,7 +228,8 @@ class CacheManager:
                 "total_size_mb": round(total_size_mb, 2),
                 "oldest_file": oldest_file.isoformat(),
                 "newest_file": newest_file.isoformat(),
-                "cache_dir": str(self.cache_dir)
+                "cache_dir": str(self.cache_dir),
+                "budget": self.budget.get_stats()
             }
             
         except Exception as e:
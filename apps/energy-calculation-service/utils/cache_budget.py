@@ -0,0 +1,271 @@
+"""
+Shared disk budget for the weather caches.
+
+Both cache managers write into CACHE_DIR. Instead of walking the directory on
+every write, each manager records its writes, reads and deletions in a small
+SQLite ledger (one row per file: owner, size, last access). The running byte
+count is a query over the ledger, and the janitor (utils.cache_janitor)
+evicts least recently used files down to a low-water mark when the total is
+over MAX_CACHE_SIZE_MB.
+
+The ledger is shared by every worker and pool process of the host (WAL mode,
+one connection per operation, like utils.cache_index). Access times are
+written at most once per TOUCH_RESOLUTION_SECONDS per file and process, so a
+hit costs no extra write in the common case.
+"""
+
+import sqlite3
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+BUDGET_FILENAME = "cache_budget.sqlite3"
+
+# Last-access resolution: precise enough for LRU ordering
+TOUCH_RESOLUTION_SECONDS = 60.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    file_name   TEXT PRIMARY KEY,
+    owner       TEXT NOT NULL,
+    size_bytes  INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_files_last_access ON files (last_access);
+"""
+
+
+class CacheBudget:
+    """Byte and last-access accounting for the cache files"""
+
+    def __init__(self, cache_dir: Path = None, max_mb: float = None, low_water_ratio: float = None):
+        """
+        Args:
+            cache_dir: Directory holding the cache files and the ledger (default CACHE_DIR)
+            max_mb: High-water mark (default MAX_CACHE_SIZE_MB; 0 disables eviction)
+            low_water_ratio: Eviction stops below max_mb * ratio (default CACHE_LOW_WATER_RATIO)
+        """
+        self.cache_dir = Path(cache_dir or settings.CACHE_DIR)
+        self.max_mb = settings.MAX_CACHE_SIZE_MB if max_mb is None else max_mb
+        self.low_water_ratio = settings.CACHE_LOW_WATER_RATIO if low_water_ratio is None else low_water_ratio
+        self.db_path = self.cache_dir / BUDGET_FILENAME
+
+        self._initialized = False
+        self._touched: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+        # Counters for this process
+        self.evicted_files = 0
+        self.evicted_bytes = 0
+        self.eviction_runs = 0
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        if not self._initialized:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            if not self._initialized:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                self._initialized = True
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    @property
+    def max_bytes(self) -> int:
+        return int(self.max_mb * 1024 * 1024)
+
+    @property
+    def low_water_bytes(self) -> int:
+        return int(self.max_bytes * self.low_water_ratio)
+
+    def record(self, owner: str, path: Path) -> None:
+        """Record the write (or rewrite) of a file"""
+        try:
+            size = path.stat().st_size
+            now = time.time()
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO files (file_name, owner, size_bytes, last_access) VALUES (?, ?, ?, ?)",
+                    (path.name, owner, size, now)
+                )
+            with self._lock:
+                self._touched[path.name] = now
+        except Exception as e:
+            logger.warning(f"Cache budget: failed to record {path}: {e}")
+
+    def touch(self, file_name: str) -> None:
+        """Update the last access (at most one write per TOUCH_RESOLUTION_SECONDS)"""
+        now = time.time()
+        with self._lock:
+            if now - self._touched.get(file_name, 0.0) < TOUCH_RESOLUTION_SECONDS:
+                return
+            self._touched[file_name] = now
+        try:
+            with self._connect() as conn:
+                conn.execute("UPDATE files SET last_access = ? WHERE file_name = ?", (now, file_name))
+        except Exception as e:
+            logger.warning(f"Cache budget: failed to update access of {file_name}: {e}")
+
+    def forget(self, file_names: Iterable[str]) -> None:
+        """Drop deleted files from the ledger"""
+        names = list(file_names)
+        if not names:
+            return
+        try:
+            with self._connect() as conn:
+                conn.executemany("DELETE FROM files WHERE file_name = ?", [(name,) for name in names])
+            with self._lock:
+                for name in names:
+                    self._touched.pop(name, None)
+        except Exception as e:
+            logger.warning(f"Cache budget: failed to drop ledger rows: {e}")
+
+    def forget_owner(self, owner: str) -> None:
+        """Drop every ledger row of one manager"""
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM files WHERE owner = ?", (owner,))
+        except Exception as e:
+            logger.warning(f"Cache budget: failed to drop ledger rows of {owner}: {e}")
+
+    def adopt(self, owner: str, paths: Iterable[Path]) -> int:
+        """
+        Register existing files of `owner` if it has none registered yet.
+
+        Used once for cache directories written before the ledger existed;
+        the file mtime stands in for the last access.
+
+        Returns:
+            Number of files registered
+        """
+        with self._connect() as conn:
+            if conn.execute("SELECT 1 FROM files WHERE owner = ? LIMIT 1", (owner,)).fetchone():
+                return 0
+
+        rows = []
+        for path in paths:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            rows.append((path.name, owner, stat.st_size, stat.st_mtime))
+
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO files (file_name, owner, size_bytes, last_access) VALUES (?, ?, ?, ?)", rows
+            )
+        if rows:
+            logger.info(f"Cache budget: registered {len(rows)} existing files of {owner}")
+        return len(rows)
+
+    def total_bytes(self, owner: str = None) -> int:
+        """Registered bytes (of one manager, or of all)"""
+        with self._connect() as conn:
+            if owner is None:
+                row = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM files").fetchone()
+            else:
+                row = conn.execute(
+                    "SELECT COALESCE(SUM(size_bytes), 0) FROM files WHERE owner = ?", (owner,)
+                ).fetchone()
+        return int(row[0])
+
+    def _least_recently_used(self, bytes_to_free: int) -> List[Dict[str, Any]]:
+        """Least recently accessed files, up to bytes_to_free"""
+        selected, freed = [], 0
+        with self._connect() as conn:
+            for row in conn.execute("SELECT file_name, owner, size_bytes FROM files ORDER BY last_access"):
+                if freed >= bytes_to_free:
+                    break
+                selected.append(dict(row))
+                freed += row["size_bytes"]
+        return selected
+
+    def enforce(self, evictors: Dict[str, Callable[[str], bool]]) -> Dict[str, int]:
+        """
+        Evict least recently used files while over the high-water mark.
+
+        Args:
+            evictors: owner -> function deleting one of its files by name
+                (and any index entry pointing to it); returns False if the
+                file could not be removed
+
+        Returns:
+            {'files': evicted files, 'bytes': evicted bytes}
+        """
+        if self.max_bytes <= 0:
+            return {'files': 0, 'bytes': 0}
+
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return {'files': 0, 'bytes': 0}
+
+        self.eviction_runs += 1
+        files, freed, removed = 0, 0, []
+        for row in self._least_recently_used(total - self.low_water_bytes):
+            evict = evictors.get(row['owner'])
+            if evict is None:
+                continue
+            try:
+                if not evict(row['file_name']):
+                    continue
+            except Exception as e:
+                logger.warning(f"Cache budget: failed to evict {row['file_name']}: {e}")
+                continue
+            removed.append(row['file_name'])
+            files += 1
+            freed += row['size_bytes']
+
+        self.forget(removed)
+        self.evicted_files += files
+        self.evicted_bytes += freed
+        logger.info(f"Cache budget: evicted {files} files ({freed / 1024 / 1024:.1f}MB) by LRU; "
+                    f"total {total / 1024 / 1024:.1f}MB > limit {self.max_mb}MB")
+        return {'files': files, 'bytes': freed}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Registered usage per manager and this process's eviction counters"""
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT owner, COUNT(*) AS files, COALESCE(SUM(size_bytes), 0) AS size_bytes, "
+                    "MIN(last_access) AS oldest_access FROM files GROUP BY owner"
+                ).fetchall()
+        except Exception as e:
+            logger.error(f"Cache budget: error getting stats: {e}")
+            return {"error": str(e)}
+
+        total = sum(row["size_bytes"] for row in rows)
+        return {
+            "total_files": sum(row["files"] for row in rows),
+            "total_size_mb": round(total / 1024 / 1024, 2),
+            "max_size_mb": self.max_mb,
+            "low_water_mb": round(self.low_water_bytes / 1024 / 1024, 2),
+            "usage_pct": round(total / self.max_bytes * 100, 1) if self.max_bytes > 0 else None,
+            "by_owner": {
+                row["owner"]: {
+                    "files": row["files"],
+                    "size_mb": round(row["size_bytes"] / 1024 / 1024, 2),
+                    "oldest_access": row["oldest_access"]
+                }
+                for row in rows
+            },
+            "eviction_runs": self.eviction_runs,
+            "evicted_files": self.evicted_files,
+            "evicted_mb": round(self.evicted_bytes / 1024 / 1024, 2)
+        }
+
+
+# Global instance: the geohash and legacy caches share CACHE_DIR
+cache_budget = CacheBudget()
@@ -0,0 +1,194 @@
+"""
+SQLite spatial index for the geohash weather cache.
+
+Each cache entry has one row holding its geohash cell, a key for the request
+parameters, its coordinates, payload size, creation/last-access times, file
+name and, for weather frames, a JSON climate summary (utils.climate_summary).
+Finding the nearest entry within the cache radius is then a single
+indexed query over the 3x3 neighbour cells, and only the winning payload is
+read from disk.
+
+The database lives next to the cache files and is shared by all uvicorn
+workers of the host (WAL mode, one connection per operation).
+"""
+
+import json
+import math
+import sqlite3
+import time
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "geohash_index.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    cache_key   TEXT PRIMARY KEY,
+    geohash     TEXT NOT NULL,
+    params_key  TEXT NOT NULL,
+    lat         REAL NOT NULL,
+    lon         REAL NOT NULL,
+    file_name   TEXT NOT NULL,
+    size_bytes  INTEGER NOT NULL,
+    created_at  REAL NOT NULL,
+    last_access REAL NOT NULL,
+    summary     TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_entries_lookup ON entries (params_key, geohash);
+CREATE INDEX IF NOT EXISTS idx_entries_created_at ON entries (created_at);
+"""
+
+_COLUMNS = "cache_key, geohash, params_key, lat, lon, file_name, size_bytes, created_at, last_access, summary"
+
+
+class CacheIndex:
+    """Índice espacial das entradas do cache geohash"""
+
+    def __init__(self, db_path: Path, distance_fn: Callable[[float, float, float, float], float]):
+        """
+        Args:
+            db_path: SQLite file
+            distance_fn: Distance in km between (lat1, lon1, lat2, lon2), registered
+                as the SQL function `distance_km` so ranking happens in the query
+        """
+        self.db_path = Path(db_path)
+        self.distance_fn = distance_fn
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            # Índices criados antes do resumo climático
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(entries)")}
+            if "summary" not in columns:
+                conn.execute("ALTER TABLE entries ADD COLUMN summary TEXT")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.create_function("distance_km", 4, self.distance_fn, deterministic=True)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def upsert(self, cache_key: str, geohash: str, params_key: str, lat: float, lon: float,
+               file_name: str, size_bytes: int, created_at: float = None,
+               summary: Optional[Dict[str, Any]] = None) -> None:
+        """Registra (ou substitui) uma entrada"""
+        now = time.time()
+        created_at = created_at or now
+        summary_json = json.dumps(summary) if summary is not None else None
+
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO entries ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (cache_key, geohash, params_key, lat, lon, file_name, size_bytes, created_at, now, summary_json)
+            )
+
+    def nearest(self, cells: Sequence[str], params_key: str, lat: float, lon: float,
+                radius_km: float, min_created_at: float = 0.0) -> Optional[Dict[str, Any]]:
+        """
+        Entrada mais próxima de (lat, lon) dentro do raio, nas células informadas.
+
+        Returns:
+            Row as dict with an extra `distance_km` field and `summary` decoded
+            (None if not computed), or None
+        """
+        placeholders = ", ".join("?" for _ in cells)
+
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {_COLUMNS}, distance_km(?, ?, lat, lon) AS distance_km FROM entries "
+                f"WHERE params_key = ? AND geohash IN ({placeholders}) AND created_at >= ? "
+                f"AND distance_km(?, ?, lat, lon) <= ? "
+                f"ORDER BY distance_km LIMIT 1",
+                (lat, lon, params_key, *cells, min_created_at, lat, lon, radius_km)
+            ).fetchone()
+
+        if row is None:
+            return None
+        match = dict(row)
+        match["summary"] = json.loads(match["summary"]) if match["summary"] else None
+        return match
+
+    def within(self, params_key: str, lat: float, lon: float, radius_km: float,
+               min_created_at: float = 0.0, limit: int = 4) -> List[Dict[str, Any]]:
+        """
+        Entradas mais próximas de (lat, lon) dentro do raio, em ordem de distância.
+
+        Busca por caixa de coordenadas em vez das células geohash, para raios
+        maiores que a vizinhança 3x3 (interpolação entre entradas vizinhas).
+
+        Returns:
+            Up to `limit` rows as dicts with an extra `distance_km` field
+        """
+        dlat = radius_km / 111.0
+        dlon = radius_km / (111.0 * max(math.cos(math.radians(lat)), 0.01))
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {_COLUMNS}, distance_km(?, ?, lat, lon) AS distance_km FROM entries "
+                f"WHERE params_key = ? AND created_at >= ? "
+                f"AND lat BETWEEN ? AND ? AND lon BETWEEN ? AND ? "
+                f"AND distance_km(?, ?, lat, lon) <= ? "
+                f"ORDER BY distance_km LIMIT ?",
+                (lat, lon, params_key, min_created_at, lat - dlat, lat + dlat, lon - dlon, lon + dlon,
+                 lat, lon, radius_km, limit)
+            ).fetchall()
+
+        matches = [dict(row) for row in rows]
+        for match in matches:
+            match["summary"] = json.loads(match["summary"]) if match["summary"] else None
+        return matches
+
+    def set_summary(self, cache_key: str, summary: Dict[str, Any]) -> None:
+        """Grava o resumo climático de uma entrada existente"""
+        with self._connect() as conn:
+            conn.execute("UPDATE entries SET summary = ? WHERE cache_key = ?", (json.dumps(summary), cache_key))
+
+    def touch(self, cache_key: str) -> None:
+        """Atualiza o último acesso da entrada"""
+        with self._connect() as conn:
+            conn.execute("UPDATE entries SET last_access = ? WHERE cache_key = ?", (time.time(), cache_key))
+
+    def remove(self, cache_key: str) -> None:
+        """Remove a entrada do índice"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM entries WHERE cache_key = ?", (cache_key,))
+
+    def remove_file(self, file_name: str) -> None:
+        """Remove as entradas que apontam para o arquivo"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM entries WHERE file_name = ?", (file_name,))
+
+    def remove_older_than(self, created_before: float) -> List[str]:
+        """Remove entradas criadas antes do instante informado; retorna os arquivos delas"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT file_name FROM entries WHERE created_at < ?", (created_before,)
+            ).fetchall()
+            conn.execute("DELETE FROM entries WHERE created_at < ?", (created_before,))
+
+        return [row["file_name"] for row in rows]
+
+    def coordinates(self) -> List[Tuple[float, float]]:
+        """Coordenadas distintas das entradas indexadas"""
+        with self._connect() as conn:
+            return [(row["lat"], row["lon"]) for row in conn.execute("SELECT DISTINCT lat, lon FROM entries")]
+
+    def clear(self) -> int:
+        """Remove todas as entradas; retorna quantidade removida"""
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM entries").rowcount
+
+    def count(self) -> int:
+        """Quantidade de entradas indexadas"""
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
@@ -0,0 +1,122 @@
+"""
+Periodic cache maintenance: expired entries and the disk size bound.
+
+Reads never delete: entries past their TTL are still served during the stale
+grace window (see utils.revalidation). The janitor runs on a daemon thread of
+each API worker and, on every pass:
+
+1. calls `clear_expired()` on every registered cache, which removes only what
+   is past TTL + grace;
+2. enforces the shared disk budget (utils.cache_budget), evicting least
+   recently used files down to the low-water mark when the total is over
+   MAX_CACHE_SIZE_MB.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+from core.config import settings
+from utils.cache import cache_manager
+from utils.cache_budget import CacheBudget, cache_budget
+from utils.geohash_cache import geohash_cache_manager
+from utils.response_cache import response_cache
+
+logger = logging.getLogger(__name__)
+
+
+class CacheJanitor:
+    """Periodic removal of entries past the grace window"""
+
+    def __init__(self, caches: Dict[str, Any], interval: float = None, budget: CacheBudget = None):
+        """
+        Args:
+            caches: Name -> cache exposing clear_expired() -> int, budget_owner,
+                evict_file(file_name) -> bool and _cache_files()
+            interval: Seconds between runs (default CACHE_JANITOR_INTERVAL_SECONDS; 0 disables)
+            budget: Disk budget shared by the caches (default: the global one)
+        """
+        self.caches = caches
+        self.interval = settings.CACHE_JANITOR_INTERVAL_SECONDS if interval is None else interval
+        self.budget = budget or cache_budget
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        # Counters for this process
+        self.runs = 0
+        self.removed: Dict[str, int] = {name: 0 for name in caches}
+        self.evicted_lru = 0
+
+    def run_once(self) -> Dict[str, int]:
+        """
+        One maintenance pass.
+
+        Returns:
+            Expired files removed per cache name, plus 'lru' with the files
+            evicted to bring the cache under its size bound
+        """
+        removed = {}
+        for name, cache in self.caches.items():
+            try:
+                removed[name] = cache.clear_expired()
+            except Exception as e:
+                logger.error(f"Janitor: error clearing cache {name}: {e}")
+                removed[name] = 0
+            self.removed[name] = self.removed.get(name, 0) + removed[name]
+
+        removed['lru'] = self._enforce_budget()
+        self.evicted_lru += removed['lru']
+
+        self.runs += 1
+        if any(removed.values()):
+            logger.info(f"Janitor: files removed {removed}")
+        return removed
+
+    def _enforce_budget(self) -> int:
+        """LRU eviction down to the low-water mark; files older than the ledger are adopted first"""
+        try:
+            for cache in self.caches.values():
+                self.budget.adopt(cache.budget_owner, cache._cache_files())
+            evictors = {cache.budget_owner: cache.evict_file for cache in self.caches.values()}
+            return self.budget.enforce(evictors)['files']
+        except Exception as e:
+            logger.error(f"Janitor: error enforcing the size bound: {e}")
+            return 0
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.run_once()
+
+    def start(self) -> None:
+        """Start the periodic thread (no-op if disabled or already running)"""
+        if self.interval <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="cache-janitor", daemon=True)
+        self._thread.start()
+        logger.info(f"Cache janitor started (interval {self.interval}s)")
+
+    def stop(self) -> None:
+        """Stop the periodic thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters for this process"""
+        return {
+            "interval_seconds": self.interval,
+            "running": self._thread is not None and self._thread.is_alive(),
+            "runs": self.runs,
+            "removed": dict(self.removed),
+            "evicted_lru": self.evicted_lru
+        }
+
+
+# Global instance: geohash and legacy caches
+cache_janitor = CacheJanitor({"geohash": geohash_cache_manager, "legacy": cache_manager})
+
+# Response cache: its own directory and disk budget
+response_cache_janitor = CacheJanitor({"responses": response_cache}, budget=response_cache.budget)
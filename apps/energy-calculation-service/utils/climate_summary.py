@@ -0,0 +1,69 @@
+"""
+Per-entry climate summary for hourly weather frames.
+
+Computed once when a weather DataFrame is written to the geohash cache and
+stored in the spatial index, so statistics lookups (minimum temperature for
+string sizing, data summaries) do not need to load the hourly data.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_VERSION = 1
+
+# Average days per calendar month (February over the leap cycle)
+_DAYS_IN_MONTH = np.array([31, 28.25, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+_REQUIRED_COLUMNS = ('ghi', 'temp_air')
+
+
+def _monthly_kwh_m2(series: pd.Series) -> List[float]:
+    """Average monthly irradiation (kWh/m²) from the mean hourly value of each month"""
+    means = series.groupby(series.index.month).mean().reindex(range(1, 13))
+    return [round(v, 2) if pd.notna(v) else None for v in (means.to_numpy() * 24 * _DAYS_IN_MONTH / 1000.0)]
+
+
+def summarize_weather(df: Any) -> Optional[Dict[str, Any]]:
+    """
+    Build the summary of an hourly weather frame.
+
+    Returns:
+        JSON-serializable dict, or None if `df` is not a weather frame
+        (DatetimeIndex with at least ghi and temp_air)
+    """
+    if not isinstance(df, pd.DataFrame) or not isinstance(df.index, pd.DatetimeIndex) or df.empty:
+        return None
+    if any(column not in df.columns for column in _REQUIRED_COLUMNS):
+        return None
+
+    index = df.index
+    utc_index = index.tz_convert('UTC') if index.tz is not None else index
+    wind = df['wind_speed'] if 'wind_speed' in df.columns else pd.Series(dtype=float)
+
+    def stat(value: Any) -> Optional[float]:
+        return round(float(value), 2) if pd.notna(value) else None
+
+    summary = {
+        'version': SUMMARY_VERSION,
+        'n_records': int(len(df)),
+        'start': index.min().strftime('%Y-%m-%d'),
+        'end': index.max().strftime('%Y-%m-%d'),
+        'years': sorted(int(y) for y in utc_index.year.unique()),
+        'temp_min': stat(df['temp_air'].min()),
+        'temp_max': stat(df['temp_air'].max()),
+        'temp_mean': stat(df['temp_air'].mean()),
+        'wind_mean': stat(wind.mean()),
+        'wind_max': stat(wind.max()),
+        'wind_p95': stat(wind.quantile(0.95)) if not wind.empty else None,
+        'ghi_mean': stat(df['ghi'].mean()),
+        'ghi_max': stat(df['ghi'].max()),
+    }
+    for column in ('ghi', 'dni', 'dhi'):
+        summary[f'monthly_{column}_kwh_m2'] = _monthly_kwh_m2(df[column]) if column in df.columns else None
+
+    return summary
@@ -0,0 +1,278 @@
+"""
+Columnar, memory-mappable file format for cached weather series.
+
+Pickled DataFrames force every cache hit to deserialize the whole object
+(6 years x 8760 rows x 6 columns) into RAM, even when the caller only needs the
+entry coordinates or a single column. This module stores the same data as raw
+arrays that can be memory-mapped:
+
+    [0:8]    magic b"BESSWCOL"
+    [8:16]   header length (uint64, little endian)
+    [16:..]  JSON header (utf-8), padded so the payload starts 64-byte aligned
+    payload  int64 UTC epoch index (ns) followed by one float32 array per column,
+             each array 64-byte aligned
+
+The header carries the entry metadata (lat, lon, source, years, schema version
+and any extra fields such as cache params), so it can be read without touching
+the payload. Columns are mapped lazily and without copies via numpy.memmap,
+and frames are returned backed by those maps (float32, read-only).
+"""
+
+import json
+import struct
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from utils.file_io import atomic_write
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"BESSWCOL"
+SCHEMA_VERSION = 1
+FILE_EXTENSION = ".wcol"
+
+_ALIGNMENT = 64
+_PREAMBLE = struct.Struct("<8sQ")
+_INDEX_DTYPE = np.dtype("<i8")
+_COLUMN_DTYPE = np.dtype("<f4")
+
+
+class ColumnarFormatError(ValueError):
+    """File is not a valid columnar weather file"""
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def is_columnar_compatible(data: Any) -> bool:
+    """
+    Check whether data can be stored in the columnar format.
+
+    Supported: DataFrame or Series with a DatetimeIndex and numeric values.
+    """
+    if isinstance(data, pd.Series):
+        data = data.to_frame(name=data.name if data.name is not None else "value")
+
+    if not isinstance(data, pd.DataFrame) or not isinstance(data.index, pd.DatetimeIndex):
+        return False
+
+    if not data.columns.map(lambda c: isinstance(c, str)).all():
+        return False
+
+    return all(pd.api.types.is_numeric_dtype(dtype) for dtype in data.dtypes)
+
+
+def write_columnar(path: Path, data: Union[pd.DataFrame, pd.Series], metadata: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Write a weather DataFrame (or Series) to a columnar file.
+
+    Args:
+        path: Destination file
+        data: DataFrame/Series with DatetimeIndex and numeric columns
+        metadata: Extra entry metadata stored in the header (lat, lon, source, params...)
+
+    Returns:
+        Number of bytes written
+
+    Raises:
+        ColumnarFormatError: If data is not supported by the format
+    """
+    if not is_columnar_compatible(data):
+        raise ColumnarFormatError("Only numeric DataFrame/Series with DatetimeIndex are supported")
+
+    kind = "frame"
+    series_name = None
+    if isinstance(data, pd.Series):
+        kind = "series"
+        series_name = data.name
+        data = data.to_frame(name=series_name if series_name is not None else "value")
+
+    index = data.index
+    tz = str(index.tz) if index.tz is not None else None
+    epoch_ns = (index.tz_convert("UTC") if tz else index).asi8.astype(_INDEX_DTYPE, copy=False)
+
+    metadata = dict(metadata or {})
+    years = sorted({int(y) for y in index.year.unique()})
+
+    header: Dict[str, Any] = {
+        "schema_version": SCHEMA_VERSION,
+        "kind": kind,
+        "series_name": series_name,
+        "n_rows": len(data),
+        "tz": tz,
+        "lat": metadata.pop("lat", None),
+        "lon": metadata.pop("lon", None),
+        "source": metadata.pop("source", None),
+        "years": years,
+        "metadata": metadata,
+    }
+
+    # Layout is computed with the header size known, so offsets are absolute
+    columns: List[str] = list(data.columns)
+    layout = {"index": None, "columns": {}}
+    header_bytes = b""
+    for _ in range(3):
+        payload_start = _align(_PREAMBLE.size + len(header_bytes))
+        offset = payload_start
+        layout["index"] = {"offset": offset, "dtype": _INDEX_DTYPE.str, "unit": "ns"}
+        offset = _align(offset + len(data) * _INDEX_DTYPE.itemsize)
+        for name in columns:
+            layout["columns"][name] = {"offset": offset, "dtype": _COLUMN_DTYPE.str}
+            offset = _align(offset + len(data) * _COLUMN_DTYPE.itemsize)
+        header.update(layout)
+        encoded = json.dumps(header, default=_json_default).encode("utf-8")
+        if _align(_PREAMBLE.size + len(encoded)) == payload_start:
+            header_bytes = encoded
+            break
+        header_bytes = encoded
+    else:
+        raise ColumnarFormatError("Could not stabilize columnar header layout")
+
+    # Readers (possibly other processes) see the old file or the complete new one
+    path = Path(path)
+    with atomic_write(path) as f:
+        f.write(_PREAMBLE.pack(MAGIC, len(header_bytes)))
+        f.write(header_bytes)
+        _write_at(f, header["index"]["offset"], epoch_ns)
+        for name in columns:
+            values = data[name].to_numpy(dtype=_COLUMN_DTYPE, na_value=np.nan)
+            _write_at(f, header["columns"][name]["offset"], values)
+        size = f.tell()
+
+    logger.debug(f"Columnar file written: {path} ({len(data)} rows, {len(columns)} columns, {size} bytes)")
+    return size
+
+
+def _write_at(f, offset: int, array: np.ndarray) -> None:
+    padding = offset - f.tell()
+    if padding:
+        f.write(b"\0" * padding)
+    f.write(np.ascontiguousarray(array).tobytes())
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (pd.Timestamp,)):
+        return value.isoformat()
+    return str(value)
+
+
+def read_header(path: Path) -> Dict[str, Any]:
+    """
+    Read only the header of a columnar file (no payload access).
+
+    Raises:
+        ColumnarFormatError: Invalid or unsupported file
+    """
+    with open(path, "rb") as f:
+        preamble = f.read(_PREAMBLE.size)
+        if len(preamble) != _PREAMBLE.size:
+            raise ColumnarFormatError(f"Truncated columnar file: {path}")
+        magic, header_len = _PREAMBLE.unpack(preamble)
+        if magic != MAGIC:
+            raise ColumnarFormatError(f"Not a columnar weather file: {path}")
+        header_bytes = f.read(header_len)
+
+    if len(header_bytes) != header_len:
+        raise ColumnarFormatError(f"Truncated columnar header: {path}")
+
+    header = json.loads(header_bytes.decode("utf-8"))
+    if header.get("schema_version") != SCHEMA_VERSION:
+        raise ColumnarFormatError(
+            f"Unsupported columnar schema version {header.get('schema_version')} in {path}"
+        )
+    return header
+
+
+class ColumnarWeatherFile:
+    """
+    Lazy, read-only view over a columnar weather file.
+
+    Columns are memory-mapped on first access and shared between calls; the
+    hourly payload is never read unless a column or the index is requested.
+
+    Example:
+        >>> entry = ColumnarWeatherFile(path)
+        >>> entry.header['lat'], entry.header['years']
+        (-23.55, [2015, 2016, 2017, 2018, 2019, 2020])
+        >>> ghi = entry.column('ghi')          # float32 memmap, zero-copy
+        >>> df = entry.to_dataframe(['ghi', 'temp_air'])
+    """
+
+    def __init__(self, path: Path, header: Optional[Dict[str, Any]] = None):
+        self.path = Path(path)
+        self.header = header or read_header(self.path)
+        self._columns: Dict[str, np.memmap] = {}
+        self._index: Optional[pd.DatetimeIndex] = None
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.header["columns"].keys())
+
+    @property
+    def n_rows(self) -> int:
+        return self.header["n_rows"]
+
+    def _map(self, spec: Dict[str, Any]) -> np.memmap:
+        return np.memmap(self.path, dtype=np.dtype(spec["dtype"]), mode="r",
+                         offset=spec["offset"], shape=(self.n_rows,))
+
+    def column(self, name: str) -> np.ndarray:
+        """Return a read-only float32 memmap for a column"""
+        if name not in self._columns:
+            spec = self.header["columns"].get(name)
+            if spec is None:
+                raise KeyError(name)
+            self._columns[name] = self._map(spec)
+        return self._columns[name]
+
+    @property
+    def epoch_ns(self) -> np.ndarray:
+        """Read-only int64 UTC epoch (nanoseconds) memmap"""
+        return self._map(self.header["index"])
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        """DatetimeIndex in the original timezone"""
+        if self._index is None:
+            index = pd.DatetimeIndex(self.epoch_ns.view("datetime64[ns]"))
+            if self.header.get("tz"):
+                index = index.tz_localize("UTC").tz_convert(self.header["tz"])
+            self._index = index
+        return self._index
+
+    def to_dataframe(self, columns: Optional[Iterable[str]] = None, dtype: Any = None) -> Union[pd.DataFrame, pd.Series]:
+        """
+        Materialize the requested columns as a pandas object.
+
+        Only the requested columns are read from disk. By default the frame is
+        backed directly by the read-only memmaps in their stored dtype
+        (float32), without copying; callers that need float64 arithmetic
+        widen at their own call site, or pass dtype to convert here.
+
+        Returns:
+            DataFrame, or Series when the entry was written from a Series
+        """
+        names = list(columns) if columns is not None else self.columns
+        data = {
+            name: (self.column(name) if dtype is None else np.asarray(self.column(name), dtype=dtype))
+            for name in names
+        }
+        df = pd.DataFrame(data, index=self.index, copy=False)
+
+        if self.header.get("kind") == "series" and columns is None:
+            series = df.iloc[:, 0]
+            series.name = self.header.get("series_name")
+            return series
+        return df
+
+
+def read_columnar(path: Path, columns: Optional[Iterable[str]] = None) -> Union[pd.DataFrame, pd.Series]:
+    """Convenience wrapper: load a columnar file as DataFrame/Series"""
+    return ColumnarWeatherFile(path).to_dataframe(columns)
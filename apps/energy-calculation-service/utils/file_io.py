@@ -0,0 +1,91 @@
+"""
+File helpers shared by the disk caches: atomic writes and inter-process locks.
+
+Cache files are read by every uvicorn worker and calculation process of the
+host, so a reader must never see a partially written file (atomic_write), and
+work on the same key can be serialized across processes (file_lock).
+"""
+
+import os
+import time
+import uuid
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_LOCK_POLL_SECONDS = 0.05
+
+
+@contextmanager
+def atomic_write(path: Path) -> Iterator[BinaryIO]:
+    """
+    Write a file through a temporary sibling and rename it into place.
+
+    Readers see either the previous file or the complete new one. The
+    temporary file is removed if writing fails.
+
+    Example:
+        >>> with atomic_write(cache_file) as f:
+        ...     pickle.dump(entry, f)
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+
+    try:
+        with open(tmp_path, 'wb') as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except FileNotFoundError:
+            pass
+        raise
+
+
+@contextmanager
+def file_lock(path: Path, timeout: float) -> Iterator[bool]:
+    """
+    Exclusive advisory lock on `path` (flock), shared across threads and processes.
+
+    Yields True when the lock was acquired, False when `timeout` expired; the
+    caller decides whether to proceed unlocked. Without fcntl (Windows) the
+    lock is not taken and False is yielded.
+    """
+    if fcntl is None:
+        yield False
+        return
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(path, 'a+b') as f:
+        deadline = time.monotonic() + timeout
+        acquired = False
+
+        while True:
+            try:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                acquired = True
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    logger.warning(f"Timeout aguardando lock {path} ({timeout}s)")
+                    break
+                time.sleep(_LOCK_POLL_SECONDS)
+
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
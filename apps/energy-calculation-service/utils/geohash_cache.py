@@ -7,15 +7,30 @@ within a configurable radius.
 """
 
 import geohash as gh
+import pandas as pd
 import pickle
+import time
 import logging
 from typing import Optional, Dict, Any, List, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 from math import radians, cos, sin, asin, sqrt
 
 from core.config import settings
 from core.exceptions import CacheError
+from utils.cache_budget import CacheBudget, cache_budget
+from utils.cache_index import CacheIndex, INDEX_FILENAME
+from utils.climate_summary import summarize_weather
+from utils.file_io import atomic_write
+from utils.interpolation import idw_blend
+from utils.memory_cache import MemoryCache
+from utils.columnar_store import (
+    FILE_EXTENSION as COLUMNAR_EXTENSION,
+    ColumnarWeatherFile,
+    is_columnar_compatible,
+    read_header,
+    write_columnar,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -154,24 +169,57 @@ class GeohashCacheManager:
     - Spatial indexing using geohashes (precision 5 = ~4.9km cells)
     - 3x3 neighbor search (covers ~44km² area)
     - Distance verification using haversine formula
+    - SQLite index of entry coordinates (see utils.cache_index): a lookup is one
+      indexed query and only the winning payload is read
+    - In-process LRU memory tier (see utils.memory_cache): repeated hits skip
+      disk and return read-only frames
     - Configurable cache radius (default 15km)
-    - TTL support (default 30 days)
+    - TTL support (default 30 days); expired entries are still served during
+      a grace window (stale-while-revalidate) and deleted by the janitor
+      (see utils.cache_janitor), never on the read path
+    - Size bound shared with the legacy cache (see utils.cache_budget): the
+      janitor evicts least recently used entries above MAX_CACHE_SIZE_MB
+    - Columnar memory-mapped storage for time series (see utils.columnar_store);
+      other data types are pickled
+    - Optional inverse-distance interpolation of weather frames across
+      surrounding entries (see utils.interpolation)
     """
 
-    def __init__(self, cache_dir: Path = None):
+    # Owner name of this manager's files in the cache budget
+    budget_owner = "geohash"
+
+    def __init__(self, cache_dir: Path = None, memory_cache: MemoryCache = None, budget: CacheBudget = None):
         """
         Initialize the geohash cache manager.
 
         Args:
             cache_dir: Directory for cache storage (default from settings)
+            memory_cache: Memory tier (default: new tier with MEMORY_CACHE_MAX_MB budget)
+            budget: Disk budget ledger (default: the shared one if cache_dir is
+                CACHE_DIR, otherwise a ledger in cache_dir)
         """
         self.cache_dir = cache_dir or settings.CACHE_DIR
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.budget = budget or (cache_budget if self.cache_dir == cache_budget.cache_dir
+                                 else CacheBudget(self.cache_dir))
 
         # Cache configuration
         self.geohash_precision = getattr(settings, 'GEOHASH_PRECISION', 5)
         self.cache_radius_km = getattr(settings, 'CACHE_RADIUS_KM', 15.0)
         self.ttl_days = getattr(settings, 'PVGIS_CACHE_TTL_DAYS', 30)
+        self.stale_grace_hours = getattr(settings, 'CACHE_STALE_GRACE_HOURS', 0)
+
+        # Inverse-distance interpolation across neighbouring entries (opt-in)
+        self.interpolation_enabled = getattr(settings, 'CACHE_INTERPOLATION_ENABLED', False)
+        self.interpolation_neighbors = getattr(settings, 'CACHE_INTERPOLATION_MAX_NEIGHBORS', 4)
+        self.interpolation_radius_km = getattr(settings, 'CACHE_INTERPOLATION_RADIUS_KM', 30.0)
+        self.interpolation_power = getattr(settings, 'CACHE_INTERPOLATION_POWER', 2.0)
+        self.interpolation_exact_km = getattr(settings, 'CACHE_INTERPOLATION_EXACT_KM', 1.0)
+        self.interpolated_hits = 0
+
+        # Spatial index, opened on first use
+        self._index: Optional[CacheIndex] = None
+        self.memory = memory_cache or MemoryCache()
 
         logger.info(f"GeohashCacheManager initialized: precision={self.geohash_precision}, "
                    f"radius={self.cache_radius_km}km, ttl={self.ttl_days}days")
@@ -203,51 +251,143 @@ class GeohashCacheManager:
         cache_key = ':'.join(str(p) for p in key_parts)
         return cache_key
 
-    def _get_cache_filepath(self, cache_key: str) -> Path:
+    def cell_key(self, lat: float, lon: float, **params) -> str:
+        """
+        Key of the cache entry that set(lat, lon, **params) would write.
+
+        Used to coalesce concurrent downloads for the same cell and parameters.
+        """
+        geohash_str = encode_geohash(lat, lon, precision=self.geohash_precision)
+        return self._create_cache_key(geohash_str, **params)
+
+    def _create_params_key(self, **params) -> str:
+        """
+        Create the parameter part of the cache key (without geohash).
+
+        Entries sharing this key are candidates for the same lookup.
+
+        Example:
+            >>> _create_params_key(tilt=20, azimuth=0)
+            'azimuth_0:tilt_20'
+        """
+        return ':'.join(f"{key}_{value}" for key, value in sorted(params.items()) if value is not None)
+
+    @property
+    def index(self) -> CacheIndex:
+        """Spatial index of cache entries (built from existing files on first use)."""
+        if self._index is None:
+            index = CacheIndex(self.cache_dir / INDEX_FILENAME, distance_fn=haversine_distance)
+            self._index = index
+            if index.count() == 0:
+                self.rebuild_index()
+        return self._index
+
+    def rebuild_index(self) -> int:
+        """
+        Rebuild the spatial index from the cache files on disk.
+
+        Used on first start with a cache directory written before the index
+        existed. Legacy pickles are loaded once here to read their coordinates.
+
+        Returns:
+            Number of indexed entries
+        """
+        indexed = 0
+        for cache_file in self._cache_files():
+            if not self._is_cache_valid(cache_file):
+                continue
+            try:
+                entry = self._read_entry_metadata(cache_file)
+                cache_key = self._create_cache_key(entry['geohash'], **entry['params'])
+                self.index.upsert(
+                    cache_key=cache_key,
+                    geohash=entry['geohash'],
+                    params_key=self._create_params_key(**entry['params']),
+                    lat=entry['lat'],
+                    lon=entry['lon'],
+                    file_name=cache_file.name,
+                    size_bytes=cache_file.stat().st_size,
+                    created_at=cache_file.stat().st_mtime
+                )
+                indexed += 1
+            except Exception as e:
+                logger.warning(f"Could not index cache file {cache_file}: {e}")
+
+        if indexed:
+            logger.info(f"Geohash cache index rebuilt: {indexed} entries")
+        return indexed
+
+    def _get_cache_filepath(self, cache_key: str, extension: str = ".pkl") -> Path:
         """Get full path for cache file."""
         # Use hash to avoid filesystem issues with long keys
         import hashlib
         key_hash = hashlib.md5(cache_key.encode()).hexdigest()
-        filename = f"geohash_{key_hash}.pkl"
+        filename = f"geohash_{key_hash}{extension}"
         return self.cache_dir / filename
 
+    def _cache_files(self) -> List[Path]:
+        """List all geohash cache files (columnar and pickle)."""
+        return (list(self.cache_dir.glob(f"geohash_*{COLUMNAR_EXTENSION}"))
+                + list(self.cache_dir.glob("geohash_*.pkl")))
+
+    def _read_entry_metadata(self, cache_file: Path) -> Dict[str, Any]:
+        """
+        Read lat, lon, geohash and params of a cache entry.
+
+        Columnar entries only have their header read.
+        """
+        if cache_file.suffix == COLUMNAR_EXTENSION:
+            header = read_header(cache_file)
+            return {'lat': header['lat'], 'lon': header['lon'], **header['metadata']}
+
+        with open(cache_file, 'rb') as f:
+            return pickle.load(f)
+
+    @staticmethod
+    def _load_entry_data(cache_file: Path) -> Any:
+        """
+        Load the payload of a cache entry.
+
+        Columnar entries are returned backed by their float32 memmaps (no
+        copy); the calculations widen to float64 where they need it.
+        """
+        if cache_file.suffix == COLUMNAR_EXTENSION:
+            return ColumnarWeatherFile(cache_file).to_dataframe()
+
+        with open(cache_file, 'rb') as f:
+            return pickle.load(f)['data']
+
+    def _ttl_seconds(self) -> float:
+        return self.ttl_days * 24 * 3600
+
+    def _max_age_seconds(self) -> float:
+        """Age after which an entry is no longer served (TTL + stale grace)."""
+        return self._ttl_seconds() + self.stale_grace_hours * 3600
+
     def _is_cache_valid(self, filepath: Path) -> bool:
         """
-        Check if cache file exists and has not expired.
+        Check if cache file exists and can still be served (TTL + stale grace).
+
+        Expired files are left on disk; clear_expired() removes them.
 
         Args:
             filepath: Path to cache file
 
         Returns:
-            True if cache is valid and not expired
+            True if cache exists and is within TTL + grace
         """
         if not filepath.exists():
             return False
 
-        # Check TTL
-        file_age = datetime.now() - datetime.fromtimestamp(filepath.stat().st_mtime)
-        ttl_seconds = self.ttl_days * 24 * 3600
-
-        if file_age.total_seconds() > ttl_seconds:
-            logger.debug(f"Cache expired: {filepath} (age: {file_age.days} days)")
-            try:
-                filepath.unlink()  # Remove expired file
-            except Exception as e:
-                logger.warning(f"Could not remove expired cache: {e}")
-            return False
-
-        return True
+        file_age = time.time() - filepath.stat().st_mtime
+        return file_age <= self._max_age_seconds()
 
     def get(self, lat: float, lon: float, **params) -> Optional[Any]:
         """
         Retrieve data from cache using geohash-based neighbor search.
 
-        Search strategy:
-        1. Generate geohash for target location
-        2. Get current cell + 8 neighbors (3x3 grid)
-        3. Search each cell for cached data
-        4. Verify distance is within radius using haversine
-        5. Return closest match if found
+        Entries past their TTL are returned during the stale grace window;
+        callers that can refresh them use lookup() instead.
 
         Args:
             lat: Target latitude
@@ -261,61 +401,238 @@ class GeohashCacheManager:
             >>> cache.get(-23.5505, -46.6333, tilt=20, azimuth=0)
             <cached_data>  # If found within 15km
         """
+        return self.lookup(lat, lon, **params)[0]
+
+    def get_fresh(self, lat: float, lon: float, **params) -> Optional[Any]:
+        """Like get(), but entries past their TTL count as a miss."""
+        data, stale_entry = self.lookup(lat, lon, **params)
+        return data if stale_entry is None else None
+
+    def lookup(self, lat: float, lon: float, **params) -> Tuple[Optional[Any], Optional[Dict[str, Any]]]:
+        """
+        Retrieve data from cache and report whether it is stale.
+
+        Search strategy:
+        1. Generate geohash for target location
+        2. Get current cell + 8 neighbors (3x3 grid)
+        3. Query the spatial index for the closest entry in those cells
+           within radius and within TTL + stale grace (haversine distance
+           computed in the query)
+        4. Serve the winning entry from the memory tier, or load its payload
+
+        With CACHE_INTERPOLATION_ENABLED, a weather frame with no entry within
+        CACHE_INTERPOLATION_EXACT_KM is first synthesized from the surrounding
+        entries (_interpolate); provenance is in attrs['interpolation'].
+
+        Pandas objects are returned with read-only arrays (shared with the memory
+        tier): replacing columns is fine, in-place writes raise.
+
+        Args:
+            lat: Target latitude
+            lon: Target longitude
+            **params: Additional cache parameters (tilt, azimuth, etc.)
+
+        Returns:
+            Tuple (data or None, index row of the entry if it is past its TTL
+            else None). The row's lat/lon locate the entry to refresh.
+        """
         try:
             # Generate geohash for target location
             target_geohash = encode_geohash(lat, lon, precision=self.geohash_precision)
 
             # Get all neighbor cells (3x3 grid)
             neighbor_cells = get_neighbors(target_geohash)
+            params_key = self._create_params_key(**params)
+            now = time.time()
+            min_created_at = now - self._max_age_seconds()
 
             logger.debug(f"Searching cache in {len(neighbor_cells)} cells for ({lat}, {lon})")
 
-            closest_match = None
-            closest_distance = float('inf')
+            # Opt-in: blend surrounding entries instead of reusing the nearest one
+            if self.interpolation_enabled:
+                blended = self._interpolate(lat, lon, params_key, now, min_created_at)
+                if blended is not None:
+                    return blended
+
+            # At most one entry per cell and params; stale rows are dropped and the query repeated
+            for _ in neighbor_cells:
+                match = self.index.nearest(
+                    neighbor_cells, params_key, lat, lon,
+                    radius_km=self.cache_radius_km, min_created_at=min_created_at
+                )
+                if match is None:
+                    break
+
+                data = self._load_match(match)
+                if data is None:
+                    continue
 
-            # Search in all neighbor cells
-            for cell_geohash in neighbor_cells:
-                cache_key = self._create_cache_key(cell_geohash, **params)
-                cache_file = self._get_cache_filepath(cache_key)
+                stale_entry = match if now - match['created_at'] > self._ttl_seconds() else None
+                logger.info(f"Cache HIT{' (stale)' if stale_entry else ''}: Found data at "
+                           f"{match['distance_km']:.2f}km from target ({lat}, {lon}) in cell {match['geohash']}")
+                return data, stale_entry
 
-                # Check if cache file is valid
-                if not self._is_cache_valid(cache_file):
-                    continue
+            logger.debug(f"Cache MISS: No data found within {self.cache_radius_km}km of ({lat}, {lon})")
+            return None, None
 
-                # Load cached data
-                try:
-                    with open(cache_file, 'rb') as f:
-                        cached_entry = pickle.load(f)
+        except Exception as e:
+            logger.error(f"Error in geohash cache get: {e}")
+            # Fallback gracefully - don't break the application
+            return None, None
 
-                    cached_lat = cached_entry['lat']
-                    cached_lon = cached_entry['lon']
+    def _load_match(self, match: Dict[str, Any]) -> Optional[Any]:
+        """
+        Payload of an index row, from the memory tier or disk.
 
-                    # Calculate distance to cached location
-                    distance = haversine_distance(lat, lon, cached_lat, cached_lon)
+        Rows whose file is missing or unreadable are dropped from the index
+        and None is returned.
+        """
+        # created_at distinguishes a rewritten entry from the version held in memory
+        memory_key = (match['cache_key'], match['created_at'])
+        data = self.memory.get(memory_key)
+        if data is not None:
+            self.index.touch(match['cache_key'])
+            self.budget.touch(match['file_name'])
+            logger.debug(f"Memory cache HIT for cell {match['geohash']} ({match['distance_km']:.2f}km)")
+            return data
+
+        cache_file = self.cache_dir / match['file_name']
+        if not cache_file.exists():
+            self.index.remove(match['cache_key'])
+            self.budget.forget([match['file_name']])
+            return None
 
-                    logger.debug(f"Found cache in cell {cell_geohash}: distance={distance:.2f}km")
+        try:
+            data = self._load_entry_data(cache_file)
+        except Exception as e:
+            logger.warning(f"Error reading cache file {cache_file}: {e}")
+            self.index.remove(match['cache_key'])
+            return None
 
-                    # Check if within radius and closer than previous matches
-                    if distance <= self.cache_radius_km and distance < closest_distance:
-                        closest_match = cached_entry
-                        closest_distance = distance
+        self.index.touch(match['cache_key'])
+        self.budget.touch(match['file_name'])
+        return self.memory.set(memory_key, data)
 
-                except Exception as e:
-                    logger.warning(f"Error reading cache file {cache_file}: {e}")
-                    continue
+    def _interpolate(self, lat: float, lon: float, params_key: str, now: float,
+                     min_created_at: float) -> Optional[Tuple[Any, Optional[Dict[str, Any]]]]:
+        """
+        Inverse-distance blend of the entries surrounding (lat, lon).
 
-            # Return closest match if found
-            if closest_match is not None:
-                logger.info(f"Cache HIT: Found data at {closest_distance:.2f}km from target "
-                           f"({lat}, {lon}) in cell {encode_geohash(closest_match['lat'], closest_match['lon'])}")
-                return closest_match['data']
+        Returns None, so the caller falls back to the nearest entry, when the
+        nearest entry is within CACHE_INTERPOLATION_EXACT_KM, when fewer than
+        two aligned weather frames are within CACHE_INTERPOLATION_RADIUS_KM,
+        or for non-frame payloads.
 
-            logger.debug(f"Cache MISS: No data found within {self.cache_radius_km}km of ({lat}, {lon})")
+        Returns:
+            Same tuple as lookup(); the stale row is that of the nearest
+            stale source entry, so it gets refreshed
+        """
+        matches = self.index.within(
+            params_key, lat, lon, radius_km=self.interpolation_radius_km,
+            min_created_at=min_created_at, limit=max(2, self.interpolation_neighbors)
+        )
+        if len(matches) < 2 or matches[0]['distance_km'] <= self.interpolation_exact_km:
+            return None
+
+        frames, sources = [], []
+        for match in matches:
+            data = self._load_match(match)
+            if isinstance(data, pd.DataFrame):
+                frames.append(data)
+                sources.append(match)
+        if len(frames) < 2:
+            return None
+
+        blended = idw_blend(frames, sources, self.interpolation_power)
+        if blended is None:
+            return None
+
+        used = {(source['lat'], source['lon']) for source in blended.attrs['interpolation']['sources']}
+        stale_entry = next(
+            (source for source in sources
+             if (source['lat'], source['lon']) in used and now - source['created_at'] > self._ttl_seconds()),
+            None
+        )
+        self.interpolated_hits += 1
+        logger.info(f"Cache HIT (IDW): blended {len(used)} entries within "
+                   f"{self.interpolation_radius_km}km of ({lat}, {lon})")
+        return blended, stale_entry
+
+    def get_summary(self, lat: float, lon: float, **params) -> Optional[Dict[str, Any]]:
+        """
+        Climate summary of the nearest entry, without loading it.
+
+        Entries indexed before summaries existed are loaded once and their
+        summary is backfilled into the index. The backfill always reads the
+        entry itself, never an interpolated blend, since the summary is
+        stored on that entry's row.
+
+        Returns:
+            Summary dict (see utils.climate_summary), or None if there is no
+            entry within radius or the entry is not a weather frame
+        """
+        try:
+            neighbor_cells = get_neighbors(encode_geohash(lat, lon, precision=self.geohash_precision))
+            match = self.index.nearest(
+                neighbor_cells, self._create_params_key(**params), lat, lon,
+                radius_km=self.cache_radius_km, min_created_at=time.time() - self._max_age_seconds()
+            )
+            if match is None:
+                return None
+            if not (self.cache_dir / match['file_name']).exists():
+                self.index.remove(match['cache_key'])
+                return None
+            if match['summary'] is not None:
+                return match['summary']
+
+            summary = summarize_weather(self._load_match(match))
+            if summary is not None:
+                self.index.set_summary(match['cache_key'], summary)
+            return summary
+
+        except Exception as e:
+            logger.error(f"Error in geohash cache summary: {e}")
             return None
 
+    def get_version(self, lat: float, lon: float, **params) -> Optional[str]:
+        """
+        Identity of the entries get() would serve (cache key and creation
+        time of each), without loading them; changes whenever one of them is
+        rewritten or, with interpolation, a neighbour is added or refreshed.
+
+        With CACHE_INTERPOLATION_ENABLED every entry that _interpolate() would
+        blend is included, not only the nearest one.
+
+        Returns:
+            "<cache_key>@<created_at>[,...]" or None if there is no entry within radius
+        """
+        try:
+            params_key = self._create_params_key(**params)
+            min_created_at = time.time() - self._max_age_seconds()
+
+            matches = []
+            if self.interpolation_enabled:
+                candidates = self.index.within(
+                    params_key, lat, lon, radius_km=self.interpolation_radius_km,
+                    min_created_at=min_created_at, limit=max(2, self.interpolation_neighbors)
+                )
+                if len(candidates) >= 2 and candidates[0]['distance_km'] > self.interpolation_exact_km:
+                    matches = candidates
+
+            if not matches:
+                neighbor_cells = get_neighbors(encode_geohash(lat, lon, precision=self.geohash_precision))
+                match = self.index.nearest(
+                    neighbor_cells, params_key, lat, lon,
+                    radius_km=self.cache_radius_km, min_created_at=min_created_at
+                )
+                matches = [match] if match else []
+
+            if not matches:
+                return None
+            return ",".join(f"{match['cache_key']}@{match['created_at']:.3f}" for match in matches)
+
         except Exception as e:
-            logger.error(f"Error in geohash cache get: {e}")
-            # Fallback gracefully - don't break the application
+            logger.error(f"Error in geohash cache version: {e}")
             return None
 
     def set(self, lat: float, lon: float, data: Any, **params) -> bool:
@@ -346,7 +663,7 @@ class GeohashCacheManager:
 
             # Create cache key
             cache_key = self._create_cache_key(geohash_str, **params)
-            cache_file = self._get_cache_filepath(cache_key)
+            pickle_file = self._get_cache_filepath(cache_key)
 
             # Create cache entry with metadata
             cache_entry = {
@@ -355,12 +672,34 @@ class GeohashCacheManager:
                 'geohash': geohash_str,
                 'timestamp': datetime.now().isoformat(),
                 'params': params,
-                'data': data
             }
 
-            # Save to disk
-            with open(cache_file, 'wb') as f:
-                pickle.dump(cache_entry, f)
+            # Save to disk: time series as columnar file, anything else pickled
+            if is_columnar_compatible(data):
+                cache_file = self._get_cache_filepath(cache_key, COLUMNAR_EXTENSION)
+                write_columnar(cache_file, data, metadata={
+                    **cache_entry, 'source': params.get('source')
+                })
+                # Drop a legacy pickle for the same key so it cannot shadow the new entry
+                if pickle_file.exists():
+                    pickle_file.unlink(missing_ok=True)
+                    self.budget.forget([pickle_file.name])
+            else:
+                cache_file = pickle_file
+                with atomic_write(cache_file) as f:
+                    pickle.dump({**cache_entry, 'data': data}, f)
+
+            self.index.upsert(
+                cache_key=cache_key,
+                geohash=geohash_str,
+                params_key=self._create_params_key(**params),
+                lat=lat,
+                lon=lon,
+                file_name=cache_file.name,
+                size_bytes=cache_file.stat().st_size,
+                summary=summarize_weather(data)
+            )
+            self.budget.record(self.budget_owner, cache_file)
 
             logger.info(f"Cache SET: Saved data for ({lat}, {lon}) with geohash {geohash_str}")
             logger.debug(f"Cache file: {cache_file}")
@@ -382,11 +721,14 @@ class GeohashCacheManager:
             - total_size_mb: Total cache size in MB
             - oldest_file: Date of oldest cache entry
             - newest_file: Date of newest cache entry
+            - indexed_entries: Number of entries in the spatial index
+            - memory_tier: Memory tier occupancy and hit/miss counters (this process)
+            - budget: Disk budget shared with the legacy cache (utils.cache_budget)
             - cache_dir: Cache directory path
             - config: Cache configuration
         """
         try:
-            files = list(self.cache_dir.glob("geohash_*.pkl"))
+            files = self._cache_files()
             total_files = len(files)
 
             if total_files == 0:
@@ -395,11 +737,16 @@ class GeohashCacheManager:
                     "total_size_mb": 0.0,
                     "oldest_file": None,
                     "newest_file": None,
+                    "indexed_entries": self.index.count(),
+                    "memory_tier": self.memory.get_stats(),
+                    "budget": self.budget.get_stats(),
                     "cache_dir": str(self.cache_dir),
                     "config": {
                         "geohash_precision": self.geohash_precision,
                         "cache_radius_km": self.cache_radius_km,
-                        "ttl_days": self.ttl_days
+                        "ttl_days": self.ttl_days,
+                        "stale_grace_hours": self.stale_grace_hours,
+                        "interpolation": self._interpolation_config()
                     }
                 }
 
@@ -415,11 +762,16 @@ class GeohashCacheManager:
                 "total_size_mb": round(total_size_mb, 2),
                 "oldest_file": oldest_file.isoformat(),
                 "newest_file": newest_file.isoformat(),
+                "indexed_entries": self.index.count(),
+                "memory_tier": self.memory.get_stats(),
+                "budget": self.budget.get_stats(),
                 "cache_dir": str(self.cache_dir),
                 "config": {
                     "geohash_precision": self.geohash_precision,
                     "cache_radius_km": self.cache_radius_km,
-                    "ttl_days": self.ttl_days
+                    "ttl_days": self.ttl_days,
+                    "stale_grace_hours": self.stale_grace_hours,
+                    "interpolation": self._interpolation_config()
                 }
             }
 
@@ -427,20 +779,41 @@ class GeohashCacheManager:
             logger.error(f"Error getting cache stats: {e}")
             return {"error": str(e)}
 
+    def _interpolation_config(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.interpolation_enabled,
+            "max_neighbors": self.interpolation_neighbors,
+            "radius_km": self.interpolation_radius_km,
+            "power": self.interpolation_power,
+            "exact_km": self.interpolation_exact_km,
+            "interpolated_hits": self.interpolated_hits
+        }
+
     def clear_expired(self) -> int:
         """
-        Remove expired cache files.
+        Remove cache files past their TTL + stale grace, and their index rows.
+
+        Called by the janitor (utils.cache_janitor) and the admin cleanup
+        endpoint; reads never delete.
 
         Returns:
             Number of files removed
         """
         try:
-            removed_count = 0
-            files = list(self.cache_dir.glob("geohash_*.pkl"))
+            removed = []
+            cutoff = time.time() - self._max_age_seconds()
 
-            for cache_file in files:
-                if not self._is_cache_valid(cache_file):
-                    removed_count += 1
+            for cache_file in self._cache_files():
+                try:
+                    if cache_file.stat().st_mtime < cutoff:
+                        cache_file.unlink()
+                        removed.append(cache_file.name)
+                except FileNotFoundError:
+                    continue
+
+            self.index.remove_older_than(cutoff)
+            self.budget.forget(removed)
+            removed_count = len(removed)
 
             if removed_count > 0:
                 logger.info(f"Cleared {removed_count} expired cache files")
@@ -451,6 +824,21 @@ class GeohashCacheManager:
             logger.error(f"Error clearing expired cache: {e}")
             return 0
 
+    def evict_file(self, file_name: str) -> bool:
+        """
+        Remove one cache file and its index entry (LRU eviction by the janitor).
+
+        Returns:
+            True if the file is gone
+        """
+        try:
+            (self.cache_dir / file_name).unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Could not evict {file_name}: {e}")
+            return False
+        self.index.remove_file(file_name)
+        return True
+
     def clear_all(self) -> int:
         """
         Remove all geohash cache files.
@@ -460,7 +848,7 @@ class GeohashCacheManager:
         """
         try:
             removed_count = 0
-            files = list(self.cache_dir.glob("geohash_*.pkl"))
+            files = self._cache_files()
 
             for cache_file in files:
                 try:
@@ -469,6 +857,10 @@ class GeohashCacheManager:
                 except Exception as e:
                     logger.warning(f"Could not remove {cache_file}: {e}")
 
+            self.index.clear()
+            self.budget.forget_owner(self.budget_owner)
+            self.memory.clear()
+
             logger.info(f"Cleared all geohash cache: {removed_count} files removed")
             return removed_count
 
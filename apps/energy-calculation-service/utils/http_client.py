@@ -0,0 +1,247 @@
+"""
+Shared HTTP client for upstream weather providers (PVGIS, NASA POWER).
+
+One UpstreamClient per provider keeps a pooled requests.Session (HTTP
+keep-alive), retries transient failures with jittered exponential backoff,
+limits concurrent requests per host and trips a circuit breaker after
+repeated failures so a provider that is down fails fast instead of holding a
+worker for the full timeout.
+
+Downloads run synchronously inside the calculation pool, so the client is
+thread-based; each process has its own sessions, limits, breaker and
+counters. get_stats() reports the calling process only: the uvicorn worker
+that serves /admin/upstream/stats does not see the downloads made by its
+pool processes.
+"""
+
+import os
+import random
+import threading
+import time
+import logging
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(requests.RequestException):
+    """Provider circuit is open; the request was not sent"""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker: closed -> open after `failure_threshold` consecutive
+    failures; after `reset_timeout` seconds one trial request is let through
+    (half-open) and its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """True if a request may be sent now"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                # Uma única requisição de teste
+                self._state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(f"Circuit breaker aberto após {self._failures} falhas consecutivas")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class UpstreamClient:
+    """Cliente HTTP de um provedor externo com pool, retries, limite por host e circuit breaker"""
+
+    def __init__(
+        self,
+        name: str,
+        max_retries: int = None,
+        backoff_base: float = None,
+        backoff_max: float = None,
+        max_concurrency_per_host: int = None,
+        failure_threshold: int = None,
+        reset_timeout: float = None
+    ):
+        self.name = name
+        self.max_retries = settings.UPSTREAM_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_base = settings.UPSTREAM_BACKOFF_BASE_SECONDS if backoff_base is None else backoff_base
+        self.backoff_max = settings.UPSTREAM_BACKOFF_MAX_SECONDS if backoff_max is None else backoff_max
+        self.max_concurrency_per_host = max_concurrency_per_host or settings.UPSTREAM_MAX_CONCURRENCY_PER_HOST
+
+        self.breaker = CircuitBreaker(
+            failure_threshold=failure_threshold or settings.UPSTREAM_CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=settings.UPSTREAM_CIRCUIT_RESET_SECONDS if reset_timeout is None else reset_timeout
+        )
+
+        self._session: Optional[requests.Session] = None
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+        # Contadores deste processo
+        self.requests_sent = 0
+        self.retries = 0
+        self.failures = 0
+        self.rejected = 0
+
+    @property
+    def session(self) -> requests.Session:
+        # Criada sob demanda: cada processo do pool tem a sua
+        with self._lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=self.max_concurrency_per_host,
+                    pool_maxsize=self.max_concurrency_per_host
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
+    def _semaphore(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.max_concurrency_per_host)
+            return self._semaphores[host]
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        # Retry-After do provedor tem prioridade (limitado ao máximo configurado)
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+
+        # Full jitter: uniforme entre 0 e base * 2^attempt
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def get(self, url: str, timeout: float, **kwargs: Any) -> requests.Response:
+        """
+        GET com retries e circuit breaker.
+
+        Returns:
+            Response with a 2xx status
+
+        Raises:
+            CircuitOpenError: Provider circuit is open
+            requests.HTTPError: Non-retryable status, or retryable status after all retries
+            requests.RequestException: Connection error, timeout or broken response after all retries
+        """
+        if not self.breaker.allow():
+            self.rejected += 1
+            raise CircuitOpenError(f"Provedor {self.name} indisponível (circuit breaker aberto)")
+
+        semaphore = self._semaphore(url)
+        last_error: Optional[Exception] = None
+        outcome_recorded = False
+
+        try:
+            for attempt in range(self.max_retries + 1):
+                response = None
+                try:
+                    with semaphore:
+                        self.requests_sent += 1
+                        response = self.session.get(url, timeout=timeout, **kwargs)
+
+                    if response.status_code not in RETRYABLE_STATUS:
+                        response.raise_for_status()
+                        self.breaker.record_success()
+                        outcome_recorded = True
+                        return response
+
+                    last_error = requests.HTTPError(
+                        f"{response.status_code} Server Error for url: {url}", response=response
+                    )
+
+                except requests.HTTPError:
+                    # 4xx não retentável: o provedor está respondendo
+                    self.breaker.record_success()
+                    outcome_recorded = True
+                    raise
+                except requests.RequestException as e:
+                    # Conexão, timeout, corpo truncado/ilegível, redirecionamentos...
+                    last_error = e
+
+                if attempt < self.max_retries:
+                    delay = self._backoff(attempt, response)
+                    self.retries += 1
+                    logger.warning(f"{self.name}: tentativa {attempt + 1} falhou ({last_error}); "
+                                   f"nova tentativa em {delay:.1f}s")
+                    time.sleep(delay)
+
+            self.failures += 1
+            self.breaker.record_failure()
+            outcome_recorded = True
+            raise last_error
+
+        finally:
+            # Qualquer outra saída (exceção inesperada) conta como falha; sem isso
+            # uma requisição de teste deixaria o circuito meio aberto para sempre
+            if not outcome_recorded:
+                self.failures += 1
+                self.breaker.record_failure()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Contadores e estado do circuit breaker deste processo (não agregados entre processos)"""
+        return {
+            "provider": self.name,
+            "scope": "process",
+            "pid": os.getpid(),
+            "circuit_state": self.breaker.state,
+            "requests_sent": self.requests_sent,
+            "retries": self.retries,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "max_concurrency_per_host": self.max_concurrency_per_host
+        }
+
+    def close(self) -> None:
+        """Fecha as conexões do pool"""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+# Clientes globais por provedor
+pvgis_client = UpstreamClient("pvgis")
+nasa_power_client = UpstreamClient("nasa_power")
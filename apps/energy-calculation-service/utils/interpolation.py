@@ -0,0 +1,101 @@
+"""
+Inverse-distance weighting (IDW) of cached hourly weather frames.
+
+Used by the geohash cache in interpolation mode (CACHE_INTERPOLATION_ENABLED):
+instead of reusing the single nearest entry, a series for the target site is
+synthesized from up to CACHE_INTERPOLATION_MAX_NEIGHBORS surrounding entries,
+weighted by 1 / distance^p. The blend is one tensor product over the stacked
+column arrays (memory-mapped for columnar entries).
+
+The result carries its provenance in `DataFrame.attrs['interpolation']`:
+method, power and, per source entry, its coordinates, distance and weight.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Frames whose timestamps differ by less than this are the same hourly slots
+# (PVGIS stamps each hour with a site-dependent minute offset)
+MAX_SLOT_OFFSET = pd.Timedelta(hours=1)
+
+# Distances below this (km) are clamped to avoid an infinite weight
+_MIN_DISTANCE_KM = 1e-3
+
+
+def idw_weights(distances_km: Sequence[float], power: float) -> np.ndarray:
+    """Normalized inverse-distance weights"""
+    distances = np.maximum(np.asarray(distances_km, dtype=float), _MIN_DISTANCE_KM)
+    weights = distances ** -power
+    return weights / weights.sum()
+
+
+def aligned(reference: pd.DataFrame, frame: Any) -> bool:
+    """True if `frame` has the columns and hourly slots of `reference`"""
+    if not isinstance(frame, pd.DataFrame) or len(frame) != len(reference):
+        return False
+    if not reference.columns.equals(frame.columns):
+        return False
+    if not isinstance(frame.index, pd.DatetimeIndex) or not isinstance(reference.index, pd.DatetimeIndex):
+        return frame.index.equals(reference.index)
+    if frame.index.equals(reference.index):
+        return True
+    try:
+        offsets = np.abs(frame.index.asi8 - reference.index.asi8)
+    except TypeError:
+        return False
+    return bool(offsets.max(initial=0) < MAX_SLOT_OFFSET.value)
+
+
+def idw_blend(frames: List[pd.DataFrame], sources: List[Dict[str, Any]],
+              power: float) -> Optional[pd.DataFrame]:
+    """
+    Blend aligned frames by inverse-distance weighting.
+
+    Numeric columns are weighted; other columns, and the index, are taken
+    from the first (nearest) frame.
+
+    Args:
+        frames: Frames ordered by distance, nearest first
+        sources: One dict per frame with at least `lat`, `lon` and `distance_km`
+        power: Distance exponent
+
+    Returns:
+        Blended frame with provenance in attrs, or None if fewer than two
+        frames are aligned with the nearest one
+    """
+    reference = frames[0]
+    keep = [i for i, frame in enumerate(frames) if i == 0 or aligned(reference, frame)]
+    if len(keep) < 2:
+        return None
+    if len(keep) < len(frames):
+        logger.debug(f"IDW: {len(frames) - len(keep)} misaligned neighbour(s) skipped")
+
+    weights = idw_weights([sources[i]['distance_km'] for i in keep], power)
+
+    numeric = [column for column in reference.columns if pd.api.types.is_numeric_dtype(reference[column])]
+    blended = reference.copy()
+    if numeric:
+        stacked = np.stack([frames[i][numeric].to_numpy(dtype=float) for i in keep])
+        blended[numeric] = np.tensordot(weights, stacked, axes=1)
+
+    blended.attrs = {
+        'interpolation': {
+            'method': 'idw',
+            'power': power,
+            'sources': [
+                {
+                    'lat': sources[i]['lat'],
+                    'lon': sources[i]['lon'],
+                    'distance_km': round(float(sources[i]['distance_km']), 3),
+                    'weight': round(float(weight), 4)
+                }
+                for i, weight in zip(keep, weights)
+            ]
+        }
+    }
+    return blended
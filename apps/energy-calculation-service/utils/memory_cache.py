@@ -0,0 +1,161 @@
+"""
+In-process LRU memory tier for weather datasets.
+
+Sits in front of the disk caches so that the same site requested again by the
+hybrid flow, the MPPT temperature lookup or the irradiation endpoint does not
+re-read the payload from disk. The tier is bounded by a byte budget and evicts
+least recently used entries.
+
+DataFrames/Series are stored with read-only arrays and every `get` returns a
+shallow copy: replacing a column on the returned frame (df['dni'] = ...) only
+affects the caller, and in-place writes raise instead of corrupting the shared
+entry. Each process (uvicorn worker or calculation pool process) has its own tier.
+"""
+
+import pickle
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _readonly(array: np.ndarray) -> np.ndarray:
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
+def freeze(value: Any) -> Any:
+    """Return a DataFrame/Series whose arrays are read-only; other values unchanged"""
+    if isinstance(value, pd.DataFrame):
+        return pd.DataFrame(
+            {name: _readonly(value[name].to_numpy()) for name in value.columns},
+            index=value.index,
+            copy=False
+        )
+    if isinstance(value, pd.Series):
+        return pd.Series(_readonly(value.to_numpy()), index=value.index, name=value.name, copy=False)
+    return value
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate memory footprint in bytes"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 0
+
+
+class MemoryCache:
+    """
+    LRU cache with a byte budget and hit/miss counters.
+
+    Thread-safe; a budget of 0 disables the tier (every get is a miss and
+    nothing is stored).
+    """
+
+    def __init__(self, max_mb: float = None):
+        max_mb = settings.MEMORY_CACHE_MAX_MB if max_mb is None else max_mb
+        self.max_bytes = int(max_mb * 1024 * 1024)
+
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._current_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value (shallow copy for pandas objects) or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            value = entry[0]
+
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            return value.copy(deep=False)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> Any:
+        """
+        Store a value, evicting least recently used entries to fit the budget.
+
+        Returns:
+            The value as it should be handed to the caller: a read-only shallow
+            copy for pandas objects, the original value otherwise
+        """
+        frozen = freeze(value)
+        size = estimate_size(frozen)
+
+        if not self.enabled or size > self.max_bytes:
+            if self.enabled:
+                logger.debug(f"Memory cache: entry {key} too large ({size} bytes), not stored")
+            return frozen
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._current_bytes -= previous[1]
+
+            while self._entries and self._current_bytes + size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._current_bytes -= evicted_size
+                self.evictions += 1
+
+            self._entries[key] = (frozen, size)
+            self._current_bytes += size
+
+        if isinstance(frozen, (pd.DataFrame, pd.Series)):
+            return frozen.copy(deep=False)
+        return frozen
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove a single entry"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._current_bytes -= entry[1]
+
+    def clear(self) -> int:
+        """Remove all entries; returns how many were removed"""
+        with self._lock:
+            removed = len(self._entries)
+            self._entries.clear()
+            self._current_bytes = 0
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Occupancy and hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "size_mb": round(self._current_bytes / (1024 * 1024), 2),
+                "max_size_mb": round(self.max_bytes / (1024 * 1024), 2),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
@@ -0,0 +1,227 @@
+"""
+Content-addressed cache of calculation results.
+
+The Node backend often re-posts byte-identical payloads (re-opening a saved
+project, regenerating a proposal). The result of /solar/calculate,
+/financial/* and /bess/hybrid-dimensioning is stored under a canonical hash of
+the validated request, the service version and, for calculations that read
+weather data, the identity of every cached entry that feeds them (see
+SolarCalculationService.weather_fingerprint: source entries, interpolation
+neighbours, the typical year), so a refreshed weather series is a miss.
+Fingerprints and result files are read off the event loop.
+
+Results are pickled in CACHE_DIR/responses, shared by all uvicorn workers of
+the host. Entries expire after RESPONSE_CACHE_TTL_HOURS; the directory has its
+own disk budget (RESPONSE_CACHE_MAX_MB), enforced by a janitor like the
+weather caches (utils.cache_janitor).
+
+Responses carry `X-Cache: HIT | MISS | BYPASS`. A request with
+`Cache-Control: no-cache` is recomputed and its stored result replaced;
+`no-store` is recomputed and nothing is written.
+"""
+
+import hashlib
+import json
+import logging
+import pickle
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from core.config import settings
+from core.executor import calculation_executor, WorkloadKind
+from utils.cache_budget import CacheBudget
+from utils.file_io import atomic_write
+
+logger = logging.getLogger(__name__)
+
+CACHE_HEADER = "X-Cache"
+FILE_PREFIX = "response_"
+FILE_EXTENSION = ".pkl"
+
+
+class ResponseCache:
+    """Calculation results keyed by the canonical hash of the request"""
+
+    # Owner of this cache's files in the disk budget
+    budget_owner = "responses"
+
+    def __init__(self, cache_dir: Path = None, ttl_hours: float = None, max_mb: float = None,
+                 enabled: bool = None, budget: CacheBudget = None):
+        """
+        Args:
+            cache_dir: Directory of the stored results (default CACHE_DIR/responses)
+            ttl_hours: Result lifetime (default RESPONSE_CACHE_TTL_HOURS)
+            max_mb: Disk budget of the directory (default RESPONSE_CACHE_MAX_MB)
+            enabled: Default RESPONSE_CACHE_ENABLED
+            budget: Ledger of the directory (default: a new one in cache_dir)
+        """
+        self.cache_dir = Path(cache_dir or settings.CACHE_DIR / "responses")
+        self.ttl_hours = settings.RESPONSE_CACHE_TTL_HOURS if ttl_hours is None else ttl_hours
+        self.enabled = settings.RESPONSE_CACHE_ENABLED if enabled is None else enabled
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.budget = budget or CacheBudget(
+            self.cache_dir, max_mb=settings.RESPONSE_CACHE_MAX_MB if max_mb is None else max_mb
+        )
+
+        # Counters for this process
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+
+    @staticmethod
+    def key(namespace: str, payload: BaseModel, fingerprint: Optional[str] = None) -> str:
+        """Canonical hash of (endpoint, service version, validated request, weather data)"""
+        canonical = json.dumps({
+            'namespace': namespace,
+            'version': settings.VERSION,
+            'request': payload.model_dump(mode='json'),
+            'weather': fingerprint
+        }, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{FILE_PREFIX}{key}{FILE_EXTENSION}"
+
+    def _cache_files(self) -> List[Path]:
+        return list(self.cache_dir.glob(f"{FILE_PREFIX}*{FILE_EXTENSION}"))
+
+    def _ttl_seconds(self) -> float:
+        return self.ttl_hours * 3600
+
+    def get(self, key: str) -> Optional[Any]:
+        """Stored result within its TTL, or None"""
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self._ttl_seconds():
+                return None
+            with open(path, 'rb') as f:
+                result = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Response cache: failed to read {path.name}: {e}")
+            return None
+
+        self.budget.touch(path.name)
+        return result
+
+    def set(self, key: str, result: Any) -> bool:
+        """Store a result (atomic write; the janitor bounds the directory size)"""
+        path = self._path(key)
+        try:
+            with atomic_write(path) as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            self.budget.record(self.budget_owner, path)
+            return True
+        except Exception as e:
+            logger.warning(f"Response cache: failed to write {path.name}: {e}")
+            return False
+
+    async def run(self, namespace: str, payload: BaseModel, request: Request, response: Response,
+                  compute: Callable[[], Awaitable[Any]],
+                  fingerprint: Callable[[], Optional[str]] = None) -> Any:
+        """
+        Result from the cache or from `compute`, with the X-Cache header set.
+
+        Args:
+            namespace: Calculation (endpoints running the same calculation may share it)
+            payload: Validated request
+            request: HTTP request (Cache-Control header)
+            response: Endpoint response (receives the X-Cache header)
+            compute: Runs the calculation
+            fingerprint: Fingerprint of the cached data used (weather,
+                interpolation neighbours, typical year); evaluated off the
+                event loop, and again after the calculation, which may write
+                weather data to the cache
+        """
+        if not self.enabled:
+            return await compute()
+
+        directives = {d.strip().lower() for d in request.headers.get("cache-control", "").split(",")}
+        bypass = bool(directives & {"no-cache", "no-store"})
+
+        if not bypass:
+            # Fingerprint (sqlite index) and result read off the event loop
+            result = await calculation_executor.run(self._lookup, namespace, payload, fingerprint,
+                                                    kind=WorkloadKind.IO)
+            if result is not None:
+                self.hits += 1
+                response.headers[CACHE_HEADER] = "HIT"
+                logger.info(f"Response cache: HIT ({namespace})")
+                return result
+
+        result = await compute()
+
+        if bypass:
+            self.bypasses += 1
+            response.headers[CACHE_HEADER] = "BYPASS"
+        else:
+            self.misses += 1
+            response.headers[CACHE_HEADER] = "MISS"
+        if "no-store" not in directives:
+            await calculation_executor.run(self._store, namespace, payload, fingerprint, result,
+                                           kind=WorkloadKind.IO)
+        return result
+
+    def _lookup(self, namespace: str, payload: BaseModel, fingerprint: Optional[Callable[[], Optional[str]]]) -> Any:
+        return self.get(self.key(namespace, payload, fingerprint() if fingerprint else None))
+
+    def _store(self, namespace: str, payload: BaseModel, fingerprint: Optional[Callable[[], Optional[str]]],
+               result: Any) -> bool:
+        # Fingerprint re-evaluated: the calculation may have written weather data to the cache
+        return self.set(self.key(namespace, payload, fingerprint() if fingerprint else None), result)
+
+    def clear_expired(self) -> int:
+        """Remove expired results (run by the janitor)"""
+        cutoff = time.time() - self._ttl_seconds()
+        removed = []
+        for path in self._cache_files():
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed.append(path.name)
+            except FileNotFoundError:
+                continue
+
+        self.budget.forget(removed)
+        if removed:
+            logger.info(f"Response cache: removed {len(removed)} expired results")
+        return len(removed)
+
+    def evict_file(self, file_name: str) -> bool:
+        """Delete a file chosen by the janitor's LRU eviction"""
+        try:
+            (self.cache_dir / file_name).unlink(missing_ok=True)
+            return True
+        except OSError as e:
+            logger.warning(f"Error removing {file_name}: {e}")
+            return False
+
+    def clear_all(self) -> int:
+        """Remove every stored result"""
+        removed = 0
+        for path in self._cache_files():
+            path.unlink(missing_ok=True)
+            removed += 1
+        self.budget.forget_owner(self.budget_owner)
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters for this process and disk usage"""
+        return {
+            "enabled": self.enabled,
+            "ttl_hours": self.ttl_hours,
+            "cache_dir": str(self.cache_dir),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypasses": self.bypasses,
+            "budget": self.budget.get_stats()
+        }
+
+
+# Global instance
+response_cache = ResponseCache()
@@ -0,0 +1,117 @@
+"""
+Background refresh of stale cache entries (stale-while-revalidate).
+
+Entries past their TTL are still served during a grace window; the request
+that finds one schedules its refresh here and returns immediately. Refreshes
+run on a small per-process pool, are deduplicated by key, are spaced by a
+minimum interval and are skipped while the upstream circuit breaker is open,
+so revalidation never adds bursts on top of the regular traffic.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Set
+
+from core.config import settings
+from utils.http_client import CircuitBreaker, UpstreamClient
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundRefresher:
+    """Atualização em segundo plano de entradas de cache vencidas"""
+
+    def __init__(self, max_workers: int = None, min_interval: float = None):
+        self.max_workers = max_workers or settings.CACHE_REFRESH_MAX_WORKERS
+        self.min_interval = (min_interval if min_interval is not None
+                             else settings.CACHE_REFRESH_MIN_INTERVAL_SECONDS)
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Set[str] = set()
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+        # Contadores deste processo
+        self.scheduled = 0
+        self.completed = 0
+        self.failed = 0
+        self.skipped = 0
+
+    def submit(self, key: str, refresh: Callable[[], Any], client: UpstreamClient = None) -> bool:
+        """
+        Schedule `refresh` unless the same key is already pending.
+
+        Args:
+            key: Cache entry identifier (e.g. geohash cell + cache params)
+            refresh: Downloads the data and rewrites the cache entry
+            client: Upstream used by `refresh`; nothing is scheduled while its
+                circuit breaker is open
+
+        Returns:
+            True if the refresh was scheduled
+        """
+        if client is not None and client.breaker.state == CircuitBreaker.OPEN:
+            self.skipped += 1
+            logger.debug(f"Atualização de {key} adiada: circuito {client.name} aberto")
+            return False
+
+        with self._lock:
+            if key in self._pending:
+                return False
+            self._pending.add(key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="cache-refresh")
+            self.scheduled += 1
+            self._executor.submit(self._run, key, refresh)
+
+        logger.info(f"Entrada vencida servida; atualização agendada para {key}")
+        return True
+
+    def _wait_turn(self) -> None:
+        """Espaça o início das atualizações em pelo menos min_interval"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+    def _run(self, key: str, refresh: Callable[[], Any]) -> None:
+        try:
+            self._wait_turn()
+            refresh()
+            self.completed += 1
+            logger.info(f"Entrada de cache atualizada em segundo plano: {key}")
+        except Exception as e:
+            self.failed += 1
+            logger.warning(f"Falha na atualização em segundo plano de {key}: {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Contadores deste processo"""
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "scheduled": self.scheduled,
+            "completed": self.completed,
+            "failed": self.failed,
+            "skipped_circuit_open": self.skipped,
+            "pending": pending,
+            "max_workers": self.max_workers,
+            "min_interval_seconds": self.min_interval
+        }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Descarta atualizações ainda não iniciadas"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# Instância global para o cache de dados meteorológicos
+cache_refresher = BackgroundRefresher()
@@ -0,0 +1,77 @@
+"""
+Single-flight coalescing of weather downloads.
+
+Concurrent requests for projects in the same city miss the cache at the same
+time and would each fire their own PVGIS/NASA call (up to 120 s). SingleFlight
+serializes work per key with a file lock shared by every thread and process of
+the host (uvicorn workers and calculation pool): the first caller downloads and
+writes the cache, the others wait and then read the result from the cache.
+"""
+
+import hashlib
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from core.config import settings
+from utils.file_io import file_lock
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Uma única execução por chave entre threads e processos"""
+
+    def __init__(self, lock_dir: Path = None, timeout: float = None):
+        self.lock_dir = Path(lock_dir or settings.CACHE_DIR / "locks")
+        self.timeout = timeout if timeout is not None else settings.WEATHER_DOWNLOAD_LOCK_TIMEOUT
+
+        # Contadores deste processo
+        self.leaders = 0
+        self.coalesced = 0
+        self.timeouts = 0
+
+    def _lock_path(self, key: str) -> Path:
+        return self.lock_dir / f"{hashlib.md5(key.encode()).hexdigest()}.lock"
+
+    def run(self, key: str, compute: Callable[[], T], lookup: Callable[[], Optional[T]] = None) -> T:
+        """
+        Execute `compute` at most once at a time for `key`.
+
+        Args:
+            key: Work identifier (e.g. geohash cell + cache params)
+            compute: Produces the value and stores it where `lookup` can find it
+            lookup: Checked after the lock is acquired; a non-None value means
+                another caller already did the work and is returned as is
+
+        Returns:
+            Value from `lookup` or `compute`
+        """
+        with file_lock(self._lock_path(key), timeout=self.timeout) as acquired:
+            if not acquired:
+                self.timeouts += 1
+
+            if lookup is not None:
+                value = lookup()
+                if value is not None:
+                    self.coalesced += 1
+                    logger.info(f"Single-flight: resultado reaproveitado para {key}")
+                    return value
+
+            self.leaders += 1
+            return compute()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Contadores deste processo"""
+        return {
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "timeouts": self.timeouts,
+            "lock_dir": str(self.lock_dir)
+        }
+
+
+# Instância global para downloads de dados meteorológicos
+weather_download_flight = SingleFlight()